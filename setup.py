@@ -26,7 +26,9 @@ setup(
     packages=find_packages(
         exclude=('tests', 'samples'),
     ),
-    install_requires=[],
+    install_requires=[
+        'tomli>=1.1.0; python_version < "3.11"',
+    ],
     include_package_data=True,
     license='MIT',
     classifiers=[
@@ -1,2 +1,11 @@
 __version__: str = '0.1.12'
 from stubdoc.stubdoc import add_docstring_to_stubfile
+from stubdoc.index import export_docstring_index
+from stubdoc.index import add_docstring_to_stubfile_from_index
+from stubdoc.update import update_docstrings_in_stubfile
+from stubdoc.bytecode import add_docstring_to_stubfile_from_bytecode
+from stubdoc.archive import add_docstring_to_stubfiles_in_archive
+from stubdoc.session import StubdocSession
+from stubdoc.symbols import SymbolTable
+from stubdoc.aio import add_docstring_to_stubfile_async
+from stubdoc.aio import add_docstring_to_stubfiles_async
@@ -0,0 +1,193 @@
+"""The module that implements the asyncio interface, for use inside
+event-loop-based applications (e.g., asyncio-based build servers).
+
+Stub files are read and written in threads (`asyncio.to_thread`) and
+docstrings are extracted in an executor with `StubdocSession` (which is
+thread-safe and does not change `sys.path`), so the event loop is not
+blocked by module imports or file I/O.
+"""
+
+import asyncio
+import functools
+import itertools
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Dict, Iterable, Iterator, List, Optional
+from typing import Set, Tuple
+
+from stubdoc import stubdoc
+from stubdoc.batch import PairResult
+from stubdoc.session import StubdocSession
+
+
+async def add_docstring_to_stubfile_async(
+        original_module_path: str, stub_file_path: str,
+        session: Optional[StubdocSession] = None,
+        executor: Optional[ThreadPoolExecutor] = None) -> None:
+    """
+    Add docstring to a specified stub file without blocking the event
+    loop.
+
+    Parameters
+    ----------
+    original_module_path : str
+        The path of stub file's original module.
+    stub_file_path : str
+        Target stub file path.
+    session : StubdocSession or None, default None
+        The session to extract docstrings with. Paths are resolved from
+        the session's root directory. If not specified, a new session
+        (import backend) is created.
+    executor : ThreadPoolExecutor or None, default None
+        The executor to extract docstrings in. The event loop's default
+        executor is used if not specified.
+    """
+    if session is None:
+        session = StubdocSession()
+    stub_file_path = session._get_path(path=stub_file_path)
+    stub_str: str = await asyncio.to_thread(
+        stubdoc._read_txt, file_path=stub_file_path)
+    if not stubdoc._needs_docstring_index(stub_str=stub_str):
+        return
+    declared_names: List[str] = stubdoc._get_declared_names(
+        stub_str=stub_str)
+    loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+    docstring_index: Dict[str, str] = await loop.run_in_executor(
+        executor, functools.partial(
+            session.get_docstring_index, module_path=original_module_path,
+            names=declared_names))
+    stub_str = await asyncio.to_thread(
+        _get_docstring_added_stub_str, stub_str=stub_str,
+        docstring_index=docstring_index)
+    await asyncio.to_thread(
+        stubdoc._write_txt, file_path=stub_file_path, txt=stub_str)
+
+
+def _get_docstring_added_stub_str(
+        *, stub_str: str, docstring_index: Dict[str, str]) -> str:
+    """
+    Get a stub string that docstrings of a docstring index added to.
+
+    Parameters
+    ----------
+    stub_str : str
+        A target stub file string.
+    docstring_index : dict of str to str
+        A docstring index. Please see
+        `stubdoc._get_docstring_index_from_module` function for the
+        details.
+
+    Returns
+    -------
+    result_stub_str : str
+        Stub file string after docstrings added (ends with a newline).
+    """
+    result_stub_str: str = stubdoc._add_docstrings_to_stub_str(
+        stub_str=stub_str, docstring_index=docstring_index)
+    if not result_stub_str.endswith('\n'):
+        result_stub_str += '\n'
+    return result_stub_str
+
+
+async def add_docstring_to_stubfiles_async(
+        pairs: Iterable[Tuple[str, str]], concurrency: int = 4,
+        session: Optional[StubdocSession] = None,
+        executor: Optional[ThreadPoolExecutor] = None,
+) -> AsyncIterator[PairResult]:
+    """
+    Add docstring to multiple stub files without blocking the event
+    loop.
+
+    Notes
+    -----
+    Pairs are read lazily and at most `concurrency` pairs are processed
+    at the same time. A failure of a single pair will not stop the
+    other pairs' processing. The error is stored to the result instead.
+    Module imports of the import backend are serialized (please see
+    `StubdocSession`), but file I/O and the other backends' extraction
+    overlap.
+
+    Parameters
+    ----------
+    pairs : iterable of tuple of str and str
+        Pairs of original module path and stub file path.
+    concurrency : int, default 4
+        The maximum number of pairs processed at the same time.
+    session : StubdocSession or None, default None
+        The session to extract docstrings with. If not specified,
+        a new session (import backend) is created and shared by the
+        pairs.
+    executor : ThreadPoolExecutor or None, default None
+        The executor to extract docstrings in. The event loop's default
+        executor is used if not specified.
+
+    Yields
+    ------
+    result : PairResult
+        Each pair's processing result, in the order of completion.
+
+    Raises
+    ------
+    ValueError
+        If concurrency is less than 1.
+    """
+    if concurrency < 1:
+        raise ValueError(f'concurrency needs to be 1 or more: {concurrency}')
+    if session is None:
+        session = StubdocSession()
+    pairs_iterator: Iterator[Tuple[str, str]] = iter(pairs)
+    tasks: Set['asyncio.Future[PairResult]'] = set()
+    try:
+        while True:
+            for module_path, stub_path in itertools.islice(
+                    pairs_iterator, concurrency - len(tasks)):
+                tasks.add(asyncio.ensure_future(_add_docstring_to_pair_async(
+                    module_path=module_path, stub_path=stub_path,
+                    session=session, executor=executor)))
+            if not tasks:
+                break
+            done_tasks, tasks = await asyncio.wait(
+                tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done_tasks:
+                yield task.result()
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def _add_docstring_to_pair_async(
+        *, module_path: str, stub_path: str, session: StubdocSession,
+        executor: Optional[ThreadPoolExecutor]) -> PairResult:
+    """
+    Add docstring to a single stub file and get the result.
+
+    Parameters
+    ----------
+    module_path : str
+        The path of stub file's original module.
+    stub_path : str
+        Target stub file path.
+    session : StubdocSession
+        The session to extract docstrings with.
+    executor : ThreadPoolExecutor or None
+        The executor to extract docstrings in.
+
+    Returns
+    -------
+    result : PairResult
+        The processing result.
+    """
+    start_time: float = time.perf_counter()
+    try:
+        await add_docstring_to_stubfile_async(
+            original_module_path=module_path, stub_file_path=stub_path,
+            session=session, executor=executor)
+    except Exception:
+        return PairResult(
+            module_path=module_path, stub_path=stub_path, succeeded=False,
+            message=traceback.format_exc(),
+            elapsed_seconds=time.perf_counter() - start_time)
+    return PairResult(
+        module_path=module_path, stub_path=stub_path, succeeded=True,
+        message='', elapsed_seconds=time.perf_counter() - start_time)
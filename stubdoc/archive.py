@@ -0,0 +1,169 @@
+"""The module that implements docstring adding from modules in wheel or
+zip archives, without unpacking them to disk.
+"""
+
+import os
+import posixpath
+import re
+import zipfile
+from typing import Callable, Dict, Iterator, List, Pattern, Tuple
+
+from stubdoc import batch
+from stubdoc import static
+from stubdoc import stubdoc
+from stubdoc.batch import PairResult
+
+ARCHIVE_EXTENSIONS: Tuple[str, ...] = ('.whl', '.zip')
+
+_WHEEL_DATA_LIB_PATTERN: Pattern = re.compile(
+    pattern=r'^[^/]+\.data/(?:purelib|platlib)/')
+
+
+def add_docstring_to_stubfiles_in_archive(
+        archive_path: str, stub_dir_path: str,
+        apply_docstring_index: Callable[..., None] = (
+            stubdoc._add_docstring_index_to_stubfile),
+        update_mode: bool = False,
+) -> Iterator[PairResult]:
+    """
+    Add docstring to the stub files of modules in a wheel or zip
+    archive. Module sources are read from the archive members and
+    docstrings are extracted statically (modules are not imported).
+
+    Notes
+    -----
+    Each stub file path is resolved in the stubgen's output directory
+    layout from the archive root (e.g., `pkg/mod.py` member to
+    `out/pkg/mod.pyi`). Modules whose stub file does not exist are
+    skipped, and stub files that declare no function, class or method
+    are left untouched (the module source is not read). Each result's
+    module path is the member path under the archive path (e.g.,
+    `dist/pkg.whl/pkg/mod.py`).
+
+    Parameters
+    ----------
+    archive_path : str
+        Wheel or zip archive path.
+    stub_dir_path : str
+        Stub files' root directory path.
+    apply_docstring_index : Callable, default
+            stubdoc._add_docstring_index_to_stubfile
+        The function that applies a docstring index to a stub file. It
+        receives `docstring_index` and `stub_file_path` keyword
+        arguments.
+    update_mode : bool, default False
+        Whether apply_docstring_index updates docstrings incrementally.
+        If True, stub files that already have docstrings are also
+        processed.
+
+    Yields
+    ------
+    result : PairResult
+        Each module's processing result.
+
+    Raises
+    ------
+    ValueError
+        If the specified file is not a zip archive.
+    """
+    if not zipfile.is_zipfile(archive_path):
+        raise ValueError(
+            f'Specified file is not a wheel or zip archive: {archive_path}')
+    with zipfile.ZipFile(archive_path) as zip_file:
+        member_paths: Dict[str, str] = {}
+        pairs: List[Tuple[str, str]] = []
+        for member_name in get_module_member_names(zip_file=zip_file):
+            stub_path: str = get_stub_path_of_member(
+                member_name=member_name, stub_dir_path=stub_dir_path)
+            if not os.path.isfile(stub_path):
+                continue
+            module_path: str = os.path.join(archive_path, member_name)
+            member_paths[module_path] = member_name
+            pairs.append((module_path, stub_path))
+
+        def add_docstring(module_path: str, stub_path: str) -> None:
+            if not stubdoc._needs_docstring_index(
+                    stub_str=stubdoc._read_txt(file_path=stub_path),
+                    update_mode=update_mode):
+                return
+            member_name: str = member_paths[module_path]
+            source: bytes = zip_file.read(member_name)
+            docstring_index: Dict[str, str] = \
+                static.get_docstring_index_from_source(
+                    source=source, filename=module_path)
+            apply_docstring_index(
+                docstring_index=docstring_index, stub_file_path=stub_path)
+
+        yield from batch.add_docstring_to_stubfiles(
+            pairs=pairs, add_docstring=add_docstring)
+
+
+def get_module_member_names(*, zip_file: zipfile.ZipFile) -> List[str]:
+    """
+    Get Python module member names in an archive.
+
+    Parameters
+    ----------
+    zip_file : ZipFile
+        Target opened archive.
+
+    Returns
+    -------
+    member_names : list of str
+        Sorted member names. Members in `__pycache__` or dot directories
+        (e.g., `.git`) are skipped.
+    """
+    member_names: List[str] = []
+    for member_name in zip_file.namelist():
+        if not member_name.endswith('.py'):
+            continue
+        dir_names: List[str] = member_name.split('/')[:-1]
+        if any(dir_name == '__pycache__' or dir_name.startswith('.')
+               for dir_name in dir_names):
+            continue
+        member_names.append(member_name)
+    return sorted(member_names)
+
+
+def get_stub_path_of_member(*, member_name: str, stub_dir_path: str) -> str:
+    """
+    Get a stub file path of an archive member module in the stubgen's
+    output directory layout.
+
+    Parameters
+    ----------
+    member_name : str
+        Target member name. e.g., pkg/mod.py
+        A wheel's data directory prefix
+        (e.g., `pkg-1.0.data/purelib/`) is removed.
+    stub_dir_path : str
+        Stub files' root directory path. e.g., out
+
+    Returns
+    -------
+    stub_path : str
+        The stub file path. e.g., out/pkg/mod.pyi
+    """
+    member_name = _WHEEL_DATA_LIB_PATTERN.sub('', member_name)
+    stub_member_name: str = posixpath.splitext(member_name)[0] + '.pyi'
+    stub_path: str = os.path.join(
+        stub_dir_path, *stub_member_name.split('/'))
+    return stub_path
+
+
+def is_archive_path(path: str) -> bool:
+    """
+    Get a boolean indicating whether a specified path is a wheel or
+    zip archive file path.
+
+    Parameters
+    ----------
+    path : str
+        Target path.
+
+    Returns
+    -------
+    result : bool
+        True if the path is an existing file with an archive extension.
+    """
+    return os.path.isfile(path) and path.endswith(ARCHIVE_EXTENSIONS)
@@ -0,0 +1,313 @@
+"""The module that composes docstring extraction backends and docstring
+applying modes.
+"""
+
+import os
+import traceback
+from contextlib import ExitStack
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from stubdoc import batch
+from stubdoc import bytecode
+from stubdoc import cache
+from stubdoc import depfile
+from stubdoc import static
+from stubdoc import stubdoc
+from stubdoc import update
+from stubdoc.symbols import SymbolTable
+
+DOCSTRING_INDEX_GETTERS: Dict[str, Callable[..., Dict[str, str]]] = {
+    'import': stubdoc._get_docstring_index_from_module_path,
+    'bytecode': bytecode.get_docstring_index_from_bytecode,
+    'static': static.get_docstring_index_from_module_path,
+}
+
+
+def add_docstring_to_stubfile_with_backend(
+        original_module_path: str, stub_file_path: str,
+        backend: str = 'import', update_mode: bool = False,
+        cache_dir_path: Optional[str] = None,
+        symbol_table: Optional[SymbolTable] = None,
+        write_depfile: bool = False,
+        fanout_stub_dir_paths: Optional[List[str]] = None) -> None:
+    """
+    Add docstring to a specified stub file with a specified docstring
+    extraction backend. This function is a module-level function so
+    that it can be sent to worker processes (e.g., by
+    `functools.partial`).
+
+    Notes
+    -----
+    Stub files that have nothing to document (please see
+    `stubdoc._needs_docstring_index` function) are left untouched, and
+    the original module's docstrings are not extracted (the module is
+    not imported) if none of the stub files needs them.
+
+    Parameters
+    ----------
+    original_module_path : str
+        The path of stub file's original module.
+    stub_file_path : str
+        Target stub file path.
+    backend : str, default 'import'
+        Docstring extraction backend. import, bytecode or static.
+    update_mode : bool, default False
+        If True, docstrings are updated incrementally. Please see
+        `update.update_docstrings_in_stubfile` function for the details.
+    cache_dir_path : str or None, default None
+        Docstring index cache directory path. If specified, a cached
+        index is used while the module source is unchanged. Otherwise
+        the import backend looks up only the names that the stub
+        declares.
+    symbol_table : SymbolTable or None, default None
+        The symbol table shared by a batch run's pairs. If specified,
+        docstrings of the names that the module re-exports from the
+        other modules of its package are also added. It can be
+        specified only with the import backend without cache_dir_path
+        (the other backends and cached indexes only have the module's
+        own names).
+    write_depfile : bool, default False
+        If True, a Makefile-style depfile is written next to the stub
+        file (please see the `depfile` module). It lists the original
+        module, the stub file and, with the import backend, the
+        project-local modules imported while loading the original
+        module (stored in the cache with cache_dir_path, so that they
+        are also listed if the cached index is used).
+    fanout_stub_dir_paths : list of str or None, default None
+        Stub files' root directory paths of multiple stub trees (e.g.,
+        per Python version or platform). If specified, the module's
+        stub files in all of the trees (in the stubgen's output
+        directory layout) are also processed, and the module's
+        docstrings are extracted only once for all of them.
+
+    Raises
+    ------
+    ValueError
+        If symbol_table is specified with the other backend than the
+        import backend or with cache_dir_path.
+    Exception
+        If the processing of any of the stub files failed. The other
+        stub files are still processed.
+    """
+    if symbol_table is not None and (
+            backend != 'import' or cache_dir_path is not None):
+        raise ValueError(
+            'symbol_table argument can be specified only with import'
+            ' backend and without cache_dir_path argument.')
+    stub_file_paths: List[str] = [stub_file_path]
+    if fanout_stub_dir_paths is not None:
+        stub_file_paths = get_fanout_stub_paths(
+            module_path=original_module_path, stub_path=stub_file_path,
+            stub_dir_paths=fanout_stub_dir_paths)
+    stub_strs: Dict[str, str] = {
+        path: stubdoc._read_txt(file_path=path) for path in stub_file_paths}
+    target_stub_file_paths: List[str] = [
+        path for path in stub_file_paths
+        if stubdoc._needs_docstring_index(
+            stub_str=stub_strs[path], update_mode=update_mode)]
+    docstring_index: Dict[str, str] = {}
+    declared_names_list: List[Optional[List[str]]] = [
+        None for _ in target_stub_file_paths]
+    imported_paths: Optional[List[str]] = None
+    if target_stub_file_paths:
+        docstring_index, declared_names_list, imported_paths = \
+            _get_docstring_index_of_stubs(
+                module_path=original_module_path,
+                stub_strs=[
+                    stub_strs[path] for path in target_stub_file_paths],
+                backend=backend, cache_dir_path=cache_dir_path,
+                symbol_table=symbol_table, record_imports=write_depfile)
+
+    failed_messages: List[str] = []
+    target_declared_names: Dict[str, Optional[List[str]]] = dict(
+        zip(target_stub_file_paths, declared_names_list))
+    for path in stub_file_paths:
+        try:
+            if path in target_declared_names:
+                stub_declared_names: Optional[List[str]] = \
+                    target_declared_names[path]
+                stub_docstring_index: Dict[str, str] = docstring_index
+                if len(stub_file_paths) > 1 \
+                        and stub_declared_names is not None:
+                    stub_docstring_index = _filter_docstring_index(
+                        docstring_index=docstring_index,
+                        names=stub_declared_names)
+                _apply_docstring_index(
+                    docstring_index=stub_docstring_index,
+                    stub_file_path=path, update_mode=update_mode)
+            if write_depfile:
+                depfile.write_depfile(
+                    stub_path=path,
+                    dependency_paths=depfile.get_dependency_paths(
+                        module_path=original_module_path, stub_path=path,
+                        imported_paths=imported_paths))
+        except Exception:
+            if len(stub_file_paths) == 1:
+                raise
+            failed_messages.append(
+                f'{traceback.format_exc()}\n{path}')
+    if failed_messages:
+        raise Exception(
+            '\n\n'.join(failed_messages)
+            + '\n\nDocstring adding failed in stub trees: '
+            f'{len(failed_messages)} of {len(stub_file_paths)}')
+
+
+def _get_docstring_index_of_stubs(
+        *, module_path: str, stub_strs: List[str], backend: str,
+        cache_dir_path: Optional[str], symbol_table: Optional[SymbolTable],
+        record_imports: bool,
+) -> Tuple[Dict[str, str], List[Optional[List[str]]], Optional[List[str]]]:
+    """
+    Get a module's docstring index for its stub files.
+
+    Parameters
+    ----------
+    module_path : str
+        The stub files' original module path.
+    stub_strs : list of str
+        The stub files' strings.
+    backend : str
+        Docstring extraction backend.
+    cache_dir_path : str or None
+        Docstring index cache directory path.
+    symbol_table : SymbolTable or None
+        The symbol table shared by a batch run's pairs.
+    record_imports : bool
+        If True, the imports while loading the module are recorded
+        (please see `depfile.record_imports` function).
+
+    Returns
+    -------
+    docstring_index : dict of str to str
+        The module's docstring index. The import backend without
+        cache_dir_path looks up only the names that the stubs declare.
+    declared_names_list : list of (list of str or None)
+        Each stub's declared names if the index was got by them.
+        Otherwise None for each stub.
+    imported_paths : list of str or None
+        The project-local module paths that the module imports (please
+        see `depfile.get_imported_paths` function) if record_imports is
+        True and the module was imported (or a cached index of the
+        import backend has them).
+    """
+    get_docstring_index: Callable[..., Dict[str, str]] = \
+        DOCSTRING_INDEX_GETTERS[backend]
+    docstring_index: Dict[str, str]
+    declared_names_list: List[Optional[List[str]]] = [
+        None for _ in stub_strs]
+    imported_paths: Optional[List[str]] = None
+    if cache_dir_path is None and backend == 'import':
+        declared_names_list = [
+            stubdoc._get_declared_names(stub_str=stub_str)
+            for stub_str in stub_strs]
+        declared_names: List[str] = list(dict.fromkeys(
+            name for names in declared_names_list
+            for name in names or []))
+        new_module_names: Optional[Set[str]] = None
+        with ExitStack() as exit_stack:
+            if record_imports:
+                new_module_names = exit_stack.enter_context(
+                    depfile.record_imports())
+            if symbol_table is None:
+                docstring_index = \
+                    stubdoc._get_docstring_index_from_module_path(
+                        module_path=module_path, names=declared_names)
+            else:
+                docstring_index = symbol_table.get_docstring_index(
+                    module_path=module_path, names=declared_names)
+        if new_module_names is not None:
+            imported_paths = depfile.get_imported_paths(
+                module_path=module_path, new_module_names=new_module_names)
+    elif cache_dir_path is None:
+        docstring_index = get_docstring_index(module_path=module_path)
+    else:
+        docstring_index, imported_paths = \
+            cache.get_docstring_index_and_imported_paths_with_cache(
+                module_path=module_path, backend=backend,
+                cache_dir_path=cache_dir_path,
+                get_docstring_index=get_docstring_index,
+                record_imports=record_imports and backend == 'import')
+    return docstring_index, declared_names_list, imported_paths
+
+
+def get_fanout_stub_paths(
+        *, module_path: str, stub_path: str,
+        stub_dir_paths: List[str]) -> List[str]:
+    """
+    Get a module's stub file paths in multiple stub trees.
+
+    Parameters
+    ----------
+    module_path : str
+        Target module path.
+    stub_path : str
+        The module's stub file path of the processed pair.
+    stub_dir_paths : list of str
+        Stub files' root directory paths.
+
+    Returns
+    -------
+    stub_paths : list of str
+        The pair's stub file path and the module's existing stub file
+        paths in the stub trees (without duplicates).
+    """
+    stub_paths: List[str] = [stub_path]
+    normalized_paths: Set[str] = {os.path.normpath(stub_path)}
+    for stub_dir_path in stub_dir_paths:
+        tree_stub_path: str = batch.get_stub_path(
+            module_path=module_path, stub_dir_path=stub_dir_path)
+        if os.path.normpath(tree_stub_path) in normalized_paths \
+                or not os.path.isfile(tree_stub_path):
+            continue
+        stub_paths.append(tree_stub_path)
+        normalized_paths.add(os.path.normpath(tree_stub_path))
+    return stub_paths
+
+
+def _filter_docstring_index(
+        *, docstring_index: Dict[str, str],
+        names: List[str]) -> Dict[str, str]:
+    """
+    Get a docstring index that has only specified names' entries (e.g.,
+    the names that one of stub trees' stub file declares).
+
+    Parameters
+    ----------
+    docstring_index : dict of str to str
+        Target docstring index.
+    names : list of str
+        Names to keep.
+
+    Returns
+    -------
+    docstring_index : dict of str to str
+        Filtered docstring index (in the same order).
+    """
+    names_set: Set[str] = set(names)
+    return {
+        name: docstring for name, docstring in docstring_index.items()
+        if name in names_set}
+
+
+def _apply_docstring_index(
+        *, docstring_index: Dict[str, str], stub_file_path: str,
+        update_mode: bool) -> None:
+    """
+    Add or update docstrings of a specified stub file.
+
+    Parameters
+    ----------
+    docstring_index : dict of str to str
+        The original module's docstring index.
+    stub_file_path : str
+        Target stub file path.
+    update_mode : bool
+        If True, docstrings are updated incrementally.
+    """
+    if update_mode:
+        update._update_docstring_index_in_stubfile(
+            docstring_index=docstring_index, stub_file_path=stub_file_path)
+        return
+    stubdoc._add_docstring_index_to_stubfile(
+        docstring_index=docstring_index, stub_file_path=stub_file_path)
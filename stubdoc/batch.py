@@ -0,0 +1,605 @@
+"""The module that implements processing of multiple module and stub
+file pairs.
+"""
+
+import gc
+import importlib
+import itertools
+import multiprocessing
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, Future
+from concurrent.futures import ProcessPoolExecutor, wait
+from multiprocessing.context import BaseContext
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+from typing import Set, TextIO, Tuple
+
+from stubdoc import stubdoc
+from stubdoc import tracing
+from stubdoc.config import Config
+
+
+class PairResult:
+
+    module_path: str
+    stub_path: str
+    succeeded: bool
+    message: str
+    elapsed_seconds: float
+
+    def __init__(
+            self, module_path: str, stub_path: str, succeeded: bool,
+            message: str, elapsed_seconds: float) -> None:
+        """
+        The class that stores single module and stub pair's
+        processing result.
+
+        Parameters
+        ----------
+        module_path : str
+            The path of stub file's original module.
+        stub_path : str
+            Target stub file path.
+        succeeded : bool
+            Whether the docstring adding succeeded.
+        message : str
+            Error message if failed. Empty string if succeeded.
+        elapsed_seconds : float
+            Processing time of the pair.
+        """
+        self.module_path = module_path
+        self.stub_path = stub_path
+        self.succeeded = succeeded
+        self.message = message
+        self.elapsed_seconds = elapsed_seconds
+
+    def to_line(self) -> str:
+        """
+        Convert the result to a single-line string.
+
+        Returns
+        -------
+        line : str
+            Tab-separated status, module path and stub path
+            (e.g., `ok<TAB>sample/path.py<TAB>out/sample/path.pyi`).
+        """
+        status: str = 'ok' if self.succeeded else 'failed'
+        return f'{status}\t{self.module_path}\t{self.stub_path}'
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert the result to a JSON serializable dictionary.
+
+        Returns
+        -------
+        result_dict : dict
+            Converted dictionary.
+        """
+        return {
+            'module_path': self.module_path,
+            'stub_path': self.stub_path,
+            'succeeded': self.succeeded,
+            'message': self.message,
+            'elapsed_seconds': self.elapsed_seconds,
+        }
+
+    @classmethod
+    def from_dict(cls, result_dict: Dict[str, Any]) -> 'PairResult':
+        """
+        Create a result from a dictionary that converted by `to_dict`
+        method.
+
+        Parameters
+        ----------
+        result_dict : dict
+            Source dictionary.
+
+        Returns
+        -------
+        result : PairResult
+            Created result.
+        """
+        return cls(
+            module_path=result_dict['module_path'],
+            stub_path=result_dict['stub_path'],
+            succeeded=result_dict['succeeded'],
+            message=result_dict['message'],
+            elapsed_seconds=result_dict['elapsed_seconds'])
+
+
+_AddDocstring = Callable[[str, str], None]
+
+
+def add_docstring_to_stubfiles(
+        pairs: Iterable[Tuple[str, str]],
+        add_docstring: _AddDocstring = stubdoc.add_docstring_to_stubfile,
+) -> Iterator[PairResult]:
+    """
+    Add docstring to multiple stub files.
+
+    Notes
+    -----
+    A failure of a single pair will not stop the other pairs'
+    processing. The error is stored to the result instead.
+
+    Parameters
+    ----------
+    pairs : iterable of tuple of str and str
+        Pairs of original module path and stub file path.
+    add_docstring : Callable, default stubdoc.add_docstring_to_stubfile
+        The function that adds docstring to a single stub file. It
+        receives the original module path and the stub file path.
+
+    Yields
+    ------
+    result : PairResult
+        Each pair's processing result, in the order of pairs.
+    """
+    for module_path, stub_path in pairs:
+        yield _add_docstring_to_pair(
+            module_path=module_path, stub_path=stub_path,
+            add_docstring=add_docstring)
+
+
+def _add_docstring_to_pair(
+        *, module_path: str, stub_path: str,
+        add_docstring: _AddDocstring) -> PairResult:
+    """
+    Add docstring to a single stub file and get the result.
+
+    Parameters
+    ----------
+    module_path : str
+        The path of stub file's original module.
+    stub_path : str
+        Target stub file path.
+    add_docstring : Callable
+        The function that adds docstring to a single stub file.
+
+    Returns
+    -------
+    result : PairResult
+        The processing result.
+    """
+    start_time: float = time.perf_counter()
+    try:
+        with tracing.span(
+                name=module_path, category='module',
+                args={'stub_path': stub_path}):
+            add_docstring(module_path, stub_path)
+    except Exception:
+        return PairResult(
+            module_path=module_path, stub_path=stub_path, succeeded=False,
+            message=traceback.format_exc(),
+            elapsed_seconds=time.perf_counter() - start_time)
+    return PairResult(
+        module_path=module_path, stub_path=stub_path, succeeded=True,
+        message='', elapsed_seconds=time.perf_counter() - start_time)
+
+
+def add_docstring_to_stubfiles_in_parallel(
+        pairs: Iterable[Tuple[str, str]], jobs: int,
+        add_docstring: _AddDocstring = stubdoc.add_docstring_to_stubfile,
+        preload_module_names: Optional[List[str]] = None,
+) -> Iterator[PairResult]:
+    """
+    Add docstring to multiple stub files in worker processes.
+
+    Notes
+    -----
+    Pairs are read lazily, so that pairs from a stream are dispatched
+    as soon as they arrive. If trace event recording is enabled, it is
+    also enabled in workers and their events are added to this
+    process's events.
+
+    If preload_module_names is specified, the modules are imported in
+    this process first and workers are forked from it, so workers
+    share the imported modules copy-on-write instead of importing them
+    again (please see `preload_modules` function). The garbage
+    collector's tracked objects are frozen (`gc.freeze`) while the
+    workers run, so that collections in workers do not touch (and
+    copy) the preloaded objects' memory pages.
+
+    Parameters
+    ----------
+    pairs : iterable of tuple of str and str
+        Pairs of original module path and stub file path.
+    jobs : int
+        The number of worker processes.
+    add_docstring : Callable, default stubdoc.add_docstring_to_stubfile
+        The function that adds docstring to a single stub file. Need to
+        be picklable (e.g., a module-level function or
+        `functools.partial` of it).
+    preload_module_names : list of str or None, default None
+        Module names to import before starting workers (e.g., heavy
+        dependencies that most modules import). e.g., ['numpy']
+
+    Yields
+    ------
+    result : PairResult
+        Each pair's processing result, in the order of completion.
+
+    Raises
+    ------
+    ValueError
+        If preload_module_names is specified on a platform that does not
+        support the fork start method (e.g., Windows).
+    """
+    mp_context: Optional[BaseContext] = None
+    if preload_module_names is not None:
+        mp_context = _get_fork_context()
+        preload_modules(module_names=preload_module_names)
+        gc.freeze()
+    try:
+        yield from _add_docstring_to_stubfiles_in_pool(
+            pairs=pairs, jobs=jobs, add_docstring=add_docstring,
+            mp_context=mp_context)
+    finally:
+        if preload_module_names is not None:
+            gc.unfreeze()
+
+
+def _add_docstring_to_stubfiles_in_pool(
+        *, pairs: Iterable[Tuple[str, str]], jobs: int,
+        add_docstring: _AddDocstring,
+        mp_context: Optional[BaseContext]) -> Iterator[PairResult]:
+    """
+    Add docstring to multiple stub files in a process pool.
+
+    Parameters
+    ----------
+    pairs : iterable of tuple of str and str
+        Pairs of original module path and stub file path.
+    jobs : int
+        The number of worker processes.
+    add_docstring : Callable
+        The picklable function that adds docstring to a single stub
+        file.
+    mp_context : BaseContext or None
+        The multiprocessing context to start workers with. The default
+        context is used if None.
+
+    Yields
+    ------
+    result : PairResult
+        Each pair's processing result, in the order of completion.
+    """
+    pairs_iterator: Iterator[Tuple[str, str]] = iter(pairs)
+    with ProcessPoolExecutor(
+            max_workers=jobs, mp_context=mp_context,
+            initializer=_init_worker,
+            initargs=(tracing.is_enabled(),)) as executor:
+        futures: Set[Future] = set()
+        while True:
+            for module_path, stub_path in itertools.islice(
+                    pairs_iterator, jobs * 2 - len(futures)):
+                futures.add(executor.submit(
+                    _add_docstring_to_pair_in_worker,
+                    module_path=module_path, stub_path=stub_path,
+                    add_docstring=add_docstring))
+            if not futures:
+                break
+            done_futures, futures = wait(
+                futures, return_when=FIRST_COMPLETED)
+            for future in done_futures:
+                result, events = future.result()
+                tracing.add_events(events)
+                yield result
+
+
+def preload_modules(*, module_names: Iterable[str]) -> None:
+    """
+    Import specified modules in this process, so that worker processes
+    forked from this process share them.
+
+    Notes
+    -----
+    The current directory is added to `sys.path` (same as module
+    reading of the import backend), so that the project's own packages
+    can also be preloaded.
+
+    Parameters
+    ----------
+    module_names : iterable of str
+        Module names to import. e.g., ['numpy', 'pandas']
+
+    Raises
+    ------
+    Exception
+        If a module import failed.
+    """
+    if './' not in sys.path:
+        sys.path.append('./')
+    for module_name in module_names:
+        with tracing.span(name=module_name, category='preload'):
+            try:
+                importlib.import_module(module_name)
+            except Exception:
+                raise Exception(
+                    f'{traceback.format_exc()}\n\n'
+                    f'Preloading module import failed: {module_name}')
+
+
+def _get_fork_context() -> BaseContext:
+    """
+    Get the multiprocessing context of the fork start method.
+
+    Returns
+    -------
+    context : BaseContext
+        The fork context.
+
+    Raises
+    ------
+    ValueError
+        If the platform does not support the fork start method.
+    """
+    if 'fork' not in multiprocessing.get_all_start_methods():
+        raise ValueError(
+            'Preloading modules requires the fork start method, which is'
+            ' not supported on this platform.')
+    return multiprocessing.get_context('fork')
+
+
+def _init_worker(trace_enabled: bool) -> None:
+    """
+    Initialize a worker process.
+
+    Parameters
+    ----------
+    trace_enabled : bool
+        Whether trace event recording is enabled in the parent process.
+    """
+    if trace_enabled:
+        tracing.enable(process_name='stubdoc worker')
+        return
+    tracing.disable()
+
+
+def _add_docstring_to_pair_in_worker(
+        *, module_path: str, stub_path: str,
+        add_docstring: _AddDocstring,
+) -> Tuple[PairResult, List[Dict[str, Any]]]:
+    """
+    Add docstring to a single stub file in a worker process.
+
+    Parameters
+    ----------
+    module_path : str
+        The path of stub file's original module.
+    stub_path : str
+        Target stub file path.
+    add_docstring : Callable
+        The function that adds docstring to a single stub file.
+
+    Returns
+    -------
+    result : PairResult
+        The processing result.
+    events : list of dict
+        Trace events recorded while processing.
+    """
+    result: PairResult = _add_docstring_to_pair(
+        module_path=module_path, stub_path=stub_path,
+        add_docstring=add_docstring)
+    return result, tracing.pop_events()
+
+
+def get_stub_path(*, module_path: str, stub_dir_path: str) -> str:
+    """
+    Get a stub file path of a specified module in the stubgen's
+    output directory layout.
+
+    Parameters
+    ----------
+    module_path : str
+        Target module path. e.g., sample/path.py
+    stub_dir_path : str
+        Stub files' root directory path. e.g., out
+
+    Returns
+    -------
+    stub_path : str
+        The stub file path. e.g., out/sample/path.pyi
+    """
+    module_path = os.path.relpath(module_path)
+    stub_path: str = os.path.join(
+        stub_dir_path, os.path.splitext(module_path)[0] + '.pyi')
+    return stub_path
+
+
+def get_module_paths_in_dir(
+        *, dir_path: str, config: Optional[Config] = None) -> List[str]:
+    """
+    Get Python module paths in a specified directory (recursively).
+
+    Parameters
+    ----------
+    dir_path : str
+        Target directory path.
+    config : Config or None, default None
+        If specified, excluded directories are pruned during the walk
+        (nothing under them is listed), and modules that are not
+        targets of the include and exclude patterns are skipped.
+
+    Returns
+    -------
+    module_paths : list of str
+        Sorted module paths.
+    """
+    module_paths: List[str] = []
+    for root_dir_path, dir_names, file_names in os.walk(dir_path):
+        dir_names[:] = sorted(
+            dir_name for dir_name in dir_names
+            if dir_name != '__pycache__' and not dir_name.startswith('.')
+            and (config is None or not config.is_excluded_dir(
+                dir_path=os.path.join(root_dir_path, dir_name))))
+        for file_name in sorted(file_names):
+            if not file_name.endswith('.py'):
+                continue
+            module_path: str = os.path.join(root_dir_path, file_name)
+            if config is not None and not config.is_target_path(
+                    module_path=module_path):
+                continue
+            module_paths.append(module_path)
+    return module_paths
+
+
+def get_pairs(
+        *, module_paths: Iterable[str], stub_dir_path: str,
+        fanout_stub_dir_paths: Optional[List[str]] = None,
+) -> List[Tuple[str, str]]:
+    """
+    Get module and stub file pairs. Modules whose stub file does not
+    exist are skipped.
+
+    Parameters
+    ----------
+    module_paths : iterable of str
+        Target module paths.
+    stub_dir_path : str
+        Stub files' root directory path.
+    fanout_stub_dir_paths : list of str or None, default None
+        The other stub trees' root directory paths. If specified,
+        a module whose stub file does not exist in stub_dir_path is
+        paired with its stub file in the first of these directories
+        that has it (please see
+        `backends.add_docstring_to_stubfile_with_backend` function's
+        fanout_stub_dir_paths argument).
+
+    Returns
+    -------
+    pairs : list of tuple of str and str
+        Pairs of module path and stub file path.
+    """
+    pairs: List[Tuple[str, str]] = []
+    for module_path in module_paths:
+        stub_path: Optional[str] = _get_existing_stub_path(
+            module_path=module_path,
+            stub_dir_paths=[stub_dir_path, *(fanout_stub_dir_paths or [])])
+        if stub_path is None:
+            continue
+        pairs.append((module_path, stub_path))
+    return pairs
+
+
+def _get_existing_stub_path(
+        *, module_path: str, stub_dir_paths: List[str]) -> Optional[str]:
+    """
+    Get a module's existing stub file path in the first of specified
+    stub directories that has it.
+
+    Parameters
+    ----------
+    module_path : str
+        Target module path.
+    stub_dir_paths : list of str
+        Stub files' root directory paths.
+
+    Returns
+    -------
+    stub_path : str or None
+        The stub file path. None will be returned if no directory has
+        the module's stub file.
+    """
+    for stub_dir_path in stub_dir_paths:
+        stub_path: str = get_stub_path(
+            module_path=module_path, stub_dir_path=stub_dir_path)
+        if os.path.isfile(stub_path):
+            return stub_path
+    return None
+
+
+def read_pairs(
+        *, stream: TextIO, separator: str = '\n',
+        stub_dir_path: Optional[str] = None,
+        fanout_stub_dir_paths: Optional[List[str]] = None,
+) -> Iterator[Tuple[str, str]]:
+    """
+    Read module and stub file pairs from a stream (e.g., stdin or a
+    manifest file). Each pair is yielded as soon as it arrives.
+
+    Notes
+    -----
+    Each record is a tab-separated module path and stub file path
+    (e.g., `sample/path.py<TAB>out/sample/path.pyi`). If stub_dir_path
+    is specified, a record can be a module path only, and the stub file
+    path is resolved in stubgen's output directory layout (modules whose
+    stub file does not exist are skipped).
+
+    Parameters
+    ----------
+    stream : TextIO
+        The stream to read records from.
+    separator : str, default '\\n'
+        Records separator. Newline or NUL character.
+    stub_dir_path : str or None, default None
+        Stub files' root directory path.
+    fanout_stub_dir_paths : list of str or None, default None
+        The other stub trees' root directory paths to resolve a module
+        path only record's stub file path if it does not exist in
+        stub_dir_path (please see `get_pairs` function).
+
+    Yields
+    ------
+    pair : tuple of str and str
+        A pair of module path and stub file path.
+
+    Raises
+    ------
+    ValueError
+        If a record has no stub file path and stub_dir_path is None.
+    """
+    for record in _read_records(stream=stream, separator=separator):
+        if '\t' in record:
+            module_path, stub_path = record.split('\t', 1)
+            yield module_path, stub_path
+            continue
+        if stub_dir_path is None:
+            raise ValueError(
+                'A record without stub file path requires stub directory'
+                f' specification: {record}')
+        existing_stub_path: Optional[str] = _get_existing_stub_path(
+            module_path=record,
+            stub_dir_paths=[stub_dir_path, *(fanout_stub_dir_paths or [])])
+        if existing_stub_path is None:
+            continue
+        yield record, existing_stub_path
+
+
+def _read_records(*, stream: TextIO, separator: str) -> Iterator[str]:
+    """
+    Read separated records from a stream incrementally.
+    Empty records are skipped.
+
+    Parameters
+    ----------
+    stream : TextIO
+        The stream to read records from.
+    separator : str
+        Records separator. Newline or NUL character.
+
+    Yields
+    ------
+    record : str
+        A read record.
+    """
+    if separator == '\n':
+        for line in stream:
+            line = line.rstrip('\r\n')
+            if line == '':
+                continue
+            yield line
+        return
+    chars: List[str] = []
+    for char in iter(lambda: stream.read(1), ''):
+        if char != separator:
+            chars.append(char)
+            continue
+        if chars:
+            yield ''.join(chars)
+        chars = []
+    if chars:
+        yield ''.join(chars)
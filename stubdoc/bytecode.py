@@ -0,0 +1,329 @@
+"""The module that implements docstring extraction from cached bytecode
+(`__pycache__/*.pyc`) without importing or parsing the module source.
+"""
+
+import dis
+import importlib.util
+import inspect
+import marshal
+import os
+from types import CodeType
+from typing import Dict, List, Optional
+
+from stubdoc import stubdoc
+from stubdoc import tracing
+
+_PYC_HEADER_SIZE: int = 16
+_HASH_BASED_FLAG: int = 0b1
+_CO_HAS_DOCSTRING: Optional[int] = getattr(inspect, 'CO_HAS_DOCSTRING', None)
+
+
+def add_docstring_to_stubfile_from_bytecode(
+        original_module_path: str, stub_file_path: str) -> None:
+    """
+    Add docstring to a specified stub file with the docstrings
+    extracted from the original module's cached bytecode.
+    The original module will not be imported.
+
+    Notes
+    -----
+    If the stub file declares no function, class or method, or all of
+    them already have docstrings, the bytecode is not read and the
+    stub file is left untouched.
+
+    Parameters
+    ----------
+    original_module_path : str
+        The path of stub file's original module. The module needs
+        a fresh `__pycache__/*.pyc` file (e.g., made by
+        `python -m compileall`).
+    stub_file_path : str
+        Target stub file path.
+    """
+    if not stubdoc._needs_docstring_index(
+            stub_str=stubdoc._read_txt(file_path=stub_file_path)):
+        return
+    docstring_index: Dict[str, str] = get_docstring_index_from_bytecode(
+        module_path=original_module_path)
+    stubdoc._add_docstring_index_to_stubfile(
+        docstring_index=docstring_index, stub_file_path=stub_file_path)
+
+
+def get_docstring_index_from_bytecode(module_path: str) -> Dict[str, str]:
+    """
+    Get a docstring index from a specified module's cached bytecode.
+
+    Parameters
+    ----------
+    module_path : str
+        Target module path.
+
+    Returns
+    -------
+    docstring_index : dict of str to str
+        A docstring index. Please see
+        `stubdoc._get_docstring_index_from_module` function for the
+        details. Only classes defined in the module are included.
+    """
+    with tracing.span(name='import'):
+        code: CodeType = _read_fresh_bytecode(module_path=module_path)
+    with tracing.span(name='enumerate'):
+        docstring_index: Dict[str, str] = _get_docstring_index_from_code(
+            code=code)
+    return docstring_index
+
+
+def _read_fresh_bytecode(*, module_path: str) -> CodeType:
+    """
+    Read a specified module's cached bytecode after checking that the
+    cache is fresh against the source (same as the import system).
+
+    Parameters
+    ----------
+    module_path : str
+        Target module path.
+
+    Returns
+    -------
+    code : CodeType
+        The module's code object.
+
+    Raises
+    ------
+    ValueError
+        - If the cached bytecode does not exist.
+        - If the cached bytecode is made by the other Python version.
+        - If the cached bytecode is outdated.
+    """
+    pyc_path: str = importlib.util.cache_from_source(module_path)
+    if not os.path.isfile(pyc_path):
+        raise ValueError(
+            f'Cached bytecode not found (please compile the module'
+            f' before, e.g., python -m compileall): {module_path}')
+    with open(pyc_path, 'rb') as f:
+        data: bytes = f.read()
+    if data[:4] != importlib.util.MAGIC_NUMBER:
+        raise ValueError(
+            f'Cached bytecode is made by the other Python version: {pyc_path}')
+    flags: int = int.from_bytes(data[4:8], 'little')
+    if flags & _HASH_BASED_FLAG:
+        with open(module_path, 'rb') as f:
+            source_hash: bytes = importlib.util.source_hash(f.read())
+        fresh: bool = data[8:16] == source_hash
+    else:
+        stat: os.stat_result = os.stat(module_path)
+        mtime: int = int.from_bytes(data[8:12], 'little')
+        size: int = int.from_bytes(data[12:16], 'little')
+        fresh = (
+            mtime == int(stat.st_mtime) & 0xFFFFFFFF
+            and size == stat.st_size & 0xFFFFFFFF)
+    if not fresh:
+        raise ValueError(
+            f'Cached bytecode is outdated (please compile the module'
+            f' again): {pyc_path}')
+    code: CodeType = marshal.loads(data[_PYC_HEADER_SIZE:])
+    return code
+
+
+def _get_docstring_index_from_code(*, code: CodeType) -> Dict[str, str]:
+    """
+    Get a docstring index from a module's code object.
+
+    Parameters
+    ----------
+    code : CodeType
+        The module's code object.
+
+    Returns
+    -------
+    docstring_index : dict of str to str
+        A docstring index. Callables are stored before classes,
+        in the same order as the module inspection.
+    """
+    function_docstrings: Dict[str, str] = {}
+    class_codes: Dict[str, CodeType] = {}
+    for child_code in _get_child_codes(code=code):
+        if _is_class_body(code=child_code):
+            class_codes[child_code.co_name] = child_code
+            continue
+        _set_function_docstring(
+            docstrings=function_docstrings, code=child_code)
+
+    docstring_index: Dict[str, str] = {}
+    for name in sorted([*function_docstrings, *class_codes]):
+        if name in class_codes:
+            method_docstrings: Dict[str, str] = {}
+            accessor_codes: List[CodeType] = _get_property_accessor_codes(
+                code=class_codes[name])
+            for method_code in _get_child_codes(code=class_codes[name]):
+                if _is_class_body(code=method_code):
+                    continue
+                if any(
+                        method_code is accessor_code
+                        for accessor_code in accessor_codes):
+                    continue
+                method_name: str = method_code.co_name
+                if (method_name.startswith('__')
+                        and method_name != '__init__'):
+                    continue
+                _set_function_docstring(
+                    docstrings=method_docstrings, code=method_code)
+            for method_name in sorted(method_docstrings):
+                docstring_index[f'{name}.{method_name}'] = \
+                    method_docstrings[method_name]
+            continue
+        if function_docstrings[name] == '':
+            continue
+        docstring_index[name] = function_docstrings[name]
+
+    for class_name in sorted(class_codes):
+        docstring: str = _get_class_docstring(code=class_codes[class_name])
+        if docstring == '':
+            continue
+        docstring_index[class_name] = docstring
+    return docstring_index
+
+
+def _get_child_codes(*, code: CodeType) -> List[CodeType]:
+    """
+    Get code objects that directly defined in a specified code
+    (e.g., functions and class bodies). Lambdas and comprehensions
+    are not included.
+
+    Parameters
+    ----------
+    code : CodeType
+        Parent code object.
+
+    Returns
+    -------
+    child_codes : list of CodeType
+        Child code objects.
+    """
+    child_codes: List[CodeType] = [
+        const for const in code.co_consts
+        if isinstance(const, CodeType) and not const.co_name.startswith('<')]
+    return child_codes
+
+
+def _get_property_accessor_codes(*, code: CodeType) -> List[CodeType]:
+    """
+    Get code objects of property setters and deleters (decorated by
+    `@<name>.setter` or `@<name>.deleter`) defined in a class body.
+    Their docstrings are not used by the property (the getter's
+    docstring is kept), so they need to be skipped.
+
+    Parameters
+    ----------
+    code : CodeType
+        Target class body code object.
+
+    Returns
+    -------
+    accessor_codes : list of CodeType
+        Property setters' and deleters' code objects.
+    """
+    accessor_codes: List[CodeType] = []
+    is_accessor: bool = False
+    for instruction in dis.get_instructions(code):
+        if instruction.opname in ('LOAD_ATTR', 'LOAD_METHOD') \
+                and instruction.argval in ('setter', 'deleter'):
+            is_accessor = True
+            continue
+        if instruction.opname == 'STORE_NAME':
+            is_accessor = False
+            continue
+        if is_accessor and isinstance(instruction.argval, CodeType):
+            accessor_codes.append(instruction.argval)
+    return accessor_codes
+
+
+def _is_class_body(*, code: CodeType) -> bool:
+    """
+    Get a boolean indicating whether a specified code object is
+    a class body.
+
+    Parameters
+    ----------
+    code : CodeType
+        Target code object.
+
+    Returns
+    -------
+    result : bool
+        True if the code object is a class body (function code objects
+        have optimized locals, but class bodies do not).
+    """
+    return not code.co_flags & inspect.CO_OPTIMIZED
+
+
+def _get_function_docstring(*, code: CodeType) -> str:
+    """
+    Get a function's docstring from its code object.
+
+    Parameters
+    ----------
+    code : CodeType
+        Target function's code object.
+
+    Returns
+    -------
+    docstring : str
+        Stripped docstring. Empty string if docstring does not exist.
+    """
+    if _CO_HAS_DOCSTRING is not None and \
+            not code.co_flags & _CO_HAS_DOCSTRING:
+        return ''
+    if not code.co_consts or not isinstance(code.co_consts[0], str):
+        return ''
+    return code.co_consts[0].strip()
+
+
+def _set_function_docstring(
+        *, docstrings: Dict[str, str], code: CodeType) -> None:
+    """
+    Set a function's docstring to a dictionary. If the same name
+    function is defined multiple times (e.g., in conditional blocks),
+    the docstring that exists is kept.
+
+    Parameters
+    ----------
+    docstrings : dict of str to str
+        The dictionary to set docstring to.
+    code : CodeType
+        Target function's code object.
+    """
+    docstring: str = _get_function_docstring(code=code)
+    if docstring == '' and code.co_name in docstrings:
+        return
+    docstrings[code.co_name] = docstring
+
+
+def _get_class_docstring(*, code: CodeType) -> str:
+    """
+    Get a class's docstring from its class body code object.
+
+    Parameters
+    ----------
+    code : CodeType
+        Target class body code object.
+
+    Returns
+    -------
+    docstring : str
+        Stripped docstring. Empty string if docstring does not exist.
+    """
+    if '__doc__' not in code.co_names:
+        return ''
+    const_value: object = None
+    for instruction in dis.get_instructions(code):
+        if instruction.opname == 'LOAD_CONST':
+            const_value = instruction.argval
+            continue
+        if instruction.opname == 'STORE_NAME' \
+                and instruction.argval == '__doc__':
+            if isinstance(const_value, str):
+                return const_value.strip()
+            return ''
+        const_value = None
+    return ''
@@ -0,0 +1,198 @@
+"""The module that implements the on-disk docstring index cache.
+
+Each cache file is a docstring index file (please see the `index`
+module) keyed by the extraction backend and the module's absolute path.
+A cached index is used while the module source's hash is unchanged.
+Batch runs also record each module's processing time to the timings
+file in the cache directory. With depfiles, the project-local modules
+that the module imports are also stored, so that a cache hit (which
+does not import the module) still has the module's dependencies.
+"""
+
+import hashlib
+import os
+from contextlib import ExitStack
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from stubdoc import depfile
+from stubdoc import index
+from stubdoc import stubdoc
+from stubdoc import tracing
+
+TIMINGS_FILE_NAME: str = 'timings.json'
+
+
+def get_docstring_index_with_cache(
+        *, module_path: str, backend: str, cache_dir_path: str,
+        get_docstring_index: Callable[..., Dict[str, str]],
+) -> Dict[str, str]:
+    """
+    Get a specified module's docstring index from the cache. The index
+    is extracted and cached if the cache does not exist or is outdated.
+
+    Notes
+    -----
+    Only the module's own source is checked. If a module's docstrings
+    depend on the other modules (e.g., inherited methods with the
+    import backend), please clear the cache after those changed.
+
+    Parameters
+    ----------
+    module_path : str
+        Target module path.
+    backend : str
+        Docstring extraction backend name.
+    cache_dir_path : str
+        The cache directory path. It is created if not exists.
+    get_docstring_index : Callable
+        The backend's function that receives `module_path` keyword
+        argument and returns a docstring index.
+
+    Returns
+    -------
+    docstring_index : dict of str to str
+        The module's docstring index.
+    """
+    docstring_index: Dict[str, str]
+    docstring_index, _ = get_docstring_index_and_imported_paths_with_cache(
+        module_path=module_path, backend=backend,
+        cache_dir_path=cache_dir_path,
+        get_docstring_index=get_docstring_index)
+    return docstring_index
+
+
+def get_docstring_index_and_imported_paths_with_cache(
+        *, module_path: str, backend: str, cache_dir_path: str,
+        get_docstring_index: Callable[..., Dict[str, str]],
+        record_imports: bool = False,
+) -> Tuple[Dict[str, str], Optional[List[str]]]:
+    """
+    Get a specified module's docstring index and the project-local
+    module paths that it imports from the cache. Those are extracted
+    and cached if the cache does not exist or is outdated.
+
+    Parameters
+    ----------
+    module_path : str
+        Target module path.
+    backend : str
+        Docstring extraction backend name.
+    cache_dir_path : str
+        The cache directory path. It is created if not exists.
+    get_docstring_index : Callable
+        The backend's function that receives `module_path` keyword
+        argument and returns a docstring index.
+    record_imports : bool, default False
+        If True, the imports while extracting the index are recorded
+        (please see `depfile.record_imports` function) and stored with
+        the index. A cached index without the recorded imports (e.g.,
+        cached by a run without depfiles) is extracted again.
+
+    Returns
+    -------
+    docstring_index : dict of str to str
+        The module's docstring index.
+    imported_paths : list of str or None
+        The project-local module paths that the module imports (please
+        see `depfile.get_imported_paths` function). None if
+        record_imports is False.
+    """
+    cache_file_path: str = _get_cache_file_path(
+        module_path=module_path, backend=backend,
+        cache_dir_path=cache_dir_path)
+    source_hash: str = index._get_source_hash(module_path=module_path)
+    with tracing.span(name='cache'):
+        index_data: Optional[Dict[str, Any]] = _read_cache(
+            cache_file_path=cache_file_path)
+    if index_data is not None and index_data['source_hash'] == source_hash:
+        if not record_imports:
+            return index_data['docstrings'], None
+        if 'imported_paths' in index_data:
+            return index_data['docstrings'], index_data['imported_paths']
+    imported_paths: Optional[List[str]] = None
+    with ExitStack() as exit_stack:
+        new_module_names: Optional[Set[str]] = None
+        if record_imports:
+            new_module_names = exit_stack.enter_context(
+                depfile.record_imports())
+        docstring_index: Dict[str, str] = get_docstring_index(
+            module_path=module_path)
+    if new_module_names is not None:
+        imported_paths = depfile.get_imported_paths(
+            module_path=module_path, new_module_names=new_module_names)
+    os.makedirs(cache_dir_path, exist_ok=True)
+    tmp_file_path: str = f'{cache_file_path}.{os.getpid()}.tmp'
+    index._write_index(
+        index_file_path=tmp_file_path,
+        module_name=stubdoc._get_package_name(
+            module_path=os.path.relpath(module_path)),
+        source_hash=source_hash, docstring_index=docstring_index,
+        imported_paths=imported_paths)
+    os.replace(tmp_file_path, cache_file_path)
+    return docstring_index, imported_paths
+
+
+def _get_cache_file_path(
+        *, module_path: str, backend: str, cache_dir_path: str) -> str:
+    """
+    Get a specified module's cache file path.
+
+    Parameters
+    ----------
+    module_path : str
+        Target module path.
+    backend : str
+        Docstring extraction backend name.
+    cache_dir_path : str
+        The cache directory path.
+
+    Returns
+    -------
+    cache_file_path : str
+        The cache file path. The file name is a hash of the backend
+        name and the module's absolute path.
+    """
+    key: str = f'{backend}\0{os.path.abspath(module_path)}'
+    file_name: str = hashlib.sha256(key.encode('utf-8')).hexdigest()
+    return os.path.join(cache_dir_path, f'{file_name}.json')
+
+
+def get_timings_file_path(*, cache_dir_path: str) -> str:
+    """
+    Get the timings file path of a specified cache directory.
+
+    Parameters
+    ----------
+    cache_dir_path : str
+        The cache directory path.
+
+    Returns
+    -------
+    timings_file_path : str
+        The timings file path (please see `shard.update_timings_file`
+        function). e.g., '.stubdoc_cache/timings.json'
+    """
+    return os.path.join(cache_dir_path, TIMINGS_FILE_NAME)
+
+
+def _read_cache(*, cache_file_path: str) -> Optional[Dict[str, Any]]:
+    """
+    Read a cache file.
+
+    Parameters
+    ----------
+    cache_file_path : str
+        Target cache file path.
+
+    Returns
+    -------
+    index_data : dict or None
+        Read index data. None will be returned if the file does not
+        exist or is broken (e.g., the other format version).
+    """
+    if not os.path.isfile(cache_file_path):
+        return None
+    try:
+        return index._read_index(index_file_path=cache_file_path)
+    except ValueError:
+        return None
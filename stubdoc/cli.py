@@ -1,14 +1,34 @@
 """The module that handles command line interface implementations.
 """
 
-from typing import List, Optional
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+from typing import TextIO, Tuple
+from contextlib import ExitStack
 import argparse
 from argparse import ArgumentParser
 from argparse import Namespace
 import os
+import sys
 import importlib
+import functools
 
 from stubdoc import stubdoc
+from stubdoc import archive
+from stubdoc import backends
+from stubdoc import cache
+from stubdoc import index
+from stubdoc import installed
+from stubdoc import batch
+from stubdoc import git
+from stubdoc import server
+from stubdoc import shard
+from stubdoc import tracing
+from stubdoc import update
+from stubdoc.batch import PairResult
+from stubdoc.config import Config
+from stubdoc.config import read_config
+from stubdoc.profiling import ImportProfiler
+from stubdoc.symbols import SymbolTable
 
 _DESCRIPTION: str = (
     'This command will add docstring to stub file.'
@@ -27,10 +47,11 @@ class Arg:
     long_name: str
     type_: type
     help: str
+    action: Optional[str]
 
     def __init__(
             self, short_name: str, long_name: str, type_: type,
-            help: str) -> None:
+            help: str, action: Optional[str] = None) -> None:
         """
         The class that store single argument setting.
 
@@ -46,11 +67,15 @@ class Arg:
             Argument type. e.g., str, int, etc.
         help : str
             The argument's help text.
+        action : str or None, default None
+            Argument action. e.g., 'store_true'. If specified,
+            type_ will be ignored.
         """
         self.short_name = short_name
         self.long_name = long_name
         self.type_ = type_
         self.help = help
+        self.action = action
 
 
 def _add_arg(
@@ -84,6 +109,10 @@ def _add_arg(
             'long_name is not starts with double hyphen: '
             f'{arg.long_name}')
 
+    if arg.action is not None:
+        parser.add_argument(
+            arg.short_name, arg.long_name, action=arg.action, help=arg.help)
+        return
     parser.add_argument(
         arg.short_name, arg.long_name, type=arg.type_, help=arg.help)
 
@@ -97,8 +126,183 @@ ARGS: List[Arg] = [
         long_name='--stub_path',
         type_=str,
         help='Target stub file path. e.g., sample/path.pyi'),
+    Arg(short_name='-e',
+        long_name='--export_index_path',
+        type_=str,
+        help='Docstring index file path to export module\'s docstrings'
+             ' instead of adding them to a stub file.'
+             ' e.g., sample/path.json'),
+    Arg(short_name='-i',
+        long_name='--index_path',
+        type_=str,
+        help='Docstring index file path to add docstrings from, without'
+             ' importing the original module. If module_path is also'
+             ' specified, the index source hash will be checked.'),
+    Arg(short_name='-d',
+        long_name='--stub_dir',
+        type_=str,
+        help='Stub files\' root directory path (stubgen\'s output'
+             ' directory) for batch processing. If module_path is a'
+             ' directory, all modules in it will be processed. If'
+             ' module_path is a wheel or zip archive, all modules in it'
+             ' will be processed without unpacking (static backend).'
+             ' Comma-separated multiple stub trees (e.g., per Python'
+             ' version or platform) can be specified, and each module\'s'
+             ' docstrings are extracted once and added to its stub files'
+             ' in all of them. e.g., out or out/py38,out/py312'),
+    Arg(short_name='-c',
+        long_name='--changed_since',
+        type_=str,
+        help='Git reference to process only modules changed since it'
+             ' (including working tree changes). Requires stub_dir'
+             ' argument. If module_path is a directory, only modules'
+             ' in it will be processed. e.g., HEAD'),
+    Arg(short_name='-p',
+        long_name='--pairs_path',
+        type_=str,
+        help='Manifest file path to read module and stub file pairs'
+             ' from. Specify - to read from stdin. Each record is a'
+             ' tab-separated module path and stub path, or a module'
+             ' path only if stub_dir is specified. Each pair is'
+             ' processed as soon as it arrives.'),
+    Arg(short_name='-z',
+        long_name='--null_separated',
+        type_=bool,
+        help='Pairs records are separated by NUL characters instead of'
+             ' newlines (e.g., output of find -print0).',
+        action='store_true'),
+    Arg(short_name='-N',
+        long_name='--module_name',
+        type_=str,
+        help='Comma-separated importable module or package names (e.g.,'
+             ' installed distributions\' packages) to process instead of'
+             ' module_path. Names are resolved without importing them,'
+             ' and all modules of each package are processed in one'
+             ' batch run. Stub files are looked up in stub_dir if'
+             ' specified, otherwise in stub packages (e.g.,'
+             ' requests-stubs) on sys.path and next to the modules'
+             ' (inline .pyi files). e.g., requests,urllib3'),
+    Arg(short_name='-S',
+        long_name='--serve',
+        type_=str,
+        help='Unix socket path to start a long-running server on. The'
+             ' server keeps imported modules and docstring indexes warm.'
+             ' e.g., /tmp/stubdoc.sock'),
+    Arg(short_name='-C',
+        long_name='--connect',
+        type_=str,
+        help='Unix socket path of a running server to send module and'
+             ' stub file pairs to, instead of processing them in this'
+             ' process.'),
+    Arg(short_name='-P',
+        long_name='--profile_imports',
+        type_=bool,
+        help='Record each module\'s import time, split into the module\'s'
+             ' own work and imported dependencies, and print a ranked'
+             ' report to stderr at the end.',
+        action='store_true'),
+    Arg(short_name='-u',
+        long_name='--update',
+        type_=bool,
+        help='Update docstrings of stub files that already have docstrings'
+             ' added by stubdoc. Only changed docstring blocks are'
+             ' replaced, and blocks of symbols that gained or lost'
+             ' docstrings are added or removed.',
+        action='store_true'),
+    Arg(short_name='-b',
+        long_name='--backend',
+        type_=str,
+        help='Docstring extraction backend. import (default) imports'
+             ' modules. bytecode reads docstrings from fresh cached'
+             ' bytecode (__pycache__/*.pyc) without importing or parsing'
+             ' modules. static parses module sources without importing'
+             ' them (only functions and classes defined in the module'
+             ' are supported). Names that a stub re-exports from the'
+             ' other modules of its package get the defining modules\''
+             ' docstrings only with the import backend without'
+             ' cache_dir.'),
+    Arg(short_name='-j',
+        long_name='--jobs',
+        type_=int,
+        help='The number of worker processes for batch processing.'
+             ' Results are printed in the order of completion.'
+             ' Default is 1 (processed in this process).'),
+    Arg(short_name='-t',
+        long_name='--trace',
+        type_=str,
+        help='Trace file path to write per-module and per-phase'
+             ' (import, enumerate, rewrite and write) begin and end'
+             ' events, tagged with worker process and thread ids, in'
+             ' the Chrome trace event format (can be opened by'
+             ' about://tracing or Perfetto). e.g., out.json'),
+    Arg(short_name='-k',
+        long_name='--cache_dir',
+        type_=str,
+        help='Docstring index cache directory path. A cached index is'
+             ' used while the module source is unchanged, so unchanged'
+             ' modules are not imported again. Batch runs also record'
+             ' each module\'s processing time in it to schedule the'
+             ' next runs. Cached indexes do not have re-exported'
+             ' names\' docstrings. e.g., .stubdoc_cache'),
+    Arg(short_name='-l',
+        long_name='--preload',
+        type_=str,
+        help='Comma-separated module names to import before starting'
+             ' worker processes. Workers are forked from the process'
+             ' that imported them and share them copy-on-write, so'
+             ' heavy common dependencies are not imported by each'
+             ' worker. Used only with 2 or more jobs, and requires the'
+             ' fork start method (not available on Windows).'
+             ' e.g., numpy,pandas'),
+    Arg(short_name='-D',
+        long_name='--depfile',
+        type_=bool,
+        help='Write a Makefile-style dependency file next to each stub'
+             ' file (the stub file path with .d suffix). It lists the'
+             ' module, the stub file and (with import backend) the'
+             ' project-local modules imported while loading the module.'
+             ' With cache_dir, those modules are stored in the cache'
+             ' and listed for cached modules too.',
+        action='store_true'),
+    Arg(short_name='-n',
+        long_name='--shard',
+        type_=str,
+        help='Process only one shard of batch processing pairs, in the'
+             ' INDEX/COUNT format (the index starts from 1). Pairs are'
+             ' split deterministically, balanced by past timings'
+             ' (timings_path) or source sizes, so each machine of a CI'
+             ' matrix can process its own shard. e.g., 2/4'),
+    Arg(short_name='-r',
+        long_name='--results_path',
+        type_=str,
+        help='JSON file path to write batch processing results to. Each'
+             ' result has the pair\'s processing time, so the file can'
+             ' be merged with the other shards\' ones and be used as'
+             ' timings_path. e.g., results/shard-2.json'),
+    Arg(short_name='-T',
+        long_name='--timings_path',
+        type_=str,
+        help='Results file path of a past run to balance shards and to'
+             ' start the longest pairs first with 2 or more jobs by the'
+             ' recorded processing times (if not specified, the times'
+             ' recorded in cache_dir are used to start the longest pairs'
+             ' first, but not to balance shards, since they differ'
+             ' between machines). Pairs streamed by pairs_path are'
+             ' started in the order they arrive unless shard is'
+             ' specified. Modules without a recorded time are estimated'
+             ' from their source sizes.'
+             ' e.g., results/merged.json'),
+    Arg(short_name='-M',
+        long_name='--merge_results',
+        type_=str,
+        help='Comma-separated results file paths or glob patterns to'
+             ' merge (e.g., all shards\' results) instead of processing'
+             ' pairs. Merged results are printed and written to'
+             ' results_path if specified. e.g., \'results/shard-*.json\''),
 ]
 
+BACKENDS: List[str] = ['import', 'bytecode', 'static']
+
 
 def _validate_module_path_arg(module_path_arg: Optional[str]) -> None:
     """
@@ -157,6 +361,636 @@ def _validate_stub_path_arg(stub_path_arg: Optional[str]) -> None:
             f'A non-stub file path specified: {stub_path_arg}')
 
 
+def _validate_index_path_arg(index_path_arg: str) -> None:
+    """
+    Validate specified index_path argument.
+
+    Parameters
+    ----------
+    index_path_arg : str
+        Specified index_path argument value.
+
+    Raises
+    ------
+    ValueError
+        If index file that specified by argument not exists.
+    """
+    if not os.path.isfile(index_path_arg):
+        raise ValueError(
+            f'Specified index file not found: {index_path_arg}')
+
+
+def _validate_stub_dir_arg(stub_dir_arg: Optional[str]) -> None:
+    """
+    Validate specified stub_dir argument.
+
+    Parameters
+    ----------
+    stub_dir_arg : str or None
+        Specified stub_dir argument value.
+
+    Raises
+    ------
+    ValueError
+        - If stub_dir argument is None.
+        - If any directory that specified by argument not exists.
+    """
+    if stub_dir_arg is None:
+        raise ValueError(
+            'Batch processing requires stub_dir argument.')
+    for stub_dir_path in _get_stub_dir_paths(stub_dir_arg=stub_dir_arg):
+        if not os.path.isdir(stub_dir_path):
+            raise ValueError(
+                f'Specified stub directory not found: {stub_dir_path}')
+
+
+def _get_stub_dir_paths(*, stub_dir_arg: Optional[str]) -> List[str]:
+    """
+    Get stub trees' root directory paths from stub_dir argument.
+
+    Parameters
+    ----------
+    stub_dir_arg : str or None
+        Specified stub_dir argument value (comma-separated directory
+        paths).
+
+    Returns
+    -------
+    stub_dir_paths : list of str
+        Directory paths. An empty list will be returned if stub_dir
+        argument is None.
+    """
+    if stub_dir_arg is None:
+        return []
+    return [
+        stub_dir_path.strip() for stub_dir_path in stub_dir_arg.split(',')
+        if stub_dir_path.strip()]
+
+
+def _get_batch_module_paths(
+        args: Namespace, config: Optional[Config] = None) -> List[str]:
+    """
+    Get target module paths of batch processing.
+
+    Parameters
+    ----------
+    args : Namespace
+        Parsed command line arguments.
+    config : Config or None, default None
+        The configuration to filter modules by include and exclude
+        patterns.
+
+    Returns
+    -------
+    module_paths : list of str
+        Target module paths.
+    """
+    if config is None:
+        config = Config()
+    if args.changed_since is None:
+        return batch.get_module_paths_in_dir(
+            dir_path=args.module_path, config=config)
+    module_paths: List[str] = [
+        module_path for module_path in git.get_changed_module_paths(
+            ref=args.changed_since)
+        if config.is_target_path(module_path=module_path)]
+    if args.module_path is None:
+        return module_paths
+    dir_path: str = os.path.join(os.path.relpath(args.module_path), '')
+    module_paths = [
+        module_path for module_path in module_paths
+        if os.path.relpath(module_path).startswith(dir_path)]
+    return module_paths
+
+
+def _validate_backend_arg(backend_arg: Optional[str]) -> None:
+    """
+    Validate specified backend argument.
+
+    Parameters
+    ----------
+    backend_arg : str or None
+        Specified backend argument value.
+
+    Raises
+    ------
+    ValueError
+        If not supported backend is specified.
+    """
+    if backend_arg is None or backend_arg in BACKENDS:
+        return
+    raise ValueError(
+        f'Not supported backend specified: {backend_arg}'
+        f' (supported: {", ".join(BACKENDS)})')
+
+
+def _validate_jobs_arg(jobs_arg: Optional[int]) -> None:
+    """
+    Validate specified jobs argument.
+
+    Parameters
+    ----------
+    jobs_arg : int or None
+        Specified jobs argument value.
+
+    Raises
+    ------
+    ValueError
+        If specified value is less than 1.
+    """
+    if jobs_arg is None or jobs_arg >= 1:
+        return
+    raise ValueError(
+        f'jobs argument need to be 1 or more: {jobs_arg}')
+
+
+def _get_add_docstring(
+        *, args: Namespace,
+        profiler: ImportProfiler) -> Callable[[str, str], None]:
+    """
+    Get the function that adds docstring to a single stub file, which
+    is composed of the docstring extraction backend and the docstring
+    applying (adding or updating) mode specified by arguments.
+
+    Parameters
+    ----------
+    args : Namespace
+        Parsed command line arguments.
+    profiler : ImportProfiler
+        The profiler to record import costs if profile_imports argument
+        is specified.
+
+    Returns
+    -------
+    add_docstring : Callable
+        The function that receives the original module path and the
+        stub file path. It is picklable (can be sent to worker
+        processes) unless profile_imports argument is specified.
+        With the import backend without cache_dir argument, a symbol
+        table is shared by all pairs of the run (by each worker
+        process's pairs if sent to workers), so that names re-exported
+        from the other modules of a package get the defining modules'
+        docstrings. The other backends and cached indexes do not use
+        a symbol table.
+
+    Raises
+    ------
+    ValueError
+        If profile_imports argument is specified with a backend that
+        does not import modules, with depfile argument or with multiple
+        stub directories.
+    """
+    stub_dir_paths: List[str] = _get_stub_dir_paths(
+        stub_dir_arg=args.stub_dir)
+    if not args.profile_imports:
+        backend: str = args.backend or 'import'
+        symbol_table: Optional[SymbolTable] = None
+        if backend == 'import' and args.cache_dir is None:
+            symbol_table = SymbolTable()
+        return functools.partial(
+            backends.add_docstring_to_stubfile_with_backend,
+            backend=backend, update_mode=args.update,
+            cache_dir_path=args.cache_dir, symbol_table=symbol_table,
+            write_depfile=args.depfile,
+            fanout_stub_dir_paths=(
+                stub_dir_paths if len(stub_dir_paths) > 1 else None))
+    if args.backend not in (None, 'import') or args.depfile \
+            or len(stub_dir_paths) > 1:
+        raise ValueError(
+            'profile_imports argument can be specified only with'
+            ' import backend, and can not be specified with depfile'
+            ' argument or multiple stub directories.')
+    get_docstring_index: Callable[..., Dict[str, str]] = \
+        profiler.get_docstring_index
+    apply_docstring_index: Callable[..., None] = \
+        _get_apply_docstring_index(args=args)
+
+    def add_docstring(module_path: str, stub_path: str) -> None:
+        if not stubdoc._needs_docstring_index(
+                stub_str=stubdoc._read_txt(file_path=stub_path),
+                update_mode=args.update):
+            return
+        docstring_index: Dict[str, str] = get_docstring_index(
+            module_path=module_path)
+        apply_docstring_index(
+            docstring_index=docstring_index, stub_file_path=stub_path)
+
+    return add_docstring
+
+
+def _get_apply_docstring_index(*, args: Namespace) -> Callable[..., None]:
+    """
+    Get the function that applies a docstring index to a stub file
+    (adding or updating) specified by arguments.
+
+    Parameters
+    ----------
+    args : Namespace
+        Parsed command line arguments.
+
+    Returns
+    -------
+    apply_docstring_index : Callable
+        The function that receives `docstring_index` and
+        `stub_file_path` keyword arguments.
+    """
+    if args.update:
+        return update._update_docstring_index_in_stubfile
+    return stubdoc._add_docstring_index_to_stubfile
+
+
+def _run_archive(args: Namespace) -> None:
+    """
+    Add docstring to the stub files of modules in a wheel or zip
+    archive that specified by module_path argument, and print each
+    result.
+
+    Parameters
+    ----------
+    args : Namespace
+        Parsed command line arguments.
+
+    Raises
+    ------
+    ValueError
+        If arguments that can not be used with an archive are specified.
+    SystemExit
+        If any module's processing failed.
+    """
+    if args.backend not in (None, 'static') or args.profile_imports \
+            or args.connect is not None \
+            or args.changed_since is not None \
+            or args.jobs is not None or args.cache_dir is not None \
+            or args.preload is not None or args.depfile \
+            or args.shard is not None or args.results_path is not None \
+            or len(_get_stub_dir_paths(stub_dir_arg=args.stub_dir)) > 1:
+        raise ValueError(
+            'A wheel or zip archive module_path can be specified only'
+            ' with static backend and a single stub directory, and can'
+            ' not be specified with profile_imports, connect,'
+            ' changed_since, jobs, cache_dir, preload, depfile, shard or'
+            ' results_path argument.')
+    _validate_stub_dir_arg(stub_dir_arg=args.stub_dir)
+    results: Iterator[PairResult] = \
+        archive.add_docstring_to_stubfiles_in_archive(
+            archive_path=args.module_path, stub_dir_path=args.stub_dir,
+            apply_docstring_index=_get_apply_docstring_index(args=args),
+            update_mode=args.update)
+    _print_results(results=results)
+
+
+def _get_batch_pairs(
+        *, args: Namespace, exit_stack: ExitStack,
+        config: Optional[Config] = None,
+) -> Optional[Iterable[Tuple[str, str]]]:
+    """
+    Get module and stub file pairs of batch processing from arguments.
+
+    Parameters
+    ----------
+    args : Namespace
+        Parsed command line arguments.
+    exit_stack : ExitStack
+        The exit stack to register an opened manifest file to.
+    config : Config or None, default None
+        The configuration to filter modules by include and exclude
+        patterns.
+
+    Returns
+    -------
+    pairs : iterable of tuple of str and str, or None
+        Pairs of original module path and stub file path. None will be
+        returned if arguments are not batch processing ones.
+    """
+    stub_dir_paths: List[str] = _get_stub_dir_paths(
+        stub_dir_arg=args.stub_dir)
+    if args.module_name is not None:
+        _validate_module_name_args(args=args)
+        return installed.get_pairs(
+            module_names=_get_module_names(module_name_arg=args.module_name),
+            stub_dir_path=stub_dir_paths[0] if stub_dir_paths else None)
+
+    if args.pairs_path is not None:
+        if args.stub_dir is not None:
+            _validate_stub_dir_arg(stub_dir_arg=args.stub_dir)
+        separator: str = '\0' if args.null_separated else '\n'
+        stream: TextIO = sys.stdin
+        if args.pairs_path != '-':
+            stream = exit_stack.enter_context(open(args.pairs_path))
+        pairs: Iterator[Tuple[str, str]] = batch.read_pairs(
+            stream=stream, separator=separator,
+            stub_dir_path=stub_dir_paths[0] if stub_dir_paths else None,
+            fanout_stub_dir_paths=stub_dir_paths[1:])
+        if config is None:
+            return pairs
+        return (
+            pair for pair in pairs
+            if config.is_target_path(module_path=pair[0]))
+
+    if args.changed_since is not None or (
+            args.module_path is not None
+            and os.path.isdir(args.module_path)):
+        _validate_stub_dir_arg(stub_dir_arg=args.stub_dir)
+        module_paths: List[str] = _get_batch_module_paths(
+            args=args, config=config)
+        return batch.get_pairs(
+            module_paths=module_paths, stub_dir_path=stub_dir_paths[0],
+            fanout_stub_dir_paths=stub_dir_paths[1:])
+    return None
+
+
+def _validate_module_name_args(*, args: Namespace) -> None:
+    """
+    Validate arguments that specified with module_name argument.
+
+    Parameters
+    ----------
+    args : Namespace
+        Parsed command line arguments.
+
+    Raises
+    ------
+    ValueError
+        - If module_path, pairs_path or changed_since argument is also
+          specified.
+        - If multiple stub directories are specified.
+        - If the stub directory that specified by argument not exists.
+    """
+    if args.module_path is not None or args.pairs_path is not None \
+            or args.changed_since is not None \
+            or len(_get_stub_dir_paths(stub_dir_arg=args.stub_dir)) > 1:
+        raise ValueError(
+            'module_name argument can not be specified with module_path,'
+            ' pairs_path or changed_since argument, or multiple stub'
+            ' directories.')
+    if args.stub_dir is not None:
+        _validate_stub_dir_arg(stub_dir_arg=args.stub_dir)
+
+
+def _get_module_names(*, module_name_arg: str) -> List[str]:
+    """
+    Get module names from module_name argument.
+
+    Parameters
+    ----------
+    module_name_arg : str
+        Specified module_name argument value (comma-separated module
+        names).
+
+    Returns
+    -------
+    module_names : list of str
+        Module names.
+    """
+    return [
+        module_name.strip() for module_name in module_name_arg.split(',')
+        if module_name.strip()]
+
+
+def _get_shard_pairs(
+        *, args: Namespace,
+        pairs: Iterable[Tuple[str, str]]) -> List[Tuple[str, str]]:
+    """
+    Get the pairs of the shard specified by shard argument. Shards are
+    balanced only by timings_path argument's timings (not by the cache
+    directory's ones), so that every machine gets the same shards.
+
+    Parameters
+    ----------
+    args : Namespace
+        Parsed command line arguments.
+    pairs : iterable of tuple of str and str
+        All pairs of batch processing.
+
+    Returns
+    -------
+    shard_pairs : list of tuple of str and str
+        The shard's pairs.
+    """
+    shard_index, shard_count = shard.parse_shard(args.shard)
+    return shard.get_shard_pairs(
+        pairs=pairs, shard_index=shard_index, shard_count=shard_count,
+        timings=_get_timings(args=args, use_cache_dir=False))
+
+
+def _get_ordered_pairs(
+        *, args: Namespace,
+        pairs: Iterable[Tuple[str, str]]) -> Iterable[Tuple[str, str]]:
+    """
+    Get batch processing pairs in the order to start them.
+
+    Notes
+    -----
+    With 2 or more jobs (in this process's pool), pairs that are
+    already a list (directory, git and installed modules' pairs, or
+    a shard's pairs) are sorted in the order of the longest first by
+    `_get_timings` function's timings. Pairs read from stdin or a
+    manifest file (without shard argument) are returned as they are,
+    so that they are still streamed and submitted lazily to workers in
+    the order they arrive.
+
+    Parameters
+    ----------
+    args : Namespace
+        Parsed command line arguments.
+    pairs : iterable of tuple of str and str
+        Pairs of batch processing (a shard's ones with shard argument).
+
+    Returns
+    -------
+    ordered_pairs : iterable of tuple of str and str
+        Pairs in the order to start them.
+    """
+    if args.connect is not None or (args.jobs or 1) <= 1:
+        return pairs
+    if args.pairs_path is not None and args.shard is None:
+        return pairs
+    return shard.get_longest_first_pairs(
+        pairs=pairs, timings=_get_timings(args=args))
+
+
+def _get_timings(
+        *, args: Namespace,
+        use_cache_dir: bool = True) -> Optional[Dict[str, float]]:
+    """
+    Get recorded processing seconds of modules from timings_path
+    argument, or the timings file in the cache directory.
+
+    Parameters
+    ----------
+    args : Namespace
+        Parsed command line arguments.
+    use_cache_dir : bool, default True
+        If False, the cache directory's timings file is not used.
+
+    Returns
+    -------
+    timings : dict of str to float or None
+        Processing seconds of normalized module paths. None will be
+        returned if neither is specified, or the cache directory's
+        timings file does not exist or is broken.
+    """
+    if args.timings_path is not None:
+        return shard.read_timings(file_path=args.timings_path)
+    if not use_cache_dir:
+        return None
+    timings_file_path: Optional[str] = _get_timings_file_path(args=args)
+    if timings_file_path is None or not os.path.isfile(timings_file_path):
+        return None
+    try:
+        return shard.read_timings(file_path=timings_file_path)
+    except ValueError:
+        return None
+
+
+def _get_timings_file_path(*, args: Namespace) -> Optional[str]:
+    """
+    Get the timings file path to record batch processing times to.
+
+    Parameters
+    ----------
+    args : Namespace
+        Parsed command line arguments.
+
+    Returns
+    -------
+    timings_file_path : str or None
+        The timings file path in the cache directory. None will be
+        returned if cache_dir argument is not specified.
+    """
+    if args.cache_dir is None:
+        return None
+    return cache.get_timings_file_path(cache_dir_path=args.cache_dir)
+
+
+def _run_merge(args: Namespace) -> None:
+    """
+    Merge results files specified by merge_results argument, and print
+    each merged result (and write them to results_path if specified).
+
+    Parameters
+    ----------
+    args : Namespace
+        Parsed command line arguments.
+
+    Raises
+    ------
+    SystemExit
+        If any merged result is failed.
+    """
+    results: List[PairResult] = shard.merge_results_files(
+        file_paths=shard.get_results_file_paths(
+            patterns=args.merge_results))
+    _print_results(results=results, results_path=args.results_path)
+
+
+def _run_batch(
+        pairs: Iterable[Tuple[str, str]],
+        socket_path: Optional[str] = None,
+        add_docstring: Callable[[str, str], None] = (
+            stubdoc.add_docstring_to_stubfile),
+        jobs: int = 1,
+        preload_module_names: Optional[List[str]] = None,
+        results_path: Optional[str] = None,
+        sharding: Optional[Tuple[int, int]] = None,
+        timings_file_path: Optional[str] = None) -> None:
+    """
+    Add docstring to multiple stub files and print each result.
+
+    Parameters
+    ----------
+    pairs : iterable of tuple of str and str
+        Pairs of original module path and stub file path.
+    socket_path : str or None, default None
+        A running server's socket path. If specified, pairs will be
+        processed by the server.
+    add_docstring : Callable, default stubdoc.add_docstring_to_stubfile
+        The function that adds docstring to a single stub file. Ignored
+        if socket_path is specified.
+    jobs : int, default 1
+        The number of worker processes. If 2 or more is specified,
+        add_docstring needs to be picklable.
+    preload_module_names : list of str or None, default None
+        Module names to import before starting worker processes.
+        Ignored if jobs is 1 or socket_path is specified.
+    results_path : str or None, default None
+        If specified, all results are written to the JSON results file.
+    sharding : tuple of int and int or None, default None
+        The shard index and the number of shards of the pairs, which
+        are written to the results file.
+    timings_file_path : str or None, default None
+        If specified, the results' processing times are recorded to
+        the timings file.
+
+    Raises
+    ------
+    SystemExit
+        If any pair's processing failed.
+    """
+    results: Iterator[PairResult]
+    if socket_path is None and jobs > 1:
+        results = batch.add_docstring_to_stubfiles_in_parallel(
+            pairs=pairs, jobs=jobs, add_docstring=add_docstring,
+            preload_module_names=preload_module_names)
+    elif socket_path is None:
+        results = batch.add_docstring_to_stubfiles(
+            pairs=pairs, add_docstring=add_docstring)
+    else:
+        results = server.request(socket_path=socket_path, pairs=pairs)
+    _print_results(
+        results=results, results_path=results_path, sharding=sharding,
+        timings_file_path=timings_file_path)
+
+
+def _print_results(
+        *, results: Iterable[PairResult],
+        results_path: Optional[str] = None,
+        sharding: Optional[Tuple[int, int]] = None,
+        timings_file_path: Optional[str] = None) -> None:
+    """
+    Print each result of multiple stub files' processing. Error messages
+    are printed to stderr.
+
+    Parameters
+    ----------
+    results : iterable of PairResult
+        Processing results.
+    results_path : str or None, default None
+        If specified, all results are written to the JSON results file
+        after all results are printed.
+    sharding : tuple of int and int or None, default None
+        The shard index and the number of shards to write to the
+        results file.
+    timings_file_path : str or None, default None
+        If specified, the results' processing times are recorded to
+        the timings file (please see `shard.update_timings_file`
+        function).
+
+    Raises
+    ------
+    SystemExit
+        If any result is failed.
+    """
+    failed: bool = False
+    printed_results: List[PairResult] = []
+    for result in results:
+        print(result.to_line(), flush=True)
+        printed_results.append(result)
+        if result.succeeded:
+            continue
+        failed = True
+        print(result.message, file=sys.stderr)
+    if results_path is not None:
+        shard.write_results(
+            results=printed_results, file_path=results_path,
+            shard=sharding)
+    if timings_file_path is not None:
+        shard.update_timings_file(
+            results=printed_results, file_path=timings_file_path)
+    if failed:
+        sys.exit(1)
+
+
 def main():
     """
     Entry point of the command line interface.
@@ -173,9 +1007,157 @@ def main():
         _add_arg(parser=parser, arg=arg)
     args: Namespace = parser.parse_args()
 
-    _validate_module_path_arg(module_path_arg=args.module_path)
-    _validate_stub_path_arg(stub_path_arg=args.stub_path)
+    if args.serve is not None:
+        server.serve(socket_path=args.serve)
+        return
+
+    if args.export_index_path is not None:
+        _validate_module_path_arg(module_path_arg=args.module_path)
+        index.export_docstring_index(
+            original_module_path=args.module_path,
+            index_file_path=args.export_index_path)
+        return
+
+    if args.index_path is not None:
+        _validate_index_path_arg(index_path_arg=args.index_path)
+        _validate_stub_path_arg(stub_path_arg=args.stub_path)
+        if args.module_path is not None:
+            _validate_module_path_arg(module_path_arg=args.module_path)
+        index.add_docstring_to_stubfile_from_index(
+            index_file_path=args.index_path,
+            stub_file_path=args.stub_path,
+            original_module_path=args.module_path)
+        return
+
+    if args.merge_results is not None:
+        _run_merge(args=args)
+        return
+
+    _validate_backend_arg(backend_arg=args.backend)
+    _validate_jobs_arg(jobs_arg=args.jobs)
+    if args.shard is not None:
+        shard.parse_shard(args.shard)
+    if args.connect is not None and (
+            args.profile_imports or args.update
+            or args.backend is not None or args.jobs is not None
+            or args.cache_dir is not None or args.preload is not None
+            or args.depfile
+            or len(_get_stub_dir_paths(stub_dir_arg=args.stub_dir)) > 1):
+        raise ValueError(
+            'connect argument can not be specified with profile_imports,'
+            ' update, backend, jobs, cache_dir, preload or depfile'
+            ' argument, or multiple stub directories.')
+    if args.profile_imports and args.jobs is not None and args.jobs > 1:
+        raise ValueError(
+            'profile_imports argument can not be specified with 2 or'
+            ' more jobs.')
+    config: Config = read_config()
+    if args.trace is not None:
+        tracing.enable()
+    try:
+        _run(args=args, config=config)
+    finally:
+        if args.trace is not None:
+            tracing.write_trace(file_path=args.trace)
+            tracing.disable()
+
+
+def _run(args: Namespace, config: Config) -> None:
+    """
+    Add docstring to stub files specified by arguments (a single pair,
+    batch processing or an archive).
+
+    Parameters
+    ----------
+    args : Namespace
+        Parsed command line arguments.
+    config : Config
+        The pyproject.toml's configuration.
+    """
+    if args.module_path is not None and archive.is_archive_path(
+            path=args.module_path):
+        _run_archive(args=args)
+        return
+    if args.connect is None:
+        _apply_config(args=args, config=config)
+    profiler: ImportProfiler = ImportProfiler()
+    add_docstring: Callable[[str, str], None] = _get_add_docstring(
+        args=args, profiler=profiler)
+    try:
+        with ExitStack() as exit_stack:
+            pairs: Optional[Iterable[Tuple[str, str]]] = _get_batch_pairs(
+                args=args, exit_stack=exit_stack, config=config)
+            if pairs is None and (
+                    args.shard is not None
+                    or args.results_path is not None):
+                raise ValueError(
+                    'shard and results_path arguments can be specified'
+                    ' only with batch processing.')
+            sharding: Optional[Tuple[int, int]] = None
+            if pairs is not None and args.shard is not None:
+                sharding = shard.parse_shard(args.shard)
+                pairs = _get_shard_pairs(args=args, pairs=pairs)
+            if pairs is not None:
+                pairs = _get_ordered_pairs(args=args, pairs=pairs)
+            if pairs is None:
+                _validate_module_path_arg(module_path_arg=args.module_path)
+                _validate_stub_path_arg(stub_path_arg=args.stub_path)
+                if args.connect is None:
+                    add_docstring(args.module_path, args.stub_path)
+                    return
+                pairs = [(args.module_path, args.stub_path)]
+            _run_batch(
+                pairs=pairs, socket_path=args.connect,
+                add_docstring=add_docstring, jobs=args.jobs or 1,
+                preload_module_names=_get_preload_module_names(args=args),
+                results_path=args.results_path, sharding=sharding,
+                timings_file_path=_get_timings_file_path(args=args))
+    finally:
+        if args.profile_imports:
+            print(profiler.get_report(), file=sys.stderr)
 
-    stubdoc.add_docstring_to_stubfile(
-        original_module_path=args.module_path,
-        stub_file_path=args.stub_path)
+
+def _apply_config(*, args: Namespace, config: Config) -> None:
+    """
+    Set configuration values to arguments that are not specified
+    (command line arguments take precedence). The configured jobs is
+    not applied if profile_imports argument is specified.
+
+    Parameters
+    ----------
+    args : Namespace
+        Parsed command line arguments to update.
+    config : Config
+        The pyproject.toml's configuration.
+    """
+    if args.backend is None:
+        args.backend = config.backend
+    if args.jobs is None and not args.profile_imports:
+        args.jobs = config.jobs
+    if args.cache_dir is None:
+        args.cache_dir = config.cache_dir
+    if args.preload is None and config.preload:
+        args.preload = ','.join(config.preload)
+
+
+def _get_preload_module_names(*, args: Namespace) -> Optional[List[str]]:
+    """
+    Get module names to import before starting worker processes from
+    preload argument.
+
+    Parameters
+    ----------
+    args : Namespace
+        Parsed command line arguments.
+
+    Returns
+    -------
+    module_names : list of str or None
+        Module names. None will be returned if preload argument is not
+        specified.
+    """
+    if args.preload is None:
+        return None
+    return [
+        module_name.strip() for module_name in args.preload.split(',')
+        if module_name.strip()]
@@ -0,0 +1,271 @@
+"""The module that implements the `[tool.stubdoc]` configuration reading
+from pyproject.toml.
+
+Example configuration::
+
+    [tool.stubdoc]
+    include = ["src/**"]
+    exclude = ["tests/**", "**/_vendor/**", "**/*_pb2.py"]
+    backend = "static"
+    jobs = 8
+    cache_dir = ".stubdoc_cache"
+    preload = ["numpy", "pandas"]
+
+Glob patterns are matched against slash-separated paths relative to the
+pyproject.toml's directory. `*` and `?` do not match slashes, and `**`
+matches any number of directories.
+"""
+
+import os
+import re
+from typing import Any, Dict, List, Optional, Pattern
+
+from stubdoc import backends
+
+PYPROJECT_FILE_NAME: str = 'pyproject.toml'
+
+_CONFIG_KEYS: List[str] = [
+    'include', 'exclude', 'backend', 'jobs', 'cache_dir', 'preload']
+
+
+class Config:
+
+    root_dir_path: str
+    include: List[str]
+    exclude: List[str]
+    backend: Optional[str]
+    jobs: Optional[int]
+    cache_dir: Optional[str]
+    preload: List[str]
+    _include_patterns: List[Pattern]
+    _exclude_patterns: List[Pattern]
+
+    def __init__(
+            self, root_dir_path: str = '.',
+            include: Optional[List[str]] = None,
+            exclude: Optional[List[str]] = None,
+            backend: Optional[str] = None,
+            jobs: Optional[int] = None,
+            cache_dir: Optional[str] = None,
+            preload: Optional[List[str]] = None) -> None:
+        """
+        The class that stores `[tool.stubdoc]` configuration values.
+        Default values mean not configured.
+
+        Parameters
+        ----------
+        root_dir_path : str, default '.'
+            The directory that glob patterns and cache_dir are relative
+            to (the pyproject.toml's directory).
+        include : list of str or None, default None
+            Glob patterns of module paths to process. All modules are
+            processed if not specified.
+        exclude : list of str or None, default None
+            Glob patterns of module paths and directories to skip.
+        backend : str or None, default None
+            Docstring extraction backend.
+        jobs : int or None, default None
+            The number of worker processes.
+        cache_dir : str or None, default None
+            Docstring index cache directory path.
+        preload : list of str or None, default None
+            Module names to import before starting worker processes.
+        """
+        self.root_dir_path = root_dir_path
+        self.include = include or []
+        self.exclude = exclude or []
+        self.backend = backend
+        self.jobs = jobs
+        self.cache_dir = cache_dir
+        self.preload = preload or []
+        if cache_dir is not None:
+            self.cache_dir = os.path.join(root_dir_path, cache_dir)
+        self._include_patterns = [
+            _glob_to_pattern(glob=glob) for glob in self.include]
+        self._exclude_patterns = [
+            _glob_to_pattern(glob=glob) for glob in self.exclude]
+
+    def is_excluded_dir(self, dir_path: str) -> bool:
+        """
+        Get a boolean indicating whether a specified directory is
+        excluded (the directory can be pruned with everything under it).
+
+        Parameters
+        ----------
+        dir_path : str
+            Target directory path.
+
+        Returns
+        -------
+        result : bool
+            True if the directory path (with or without a trailing
+            slash) matches any exclude pattern.
+        """
+        if not self._exclude_patterns:
+            return False
+        rel_path: str = self._get_rel_path(path=dir_path)
+        return any(
+            pattern.match(rel_path) or pattern.match(f'{rel_path}/')
+            for pattern in self._exclude_patterns)
+
+    def is_target_path(self, module_path: str) -> bool:
+        """
+        Get a boolean indicating whether a specified module is a target
+        to process.
+
+        Parameters
+        ----------
+        module_path : str
+            Target module path.
+
+        Returns
+        -------
+        result : bool
+            True if the module path matches any include pattern (or
+            include is not configured) and does not match any exclude
+            pattern.
+        """
+        if not self._include_patterns and not self._exclude_patterns:
+            return True
+        rel_path: str = self._get_rel_path(path=module_path)
+        if self._include_patterns and not any(
+                pattern.match(rel_path)
+                for pattern in self._include_patterns):
+            return False
+        return not any(
+            pattern.match(rel_path) for pattern in self._exclude_patterns)
+
+    def _get_rel_path(self, *, path: str) -> str:
+        """
+        Get a slash-separated path relative to the root directory.
+
+        Parameters
+        ----------
+        path : str
+            Target path.
+
+        Returns
+        -------
+        rel_path : str
+            Converted path. e.g., 'sample/path.py'
+        """
+        rel_path: str = os.path.relpath(path, self.root_dir_path)
+        return rel_path.replace(os.sep, '/')
+
+
+def read_config(dir_path: str = '.') -> Config:
+    """
+    Read the `[tool.stubdoc]` table of a specified directory's
+    pyproject.toml.
+
+    Parameters
+    ----------
+    dir_path : str, default '.'
+        The directory that pyproject.toml is placed in.
+
+    Returns
+    -------
+    config : Config
+        Read configuration. Not configured values are None or empty
+        lists (also if pyproject.toml or the table does not exist).
+
+    Raises
+    ------
+    ValueError
+        If the table has an unknown key or an invalid value.
+    """
+    pyproject_path: str = os.path.join(dir_path, PYPROJECT_FILE_NAME)
+    if not os.path.isfile(pyproject_path):
+        return Config(root_dir_path=dir_path)
+    pyproject_data: Dict[str, Any] = _read_toml(file_path=pyproject_path)
+    table: Dict[str, Any] = pyproject_data.get('tool', {}).get('stubdoc', {})
+    for key in table:
+        if key not in _CONFIG_KEYS:
+            raise ValueError(
+                f'Unknown [tool.stubdoc] key in {pyproject_path}: {key}')
+    for key in ('include', 'exclude', 'preload'):
+        values: Any = table.get(key, [])
+        if not isinstance(values, list) or not all(
+                isinstance(value, str) for value in values):
+            raise ValueError(
+                f'[tool.stubdoc] {key} needs to be a list of strings:'
+                f' {values}')
+    backend: Optional[str] = table.get('backend')
+    if backend is not None \
+            and backend not in backends.DOCSTRING_INDEX_GETTERS:
+        raise ValueError(
+            f'Not supported [tool.stubdoc] backend: {backend}')
+    jobs: Optional[int] = table.get('jobs')
+    if jobs is not None and (
+            isinstance(jobs, bool) or not isinstance(jobs, int)
+            or jobs < 1):
+        raise ValueError(
+            f'[tool.stubdoc] jobs needs to be 1 or more: {jobs}')
+    cache_dir: Optional[str] = table.get('cache_dir')
+    if cache_dir is not None and not isinstance(cache_dir, str):
+        raise ValueError(
+            f'[tool.stubdoc] cache_dir needs to be a string: {cache_dir}')
+    return Config(
+        root_dir_path=dir_path, include=table.get('include'),
+        exclude=table.get('exclude'), backend=backend, jobs=jobs,
+        cache_dir=cache_dir, preload=table.get('preload'))
+
+
+def _read_toml(*, file_path: str) -> Dict[str, Any]:
+    """
+    Read a specified TOML file. The standard library's tomllib is used
+    on Python 3.11 or later, and tomli is used on the older versions.
+
+    Parameters
+    ----------
+    file_path : str
+        Target TOML file path.
+
+    Returns
+    -------
+    toml_data : dict
+        Read data.
+    """
+    try:
+        import tomllib
+    except ImportError:
+        import tomli as tomllib  # type: ignore
+    with open(file_path, 'rb') as f:
+        toml_data: Dict[str, Any] = tomllib.load(f)
+    return toml_data
+
+
+def _glob_to_pattern(*, glob: str) -> Pattern:
+    """
+    Convert a glob pattern to a regular expression pattern.
+
+    Parameters
+    ----------
+    glob : str
+        Target glob pattern. e.g., '**/_vendor/**'
+
+    Returns
+    -------
+    pattern : Pattern
+        Converted pattern that matches a whole slash-separated path.
+    """
+    regex_parts: List[str] = []
+    i: int = 0
+    while i < len(glob):
+        if glob.startswith('**/', i):
+            regex_parts.append('(?:.*/)?')
+            i += 3
+            continue
+        if glob.startswith('**', i):
+            regex_parts.append('.*')
+            i += 2
+            continue
+        char: str = glob[i]
+        if char == '*':
+            regex_parts.append('[^/]*')
+        elif char == '?':
+            regex_parts.append('[^/]')
+        else:
+            regex_parts.append(re.escape(char))
+        i += 1
+    return re.compile(pattern=''.join(regex_parts) + r'\Z')
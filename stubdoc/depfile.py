@@ -0,0 +1,359 @@
+"""The module that implements Makefile-style dependency file (depfile)
+writing, so that build systems (e.g., make or ninja) can rerun stubdoc
+only when one of a stub file's inputs changes.
+
+Each depfile is written next to its stub file (the stub file path with
+a `.d` suffix), e.g., `out/sample/path.pyi.d`::
+
+    out/sample/path.pyi: \\
+      sample/path.py \\
+      out/sample/path.pyi \\
+      sample/__init__.py \\
+      sample/utils.py
+"""
+
+import builtins
+import importlib.util
+import os
+import sys
+import threading
+from contextlib import contextmanager
+from types import ModuleType
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set
+
+from stubdoc import stubdoc
+
+DEPFILE_SUFFIX: str = '.d'
+
+_IMPORT_GRAPH: Dict[str, Set[str]] = {}
+_HOOK_LOCK: threading.Lock = threading.Lock()
+_hook_count: int = 0
+_original_import: Optional[Callable] = None
+
+
+def get_depfile_path(*, stub_path: str) -> str:
+    """
+    Get a specified stub file's depfile path.
+
+    Parameters
+    ----------
+    stub_path : str
+        Target stub file path.
+
+    Returns
+    -------
+    depfile_path : str
+        The depfile path. e.g., 'out/sample/path.pyi.d'
+    """
+    return f'{stub_path}{DEPFILE_SUFFIX}'
+
+
+@contextmanager
+def record_imports() -> Iterator[Set[str]]:
+    """
+    Record the imports made in the context, so that the modules that
+    a module imports (directly or transitively) can be got by
+    `get_imported_module_names` function.
+
+    Notes
+    -----
+    Imports are recorded by replacing `builtins.__import__`, as edges
+    from importing modules to imported modules. Edges are kept over
+    the process, so a module that is already imported (e.g., by a
+    previous pair of a batch run) still gets its dependencies. Modules
+    imported before any recording (e.g., preloaded modules) have no
+    edges, so the modules newly added to `sys.modules` in the context
+    are also yielded.
+
+    Yields
+    ------
+    new_module_names : set of str
+        The set that the modules newly added to `sys.modules` in the
+        context are added to when the context exits.
+    """
+    global _hook_count, _original_import
+    new_module_names: Set[str] = set()
+    module_names_before: Set[str] = set(sys.modules)
+    with _HOOK_LOCK:
+        if _hook_count == 0:
+            _original_import = builtins.__import__
+            builtins.__import__ = _get_recording_import(
+                original_import=_original_import)
+        _hook_count += 1
+    try:
+        yield new_module_names
+    finally:
+        with _HOOK_LOCK:
+            _hook_count -= 1
+            if _hook_count == 0:
+                builtins.__import__ = _original_import
+                _original_import = None
+        new_module_names.update(
+            name for name in list(sys.modules)
+            if name not in module_names_before)
+
+
+def _get_recording_import(*, original_import: Callable) -> Callable:
+    """
+    Get an `__import__` replacement that records edges from importing
+    modules to imported modules.
+
+    Parameters
+    ----------
+    original_import : Callable
+        The original `__import__` function.
+
+    Returns
+    -------
+    recording_import : Callable
+        The replacement function.
+    """
+
+    def recording_import(
+            name: str, globals: Optional[Dict[str, Any]] = None,
+            locals: Optional[Dict[str, Any]] = None,
+            fromlist: Any = (), level: int = 0) -> Any:
+        module: Any = original_import(
+            name, globals, locals, fromlist, level)
+        importer_name: Any = (globals or {}).get('__name__')
+        if isinstance(importer_name, str):
+            _IMPORT_GRAPH.setdefault(importer_name, set()).update(
+                _get_imported_names(
+                    name=name, globals=globals or {}, fromlist=fromlist,
+                    level=level))
+        return module
+
+    return recording_import
+
+
+def _get_imported_names(
+        *, name: str, globals: Dict[str, Any], fromlist: Any,
+        level: int) -> Set[str]:
+    """
+    Get the absolute module names that an `__import__` call imported.
+
+    Parameters
+    ----------
+    name : str
+        The name that passed to `__import__`.
+    globals : dict
+        The importing module's globals.
+    fromlist : Any
+        The fromlist that passed to `__import__`.
+    level : int
+        The relative import level that passed to `__import__`.
+
+    Returns
+    -------
+    imported_names : set of str
+        The imported module and its parent packages' names, and the
+        names of the submodules in the fromlist. e.g., {'a', 'a.b'}
+        for `from a import b` if `a.b` is a module.
+    """
+    absolute_name: str = name
+    if level > 0:
+        package: Any = globals.get('__package__')
+        if not isinstance(package, str):
+            return set()
+        try:
+            absolute_name = importlib.util.resolve_name(
+                '.' * level + name, package)
+        except (ImportError, ValueError):
+            return set()
+    name_parts: List[str] = absolute_name.split('.')
+    imported_names: Set[str] = {
+        '.'.join(name_parts[:i]) for i in range(1, len(name_parts) + 1)}
+    for item in fromlist or ():
+        if not isinstance(item, str) or item == '*':
+            continue
+        submodule_name: str = f'{absolute_name}.{item}'
+        if submodule_name in sys.modules:
+            imported_names.add(submodule_name)
+    return imported_names
+
+
+def get_imported_module_names(*, module_name: str) -> Set[str]:
+    """
+    Get the names of the modules that a specified module imports
+    directly or transitively (the module's parent packages and their
+    imports are also included).
+
+    Parameters
+    ----------
+    module_name : str
+        Target module name. e.g., 'sample.path'
+
+    Returns
+    -------
+    module_names : set of str
+        The imported modules' names (including the module itself).
+    """
+    name_parts: List[str] = module_name.split('.')
+    names_to_visit: List[str] = [
+        '.'.join(name_parts[:i]) for i in range(1, len(name_parts) + 1)]
+    module_names: Set[str] = set(names_to_visit)
+    while names_to_visit:
+        name: str = names_to_visit.pop()
+        for imported_name in _IMPORT_GRAPH.get(name, ()):
+            if imported_name in module_names:
+                continue
+            module_names.add(imported_name)
+            names_to_visit.append(imported_name)
+    return module_names
+
+
+def get_imported_paths(
+        *, module_path: str, new_module_names: Set[str]) -> List[str]:
+    """
+    Get the project-local module paths that a specified module imports
+    (directly or transitively).
+
+    Parameters
+    ----------
+    module_path : str
+        Target module path.
+    new_module_names : set of str
+        The names of the modules newly imported while loading the
+        module in a `record_imports` context.
+
+    Returns
+    -------
+    imported_paths : list of str
+        The project-local modules' absolute paths (sorted), which are
+        under the current directory and are not installed packages.
+    """
+    module_names: Set[str] = new_module_names | get_imported_module_names(
+        module_name=stubdoc._get_package_name(module_path=module_path))
+    imported_paths: Set[str] = set()
+    for module_name in module_names:
+        module: Optional[ModuleType] = sys.modules.get(module_name)
+        file_path: Any = getattr(module, '__file__', None)
+        if not isinstance(file_path, str) \
+                or not _is_project_local_path(path=file_path):
+            continue
+        imported_paths.add(os.path.abspath(file_path))
+    return sorted(imported_paths)
+
+
+def get_dependency_paths(
+        *, module_path: str, stub_path: str,
+        new_module_names: Optional[Set[str]] = None,
+        imported_paths: Optional[List[str]] = None) -> List[str]:
+    """
+    Get a stub file's dependency paths.
+
+    Parameters
+    ----------
+    module_path : str
+        The stub file's original module path.
+    stub_path : str
+        The stub file path.
+    new_module_names : set of str or None, default None
+        The names of the modules newly imported while loading the
+        original module in a `record_imports` context. If specified,
+        the modules that the original module imports (recorded by
+        `record_imports` function) and these modules are added (only
+        project-local ones, which are under the current directory and
+        are not installed packages). None means the module was not
+        imported (e.g., the static backend).
+    imported_paths : list of str or None, default None
+        The project-local module paths that `get_imported_paths`
+        function returned for the original module (e.g., stored in a
+        docstring index cache). If specified, these paths are added
+        instead of new_module_names' ones.
+
+    Returns
+    -------
+    dependency_paths : list of str
+        The original module path, the stub file path and the
+        project-local modules' paths (relative to the current
+        directory and sorted).
+    """
+    dependency_paths: List[str] = [module_path, stub_path]
+    if imported_paths is None:
+        if new_module_names is None:
+            return dependency_paths
+        imported_paths = get_imported_paths(
+            module_path=module_path, new_module_names=new_module_names)
+    local_paths: Set[str] = set(
+        os.path.relpath(path) for path in imported_paths)
+    excluded_paths: Set[str] = {
+        os.path.relpath(module_path), os.path.relpath(stub_path)}
+    dependency_paths.extend(sorted(local_paths - excluded_paths))
+    return dependency_paths
+
+
+def _is_project_local_path(*, path: str) -> bool:
+    """
+    Get a boolean indicating whether a specified module file is
+    a project-local one.
+
+    Parameters
+    ----------
+    path : str
+        Target module file path.
+
+    Returns
+    -------
+    result : bool
+        True if the path is under the current directory and is not in
+        an installed packages' directory (e.g., a virtual environment
+        in the project directory).
+    """
+    abs_path: str = os.path.abspath(path)
+    if not os.path.isfile(abs_path):
+        return False
+    if os.path.commonpath([abs_path, os.getcwd()]) != os.getcwd():
+        return False
+    for prefix in {sys.prefix, sys.base_prefix, sys.exec_prefix}:
+        abs_prefix: str = os.path.abspath(prefix)
+        if abs_prefix != os.getcwd() and os.path.commonpath(
+                [abs_path, abs_prefix]) == abs_prefix:
+            return False
+    path_parts: List[str] = abs_path.split(os.sep)
+    return 'site-packages' not in path_parts \
+        and 'dist-packages' not in path_parts
+
+
+def write_depfile(*, stub_path: str, dependency_paths: List[str]) -> None:
+    """
+    Write a Makefile-style depfile of a specified stub file.
+
+    Parameters
+    ----------
+    stub_path : str
+        The stub file path (the depfile's target). The depfile is
+        written to the path with `.d` suffix.
+    dependency_paths : list of str
+        The stub file's dependency paths.
+    """
+    lines: List[str] = [f'{_escape_path(path=stub_path)}:']
+    for path in dependency_paths:
+        lines.append(f'  {_escape_path(path=path)}')
+    depfile_str: str = ' \\\n'.join(lines) + '\n'
+    depfile_path: str = get_depfile_path(stub_path=stub_path)
+    tmp_file_path: str = f'{depfile_path}.{os.getpid()}.tmp'
+    with open(tmp_file_path, 'w') as f:
+        f.write(depfile_str)
+    os.replace(tmp_file_path, depfile_path)
+
+
+def _escape_path(*, path: str) -> str:
+    """
+    Escape a path for a Makefile-style depfile.
+
+    Parameters
+    ----------
+    path : str
+        Target path.
+
+    Returns
+    -------
+    escaped_path : str
+        Escaped path. Backslashes are converted to slashes, and spaces,
+        `#` and `$` are escaped. e.g., 'sample\\ dir/path.py'
+    """
+    path = path.replace('\\', '/')
+    path = path.replace('$', '$$')
+    path = path.replace('#', '\\#')
+    return path.replace(' ', '\\ ')
@@ -0,0 +1,64 @@
+"""The module that implements the local git command related functions.
+"""
+
+import os
+import subprocess as sp
+from typing import List, Set
+
+
+def get_changed_module_paths(ref: str) -> List[str]:
+    """
+    Get Python module paths changed since a specified git reference.
+    Working tree changes (including untracked files) are also included.
+
+    Parameters
+    ----------
+    ref : str
+        Target git reference. e.g., `HEAD`, `origin/main`.
+
+    Returns
+    -------
+    module_paths : list of str
+        Sorted changed module paths that are relative to the current
+        directory. Deleted modules are not included.
+    """
+    file_paths: Set[str] = set()
+    file_paths.update(_run_git_command(
+        args=['diff', '--name-only', '--relative', '-z', ref, '--']))
+    file_paths.update(_run_git_command(
+        args=['ls-files', '--others', '--exclude-standard', '-z']))
+    module_paths: List[str] = sorted(
+        file_path for file_path in file_paths
+        if file_path.endswith('.py') and os.path.isfile(file_path))
+    return module_paths
+
+
+def _run_git_command(*, args: List[str]) -> List[str]:
+    """
+    Run a git command and get NUL-separated output values.
+
+    Parameters
+    ----------
+    args : list of str
+        The git command arguments (excluding `git` itself).
+
+    Returns
+    -------
+    values : list of str
+        Command output values.
+
+    Raises
+    ------
+    Exception
+        If the command return code is not 0.
+    """
+    completed_process: sp.CompletedProcess = sp.run(
+        ['git', *args], stdout=sp.PIPE, stderr=sp.PIPE)
+    if completed_process.returncode != 0:
+        stderr: str = completed_process.stderr.decode(
+            'utf-8', errors='replace')
+        raise Exception(
+            f'git command failed: git {" ".join(args)}\n{stderr}')
+    stdout: str = completed_process.stdout.decode('utf-8')
+    values: List[str] = [value for value in stdout.split('\0') if value]
+    return values
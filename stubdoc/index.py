@@ -0,0 +1,158 @@
+"""The module that implements docstring index file exporting and applying.
+
+A docstring index file stores a module's extracted docstrings, so that
+the expensive extraction (module import and inspection) and the cheap
+insertion into stub files can run on different machines.
+"""
+
+import hashlib
+import json
+from types import ModuleType
+from typing import Any, Dict, List, Optional
+
+from stubdoc import stubdoc
+
+_INDEX_FORMAT_VERSION: int = 1
+
+
+def export_docstring_index(
+        original_module_path: str, index_file_path: str) -> None:
+    """
+    Export a specified module's docstrings to an index file.
+
+    Parameters
+    ----------
+    original_module_path : str
+        The path of stub file's original module.
+    index_file_path : str
+        The index file path to write. The file format is JSON.
+    """
+    module: ModuleType = stubdoc._read_module(
+        module_path=original_module_path)
+    docstring_index: Dict[str, str] = \
+        stubdoc._get_docstring_index_from_module(module=module)
+    _write_index(
+        index_file_path=index_file_path, module_name=module.__name__,
+        source_hash=_get_source_hash(module_path=original_module_path),
+        docstring_index=docstring_index)
+
+
+def _write_index(
+        *, index_file_path: str, module_name: str, source_hash: str,
+        docstring_index: Dict[str, str],
+        imported_paths: Optional[List[str]] = None) -> None:
+    """
+    Write a docstring index file.
+
+    Parameters
+    ----------
+    index_file_path : str
+        The index file path to write.
+    module_name : str
+        The module's package path style name. e.g., 'sample.path'
+    source_hash : str
+        The module source's hash string.
+    docstring_index : dict of str to str
+        The module's docstring index.
+    imported_paths : list of str or None, default None
+        The project-local module paths that the module imports (please
+        see `depfile.get_imported_paths` function). Stored only if
+        specified (e.g., by a docstring index cache for depfiles).
+    """
+    index_data: Dict[str, Any] = {
+        'format_version': _INDEX_FORMAT_VERSION,
+        'module_name': module_name,
+        'source_hash': source_hash,
+        'docstrings': docstring_index,
+    }
+    if imported_paths is not None:
+        index_data['imported_paths'] = imported_paths
+    with open(index_file_path, 'w', encoding='utf-8') as f:
+        json.dump(
+            index_data, f, ensure_ascii=False, separators=(',', ':'))
+
+
+def add_docstring_to_stubfile_from_index(
+        index_file_path: str, stub_file_path: str,
+        original_module_path: Optional[str] = None) -> None:
+    """
+    Add docstring to a specified stub file from an index file.
+    The original module will not be imported.
+
+    Parameters
+    ----------
+    index_file_path : str
+        The index file path that exported by `export_docstring_index`
+        function.
+    stub_file_path : str
+        Target stub file path.
+    original_module_path : str or None, default None
+        The path of stub file's original module. If specified, the
+        index file's source hash will be checked against that module.
+
+    Raises
+    ------
+    ValueError
+        If the source hash does not match with the original module.
+    """
+    index_data: Dict[str, Any] = _read_index(
+        index_file_path=index_file_path)
+    if original_module_path is not None:
+        source_hash: str = _get_source_hash(
+            module_path=original_module_path)
+        if index_data['source_hash'] != source_hash:
+            raise ValueError(
+                'The index file is outdated for the specified module: '
+                f'{index_file_path}, {original_module_path}')
+    if not stubdoc._needs_docstring_index(
+            stub_str=stubdoc._read_txt(file_path=stub_file_path)):
+        return
+    stubdoc._add_docstring_index_to_stubfile(
+        docstring_index=index_data['docstrings'],
+        stub_file_path=stub_file_path)
+
+
+def _read_index(*, index_file_path: str) -> Dict[str, Any]:
+    """
+    Read a specified docstring index file.
+
+    Parameters
+    ----------
+    index_file_path : str
+        Target index file path.
+
+    Returns
+    -------
+    index_data : dict
+        Read index data.
+
+    Raises
+    ------
+    ValueError
+        If the index file's format version is not supported.
+    """
+    with open(index_file_path, encoding='utf-8') as f:
+        index_data: Dict[str, Any] = json.load(f)
+    if index_data.get('format_version') != _INDEX_FORMAT_VERSION:
+        raise ValueError(
+            f'Unsupported index file format: {index_file_path}')
+    return index_data
+
+
+def _get_source_hash(*, module_path: str) -> str:
+    """
+    Get a specified module source's hash string.
+
+    Parameters
+    ----------
+    module_path : str
+        Target module path.
+
+    Returns
+    -------
+    source_hash : str
+        SHA-256 hex digest of the module source.
+    """
+    with open(module_path, 'rb') as f:
+        source_hash: str = hashlib.sha256(f.read()).hexdigest()
+    return source_hash
@@ -0,0 +1,248 @@
+"""The module that implements getting module and stub file pairs of
+installed (importable) modules and packages by their names, so that
+stub files of installed distributions (e.g., `requests-stubs` package
+or inline `.pyi` files) can be processed without knowing their paths.
+
+Module names are resolved by `importlib.util.find_spec` function with
+top-level names only and by walking package directories, so that no
+module (including parent packages) is imported while resolving.
+"""
+
+import importlib.util
+import os
+import sys
+from importlib.machinery import ModuleSpec
+from typing import Iterable, List, Optional, Set, Tuple
+
+from stubdoc import batch
+
+STUB_PACKAGE_SUFFIX: str = '-stubs'
+
+
+def get_pairs(
+        *, module_names: Iterable[str],
+        stub_dir_path: Optional[str] = None) -> List[Tuple[str, str]]:
+    """
+    Get module and stub file pairs of specified installed modules. All
+    modules of a package (recursively) are included. Modules whose
+    stub file does not exist are skipped.
+
+    Parameters
+    ----------
+    module_names : iterable of str
+        Target module or package names. e.g., ['requests', 'urllib3']
+    stub_dir_path : str or None, default None
+        Stub files' root directory path (stubgen's output directory).
+        If not specified, stub files are looked up in the stub packages
+        on `sys.path` and next to the modules. Please see
+        `get_stub_path` function.
+
+    Returns
+    -------
+    pairs : list of tuple of str and str
+        Pairs of module path (absolute) and stub file path.
+
+    Raises
+    ------
+    ValueError
+        If any module name is invalid or the module is not found.
+    """
+    pairs: List[Tuple[str, str]] = []
+    added_module_paths: Set[str] = set()
+    for module_name in module_names:
+        for file_module_name, module_path in get_module_paths(
+                module_name=module_name):
+            if module_path in added_module_paths:
+                continue
+            added_module_paths.add(module_path)
+            stub_path: Optional[str] = get_stub_path(
+                module_name=file_module_name, module_path=module_path,
+                stub_dir_path=stub_dir_path)
+            if stub_path is None:
+                continue
+            pairs.append((module_path, stub_path))
+    return pairs
+
+
+def get_module_paths(*, module_name: str) -> List[Tuple[str, str]]:
+    """
+    Get the Python source module paths of a specified installed module
+    or package (recursively).
+
+    Parameters
+    ----------
+    module_name : str
+        Target module or package name. e.g., 'requests.adapters'
+
+    Returns
+    -------
+    module_paths : list of tuple of str and str
+        Pairs of module name and absolute module path. A package's
+        `__init__.py` has the package name. Extension modules and
+        directories that are not packages (their names are not valid
+        identifiers) are skipped.
+        e.g., [('requests', '/site-packages/requests/__init__.py'), ...]
+
+    Raises
+    ------
+    ValueError
+        If the module name is invalid or the module is not found.
+    """
+    module_path, search_locations = _find_module(module_name=module_name)
+    module_paths: List[Tuple[str, str]] = []
+    if module_path is not None and module_path.endswith('.py'):
+        module_paths.append((module_name, module_path))
+    for location in search_locations:
+        for path in batch.get_module_paths_in_dir(dir_path=location):
+            path = os.path.abspath(path)
+            names: List[str] = os.path.splitext(
+                os.path.relpath(path, location))[0].split(os.sep)
+            if not all(name.isidentifier() for name in names):
+                continue
+            if names[-1] == '__init__':
+                names = names[:-1]
+            if path == module_path:
+                continue
+            module_paths.append(('.'.join([module_name, *names]), path))
+    return module_paths
+
+
+def _find_module(
+        *, module_name: str) -> Tuple[Optional[str], List[str]]:
+    """
+    Find a specified module without importing it or its parent
+    packages.
+
+    Parameters
+    ----------
+    module_name : str
+        Target module name. e.g., 'requests.adapters'
+
+    Returns
+    -------
+    module_path : str or None
+        The module's absolute file path (`__init__.py` for a regular
+        package). None will be returned for a namespace package.
+    search_locations : list of str
+        The package's absolute directory paths (multiple ones for
+        a namespace package). An empty list will be returned if the
+        module is not a package.
+
+    Raises
+    ------
+    ValueError
+        If the module name is invalid or the module is not found.
+    """
+    names: List[str] = module_name.split('.')
+    if not all(name.isidentifier() for name in names):
+        raise ValueError(f'Invalid module name specified: {module_name}')
+    try:
+        spec: Optional[ModuleSpec] = importlib.util.find_spec(names[0])
+    except (ImportError, ValueError):
+        spec = None
+    if spec is None:
+        raise ValueError(f'Specified module not found: {module_name}')
+    module_path: Optional[str] = None
+    if spec.has_location and spec.origin is not None:
+        module_path = os.path.abspath(spec.origin)
+    search_locations: List[str] = []
+    for location in spec.submodule_search_locations or []:
+        location = os.path.abspath(location)
+        if location not in search_locations:
+            search_locations.append(location)
+    for name in names[1:]:
+        module_path = None
+        sub_search_locations: List[str] = []
+        for location in search_locations:
+            dir_path: str = os.path.join(location, name)
+            init_file_path: str = os.path.join(dir_path, '__init__.py')
+            if os.path.isfile(init_file_path):
+                module_path = init_file_path
+                sub_search_locations = [dir_path]
+                break
+            if os.path.isfile(f'{dir_path}.py'):
+                module_path = f'{dir_path}.py'
+                sub_search_locations = []
+                break
+            if os.path.isdir(dir_path):
+                sub_search_locations.append(dir_path)
+        if module_path is None and not sub_search_locations:
+            raise ValueError(
+                f'Specified module not found: {module_name}')
+        search_locations = sub_search_locations
+    return module_path, search_locations
+
+
+def get_stub_path(
+        *, module_name: str, module_path: str,
+        stub_dir_path: Optional[str] = None) -> Optional[str]:
+    """
+    Get a specified installed module's existing stub file path.
+
+    Parameters
+    ----------
+    module_name : str
+        Target module name. e.g., 'requests.adapters'
+    module_path : str
+        Target module path. e.g., '/site-packages/requests/adapters.py'
+    stub_dir_path : str or None, default None
+        Stub files' root directory path (stubgen's output directory).
+        If specified, only the stub file in it (e.g.,
+        'out/requests/adapters.pyi') is used.
+
+    Returns
+    -------
+    stub_path : str or None
+        The stub file path. If stub_dir_path is not specified, the stub
+        file in the first stub package (PEP 561, e.g.,
+        '/site-packages/requests-stubs/adapters.pyi') on `sys.path`
+        that has it, or the inline stub file next to the module (e.g.,
+        '/site-packages/requests/adapters.pyi'). None will be returned
+        if the stub file does not exist.
+    """
+    names: List[str] = module_name.split('.')
+    is_package: bool = os.path.basename(module_path) == '__init__.py'
+    if stub_dir_path is not None:
+        stub_path: str = _get_stub_path_in_dir(
+            dir_path=stub_dir_path, names=names, is_package=is_package)
+        return stub_path if os.path.isfile(stub_path) else None
+    for path in sys.path:
+        if not isinstance(path, str) or not path:
+            continue
+        stub_package_dir_path: str = os.path.join(
+            path, f'{names[0]}{STUB_PACKAGE_SUFFIX}')
+        if not os.path.isdir(stub_package_dir_path):
+            continue
+        stub_path = _get_stub_path_in_dir(
+            dir_path=stub_package_dir_path, names=names[1:],
+            is_package=is_package or len(names) == 1)
+        if os.path.isfile(stub_path):
+            return stub_path
+    stub_path = f'{os.path.splitext(module_path)[0]}.pyi'
+    return stub_path if os.path.isfile(stub_path) else None
+
+
+def _get_stub_path_in_dir(
+        *, dir_path: str, names: List[str], is_package: bool) -> str:
+    """
+    Get a module's stub file path in a specified directory.
+
+    Parameters
+    ----------
+    dir_path : str
+        The stub files' root directory path.
+    names : list of str
+        The module name's parts under the directory.
+        e.g., ['requests', 'adapters']
+    is_package : bool
+        Whether the module is a package (its stub file is
+        `__init__.pyi`).
+
+    Returns
+    -------
+    stub_path : str
+        The stub file path. e.g., 'out/requests/adapters.pyi'
+    """
+    if is_package:
+        return os.path.join(dir_path, *names, '__init__.pyi')
+    return os.path.join(dir_path, *names[:-1], f'{names[-1]}.pyi')
@@ -0,0 +1,270 @@
+"""The module that implements the per-module import cost profiler.
+"""
+
+import builtins
+import importlib.util
+import time
+from types import ModuleType
+from typing import Any, Callable, Dict, List, Optional
+
+from stubdoc import stubdoc
+from stubdoc import tracing
+
+
+class ImportProfile:
+
+    module_path: str
+    total_seconds: float
+    dependency_seconds: Dict[str, float]
+
+    def __init__(self, module_path: str) -> None:
+        """
+        The class that stores single module's import cost.
+
+        Parameters
+        ----------
+        module_path : str
+            The profiled module path.
+        """
+        self.module_path = module_path
+        self.total_seconds = 0.0
+        self.dependency_seconds = {}
+
+    @property
+    def dependencies_total_seconds(self) -> float:
+        """
+        Get the total seconds of the imported dependencies.
+
+        Returns
+        -------
+        dependencies_total_seconds : float
+            Total seconds of the imported dependencies.
+        """
+        return sum(self.dependency_seconds.values())
+
+    @property
+    def self_seconds(self) -> float:
+        """
+        Get the seconds of the module's own work (excluding the
+        imported dependencies).
+
+        Returns
+        -------
+        self_seconds : float
+            Seconds of the module's own work.
+        """
+        return self.total_seconds - self.dependencies_total_seconds
+
+
+class ImportProfiler:
+    """
+    The class that records each module's `_read_module` time, split
+    into the module's own work and the transitively imported
+    dependencies (aggregated by top-level package name). Imports of the
+    module's own top-level package (e.g., its sibling modules) are
+    counted as the module's own work.
+    """
+
+    profiles: List[ImportProfile]
+    _depth: int
+    _current_profile: Optional[ImportProfile]
+    _current_package_name: str
+
+    def __init__(self) -> None:
+        """
+        The class that records each module's `_read_module` time, split
+        into the module's own work and the transitively imported
+        dependencies (aggregated by top-level package name). Imports of
+        the module's own top-level package (e.g., its sibling modules)
+        are counted as the module's own work.
+        """
+        self.profiles = []
+        self._depth = 0
+        self._current_profile = None
+        self._current_package_name = ''
+
+    def read_module(self, module_path: str) -> ModuleType:
+        """
+        Read specified path's module and record its import cost.
+
+        Parameters
+        ----------
+        module_path : str
+            Target module path to read.
+
+        Returns
+        -------
+        module : ModuleType
+            Read module.
+        """
+        profile: ImportProfile = ImportProfile(module_path=module_path)
+        self.profiles.append(profile)
+        self._current_profile = profile
+        self._current_package_name = stubdoc._get_package_name(
+            module_path=module_path).split('.')[0]
+        original_import: Callable = builtins.__import__
+        builtins.__import__ = self._get_profiled_import(
+            original_import=original_import)
+        start_time: float = time.perf_counter()
+        try:
+            module: ModuleType = stubdoc._read_module(
+                module_path=module_path)
+        finally:
+            profile.total_seconds = time.perf_counter() - start_time
+            builtins.__import__ = original_import
+            self._current_profile = None
+        return module
+
+    def get_docstring_index(self, module_path: str) -> Dict[str, str]:
+        """
+        Get a specified module's docstring index and record the module's
+        import cost.
+
+        Parameters
+        ----------
+        module_path : str
+            Target module path.
+
+        Returns
+        -------
+        docstring_index : dict of str to str
+            The module's docstring index.
+        """
+        with tracing.span(name='import'):
+            module: ModuleType = self.read_module(module_path=module_path)
+        with tracing.span(name='enumerate'):
+            docstring_index: Dict[str, str] = \
+                stubdoc._get_docstring_index_from_module(module=module)
+        return docstring_index
+
+    def _get_profiled_import(
+            self, *, original_import: Callable) -> Callable:
+        """
+        Get an `__import__` replacement that records the time of the
+        imports made directly by the profiled module.
+
+        Parameters
+        ----------
+        original_import : Callable
+            The original `__import__` function.
+
+        Returns
+        -------
+        profiled_import : Callable
+            The replacement function.
+        """
+
+        def profiled_import(
+                name: str, globals: Optional[Dict[str, Any]] = None,
+                locals: Optional[Dict[str, Any]] = None,
+                fromlist: Any = (), level: int = 0) -> Any:
+            self._depth += 1
+            start_time: float = time.perf_counter()
+            try:
+                return original_import(
+                    name, globals, locals, fromlist, level)
+            finally:
+                self._depth -= 1
+                if self._depth == 0 and self._current_profile is not None:
+                    self._add_dependency_seconds(
+                        dependency_name=_get_top_level_package_name(
+                            name=name, globals=globals, level=level),
+                        seconds=time.perf_counter() - start_time)
+
+        return profiled_import
+
+    def _add_dependency_seconds(
+            self, *, dependency_name: str, seconds: float) -> None:
+        """
+        Add an import's seconds to the current profile's dependency.
+        Imports of the profiled module's own top-level package and
+        unresolved relative imports are not added.
+
+        Parameters
+        ----------
+        dependency_name : str
+            The imported module's top-level package name.
+        seconds : float
+            The import's seconds.
+        """
+        if self._current_profile is None or dependency_name in (
+                '', self._current_package_name):
+            return
+        dependency_seconds: Dict[str, float] = \
+            self._current_profile.dependency_seconds
+        dependency_seconds[dependency_name] = \
+            dependency_seconds.get(dependency_name, 0.0) + seconds
+
+    def get_report(self, *, dependencies_num: int = 3) -> str:
+        """
+        Get a report string ranked by the total import time.
+
+        Parameters
+        ----------
+        dependencies_num : int, default 3
+            The number of the most expensive dependencies to show for
+            each module.
+
+        Returns
+        -------
+        report : str
+            The report string.
+        """
+        lines: List[str] = [
+            'Import cost profile (ranked by total time):',
+            f'{"total":>9} {"self":>9} {"deps":>9}  module',
+        ]
+        profiles: List[ImportProfile] = sorted(
+            self.profiles, key=lambda profile: -profile.total_seconds)
+        for profile in profiles:
+            line: str = (
+                f'{profile.total_seconds:8.3f}s'
+                f' {profile.self_seconds:8.3f}s'
+                f' {profile.dependencies_total_seconds:8.3f}s'
+                f'  {profile.module_path}'
+            )
+            dependency_names: List[str] = sorted(
+                profile.dependency_seconds,
+                key=lambda name: -profile.dependency_seconds[name],
+            )[:dependencies_num]
+            if dependency_names:
+                dependencies_str: str = ', '.join(
+                    f'{name} {profile.dependency_seconds[name]:.3f}s'
+                    for name in dependency_names)
+                line += f'  ({dependencies_str})'
+            lines.append(line)
+        return '\n'.join(lines)
+
+
+def _get_top_level_package_name(
+        *, name: str, globals: Optional[Dict[str, Any]],
+        level: int) -> str:
+    """
+    Get an imported module's top-level package name.
+
+    Parameters
+    ----------
+    name : str
+        The name that passed to `__import__`.
+    globals : dict or None
+        The importing module's globals.
+    level : int
+        The relative import level that passed to `__import__`.
+
+    Returns
+    -------
+    package_name : str
+        The top-level package name. e.g., 'numpy' for 'numpy.linalg',
+        or 'pkg' for `from . import sub` in 'pkg.mod' module. An empty
+        string will be returned if a relative import can not be
+        resolved.
+    """
+    if level > 0:
+        package: Any = (globals or {}).get('__package__')
+        if not isinstance(package, str) or package == '':
+            return ''
+        try:
+            name = importlib.util.resolve_name('.' * level + name, package)
+        except (ImportError, ValueError):
+            return ''
+    return name.split('.')[0]
@@ -0,0 +1,274 @@
+"""The module that implements the long-running stubdoc server and its
+thin client.
+
+The server listens on a Unix socket and keeps imported modules and
+docstring indexes warm between requests. A request is a single JSON
+line (`{"cwd": ..., "pairs": [[module_path, stub_path], ...]}`) and each
+pair's result is returned as a JSON line as soon as it completes.
+
+Modules under a request's directory are loaded by a session of that
+directory (please see the `session` module), so that projects served
+from different directories never share their modules, and the server's
+current directory is never changed.
+"""
+
+import importlib
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+from types import ModuleType
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from stubdoc import batch
+from stubdoc import stubdoc
+from stubdoc.batch import PairResult
+from stubdoc.session import StubdocSession
+
+
+class _DocstringIndexCache:
+    """
+    The class that caches docstring indexes of modules. A cached index
+    is invalidated when the module source's mtime changes.
+    """
+
+    _entries: Dict[str, Tuple[int, Dict[str, str]]]
+    _sessions: Dict[str, StubdocSession]
+
+    def __init__(self) -> None:
+        """
+        The class that caches docstring indexes of modules. A cached
+        index is invalidated when the module source's mtime changes.
+        """
+        self._entries = {}
+        self._sessions = {}
+
+    def get_docstring_index(
+            self, module_path: str,
+            root_dir_path: Optional[str] = None) -> Dict[str, str]:
+        """
+        Get a specified module's docstring index. The module will be
+        loaded again if the cached index is outdated.
+
+        Parameters
+        ----------
+        module_path : str
+            Target module path.
+        root_dir_path : str or None, default None
+            The directory that a relative module path is resolved from,
+            and the root of package path style module names (the
+            request's directory). The current directory will be used if
+            None.
+
+        Returns
+        -------
+        docstring_index : dict of str to str
+            The module's docstring index.
+        """
+        root_dir_path = os.path.abspath(root_dir_path or os.getcwd())
+        key: str = os.path.normpath(os.path.join(root_dir_path, module_path))
+        mtime_ns: int = os.stat(key).st_mtime_ns
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == mtime_ns:
+            return entry[1]
+        docstring_index: Dict[str, str]
+        if os.path.relpath(key, root_dir_path).startswith(os.pardir):
+            docstring_index = _get_docstring_index_by_sys_path(
+                module_path=key)
+        else:
+            session: Optional[StubdocSession] = self._sessions.get(
+                root_dir_path)
+            if session is None or entry is not None:
+                session = StubdocSession(root_dir_path=root_dir_path)
+                self._sessions[root_dir_path] = session
+            docstring_index = session.get_docstring_index(module_path=key)
+        self._entries[key] = (mtime_ns, docstring_index)
+        return docstring_index
+
+    def add_docstring_to_stubfile(
+            self, original_module_path: str, stub_file_path: str,
+            root_dir_path: Optional[str] = None) -> None:
+        """
+        Add docstring to a specified stub file with the cached index.
+
+        Parameters
+        ----------
+        original_module_path : str
+            The path of stub file's original module.
+        stub_file_path : str
+            Target stub file path.
+        root_dir_path : str or None, default None
+            The directory that relative paths are resolved from. Please
+            see `get_docstring_index` method.
+        """
+        stub_file_path = os.path.join(
+            root_dir_path or os.getcwd(), stub_file_path)
+        if not stubdoc._needs_docstring_index(
+                stub_str=stubdoc._read_txt(file_path=stub_file_path)):
+            return
+        docstring_index: Dict[str, str] = self.get_docstring_index(
+            module_path=original_module_path, root_dir_path=root_dir_path)
+        stubdoc._add_docstring_index_to_stubfile(
+            docstring_index=docstring_index, stub_file_path=stub_file_path)
+
+
+def _get_docstring_index_by_sys_path(*, module_path: str) -> Dict[str, str]:
+    """
+    Get the docstring index of a module outside the request's directory
+    (e.g., an installed package's module under a `sys.path` entry) by
+    importing its package path style name. The module will be reloaded
+    if it has been imported.
+
+    Parameters
+    ----------
+    module_path : str
+        Target module's absolute path.
+
+    Returns
+    -------
+    docstring_index : dict of str to str
+        The module's docstring index.
+    """
+    package_name: str = stubdoc._get_package_name(module_path=module_path)
+    imported: bool = package_name in sys.modules
+    module: ModuleType = stubdoc._read_module(module_path=module_path)
+    if imported:
+        module = importlib.reload(module)
+    return stubdoc._get_docstring_index_from_module(module=module)
+
+
+class _StubdocServer(socketserver.UnixStreamServer):
+    """
+    The Unix socket server that holds a docstring index cache.
+    Requests are handled one by one.
+    """
+
+    cache: _DocstringIndexCache
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """
+    The handler of a single client request.
+    """
+
+    server: _StubdocServer
+
+    def handle(self) -> None:
+        """
+        Handle a client request and write each pair's result. Relative
+        paths are resolved from the request's directory.
+        """
+        request: Dict[str, Any] = json.loads(self.rfile.readline())
+        root_dir_path: str = request['cwd']
+        pairs: List[Tuple[str, str]] = [
+            (module_path, stub_path)
+            for module_path, stub_path in request['pairs']]
+
+        def add_docstring(module_path: str, stub_path: str) -> None:
+            self.server.cache.add_docstring_to_stubfile(
+                module_path, stub_path, root_dir_path=root_dir_path)
+
+        for result in batch.add_docstring_to_stubfiles(
+                pairs=pairs, add_docstring=add_docstring):
+            self.wfile.write(
+                json.dumps(result.to_dict()).encode('utf-8') + b'\n')
+            self.wfile.flush()
+
+
+def serve(socket_path: str) -> None:
+    """
+    Start the stubdoc server. This function blocks until interrupted
+    (SIGINT or SIGTERM). Need to be called from the main thread.
+
+    Parameters
+    ----------
+    socket_path : str
+        The Unix socket path to listen on. An existing file at the
+        path will be replaced.
+    """
+    server: _StubdocServer = _make_server(socket_path=socket_path)
+    signal.signal(signal.SIGTERM, _raise_keyboard_interrupt)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        os.remove(socket_path)
+
+
+def _raise_keyboard_interrupt(signal_number: int, frame: Any) -> None:
+    """
+    Signal handler that stops the server as same as SIGINT.
+
+    Parameters
+    ----------
+    signal_number : int
+        Received signal number.
+    frame : Any
+        Current stack frame.
+
+    Raises
+    ------
+    KeyboardInterrupt
+        Always raised to stop the server.
+    """
+    raise KeyboardInterrupt
+
+
+def _make_server(*, socket_path: str) -> _StubdocServer:
+    """
+    Make a stubdoc server that bound to a specified socket path.
+
+    Parameters
+    ----------
+    socket_path : str
+        The Unix socket path to listen on.
+
+    Returns
+    -------
+    server : _StubdocServer
+        Created server.
+    """
+    if os.path.exists(socket_path):
+        os.remove(socket_path)
+    server: _StubdocServer = _StubdocServer(socket_path, _RequestHandler)
+    server.cache = _DocstringIndexCache()
+    return server
+
+
+def request(
+        socket_path: str, pairs: Iterable[Tuple[str, str]],
+        cwd: Optional[str] = None) -> Iterator[PairResult]:
+    """
+    Send module and stub file pairs to a running stubdoc server.
+
+    Parameters
+    ----------
+    socket_path : str
+        The server's Unix socket path.
+    pairs : iterable of tuple of str and str
+        Pairs of original module path and stub file path. Relative
+        paths are resolved from cwd.
+    cwd : str or None, default None
+        The directory that relative paths and package path style module
+        names are resolved from. The current directory will be used if
+        None.
+
+    Yields
+    ------
+    result : PairResult
+        Each pair's processing result, as soon as it completes.
+    """
+    request_data: Dict[str, Any] = {
+        'cwd': os.getcwd() if cwd is None else os.path.abspath(cwd),
+        'pairs': [list(pair) for pair in pairs],
+    }
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(socket_path)
+        sock.sendall(json.dumps(request_data).encode('utf-8') + b'\n')
+        with sock.makefile('rb') as f:
+            for line in f:
+                yield PairResult.from_dict(json.loads(line))
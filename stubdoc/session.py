@@ -0,0 +1,428 @@
+"""The module that implements the session-scoped library interface.
+
+A session resolves paths against its own root directory and loads
+modules from their file locations, so that `sys.path` and the current
+directory are never changed. Sessions are safe to use from multiple
+threads (including a single session shared by a thread pool).
+"""
+
+import importlib.abc
+import importlib.machinery
+import importlib.util
+import os
+import sys
+import threading
+import traceback
+from contextlib import contextmanager
+from importlib.machinery import ModuleSpec
+from types import ModuleType
+from typing import Dict, Iterator, List, Optional, Sequence, Set
+
+from stubdoc import backends
+from stubdoc import stubdoc
+from stubdoc import tracing
+from stubdoc import update
+
+# Module execution touches `sys.modules` that is shared by all threads,
+# so the import backend is serialized over all sessions.
+_IMPORT_LOCK: threading.RLock = threading.RLock()
+
+
+class StubdocSession:
+
+    backend: str
+    root_dir_path: str
+    _modules: Dict[str, ModuleType]
+
+    def __init__(
+            self, backend: str = 'import',
+            root_dir_path: Optional[str] = None) -> None:
+        """
+        The class that holds a docstring adding session's state.
+
+        Notes
+        -----
+        Modules loaded by the import backend are cached in the session
+        (not in `sys.modules`). Project modules (top-level modules and
+        packages in the root directory, and the loaded module's
+        top-level package) are always loaded from the root directory,
+        even if `sys.modules` has modules of the same names (e.g.,
+        another project's or the host application's ones), and project
+        modules imported while loading are also moved to the session.
+        Please create a new session to load changed modules again.
+
+        Parameters
+        ----------
+        backend : str, default 'import'
+            Docstring extraction backend. import, bytecode or static.
+            The bytecode and static backends run in parallel on
+            multiple threads, but the import backend is serialized.
+        root_dir_path : str or None, default None
+            The directory that relative module and stub file paths are
+            resolved from, and the root of package path style module
+            names (e.g., 'sample/path.py' to 'sample.path'). The current
+            directory at session creation will be used if None.
+
+        Raises
+        ------
+        ValueError
+            If not supported backend is specified.
+        """
+        if backend not in backends.DOCSTRING_INDEX_GETTERS:
+            raise ValueError(f'Not supported backend specified: {backend}')
+        if root_dir_path is None:
+            root_dir_path = os.getcwd()
+        self.backend = backend
+        self.root_dir_path = os.path.abspath(root_dir_path)
+        self._modules = {}
+
+    def add_docstring_to_stubfile(
+            self, original_module_path: str, stub_file_path: str) -> None:
+        """
+        Add docstring to a specified stub file.
+
+        Parameters
+        ----------
+        original_module_path : str
+            The path of stub file's original module.
+        stub_file_path : str
+            Target stub file path.
+        """
+        stub_file_path = self._get_path(path=stub_file_path)
+        stub_str: str = stubdoc._read_txt(file_path=stub_file_path)
+        if not stubdoc._needs_docstring_index(stub_str=stub_str):
+            return
+        docstring_index: Dict[str, str] = self.get_docstring_index(
+            module_path=original_module_path,
+            names=stubdoc._get_declared_names(stub_str=stub_str))
+        stubdoc._add_docstring_index_to_stubfile(
+            docstring_index=docstring_index, stub_file_path=stub_file_path)
+
+    def update_docstrings_in_stubfile(
+            self, original_module_path: str, stub_file_path: str) -> None:
+        """
+        Update docstrings of a specified stub file incrementally.
+        Please see `update.update_docstrings_in_stubfile` function for
+        the details.
+
+        Parameters
+        ----------
+        original_module_path : str
+            The path of stub file's original module.
+        stub_file_path : str
+            Target stub file path.
+        """
+        stub_file_path = self._get_path(path=stub_file_path)
+        stub_str: str = stubdoc._read_txt(file_path=stub_file_path)
+        if not stubdoc._needs_docstring_index(
+                stub_str=stub_str, update_mode=True):
+            return
+        docstring_index: Dict[str, str] = self.get_docstring_index(
+            module_path=original_module_path,
+            names=stubdoc._get_declared_names(stub_str=stub_str))
+        update._update_docstring_index_in_stubfile(
+            docstring_index=docstring_index, stub_file_path=stub_file_path)
+
+    def get_docstring_index(
+            self, module_path: str,
+            names: Optional[List[str]] = None) -> Dict[str, str]:
+        """
+        Get a specified module's docstring index with the session's
+        backend.
+
+        Parameters
+        ----------
+        module_path : str
+            Target module path.
+        names : list of str or None, default None
+            Qualified names to look up (e.g., names that a stub
+            declares). If specified, the import backend looks up only
+            these names instead of enumerating all module members.
+            The other backends ignore this argument.
+
+        Returns
+        -------
+        docstring_index : dict of str to str
+            The module's docstring index. Please see
+            `stubdoc._get_docstring_index_from_module` function for the
+            details.
+        """
+        if self.backend != 'import':
+            return backends.DOCSTRING_INDEX_GETTERS[self.backend](
+                module_path=self._get_path(path=module_path))
+        with tracing.span(name='import_lock_wait'):
+            _IMPORT_LOCK.acquire()
+        try:
+            with tracing.span(name='import'):
+                module: ModuleType = self._read_module(
+                    module_path=module_path)
+            with tracing.span(name='enumerate'):
+                docstring_index: Dict[str, str]
+                if names is None:
+                    docstring_index = \
+                        stubdoc._get_docstring_index_from_module(
+                            module=module)
+                else:
+                    docstring_index = \
+                        stubdoc._get_docstring_index_from_module_by_names(
+                            module=module, names=names)
+        finally:
+            _IMPORT_LOCK.release()
+        return docstring_index
+
+    def _get_path(self, *, path: str) -> str:
+        """
+        Get a path resolved from the session's root directory.
+
+        Parameters
+        ----------
+        path : str
+            Target path. An absolute path is returned as it is.
+
+        Returns
+        -------
+        path : str
+            Resolved absolute path.
+        """
+        return os.path.normpath(os.path.join(self.root_dir_path, path))
+
+    def _read_module(self, *, module_path: str) -> ModuleType:
+        """
+        Read specified path's module without changing `sys.path`.
+        Need to be called while the import lock is acquired.
+
+        Parameters
+        ----------
+        module_path : str
+            Target module path to read.
+
+        Returns
+        -------
+        module : ModuleType
+            Read module.
+
+        Raises
+        ------
+        Exception
+            If the module is not under the root directory or its import
+            failed.
+        """
+        file_path: str = self._get_path(path=module_path)
+        rel_path: str = os.path.relpath(file_path, self.root_dir_path)
+        module_name: str = stubdoc._get_package_name(module_path=rel_path)
+        if rel_path.startswith(os.pardir) or module_name == '':
+            raise Exception(
+                'Specified module is not under the session root directory'
+                f' (need to be able to import by package path style):'
+                f' {module_path}')
+        if os.path.basename(file_path) == '__init__.py':
+            module_name = module_name.rsplit('.', 1)[0]
+        names: List[str] = module_name.split('.')
+        project_names: Set[str] = _get_project_names(
+            root_dir_path=self.root_dir_path, package_name=names[0])
+        with self._use_session_modules(project_names=project_names):
+            for i in range(1, len(names)):
+                package_name: str = '.'.join(names[:i])
+                if package_name in sys.modules:
+                    continue
+                package_dir_path: str = os.path.join(
+                    self.root_dir_path, *names[:i])
+                init_file_path: str = os.path.join(
+                    package_dir_path, '__init__.py')
+                if not os.path.isfile(init_file_path):
+                    sys.modules[package_name] = _make_namespace_package(
+                        package_name=package_name,
+                        dir_path=package_dir_path)
+                    continue
+                self._load_module(
+                    module_name=package_name, file_path=init_file_path)
+            if module_name in sys.modules:
+                return sys.modules[module_name]
+            return self._load_module(
+                module_name=module_name, file_path=file_path)
+
+    @contextmanager
+    def _use_session_modules(
+            self, *, project_names: Set[str]) -> Iterator[None]:
+        """
+        Make the session's cached modules importable while the context,
+        in place of the `sys.modules` entries of the project modules,
+        and make the project's top-level modules importable from the
+        root directory. After the context, project modules in
+        `sys.modules` are moved to the session's cache and the replaced
+        entries are restored.
+
+        Parameters
+        ----------
+        project_names : set of str
+            The project's top-level module and package names.
+        """
+        project_names = project_names | {
+            name.split('.')[0] for name in self._modules}
+        replaced_modules: Dict[str, ModuleType] = {
+            name: sys.modules.pop(name) for name in list(sys.modules)
+            if name.split('.')[0] in project_names}
+        sys.modules.update(self._modules)
+        finder: _RootFinder = _RootFinder(
+            root_dir_path=self.root_dir_path, names=project_names)
+        sys.meta_path.insert(0, finder)
+        try:
+            yield
+        finally:
+            sys.meta_path.remove(finder)
+            for name in list(sys.modules):
+                if name.split('.')[0] not in project_names:
+                    continue
+                self._modules[name] = sys.modules.pop(name)
+            sys.modules.update(replaced_modules)
+
+    def _load_module(self, *, module_name: str, file_path: str) -> ModuleType:
+        """
+        Load and execute a module from a specified file location.
+
+        Parameters
+        ----------
+        module_name : str
+            Package path style module name. e.g., 'sample.path'
+        file_path : str
+            The module's file path. If the file name is `__init__.py`, the
+            module is loaded as a package.
+
+        Returns
+        -------
+        module : ModuleType
+            Loaded module.
+
+        Raises
+        ------
+        Exception
+            If the module import failed.
+        """
+        submodule_search_locations: Optional[List[str]] = None
+        if os.path.basename(file_path) == '__init__.py':
+            submodule_search_locations = [os.path.dirname(file_path)]
+        spec: Optional[ModuleSpec] = None
+        if os.path.isfile(file_path):
+            spec = importlib.util.spec_from_file_location(
+                module_name, file_path,
+                submodule_search_locations=submodule_search_locations)
+        if spec is None or spec.loader is None:
+            raise Exception(
+                f'Specified module not found: {module_name} ({file_path})')
+        module: ModuleType = importlib.util.module_from_spec(spec)
+        sys.modules[module_name] = module
+        try:
+            spec.loader.exec_module(module)
+        except Exception:
+            sys.modules.pop(module_name, None)
+            raise Exception(
+                f'{traceback.format_exc()}\n\n'
+                f'Specified module import failed: {module_name}')
+        return module
+
+
+class _RootFinder(importlib.abc.MetaPathFinder):
+    """
+    The meta path finder that finds a session's top-level project
+    modules in its root directory.
+    """
+
+    _root_dir_path: str
+    _names: Set[str]
+
+    def __init__(self, *, root_dir_path: str, names: Set[str]) -> None:
+        """
+        The meta path finder that finds a session's top-level project
+        modules in its root directory.
+
+        Parameters
+        ----------
+        root_dir_path : str
+            The session's root directory path.
+        names : set of str
+            The project's top-level module and package names.
+        """
+        self._root_dir_path = root_dir_path
+        self._names = names
+
+    def find_spec(
+            self, fullname: str, path: Optional[Sequence[str]],
+            target: Optional[ModuleType] = None) -> Optional[ModuleSpec]:
+        """
+        Find a specified top-level project module's spec.
+
+        Parameters
+        ----------
+        fullname : str
+            The module name to find.
+        path : sequence of str or None
+            The parent package's search locations. None for a top-level
+            module.
+        target : ModuleType or None, default None
+            The module to reload. Not used.
+
+        Returns
+        -------
+        spec : ModuleSpec or None
+            The module's spec in the root directory. None will be
+            returned if the module is not a top-level project module.
+        """
+        if path is not None or fullname not in self._names:
+            return None
+        return importlib.machinery.PathFinder.find_spec(
+            fullname, [self._root_dir_path])
+
+
+def _get_project_names(*, root_dir_path: str, package_name: str) -> Set[str]:
+    """
+    Get the top-level module and package names of a project.
+
+    Parameters
+    ----------
+    root_dir_path : str
+        The project's root directory path.
+    package_name : str
+        The loading module's top-level package name (it can be a
+        namespace package).
+
+    Returns
+    -------
+    project_names : set of str
+        The loading module's top-level package name, and the names of
+        the modules and the packages (that have `__init__.py`) in the
+        root directory.
+    """
+    project_names: Set[str] = {package_name}
+    for entry in os.scandir(root_dir_path):
+        name, extension = os.path.splitext(entry.name)
+        if entry.is_file() and extension == '.py' and name.isidentifier():
+            project_names.add(name)
+            continue
+        if entry.is_dir() and entry.name.isidentifier() and os.path.isfile(
+                os.path.join(entry.path, '__init__.py')):
+            project_names.add(entry.name)
+    return project_names
+
+
+def _make_namespace_package(*, package_name: str, dir_path: str) -> ModuleType:
+    """
+    Make a namespace package module (a package directory without
+    `__init__.py`).
+
+    Parameters
+    ----------
+    package_name : str
+        Package path style package name. e.g., 'sample'
+    dir_path : str
+        The package directory path.
+
+    Returns
+    -------
+    package : ModuleType
+        Created package module.
+    """
+    spec: ModuleSpec = ModuleSpec(
+        name=package_name, loader=None, is_package=True)
+    spec.submodule_search_locations = [dir_path]
+    package: ModuleType = importlib.util.module_from_spec(spec)
+    return package
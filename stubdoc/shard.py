@@ -0,0 +1,453 @@
+"""The module that implements sharding of batch processing over multiple
+machines (e.g., a CI matrix), and per-shard results files and their
+merging.
+
+Every machine gets the same pairs and processes one shard of them
+(e.g., `--shard 2/4`). Pairs are assigned to shards by the same
+deterministic algorithm on every machine, so no coordination is
+necessary. Each shard's results are written to a results file, and
+a final step merges them (please see `merge_results_files` function).
+A results file can also be used as past timings to balance the next
+run's shards and to schedule parallel runs' longest pairs first
+(please see `get_longest_first_pairs` function).
+"""
+
+import glob
+import heapq
+import json
+import os
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from stubdoc.batch import PairResult
+
+_RESULTS_FORMAT_VERSION: int = 1
+
+
+def parse_shard(shard_str: str) -> Tuple[int, int]:
+    """
+    Parse a shard specification string.
+
+    Parameters
+    ----------
+    shard_str : str
+        Target string in the INDEX/COUNT format. The index starts from
+        1. e.g., '2/4'
+
+    Returns
+    -------
+    shard_index : int
+        The shard index (1 to shard_count).
+    shard_count : int
+        The number of shards.
+
+    Raises
+    ------
+    ValueError
+        If the string is not the INDEX/COUNT format, or the index is
+        out of range.
+    """
+    index_str, _, count_str = shard_str.partition('/')
+    if not index_str.isdigit() or not count_str.isdigit():
+        raise ValueError(
+            f'shard needs to be the INDEX/COUNT format (e.g., 2/4): '
+            f'{shard_str}')
+    shard_index: int = int(index_str)
+    shard_count: int = int(count_str)
+    if not 1 <= shard_index <= shard_count:
+        raise ValueError(
+            'shard index needs to be 1 or more and the number of shards'
+            f' or less: {shard_str}')
+    return shard_index, shard_count
+
+
+def get_shard_pairs(
+        *, pairs: Iterable[Tuple[str, str]], shard_index: int,
+        shard_count: int,
+        timings: Optional[Dict[str, float]] = None,
+) -> List[Tuple[str, str]]:
+    """
+    Get the pairs of a specified shard.
+
+    Notes
+    -----
+    Pairs are sorted by their weights (descending) and paths, and each
+    pair is assigned to the shard that has the smallest total weight
+    (the longest processing time first rule). The assignment depends
+    only on the pairs' paths and weights, so it is the same on every
+    machine that has the same pairs (in any order), sources and
+    timings.
+
+    Each pair's weight is its recorded time if timings has the module
+    path. Otherwise it is the module source size, scaled to seconds by
+    the recorded pairs' total time per source byte (or the size itself
+    if no pair has a recorded time).
+
+    Parameters
+    ----------
+    pairs : iterable of tuple of str and str
+        All pairs of original module path and stub file path.
+    shard_index : int
+        Target shard index (1 to shard_count).
+    shard_count : int
+        The number of shards.
+    timings : dict of str to float or None, default None
+        Recorded processing seconds of module paths. Please see
+        `read_timings` function.
+
+    Returns
+    -------
+    shard_pairs : list of tuple of str and str
+        The shard's pairs, in the order of descending weights.
+    """
+    shard_loads: List[Tuple[float, int]] = [
+        (0.0, i) for i in range(1, shard_count + 1)]
+    shard_pairs: List[Tuple[str, str]] = []
+    for pair, weight in _get_sorted_pair_weights(
+            pairs=pairs, timings=timings):
+        load, index = heapq.heappop(shard_loads)
+        heapq.heappush(shard_loads, (load + weight, index))
+        if index == shard_index:
+            shard_pairs.append(pair)
+    return shard_pairs
+
+
+def get_longest_first_pairs(
+        *, pairs: Iterable[Tuple[str, str]],
+        timings: Optional[Dict[str, float]] = None,
+) -> List[Tuple[str, str]]:
+    """
+    Get pairs sorted in the order of descending weights (estimated
+    processing seconds), so that a process pool starts the longest
+    pairs first and a long pair does not start last while the other
+    workers are idle.
+
+    Parameters
+    ----------
+    pairs : iterable of tuple of str and str
+        Target pairs.
+    timings : dict of str to float or None, default None
+        Recorded processing seconds of module paths. Pairs without
+        a recorded time are estimated from their source sizes (please
+        see `get_shard_pairs` function).
+
+    Returns
+    -------
+    sorted_pairs : list of tuple of str and str
+        Sorted pairs. Pairs of the same weight are sorted by their
+        paths.
+    """
+    return [
+        pair for pair, _ in _get_sorted_pair_weights(
+            pairs=pairs, timings=timings)]
+
+
+def _get_sorted_pair_weights(
+        *, pairs: Iterable[Tuple[str, str]],
+        timings: Optional[Dict[str, float]],
+) -> List[Tuple[Tuple[str, str], float]]:
+    """
+    Get each pair's weight, sorted by the weights (descending) and the
+    pairs' paths.
+
+    Parameters
+    ----------
+    pairs : iterable of tuple of str and str
+        Target pairs.
+    timings : dict of str to float or None
+        Recorded processing seconds of module paths.
+
+    Returns
+    -------
+    pair_weights : list of tuple
+        Sorted pairs and their weights.
+    """
+    pair_weights: List[Tuple[Tuple[str, str], float]] = _get_pair_weights(
+        pairs=list(pairs), timings=timings or {})
+    pair_weights.sort(key=lambda pair_weight: (
+        -pair_weight[1], _get_path_key(path=pair_weight[0][0]),
+        _get_path_key(path=pair_weight[0][1])))
+    return pair_weights
+
+
+def _get_pair_weights(
+        *, pairs: List[Tuple[str, str]],
+        timings: Dict[str, float]) -> List[Tuple[Tuple[str, str], float]]:
+    """
+    Get each pair's weight (estimated processing seconds).
+
+    Parameters
+    ----------
+    pairs : list of tuple of str and str
+        Target pairs.
+    timings : dict of str to float
+        Recorded processing seconds of module paths.
+
+    Returns
+    -------
+    pair_weights : list of tuple
+        Pairs and their weights. Please see `get_shard_pairs` function
+        for the details.
+    """
+    sizes: List[int] = [
+        _get_source_size(module_path=module_path)
+        for module_path, _ in pairs]
+    recorded_seconds: List[Optional[float]] = [
+        timings.get(_get_path_key(path=module_path))
+        for module_path, _ in pairs]
+    recorded_size_total: int = sum(
+        size for size, seconds in zip(sizes, recorded_seconds)
+        if seconds is not None)
+    seconds_per_byte: float = 1.0
+    if recorded_size_total > 0:
+        seconds_per_byte = sum(
+            seconds for seconds in recorded_seconds
+            if seconds is not None) / recorded_size_total
+    return [
+        (pair, size * seconds_per_byte if seconds is None else seconds)
+        for pair, size, seconds in zip(pairs, sizes, recorded_seconds)]
+
+
+def _get_source_size(*, module_path: str) -> int:
+    """
+    Get a module's source size.
+
+    Parameters
+    ----------
+    module_path : str
+        Target module path.
+
+    Returns
+    -------
+    size : int
+        The source size in bytes. 0 will be returned if the module
+        does not exist.
+    """
+    try:
+        return os.path.getsize(module_path)
+    except OSError:
+        return 0
+
+
+def _get_path_key(*, path: str) -> str:
+    """
+    Get a normalized slash-separated path, which is the same on every
+    machine for the same relative path.
+
+    Parameters
+    ----------
+    path : str
+        Target path.
+
+    Returns
+    -------
+    path_key : str
+        Normalized path. e.g., 'sample/path.py' for './sample/path.py'
+    """
+    return os.path.normpath(path).replace(os.sep, '/')
+
+
+def write_results(
+        *, results: Iterable[PairResult], file_path: str,
+        shard: Optional[Tuple[int, int]] = None) -> None:
+    """
+    Write processing results to a JSON results file.
+
+    Parameters
+    ----------
+    results : iterable of PairResult
+        Results to write.
+    file_path : str
+        The results file path to write.
+    shard : tuple of int and int or None, default None
+        The results' shard index and the number of shards. None means
+        not sharded (e.g., merged results).
+    """
+    results_data: Dict[str, Any] = {
+        'format_version': _RESULTS_FORMAT_VERSION,
+        'shard': None if shard is None else list(shard),
+        'results': [result.to_dict() for result in results],
+    }
+    dir_path: str = os.path.dirname(file_path)
+    if dir_path != '':
+        os.makedirs(dir_path, exist_ok=True)
+    with open(file_path, 'w') as f:
+        json.dump(results_data, f, indent=2)
+        f.write('\n')
+
+
+def _read_results_data(*, file_path: str) -> Dict[str, Any]:
+    """
+    Read a results file.
+
+    Parameters
+    ----------
+    file_path : str
+        The results file path to read.
+
+    Returns
+    -------
+    results_data : dict
+        Read data. Please see `write_results` function.
+
+    Raises
+    ------
+    ValueError
+        If the file's format version is not supported.
+    """
+    with open(file_path) as f:
+        results_data: Dict[str, Any] = json.load(f)
+    if results_data.get('format_version') != _RESULTS_FORMAT_VERSION:
+        raise ValueError(
+            f'Not supported results file format: {file_path}')
+    return results_data
+
+
+def read_results(*, file_path: str) -> List[PairResult]:
+    """
+    Read processing results from a results file.
+
+    Parameters
+    ----------
+    file_path : str
+        The results file path to read.
+
+    Returns
+    -------
+    results : list of PairResult
+        Read results.
+    """
+    results_data: Dict[str, Any] = _read_results_data(file_path=file_path)
+    return [
+        PairResult.from_dict(result_dict)
+        for result_dict in results_data['results']]
+
+
+def read_timings(*, file_path: str) -> Dict[str, float]:
+    """
+    Read recorded processing seconds of modules from a results file
+    (e.g., the previous run's merged results).
+
+    Parameters
+    ----------
+    file_path : str
+        The results file path to read.
+
+    Returns
+    -------
+    timings : dict of str to float
+        Processing seconds of normalized module paths.
+    """
+    return {
+        _get_path_key(path=result.module_path): result.elapsed_seconds
+        for result in read_results(file_path=file_path)}
+
+
+def update_timings_file(
+        *, results: Iterable[PairResult], file_path: str) -> None:
+    """
+    Record processing results' times to a timings file (e.g., in the
+    cache directory) for the next runs. The file is a results file, and
+    the results of modules that are not in the specified results (e.g.,
+    not changed modules) are kept.
+
+    Parameters
+    ----------
+    results : iterable of PairResult
+        Results to record.
+    file_path : str
+        The timings file path. It is created if not exists, and is
+        overwritten if it is broken (e.g., the other format version).
+    """
+    recorded_results: Dict[str, PairResult] = {}
+    if os.path.isfile(file_path):
+        try:
+            recorded_results = {
+                _get_path_key(path=result.module_path): result
+                for result in read_results(file_path=file_path)}
+        except ValueError:
+            pass
+    for result in results:
+        recorded_results[_get_path_key(path=result.module_path)] = result
+    tmp_file_path: str = f'{file_path}.{os.getpid()}.tmp'
+    write_results(
+        results=[
+            recorded_results[key] for key in sorted(recorded_results)],
+        file_path=tmp_file_path)
+    os.replace(tmp_file_path, file_path)
+
+
+def get_results_file_paths(*, patterns: str) -> List[str]:
+    """
+    Get results file paths from comma-separated paths or glob patterns.
+
+    Parameters
+    ----------
+    patterns : str
+        Comma-separated paths or glob patterns. e.g., 'results/*.json'
+
+    Returns
+    -------
+    file_paths : list of str
+        Sorted and deduplicated file paths.
+
+    Raises
+    ------
+    ValueError
+        If a path or pattern matches no file.
+    """
+    file_paths: List[str] = []
+    for pattern in patterns.split(','):
+        pattern = pattern.strip()
+        if pattern == '':
+            continue
+        matched_paths: List[str] = sorted(glob.glob(pattern))
+        if not matched_paths:
+            raise ValueError(f'No results file matched: {pattern}')
+        file_paths.extend(matched_paths)
+    return sorted(set(file_paths))
+
+
+def merge_results_files(*, file_paths: List[str]) -> List[PairResult]:
+    """
+    Merge multiple shards' results files.
+
+    Parameters
+    ----------
+    file_paths : list of str
+        The results file paths to merge.
+
+    Returns
+    -------
+    results : list of PairResult
+        Merged results, sorted by module path and stub path.
+
+    Raises
+    ------
+    ValueError
+        If sharded results files have different numbers of shards, or
+        a shard's results file is missing or duplicated.
+    """
+    results: List[PairResult] = []
+    shard_indexes: List[int] = []
+    shard_counts: List[int] = []
+    for file_path in file_paths:
+        results_data: Dict[str, Any] = _read_results_data(
+            file_path=file_path)
+        if results_data['shard'] is not None:
+            shard_index, shard_count = results_data['shard']
+            shard_indexes.append(shard_index)
+            shard_counts.append(shard_count)
+        results.extend(
+            PairResult.from_dict(result_dict)
+            for result_dict in results_data['results'])
+    if shard_counts:
+        if len(set(shard_counts)) != 1:
+            raise ValueError(
+                'Results files have different numbers of shards:'
+                f' {sorted(set(shard_counts))}')
+        if sorted(shard_indexes) != list(range(1, shard_counts[0] + 1)):
+            raise ValueError(
+                'Each shard needs exactly one results file. Shard indexes'
+                f' of {shard_counts[0]} shards: {sorted(shard_indexes)}')
+    return sorted(
+        results, key=lambda result: (result.module_path, result.stub_path))
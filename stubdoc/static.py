@@ -0,0 +1,259 @@
+"""The module that implements static docstring extraction from module
+source (no import, no code execution).
+"""
+
+import ast
+import sys
+from typing import Dict, List, Union
+
+from stubdoc import tracing
+
+_DefinitionNode = Union[ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef]
+
+
+def get_docstring_index_from_module_path(module_path: str) -> Dict[str, str]:
+    """
+    Get a docstring index from a specified module's source file.
+
+    Parameters
+    ----------
+    module_path : str
+        Target module path.
+
+    Returns
+    -------
+    docstring_index : dict of str to str
+        A docstring index. Please see
+        `get_docstring_index_from_source` function for the details.
+    """
+    with tracing.span(name='import'):
+        with open(module_path, 'rb') as f:
+            source: bytes = f.read()
+        module_node: ast.Module = ast.parse(source, filename=module_path)
+    with tracing.span(name='enumerate'):
+        docstring_index: Dict[str, str] = \
+            _get_docstring_index_from_module_node(module_node=module_node)
+    return docstring_index
+
+
+def get_docstring_index_from_source(
+        source: Union[str, bytes],
+        filename: str = '<unknown>') -> Dict[str, str]:
+    """
+    Get a docstring index from a module source by parsing it.
+
+    Parameters
+    ----------
+    source : str or bytes
+        Module source. If bytes are specified, the source encoding is
+        detected as same as the import system (e.g., coding cookie).
+    filename : str, default '<unknown>'
+        The file name to show in syntax errors.
+
+    Returns
+    -------
+    docstring_index : dict of str to str
+        A docstring index. Please see
+        `stubdoc._get_docstring_index_from_module` function for the
+        details. Only functions and classes defined in the module are
+        included (imported ones can not be resolved statically).
+    """
+    with tracing.span(name='import'):
+        module_node: ast.Module = ast.parse(source, filename=filename)
+    with tracing.span(name='enumerate'):
+        docstring_index: Dict[str, str] = \
+            _get_docstring_index_from_module_node(module_node=module_node)
+    return docstring_index
+
+
+def _get_docstring_index_from_module_node(
+        *, module_node: ast.Module) -> Dict[str, str]:
+    """
+    Get a docstring index from a parsed module node.
+
+    Parameters
+    ----------
+    module_node : ast.Module
+        Parsed module node.
+
+    Returns
+    -------
+    docstring_index : dict of str to str
+        A docstring index. Please see
+        `get_docstring_index_from_source` function for the details.
+    """
+    function_docstrings: Dict[str, str] = {}
+    class_nodes: Dict[str, ast.ClassDef] = {}
+    for node in _get_definition_nodes(body=module_node.body):
+        if isinstance(node, ast.ClassDef):
+            class_nodes[node.name] = node
+            continue
+        _set_function_docstring(docstrings=function_docstrings, node=node)
+
+    docstring_index: Dict[str, str] = {}
+    for name in sorted([*function_docstrings, *class_nodes]):
+        if name in class_nodes:
+            method_docstrings: Dict[str, str] = {}
+            for method_node in _get_definition_nodes(
+                    body=class_nodes[name].body):
+                if isinstance(method_node, ast.ClassDef):
+                    continue
+                if _is_property_accessor(node=method_node):
+                    continue
+                method_name: str = method_node.name
+                if (method_name.startswith('__')
+                        and method_name != '__init__'):
+                    continue
+                _set_function_docstring(
+                    docstrings=method_docstrings, node=method_node)
+            for method_name in sorted(method_docstrings):
+                docstring_index[f'{name}.{method_name}'] = \
+                    method_docstrings[method_name]
+            continue
+        if function_docstrings[name] == '':
+            continue
+        docstring_index[name] = function_docstrings[name]
+
+    for class_name in sorted(class_nodes):
+        docstring: str = _get_docstring(node=class_nodes[class_name])
+        if docstring == '':
+            continue
+        docstring_index[class_name] = docstring
+    return docstring_index
+
+
+def _get_definition_nodes(
+        *, body: List[ast.stmt]) -> List[_DefinitionNode]:
+    """
+    Get function and class definition nodes in a specified body.
+    Definitions in conditional blocks (e.g., `if sys.version_info...`
+    or `try: ... except ImportError: ...`) are also included, in the
+    source order. Nested definitions are not included.
+
+    Parameters
+    ----------
+    body : list of ast.stmt
+        Target body statements (e.g., module body or class body).
+
+    Returns
+    -------
+    definition_nodes : list of ast.FunctionDef, ast.AsyncFunctionDef
+            or ast.ClassDef
+        Definition nodes.
+    """
+    definition_nodes: List[_DefinitionNode] = []
+    for node in body:
+        if isinstance(
+                node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            definition_nodes.append(node)
+            continue
+        if isinstance(node, ast.If):
+            definition_nodes.extend(_get_definition_nodes(body=node.body))
+            definition_nodes.extend(_get_definition_nodes(body=node.orelse))
+            continue
+        if isinstance(node, ast.Try):
+            for block in [node.body, node.orelse, node.finalbody]:
+                definition_nodes.extend(_get_definition_nodes(body=block))
+            for handler in node.handlers:
+                definition_nodes.extend(
+                    _get_definition_nodes(body=handler.body))
+    return definition_nodes
+
+
+def _get_docstring(*, node: _DefinitionNode) -> str:
+    """
+    Get a function's or class's docstring from its definition node.
+
+    Parameters
+    ----------
+    node : ast.FunctionDef, ast.AsyncFunctionDef or ast.ClassDef
+        Target definition node.
+
+    Returns
+    -------
+    docstring : str
+        Stripped docstring (dedented as `__doc__` on Python 3.13 or
+        later). Empty string if docstring does not exist.
+    """
+    docstring = ast.get_docstring(node, clean=False)
+    if docstring is None:
+        return ''
+    if sys.version_info >= (3, 13):
+        docstring = _dedent_docstring(docstring=docstring)
+    return docstring.strip()
+
+
+def _dedent_docstring(*, docstring: str) -> str:
+    """
+    Remove a docstring's indentation as same as the compiler of Python
+    3.13 or later does to `__doc__`.
+
+    Notes
+    -----
+    Unlike `inspect.cleandoc`, blank lines at the beginning and the end
+    are kept, and lines are not right-stripped. Tabs are expanded, the
+    first line's leading spaces are removed, and the other lines'
+    minimum indentation (of non-blank lines) is removed.
+
+    Parameters
+    ----------
+    docstring : str
+        Target raw docstring.
+
+    Returns
+    -------
+    docstring : str
+        Dedented docstring.
+    """
+    lines: List[str] = docstring.expandtabs().split('\n')
+    margin: int = min((
+        len(line) - len(line.lstrip(' ')) for line in lines[1:]
+        if line.lstrip(' ') != ''), default=0)
+    lines[0] = lines[0].lstrip(' ')
+    lines[1:] = [line[margin:] for line in lines[1:]]
+    return '\n'.join(lines)
+
+
+def _is_property_accessor(
+        *, node: Union[ast.FunctionDef, ast.AsyncFunctionDef]) -> bool:
+    """
+    Get a boolean indicating whether a specified function is a property
+    setter or deleter (decorated by `@<name>.setter` or
+    `@<name>.deleter`). Their docstrings are not used by the property
+    (the getter's docstring is kept).
+
+    Parameters
+    ----------
+    node : ast.FunctionDef or ast.AsyncFunctionDef
+        Target function's definition node.
+
+    Returns
+    -------
+    result : bool
+        True if the function is a property setter or deleter.
+    """
+    return any(
+        isinstance(decorator, ast.Attribute)
+        and decorator.attr in ('setter', 'deleter')
+        for decorator in node.decorator_list)
+
+
+def _set_function_docstring(
+        *, docstrings: Dict[str, str],
+        node: Union[ast.FunctionDef, ast.AsyncFunctionDef]) -> None:
+    """
+    Set a function's docstring to a dictionary. If the same name
+    function is defined multiple times (e.g., in conditional blocks),
+    the docstring that exists is kept.
+
+    Parameters
+    ----------
+    docstrings : dict of str to str
+        The dictionary to set docstring to.
+    node : ast.FunctionDef or ast.AsyncFunctionDef
+        Target function's definition node.
+    """
+    docstring: str = _get_docstring(node=node)
+    if docstring == '' and node.name in docstrings:
+        return
+    docstrings[node.name] = docstring
@@ -9,7 +9,12 @@ import importlib
 import traceback
 from types import ModuleType
 from typing import Any, Callable, List, Optional, Tuple, Pattern
-from typing import Match, Type
+from typing import Match, Type, Dict, Set, Iterable
+
+from stubdoc import tracing
+
+_WORD_PATTERN: Pattern = re.compile(pattern=r'\w+')
+_CALLABLE_NAME_PATTERN: Pattern = re.compile(pattern=r'\w+(\.\w+)?')
 
 
 def add_docstring_to_stubfile(
@@ -22,6 +27,10 @@ def add_docstring_to_stubfile(
     Currently only applied top level function or top level class
     methods. Not to be applied to nested function.
 
+    If the stub file declares no function, class or method, or all of
+    them already have docstrings, the original module is not imported
+    and the stub file is left untouched.
+
     Parameters
     ----------
     original_module_path : str
@@ -29,41 +38,822 @@ def add_docstring_to_stubfile(
     stub_file_path : str
         Target stub file path.
     """
-    module = _read_module(module_path=original_module_path)
     stub_str: str = _read_txt(file_path=stub_file_path)
+    if not _needs_docstring_index(stub_str=stub_str):
+        return
+    declared_names: List[str] = _get_declared_names(stub_str=stub_str)
+    docstring_index: Dict[str, str] = _get_docstring_index_from_module_path(
+        module_path=original_module_path, names=declared_names)
+    _add_docstring_index_to_stubfile(
+        docstring_index=docstring_index, stub_file_path=stub_file_path)
+
+
+def _get_docstring_index_from_module_path(
+        *, module_path: str,
+        names: Optional[List[str]] = None) -> Dict[str, str]:
+    """
+    Read a specified path's module and get its docstring index.
+
+    Parameters
+    ----------
+    module_path : str
+        Target module path to read.
+    names : list of str or None, default None
+        Qualified names to look up (e.g., names that a stub declares).
+        If specified, only these names are looked up instead of
+        enumerating all module members. Please see
+        `_get_docstring_index_from_module_by_names` function for the
+        details.
+
+    Returns
+    -------
+    docstring_index : dict of str to str
+        The module's docstring index. Please see
+        `_get_docstring_index_from_module` function for the details.
+    """
+    with tracing.span(name='import'):
+        module: ModuleType = _read_module(module_path=module_path)
+    with tracing.span(name='enumerate'):
+        docstring_index: Dict[str, str]
+        if names is None:
+            docstring_index = _get_docstring_index_from_module(module=module)
+        else:
+            docstring_index = _get_docstring_index_from_module_by_names(
+                module=module, names=names)
+    return docstring_index
+
+
+def _add_docstring_index_to_stubfile(
+        *, docstring_index: Dict[str, str], stub_file_path: str) -> None:
+    """
+    Add docstrings of a docstring index to a specified stub file.
+
+    Parameters
+    ----------
+    docstring_index : dict of str to str
+        A docstring index. Please see `_get_docstring_index_from_module`
+        function for the details.
+    stub_file_path : str
+        Target stub file path.
+    """
+    with tracing.span(name='rewrite'):
+        stub_str: str = _read_txt(file_path=stub_file_path)
+        stub_str = _add_docstrings_to_stub_str(
+            stub_str=stub_str, docstring_index=docstring_index)
+        if not stub_str.endswith('\n'):
+            stub_str += '\n'
+    with tracing.span(name='write'):
+        _write_txt(file_path=stub_file_path, txt=stub_str)
+
+
+def _get_docstring_index_from_module(
+        *, module: ModuleType) -> Dict[str, str]:
+    """
+    Get a docstring index from a specified module.
+
+    Parameters
+    ----------
+    module : ModuleType
+        Stub file's original module.
+
+    Returns
+    -------
+    docstring_index : dict of str to str
+        A dictionary that maps a qualified name to a docstring.
+        Keys are top-level function names, top-level class names and
+        class method names concatenated by comma
+        (e.g., `sample_func`, `SampleClass`, `SampleClass.sample_method`).
+        Callables are stored before classes. Class methods are stored
+        even if docstring does not exist (in that case value will be
+        an empty string).
+    """
+    docstring_index: Dict[str, str] = {}
     callable_names: List[str] = _get_callable_names_from_module(
         module=module)
     callable_names = _remove_doc_not_existing_func_from_callable_names(
         callable_names=callable_names, module=module)
     for callable_name in callable_names:
         if '.' not in callable_name:
-            stub_str = _add_doctring_to_target_function(
+            docstring_index[callable_name] = \
+                _get_docstring_from_top_level_func(
+                    function_name=callable_name, module=module)
+            continue
+        class_name, method_name = callable_name.split('.')
+        docstring_index[callable_name] = \
+            _get_docstring_from_top_level_class_method(
+                class_name=class_name,
+                method_name=method_name,
+                module=module)
+
+    members: List[Tuple[str, Type]] = inspect.getmembers(
+        object=module, predicate=inspect.isclass)
+    for member_name, _ in members:
+        docstring: str = _get_docstring_from_top_level_class(
+            class_name=member_name, module=module)
+        if docstring == '':
+            continue
+        docstring_index[member_name] = docstring
+    return docstring_index
+
+
+def _get_docstring_index_from_module_by_names(
+        *, module: ModuleType, names: List[str]) -> Dict[str, str]:
+    """
+    Get a docstring index of specified names from a specified module.
+    Each name is looked up directly, so members that are not specified
+    (e.g., many methods inherited from a large base class) are not
+    enumerated.
+
+    Parameters
+    ----------
+    module : ModuleType
+        Stub file's original module.
+    names : list of str
+        Qualified names to look up. Please see `_get_declared_names`
+        function for the details.
+
+    Returns
+    -------
+    docstring_index : dict of str to str
+        A docstring index. Entries and their order are the same as
+        `_get_docstring_index_from_module` function's ones, limited to
+        the specified names.
+    """
+    method_names: Dict[str, List[str]] = {}
+    for name in names:
+        if '.' not in name:
+            method_names.setdefault(name, [])
+            continue
+        class_name, method_name = name.split('.', 1)
+        method_names.setdefault(class_name, []).append(method_name)
+
+    docstring_index: Dict[str, str] = {}
+    class_docstrings: Dict[str, str] = {}
+    for name in sorted(method_names):
+        member_val: Any = getattr(module, name, None)
+        if inspect.isclass(member_val):
+            docstring: str = _get_stripped_docstring(val=member_val)
+            if docstring != '':
+                class_docstrings[name] = docstring
+        if getattr(member_val, '__module__', None) != module.__name__:
+            continue
+        if inspect.isroutine(member_val):
+            docstring = _get_stripped_docstring(val=member_val)
+            if docstring != '':
+                docstring_index[name] = docstring
+            continue
+        if not inspect.isclass(member_val):
+            continue
+        for method_name in sorted(set(method_names[name])):
+            if (method_name.startswith('__')
+                    and method_name != '__init__'):
+                continue
+            try:
+                method_val: Any = getattr(member_val, method_name)
+            except AttributeError:
+                continue
+            if (not isinstance(method_val, Callable)
+                    and not isinstance(method_val, property)):
+                continue
+            if inspect.isclass(method_val):
+                continue
+            docstring_index[f'{name}.{method_name}'] = \
+                _get_stripped_docstring(val=method_val)
+    docstring_index.update(class_docstrings)
+    return docstring_index
+
+
+def _get_stripped_docstring(*, val: Any) -> str:
+    """
+    Get a specified object's stripped docstring.
+
+    Parameters
+    ----------
+    val : Any
+        Target object (e.g., a function, a class or a property).
+
+    Returns
+    -------
+    docstring : str
+        Stripped docstring. Empty string if docstring does not exist.
+    """
+    if val.__doc__ is None:
+        return ''
+    docstring: str = val.__doc__.strip()
+    return docstring
+
+
+def _get_declared_names(*, stub_str: str) -> List[str]:
+    """
+    Get qualified names that a specified stub string declares.
+
+    Parameters
+    ----------
+    stub_str : str
+        A target stub string.
+
+    Returns
+    -------
+    names : list of str
+        Top-level function names, top-level class names and class
+        method names concatenated by comma (e.g., `sample_func`,
+        `SampleClass`, `SampleClass.sample_method`), in the stub's
+        order. Method lines are detected in the same class scope as
+        `_ClassScopeLineRange` class's one.
+    """
+    return [
+        name for name, _ in _get_declared_name_indexes(
+            lines=stub_str.splitlines())]
+
+
+def _get_declared_name_indexes(
+        *, lines: List[str]) -> List[Tuple[str, int]]:
+    """
+    Get qualified names that specified stub lines declare and their
+    header line indexes.
+
+    Parameters
+    ----------
+    lines : list of str
+        Target stub lines.
+
+    Returns
+    -------
+    name_indexes : list of tuple of str and int
+        Qualified names (please see `_get_declared_names` function) and
+        the indexes of the lines that declare them, in the stub's order.
+        Lines in docstring blocks (as this module adds) are skipped, so
+        that a docstring's unindented lines do not end a class.
+    """
+    name_indexes: List[Tuple[str, int]] = []
+    class_pattern: Pattern = re.compile(pattern=r'^class (.+?)[\(\:]')
+    function_pattern: Pattern = re.compile(pattern=r'^def (\w+)\(')
+    method_pattern: Pattern = re.compile(pattern=r'    def (\w+)\(')
+    class_name: Optional[str] = None
+    quotes_line: Optional[str] = None
+    for i, line in enumerate(lines):
+        if quotes_line is not None:
+            if line.startswith(quotes_line):
+                quotes_line = None
+            continue
+        if line.startswith(' ') and line.lstrip(' ') == '"""':
+            quotes_line = line
+            continue
+        class_match: Optional[Match] = class_pattern.match(string=line)
+        if class_match is not None:
+            class_name = class_match.group(1).strip()
+            name_indexes.append((class_name, i))
+            continue
+        if line == '' or line == '    ':
+            continue
+        if not line.startswith('    '):
+            class_name = None
+            function_match: Optional[Match] = function_pattern.match(
+                string=line)
+            if function_match is not None:
+                name_indexes.append((function_match.group(1), i))
+            continue
+        if class_name is None:
+            continue
+        for method_match in method_pattern.finditer(line):
+            name_indexes.append((f'{class_name}.{method_match.group(1)}', i))
+    return name_indexes
+
+
+def _get_undocumented_names(*, stub_str: str) -> List[str]:
+    """
+    Get qualified names that a specified stub string declares and that
+    do not have a docstring block yet.
+
+    Parameters
+    ----------
+    stub_str : str
+        A target stub string.
+
+    Returns
+    -------
+    names : list of str
+        Declared names (please see `_get_declared_names` function)
+        whose header line is not followed by a docstring block (a
+        triple quotes line in the body indent, as this module adds).
+    """
+    lines: List[str] = stub_str.splitlines()
+    names: List[str] = []
+    for name, index in _get_declared_name_indexes(lines=lines):
+        indent: str = '        ' if lines[index].startswith(' ') else '    '
+        if lines[index].endswith(':') and index + 1 < len(lines) \
+                and lines[index + 1] == f'{indent}"""':
+            continue
+        names.append(name)
+    return names
+
+
+def _needs_docstring_index(
+        *, stub_str: str, update_mode: bool = False) -> bool:
+    """
+    Get a boolean indicating whether a specified stub string needs its
+    original module's docstring index. This is a cheap pre-scan of the
+    stub lines, so that the original module is not imported (and the
+    stub file is left untouched) if there is nothing to document.
+
+    Parameters
+    ----------
+    stub_str : str
+        A target stub string.
+    update_mode : bool, default False
+        If True, docstrings are going to be updated incrementally, so
+        already documented names also need the index.
+
+    Returns
+    -------
+    result : bool
+        False if the stub declares no function, class or method (e.g.,
+        a re-export only `__init__.pyi` or a constants only module), or
+        (if update_mode is False) all of them already have docstrings.
+    """
+    if update_mode:
+        return bool(_get_declared_name_indexes(lines=stub_str.splitlines()))
+    return bool(_get_undocumented_names(stub_str=stub_str))
+
+
+def _add_docstrings_to_stub_str(
+        *, stub_str: str, docstring_index: Dict[str, str]) -> str:
+    """
+    Add docstrings of a docstring index to a stub string.
+
+    Notes
+    -----
+    Functions and methods are processed in a single pass over the stub
+    lines and class docstrings in another pass, so the processing time
+    is linear in the stub size. The result is the same as
+    `_add_docstrings_to_stub_str_per_name` function's one, which
+    rescans the stub for each name, including its quirks (each quirk
+    is kept in a helper whose summary line describes it). That function
+    is used instead if a name can not be handled by the single pass
+    (see `_needs_per_name_processing` function).
+
+    Parameters
+    ----------
+    stub_str : str
+        A target stub file string.
+    docstring_index : dict of str to str
+        A docstring index. Please see `_get_docstring_index_from_module`
+        function for the details.
+
+    Returns
+    -------
+    result_stub_str : str
+        Stub file string after docstrings added.
+    """
+    class_names: List[str] = _get_top_level_class_names(
+        stub_str=stub_str)
+    class_names_set: Set[str] = set(class_names)
+    callable_docstring_index: Dict[str, str] = {
+        name: docstring for name, docstring in docstring_index.items()
+        if name not in class_names_set}
+    if _needs_per_name_processing(names=callable_docstring_index):
+        return _add_docstrings_to_stub_str_per_name(
+            stub_str=stub_str, docstring_index=docstring_index)
+    if callable_docstring_index:
+        stub_str = _add_docstrings_to_callables_in_stub_str(
+            stub_str=stub_str, docstring_index=callable_docstring_index)
+    result_stub_str: Optional[str] = _add_docstrings_to_classes_in_stub_str(
+        stub_str=stub_str, class_names=class_names,
+        docstring_index=docstring_index)
+    if result_stub_str is None:
+        result_stub_str = _add_docstrings_to_classes_per_name(
+            stub_str=stub_str, class_names=class_names,
+            docstring_index=docstring_index)
+    return result_stub_str
+
+
+def _needs_per_name_processing(*, names: Iterable[str]) -> bool:
+    """
+    Legacy: a name that has other than word characters (e.g., a module
+    member set by `setattr`) is used as a regular expression as is.
+
+    Parameters
+    ----------
+    names : iterable of str
+        Function and method names of a docstring index.
+
+    Returns
+    -------
+    result : bool
+        True if a name needs `_add_docstrings_to_stub_str_per_name`
+        function's processing.
+    """
+    for name in names:
+        if _CALLABLE_NAME_PATTERN.fullmatch(name) is None:
+            return True
+    return False
+
+
+def _add_docstrings_to_stub_str_per_name(
+        *, stub_str: str, docstring_index: Dict[str, str]) -> str:
+    """
+    Add docstrings of a docstring index to a stub string by rescanning
+    the stub for each name. This is quadratic in the stub size, so it
+    is used only if `_add_docstrings_to_stub_str` function's single
+    pass can not handle the names.
+
+    Parameters
+    ----------
+    stub_str : str
+        A target stub file string.
+    docstring_index : dict of str to str
+        A docstring index. Please see `_get_docstring_index_from_module`
+        function for the details.
+
+    Returns
+    -------
+    result_stub_str : str
+        Stub file string after docstrings added.
+    """
+    class_names: List[str] = _get_top_level_class_names(
+        stub_str=stub_str)
+    for name, docstring in docstring_index.items():
+        if name in class_names:
+            continue
+        if '.' not in name:
+            stub_str = _add_docstring_to_target_function_by_docstring(
                 stub_str=stub_str,
-                function_name=callable_name,
-                module=module,
+                function_name=name,
+                docstring=docstring,
             )
             continue
-        stub_str = _add_docstring_to_class_method(
+        stub_str = _add_docstring_to_class_method_by_docstring(
             stub_str=stub_str,
-            method_name=callable_name,
-            module=module,
+            method_name=name,
+            docstring=docstring,
         )
+    return _add_docstrings_to_classes_per_name(
+        stub_str=stub_str, class_names=class_names,
+        docstring_index=docstring_index)
 
-    class_names: List[str] = _get_top_level_class_names(
-        stub_str=stub_str)
-    class_names = _remove_doc_not_existing_class_from_class_names(
-        class_names=class_names, module=module)
+
+def _add_docstrings_to_classes_per_name(
+        *, stub_str: str, class_names: List[str],
+        docstring_index: Dict[str, str]) -> str:
+    """
+    Add class docstrings of a docstring index to a stub string by
+    rescanning the stub for each class.
+
+    Parameters
+    ----------
+    stub_str : str
+        A target stub file string.
+    class_names : list of str
+        Top-level class names of the original stub string.
+    docstring_index : dict of str to str
+        A docstring index. Please see `_get_docstring_index_from_module`
+        function for the details.
+
+    Returns
+    -------
+    result_stub_str : str
+        Stub file string after docstrings added.
+    """
     for class_name in class_names:
-        stub_str = _add_doctring_to_target_class(
+        docstring = docstring_index.get(class_name, '')
+        if docstring == '':
+            continue
+        stub_str = _add_docstring_to_target_class_by_docstring(
             stub_str=stub_str,
             class_name=class_name,
-            module=module,
+            docstring=docstring,
         )
+    return stub_str
+
+
+def _add_docstrings_to_callables_in_stub_str(
+        *, stub_str: str, docstring_index: Dict[str, str]) -> str:
+    """
+    Add function and method docstrings to a stub string in a single
+    pass over the stub lines.
+
+    Parameters
+    ----------
+    stub_str : str
+        A target stub file string.
+    docstring_index : dict of str to str
+        A docstring index that has only function and method names.
+        Each name needs to match `_CALLABLE_NAME_PATTERN`.
+
+    Returns
+    -------
+    result_stub_str : str
+        Stub file string after docstrings added. Stub lines are joined
+        by newlines, and leading empty lines and trailing newlines are
+        removed (same as the per-name processing).
+
+    Raises
+    ------
+    Exception
+        If a method's class name not found in the stub string.
+    """
+    function_docstrings: Dict[str, str] = {}
+    method_docstrings: Dict[str, Dict[str, Tuple[int, str]]] = {}
+    for order, (name, docstring) in enumerate(docstring_index.items()):
+        if '.' not in name:
+            function_docstrings[name] = docstring
+            continue
+        class_name, method_name = name.split('.')
+        method_docstrings.setdefault(class_name, {})[method_name] = (
+            order, docstring)
+
+    lines: List[str] = stub_str.splitlines()
+    scope_class_names: List[Optional[str]] = _get_scope_class_names(
+        lines=lines)
+    existing_class_names: Set[str] = set(
+        name for name in scope_class_names if name is not None)
+    for name in docstring_index:
+        if '.' not in name:
+            continue
+        class_name = name.split('.')[0]
+        if class_name not in existing_class_names:
+            raise Exception(f'Target class name not found: {class_name}')
+
+    pattern: Pattern = re.compile(pattern=r'def (\w+)\(.')
+    result_lines: List[str] = []
+    start_index: int = _get_first_non_empty_line_index(lines=lines)
+    for line, scope_class_name in zip(
+            lines[start_index:], scope_class_names[start_index:]):
+        if scope_class_name is not None:
+            line = _add_docstrings_to_method_line(
+                line=line,
+                method_docstrings=method_docstrings.get(
+                    scope_class_name, {}),
+                min_order=-1)
+            result_lines.append(line)
+            continue
+        match: Optional[Match] = pattern.match(string=line)
+        if match is not None and match.group(1) in function_docstrings:
+            line = _remove_line_end_ellipsis_or_pass_keyword(line=line)
+            line = _add_docstring_to_top_level_func(
+                line=line, docstring=function_docstrings[match.group(1)])
+        result_lines.append(line)
+    return _remove_per_name_trailing_newlines(
+        stub_str='\n'.join(result_lines), names_num=len(docstring_index))
+
+
+def _get_first_non_empty_line_index(*, lines: List[str]) -> int:
+    """
+    Legacy: the per-name processing drops the stub's leading empty lines.
+
+    Parameters
+    ----------
+    lines : list of str
+        Stub lines.
+
+    Returns
+    -------
+    index : int
+        The first line's index that is not empty (the lines' length if
+        all lines are empty).
+    """
+    for index, line in enumerate(lines):
+        if line != '':
+            return index
+    return len(lines)
+
+
+def _remove_per_name_trailing_newlines(
+        *, stub_str: str, names_num: int) -> str:
+    """
+    Legacy: each name after the first one removes a trailing newline.
+
+    Notes
+    -----
+    The per-name processing splits and joins the stub lines again for
+    each name, and each join loses a trailing newline.
+
+    Parameters
+    ----------
+    stub_str : str
+        Stub string after docstrings added.
+    names_num : int
+        The number of function and method names that were processed.
+
+    Returns
+    -------
+    result_stub_str : str
+        Stub string after trailing newlines removed.
+    """
+    newlines_num: int = len(stub_str) - len(stub_str.rstrip('\n'))
+    removing_num: int = min(newlines_num, names_num - 1)
+    return stub_str[:len(stub_str) - removing_num]
+
+
+def _get_scope_class_names(*, lines: List[str]) -> List[Optional[str]]:
+    """
+    Get the top-level class name of each stub line's class scope.
+    The scope is same as `_ClassScopeLineRange` class's one (only the
+    first definition of each class name has a scope).
+
+    Parameters
+    ----------
+    lines : list of str
+        Stub lines.
+
+    Returns
+    -------
+    scope_class_names : list of str or None
+        Class names of the lines. None for lines outside class scopes.
+    """
+    pattern: Pattern = re.compile(pattern=r'class (\w+)[\(:]')
+    scope_class_names: List[Optional[str]] = []
+    defined_class_names: Set[str] = set()
+    scope_class_name: Optional[str] = None
+    for line in lines:
+        if (scope_class_name is not None and line != '' and line != '    '
+                and not line.startswith('    ')):
+            scope_class_name = None
+        match: Optional[Match] = pattern.match(string=line)
+        if match is not None and match.group(1) not in defined_class_names:
+            scope_class_name = match.group(1)
+            defined_class_names.add(scope_class_name)
+        scope_class_names.append(scope_class_name)
+    return scope_class_names
 
-    if not stub_str.endswith('\n'):
-        stub_str += '\n'
-    with open(stub_file_path, 'w') as f:
-        f.write(stub_str)
+
+def _add_docstrings_to_method_line(
+        *, line: str, method_docstrings: Dict[str, Tuple[int, str]],
+        min_order: int) -> str:
+    """
+    Add method docstrings to a line in a class scope.
+
+    Notes
+    -----
+    The per-name processing adds docstrings in the docstring index's
+    order, and each name's processing also matches the lines of
+    docstrings added before it. The same lines are matched here by
+    processing the added docstring lines recursively with the names
+    after the added one.
+
+    Parameters
+    ----------
+    line : str
+        Target line string.
+    method_docstrings : dict of str to tuple of int and str
+        Method names of the class to the docstring index's order and
+        docstring.
+    min_order : int
+        Only the names after this order are processed.
+
+    Returns
+    -------
+    line : str
+        Docstring added line string (can have multiple lines).
+    """
+    if '    def ' not in line:
+        return line
+    pattern: Pattern = re.compile(pattern=r'    def (\w+)\(.')
+    match_ends: Dict[str, int] = {}
+    position: int = line.find('    def ')
+    while position != -1:
+        match: Optional[Match] = pattern.match(line, position)
+        position = line.find('    def ', position + 1)
+        if match is None or match.group(1) not in method_docstrings:
+            continue
+        if method_docstrings[match.group(1)][0] <= min_order:
+            continue
+        match_ends.setdefault(match.group(1), match.end())
+    if not match_ends:
+        return line
+
+    header: str = line
+    blocks: List[str] = []
+    for order, method_name in sorted(
+            (method_docstrings[name][0], name) for name in match_ends):
+        # Removing the ellipsis or pass keyword can cut the match.
+        if match_ends[method_name] > len(header):
+            continue
+        header = _remove_line_end_ellipsis_or_pass_keyword(line=header)
+        block_lines: List[str] = _add_docstring_to_top_level_class_method(
+            line=header, docstring=method_docstrings[method_name][1],
+        )[len(header) + 1:].split('\n')
+        blocks.insert(0, '\n'.join(
+            _add_docstrings_to_method_line(
+                line=block_line, method_docstrings=method_docstrings,
+                min_order=order)
+            for block_line in block_lines))
+    return '\n'.join([header, *blocks])
+
+
+def _add_docstrings_to_classes_in_stub_str(
+        *, stub_str: str, class_names: List[str],
+        docstring_index: Dict[str, str]) -> Optional[str]:
+    """
+    Add class docstrings to a stub string in a single pass over the
+    stub lines.
+
+    Parameters
+    ----------
+    stub_str : str
+        A target stub file string.
+    class_names : list of str
+        Top-level class names of the original stub string.
+    docstring_index : dict of str to str
+        A docstring index. Please see `_get_docstring_index_from_module`
+        function for the details.
+
+    Returns
+    -------
+    result_stub_str : str or None
+        Stub file string after docstrings added. None will be returned
+        if the result can not be made in a single pass (e.g., a class
+        name has other than word characters, or a class definition's
+        colon is not at the first line), and the per-name processing is
+        needed instead.
+    """
+    line_offsets: Dict[str, Tuple[int, str]] = \
+        _get_class_line_offsets_by_prefix(stub_str=stub_str)
+    insertions: List[Tuple[int, int, str]] = []
+    for order, class_name in enumerate(class_names):
+        docstring: str = docstring_index.get(class_name, '')
+        if docstring == '':
+            continue
+        if (_WORD_PATTERN.fullmatch(class_name) is None
+                or class_name not in line_offsets):
+            return None
+        line_offset, line = line_offsets[class_name]
+        match: Optional[Match] = re.match(
+            pattern=rf'class {class_name}(.*?)\:', string=line,
+            flags=re.DOTALL)
+        if match is None:
+            return None
+        insertion_str: str = _get_class_docstring_insertion_str(
+            match=match, class_name=class_name,
+            result_docstring=_get_class_docstring_str(docstring=docstring))
+        if '\nclass ' in insertion_str:
+            return None
+        insertions.append((line_offset + match.end(), -order, insertion_str))
+
+    result_strs: List[str] = []
+    offset = 0
+    for insertion_offset, _, insertion_str in sorted(insertions):
+        result_strs.append(stub_str[offset:insertion_offset])
+        result_strs.append(insertion_str)
+        offset = insertion_offset
+    result_strs.append(stub_str[offset:])
+    return ''.join(result_strs)
+
+
+def _get_class_line_offsets_by_prefix(
+        *, stub_str: str) -> Dict[str, Tuple[int, str]]:
+    """
+    Legacy: a class name also matches a longer class name's line that
+    starts with it (the first class line wins).
+
+    Parameters
+    ----------
+    stub_str : str
+        A target stub file string.
+
+    Returns
+    -------
+    line_offsets : dict of str to tuple of int and str
+        Each prefix of the class lines' names to the first matching
+        class line's offset and the line.
+    """
+    line_offsets: Dict[str, Tuple[int, str]] = {}
+    offset: int = 0
+    for line in stub_str.split('\n'):
+        if line.startswith('class '):
+            word_match: Optional[Match] = _WORD_PATTERN.match(line, 6)
+            word: str = '' if word_match is None else word_match.group(0)
+            for i in range(1, len(word) + 1):
+                line_offsets.setdefault(word[:i], (offset, line))
+        offset += len(line) + 1
+    return line_offsets
+
+
+def _get_class_docstring_insertion_str(
+        *, match: Match, class_name: str, result_docstring: str) -> str:
+    """
+    Legacy: backslash escapes in a class docstring are processed (the
+    docstring is used as a replacement template).
+
+    Parameters
+    ----------
+    match : Match
+        The class line's match of `class <class_name>(.*?):` pattern.
+    class_name : str
+        Target class name.
+    result_docstring : str
+        Indented class docstring (`_get_class_docstring_str` function's
+        result).
+
+    Returns
+    -------
+    insertion_str : str
+        The string to insert after the class line's colon.
+    """
+    if '\\' not in result_docstring:
+        return f'\n{result_docstring}'
+    return match.expand(
+        rf'class {class_name}\1:\n{result_docstring}')[match.end():]
 
 
 def _add_doctring_to_target_class(
@@ -89,15 +879,33 @@ def _add_doctring_to_target_class(
     """
     docstring: str = _get_docstring_from_top_level_class(
         class_name=class_name, module=module)
-    result_docstring: str = '    """'
-    docstring_lines: List[str] = docstring.splitlines()
-    for i, docstring_line in enumerate(docstring_lines):
-        result_docstring += '\n'
-        if i == 0:
-            result_docstring += '    '
-        result_docstring += f'{docstring_line}'
-    result_docstring += '\n    """'
+    result_stub_str: str = _add_docstring_to_target_class_by_docstring(
+        stub_str=stub_str, class_name=class_name, docstring=docstring)
+    return result_stub_str
+
+
+def _add_docstring_to_target_class_by_docstring(
+        *, stub_str: str,
+        class_name: str,
+        docstring: str) -> str:
+    """
+    Add a specified docstring to a specified class.
+
+    Parameters
+    ----------
+    stub_str : str
+        A Target stub file string.
+    class_name : str
+        A target class name.
+    docstring : str
+        A docstring to add.
 
+    Returns
+    -------
+    result_stub_str : str
+        Stub file string after docstring added.
+    """
+    result_docstring: str = _get_class_docstring_str(docstring=docstring)
     result_stub_str = re.sub(
         pattern=rf'^class {class_name}(.*?)\:',
         repl=rf'class {class_name}\1:\n{result_docstring}',
@@ -107,6 +915,31 @@ def _add_doctring_to_target_class(
     return result_stub_str
 
 
+def _get_class_docstring_str(*, docstring: str) -> str:
+    """
+    Get a top-level class's docstring string to add to a stub.
+
+    Parameters
+    ----------
+    docstring : str
+        A docstring to add.
+
+    Returns
+    -------
+    result_docstring : str
+        Indented docstring string that includes triple quotes.
+    """
+    result_lines: List[str] = ['    """']
+    docstring_lines: List[str] = docstring.splitlines()
+    for i, docstring_line in enumerate(docstring_lines):
+        if i == 0:
+            docstring_line = f'    {docstring_line}'
+        result_lines.append(docstring_line)
+    result_lines.append('    """')
+    result_docstring: str = '\n'.join(result_lines)
+    return result_docstring
+
+
 def _remove_doc_not_existing_class_from_class_names(
         *, class_names: List[str], module: ModuleType) -> List[str]:
     """
@@ -267,6 +1100,38 @@ def _add_docstring_to_class_method(
     module: ModuleType
         Stub file's original module.
 
+    Returns
+    -------
+    result_stub_str : str
+        Stub file string after docstring added.
+    """
+    class_name: str = method_name.split('.')[0]
+    docstring: str = _get_docstring_from_top_level_class_method(
+        class_name=class_name,
+        method_name=method_name.split('.')[1],
+        module=module,
+    )
+    result_stub_str: str = _add_docstring_to_class_method_by_docstring(
+        stub_str=stub_str, method_name=method_name, docstring=docstring)
+    return result_stub_str
+
+
+def _add_docstring_to_class_method_by_docstring(
+        *, stub_str: str, method_name: str, docstring: str) -> str:
+    """
+    Add a specified docstring to a specified class method.
+
+    Parameters
+    ----------
+    stub_str : str
+        Target stub file string.
+    method_name : str
+        Target method name (top-level class method only).
+        Class name and method name need to be concatenated by comma.
+        e.g. `ClassName.method_name`
+    docstring : str
+        A docstring to add.
+
     Returns
     -------
     result_stub_str : str
@@ -290,11 +1155,6 @@ def _add_docstring_to_class_method(
         if match is None:
             result_stub_str += stub_line
             continue
-        docstring: str = _get_docstring_from_top_level_class_method(
-            class_name=class_name,
-            method_name=method_name,
-            module=module,
-        )
         stub_line = _remove_line_end_ellipsis_or_pass_keyword(line=stub_line)
         stub_line = _add_docstring_to_top_level_class_method(
             line=stub_line, docstring=docstring)
@@ -321,16 +1181,14 @@ def _add_docstring_to_top_level_class_method(
         Docstring added line str.
     """
     eight_tabs: str = '        '
-    line += f'\n{eight_tabs}"""'
+    result_lines: List[str] = [line, f'{eight_tabs}"""']
     docstring_lines: List[str] = docstring.splitlines()
     for docstring_line in docstring_lines:
-        if docstring_line == '':
-            line += '\n'
-            continue
-        if not docstring_line.startswith(eight_tabs):
+        if docstring_line != '' and not docstring_line.startswith(
+                eight_tabs):
             docstring_line = f'{eight_tabs}{docstring_line}'
-        line += f'\n{docstring_line}'
-    line = line.rstrip()
+        result_lines.append(docstring_line)
+    line = '\n'.join(result_lines).rstrip()
     line += f'\n{eight_tabs}"""'
     return line
 
@@ -421,6 +1279,34 @@ def _add_doctring_to_target_function(
     module: ModuleType
         Stub file's original module.
 
+    Returns
+    -------
+    result_stub_str : str
+        Stub file's string after docstring added.
+    """
+    docstring: str = _get_docstring_from_top_level_func(
+        function_name=function_name,
+        module=module,
+    )
+    result_stub_str: str = _add_docstring_to_target_function_by_docstring(
+        stub_str=stub_str, function_name=function_name, docstring=docstring)
+    return result_stub_str
+
+
+def _add_docstring_to_target_function_by_docstring(
+        *, stub_str: str, function_name: str, docstring: str) -> str:
+    """
+    Add a specified doctring to a specified function.
+
+    Parameters
+    ----------
+    stub_str : str
+        Target stub file's string.
+    function_name : str
+        Target function name (top-level function only).
+    docstring : str
+        A docstring to add.
+
     Returns
     -------
     result_stub_str : str
@@ -436,10 +1322,6 @@ def _add_doctring_to_target_function(
         if match is None:
             result_stub_str += line
             continue
-        docstring: str = _get_docstring_from_top_level_func(
-            function_name=function_name,
-            module=module,
-        )
         line = _remove_line_end_ellipsis_or_pass_keyword(line=line)
         line = _add_docstring_to_top_level_func(
             line=line, docstring=docstring)
@@ -465,16 +1347,14 @@ def _add_docstring_to_top_level_func(line: str, docstring: str) -> str:
     line : str
         Docstring added line str.
     """
-    line += '\n    """'
+    result_lines: List[str] = [line, '    """']
     docstring_lines: List[str] = docstring.splitlines()
     for docstring_line in docstring_lines:
-        if docstring_line == '':
-            line += '\n'
-            continue
-        if not docstring_line.startswith('    '):
+        if docstring_line != '' and not docstring_line.startswith('    '):
             docstring_line = f'    {docstring_line}'
-        line += f'\n{docstring_line}'
-    line += '\n    """'
+        result_lines.append(docstring_line)
+    result_lines.append('    """')
+    line = '\n'.join(result_lines)
     return line
 
 
@@ -548,8 +1428,49 @@ def _read_module(module_path: str) -> ModuleType:
     """
     file_name: str = os.path.basename(module_path)
     dir_path: str = module_path.replace(file_name, '', 1)
-    sys.path.append(dir_path)
-    sys.path.append('./')
+    if _get_sys_path_entry(module_path=module_path) is None:
+        for path in (dir_path, './'):
+            if path in sys.path:
+                continue
+            sys.path.append(path)
+    package_name: str = _get_package_name(module_path=module_path)
+    try:
+        module: ModuleType = importlib.import_module(package_name)
+    except Exception:
+        raise Exception(
+            f'{traceback.format_exc()}\n\n'
+            'Specified module import failed. Please check specified path'
+            ' is not a upper level directory or root directory (need to be'
+            f' able to import by package path style): {package_name}')
+    return module
+
+
+def _get_package_name(*, module_path: str) -> str:
+    """
+    Get a package path style module name from a specified module path
+    (e.g., 'sample/path.py' to 'sample.path').
+
+    Notes
+    -----
+    An absolute module path under a `sys.path` entry (e.g., an
+    installed package's module in site-packages) is converted from the
+    path relative to the entry. Please see `_get_sys_path_entry`
+    function.
+
+    Parameters
+    ----------
+    module_path : str
+        Target module path.
+
+    Returns
+    -------
+    package_name : str
+        Converted module name.
+    """
+    sys_path_entry: Optional[str] = _get_sys_path_entry(
+        module_path=module_path)
+    if sys_path_entry is not None:
+        module_path = os.path.relpath(module_path, sys_path_entry)
     package_name: str = ''
     all_suffixes: List[str] = importlib.machinery.all_suffixes()  # type: ignore
     for ending in all_suffixes:
@@ -560,15 +1481,49 @@ def _read_module(module_path: str) -> ModuleType:
     package_name = package_name.replace('\\', '.')
     while package_name.startswith('.'):
         package_name = package_name.replace('.', '', 1)
-    try:
-        module: ModuleType = importlib.import_module(package_name)
-    except Exception:
-        raise Exception(
-            f'{traceback.format_exc()}\n\n'
-            'Specified module import failed. Please check specified path'
-            ' is not a upper level directory or root directory (need to be'
-            f' able to import by package path style): {package_name}')
-    return module
+    return package_name
+
+
+def _get_sys_path_entry(*, module_path: str) -> Optional[str]:
+    """
+    Get the `sys.path` entry that a specified absolute module path can
+    be imported from.
+
+    Parameters
+    ----------
+    module_path : str
+        Target module path.
+
+    Returns
+    -------
+    sys_path_entry : str or None
+        The deepest absolute `sys.path` entry that has the module path
+        under it, and that the module path's directories under it are
+        valid package names of (e.g., site-packages rather than the
+        standard library directory that has it). None will be returned
+        if the module path is not absolute or there is no such entry.
+    """
+    if not os.path.isabs(module_path):
+        return None
+    module_path = os.path.normpath(module_path)
+    sys_path_entry: Optional[str] = None
+    for path in sys.path:
+        if not isinstance(path, str) or not os.path.isabs(path):
+            continue
+        path = os.path.normpath(path)
+        if os.path.dirname(module_path) != path and not os.path.dirname(
+                module_path).startswith(path.rstrip(os.sep) + os.sep):
+            continue
+        if sys_path_entry is not None \
+                and len(path) <= len(sys_path_entry):
+            continue
+        dir_names: List[str] = os.path.relpath(
+            os.path.dirname(module_path), path).split(os.sep)
+        if dir_names != ['.'] and not all(
+                dir_name.isidentifier() for dir_name in dir_names):
+            continue
+        sys_path_entry = path
+    return sys_path_entry
 
 
 def _get_callable_names_from_module(module: ModuleType) -> List[str]:
@@ -656,3 +1611,18 @@ def _read_txt(file_path: str) -> str:
     with open(file_path) as f:
         txt: str = f.read()
     return txt
+
+
+def _write_txt(*, file_path: str, txt: str) -> None:
+    """
+    Write a text to a specified file path.
+
+    Parameters
+    ----------
+    file_path : str
+        Target file path to write.
+    txt : str
+        A text to write.
+    """
+    with open(file_path, 'w') as f:
+        f.write(txt)
@@ -0,0 +1,305 @@
+"""The module that implements the package-level symbol table, which
+resolves names that a stub re-exports (e.g., functions and classes
+imported into a package's `__init__.py` from its submodules) to the
+docstrings of their defining modules.
+"""
+
+import inspect
+import sys
+import uuid
+from types import ModuleType
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from stubdoc import stubdoc
+from stubdoc import tracing
+
+
+class SymbolTable:
+
+    table_id: str
+    _docstrings: Dict[str, Dict[str, str]]
+    _looked_up_names: Dict[str, Set[str]]
+
+    def __init__(self, table_id: Optional[str] = None) -> None:
+        """
+        The class that maps defining modules' qualified names to their
+        docstrings, shared by all stub files of a batch run.
+
+        Notes
+        -----
+        Each defining module's names are looked up only once per run
+        (e.g., a class that is re-exported by multiple packages' stubs
+        is not looked up again). Names are looked up on demand and
+        only defining modules in the same top-level package as the
+        re-exporting module are used, so docstrings of third-party
+        libraries' names (e.g., `from collections import OrderedDict`)
+        are not added.
+
+        A table sent to worker processes (e.g., in `functools.partial`)
+        is restored as the worker's own table of the same id, so each
+        worker shares its table over all of its pairs.
+
+        Parameters
+        ----------
+        table_id : str or None, default None
+            The table's id to restore it in worker processes. A unique
+            id is set if None.
+        """
+        if table_id is None:
+            table_id = uuid.uuid4().hex
+        self.table_id = table_id
+        self._docstrings = {}
+        self._looked_up_names = {}
+
+    def __reduce__(
+            self) -> Tuple[Callable[[str], 'SymbolTable'], Tuple[str]]:
+        return _get_process_table, (self.table_id,)
+
+    def get_docstring_index(
+            self, module_path: str, names: List[str]) -> Dict[str, str]:
+        """
+        Read a specified path's module and get its docstring index,
+        including docstrings of the names that the module re-exports.
+
+        Parameters
+        ----------
+        module_path : str
+            Target module path to read.
+        names : list of str
+            Qualified names to look up (e.g., names that a stub
+            declares). Please see `stubdoc._get_declared_names` function
+            for the details.
+
+        Returns
+        -------
+        docstring_index : dict of str to str
+            The module's docstring index. Please see
+            `stubdoc._get_docstring_index_from_module` function for the
+            details.
+        """
+        with tracing.span(name='import'):
+            module: ModuleType = stubdoc._read_module(module_path=module_path)
+        with tracing.span(name='enumerate'):
+            docstring_index: Dict[str, str] = \
+                self._get_docstring_index_from_module(
+                    module=module, names=names)
+        return docstring_index
+
+    def _get_docstring_index_from_module(
+            self, *, module: ModuleType, names: List[str]) -> Dict[str, str]:
+        """
+        Get a docstring index of specified names from a specified
+        module, including docstrings of the names that the module
+        re-exports.
+
+        Parameters
+        ----------
+        module : ModuleType
+            Stub file's original module.
+        names : list of str
+            Qualified names to look up.
+
+        Returns
+        -------
+        docstring_index : dict of str to str
+            A docstring index. Entries of re-exported names are the
+            same as the defining module's ones, and the entries' order
+            is the same as the module's own names' one.
+        """
+        docstring_index: Dict[str, str] = \
+            stubdoc._get_docstring_index_from_module_by_names(
+                module=module, names=names)
+        reexported_docstring_index: Dict[str, str] = \
+            self._get_reexported_docstring_index(module=module, names=names)
+        if not reexported_docstring_index:
+            return docstring_index
+        return _merge_docstring_indexes(
+            module=module, docstring_index=docstring_index,
+            reexported_docstring_index=reexported_docstring_index)
+
+    def _get_reexported_docstring_index(
+            self, *, module: ModuleType, names: List[str]) -> Dict[str, str]:
+        """
+        Get a docstring index of the functions and class methods that
+        a specified module re-exports from the other modules of the
+        same top-level package.
+
+        Parameters
+        ----------
+        module : ModuleType
+            Stub file's original module.
+        names : list of str
+            Qualified names to look up.
+
+        Returns
+        -------
+        docstring_index : dict of str to str
+            A docstring index of the re-exported functions and class
+            methods (by the names in the module).
+        """
+        method_names: Dict[str, List[str]] = {}
+        for name in names:
+            if '.' not in name:
+                method_names.setdefault(name, [])
+                continue
+            class_name, method_name = name.split('.', 1)
+            method_names.setdefault(class_name, []).append(method_name)
+
+        docstring_index: Dict[str, str] = {}
+        for name in sorted(method_names):
+            member_val: Any = getattr(module, name, None)
+            defining_module: Optional[ModuleType] = _get_defining_module(
+                module=module, member_val=member_val)
+            if defining_module is None:
+                continue
+            qualname: str = member_val.__qualname__
+            if inspect.isroutine(member_val):
+                defining_docstring_index: Dict[str, str] = \
+                    self._get_docstrings(
+                        module=defining_module, names=[qualname])
+                if qualname in defining_docstring_index:
+                    docstring_index[name] = \
+                        defining_docstring_index[qualname]
+                continue
+            method_names_set: Set[str] = set(method_names[name])
+            defining_docstring_index = self._get_docstrings(
+                module=defining_module,
+                names=[f'{qualname}.{method_name}'
+                       for method_name in method_names_set])
+            for method_name in sorted(method_names_set):
+                defining_name: str = f'{qualname}.{method_name}'
+                if defining_name not in defining_docstring_index:
+                    continue
+                docstring_index[f'{name}.{method_name}'] = \
+                    defining_docstring_index[defining_name]
+        return docstring_index
+
+    def _get_docstrings(
+            self, *, module: ModuleType, names: List[str]) -> Dict[str, str]:
+        """
+        Get docstrings of specified names in a defining module. Names
+        that are not looked up yet are looked up and stored to the
+        table.
+
+        Parameters
+        ----------
+        module : ModuleType
+            The defining module.
+        names : list of str
+            Qualified names in the defining module.
+
+        Returns
+        -------
+        docstring_index : dict of str to str
+            A docstring index of the names. Names that have no entry
+            in the defining module's docstring index are not included.
+        """
+        looked_up_names: Set[str] = self._looked_up_names.setdefault(
+            module.__name__, set())
+        docstrings: Dict[str, str] = self._docstrings.setdefault(
+            module.__name__, {})
+        new_names: List[str] = [
+            name for name in names if name not in looked_up_names]
+        if new_names:
+            docstrings.update(
+                stubdoc._get_docstring_index_from_module_by_names(
+                    module=module, names=new_names))
+            looked_up_names.update(new_names)
+        return {name: docstrings[name] for name in names if name in docstrings}
+
+
+_PROCESS_TABLES: Dict[str, SymbolTable] = {}
+
+
+def _get_process_table(table_id: str) -> SymbolTable:
+    """
+    Get this process's symbol table of a specified id (a new table is
+    created if not exists). Used to restore pickled tables.
+
+    Parameters
+    ----------
+    table_id : str
+        Target table's id.
+
+    Returns
+    -------
+    table : SymbolTable
+        This process's table of the id.
+    """
+    if table_id not in _PROCESS_TABLES:
+        _PROCESS_TABLES[table_id] = SymbolTable(table_id=table_id)
+    return _PROCESS_TABLES[table_id]
+
+
+def _get_defining_module(
+        *, module: ModuleType, member_val: Any) -> Optional[ModuleType]:
+    """
+    Get the defining module of a specified module's re-exported
+    function or class.
+
+    Parameters
+    ----------
+    module : ModuleType
+        The re-exporting module.
+    member_val : Any
+        Target member of the module.
+
+    Returns
+    -------
+    defining_module : ModuleType or None
+        The defining module. None will be returned if the member is not
+        a function or class that is defined at the top level of the
+        other module in the same top-level package.
+    """
+    if not inspect.isroutine(member_val) and not inspect.isclass(member_val):
+        return None
+    module_name: Any = getattr(member_val, '__module__', None)
+    if not isinstance(module_name, str) or module_name == module.__name__:
+        return None
+    if module_name.split('.')[0] != module.__name__.split('.')[0]:
+        return None
+    qualname: Any = getattr(member_val, '__qualname__', None)
+    if not isinstance(qualname, str) or not qualname.isidentifier():
+        return None
+    defining_module: Optional[ModuleType] = sys.modules.get(module_name)
+    if getattr(defining_module, qualname, None) is not member_val:
+        return None
+    return defining_module
+
+
+def _merge_docstring_indexes(
+        *, module: ModuleType, docstring_index: Dict[str, str],
+        reexported_docstring_index: Dict[str, str]) -> Dict[str, str]:
+    """
+    Merge a module's docstring index and its re-exported names'
+    docstring index, in the order of
+    `stubdoc._get_docstring_index_from_module_by_names` function's
+    index (callables sorted by name and then classes).
+
+    Parameters
+    ----------
+    module : ModuleType
+        Stub file's original module.
+    docstring_index : dict of str to str
+        The module's own docstring index.
+    reexported_docstring_index : dict of str to str
+        The re-exported names' docstring index.
+
+    Returns
+    -------
+    docstring_index : dict of str to str
+        Merged docstring index.
+    """
+    class_docstring_index: Dict[str, str] = {
+        name: docstring for name, docstring in docstring_index.items()
+        if '.' not in name and inspect.isclass(getattr(module, name, None))}
+    callable_docstring_index: Dict[str, str] = {
+        name: docstring for name, docstring in docstring_index.items()
+        if name not in class_docstring_index}
+    callable_docstring_index.update(reexported_docstring_index)
+    merged_docstring_index: Dict[str, str] = {
+        name: callable_docstring_index[name]
+        for name in sorted(
+            callable_docstring_index, key=lambda name: name.split('.'))}
+    merged_docstring_index.update(class_docstring_index)
+    return merged_docstring_index
@@ -0,0 +1,156 @@
+"""The module that implements trace event recording of batch runs.
+
+Recorded events are written in the Chrome trace event format, which can
+be opened by about://tracing or Perfetto (https://ui.perfetto.dev).
+Recording is disabled by default, and disabled spans cost almost
+nothing. Events are recorded per process, so events recorded in worker
+processes need to be sent to the parent process (see `pop_events` and
+`add_events` functions).
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+_events: Optional[List[Dict[str, Any]]] = None
+
+
+def enable(process_name: str = 'stubdoc') -> None:
+    """
+    Enable trace event recording in the current process.
+
+    Parameters
+    ----------
+    process_name : str, default 'stubdoc'
+        The process name to show in trace viewers.
+    """
+    global _events
+    _events = [{
+        'name': 'process_name',
+        'ph': 'M',
+        'pid': os.getpid(),
+        'tid': threading.get_native_id(),
+        'args': {'name': process_name},
+    }]
+
+
+def disable() -> None:
+    """
+    Disable trace event recording and discard recorded events.
+    """
+    global _events
+    _events = None
+
+
+def is_enabled() -> bool:
+    """
+    Get a boolean indicating whether trace event recording is enabled.
+
+    Returns
+    -------
+    result : bool
+        True if enabled.
+    """
+    return _events is not None
+
+
+@contextmanager
+def span(
+        name: str, category: str = 'phase',
+        args: Optional[Dict[str, Any]] = None) -> Iterator[None]:
+    """
+    Record begin and end events around the context. Nothing is
+    recorded if recording is disabled.
+
+    Parameters
+    ----------
+    name : str
+        Event name. e.g., 'import'
+    category : str, default 'phase'
+        Event category. e.g., 'module', 'phase'
+    args : dict or None, default None
+        Additional event arguments to show in trace viewers.
+    """
+    events: Optional[List[Dict[str, Any]]] = _events
+    if events is None:
+        yield
+        return
+    event: Dict[str, Any] = {
+        'name': name,
+        'cat': category,
+        'pid': os.getpid(),
+        'tid': threading.get_native_id(),
+    }
+    begin_event: Dict[str, Any] = {**event, 'ph': 'B', 'ts': _get_ts()}
+    if args is not None:
+        begin_event['args'] = args
+    events.append(begin_event)
+    try:
+        yield
+    finally:
+        events.append({**event, 'ph': 'E', 'ts': _get_ts()})
+
+
+def pop_events() -> List[Dict[str, Any]]:
+    """
+    Get recorded events and clear them (recording stays enabled).
+
+    Returns
+    -------
+    events : list of dict
+        Recorded events. Empty list if recording is disabled.
+    """
+    if _events is None:
+        return []
+    events: List[Dict[str, Any]] = _events[:]
+    del _events[:len(events)]
+    return events
+
+
+def add_events(events: List[Dict[str, Any]]) -> None:
+    """
+    Add events recorded in the other process (e.g., a worker process).
+    Nothing is added if recording is disabled.
+
+    Parameters
+    ----------
+    events : list of dict
+        Events to add.
+    """
+    if _events is None:
+        return
+    _events.extend(events)
+
+
+def write_trace(file_path: str) -> None:
+    """
+    Write recorded events to a file in the Chrome trace event format.
+
+    Parameters
+    ----------
+    file_path : str
+        The trace file path to write. e.g., out.json
+    """
+    trace_data: Dict[str, Any] = {
+        'traceEvents': _events or [],
+        'displayTimeUnit': 'ms',
+    }
+    with open(file_path, 'w', encoding='utf-8') as f:
+        json.dump(trace_data, f, separators=(',', ':'))
+
+
+def _get_ts() -> float:
+    """
+    Get the current timestamp of trace events. The monotonic clock is
+    used, so that timestamps of processes on the same machine are
+    comparable.
+
+    Returns
+    -------
+    ts : float
+        Timestamp in microseconds.
+    """
+    return time.perf_counter_ns() / 1000
@@ -0,0 +1,319 @@
+"""The module that implements the incremental docstring update of stub
+files that already have docstrings added by stubdoc.
+"""
+
+import re
+from typing import Dict, List, Optional, Pattern, Tuple
+
+from stubdoc import stubdoc
+from stubdoc import tracing
+
+_FUNCTION_PATTERN: Pattern = re.compile(pattern=r'^def (\w+)\(.+$')
+_METHOD_PATTERN: Pattern = re.compile(pattern=r'^    def (\w+)\(.+$')
+_CLASS_PATTERN: Pattern = re.compile(pattern=r'^class (\w+)[\(:].*$')
+
+
+def update_docstrings_in_stubfile(
+        original_module_path: str, stub_file_path: str) -> None:
+    """
+    Update docstrings of a specified stub file incrementally.
+
+    Notes
+    -----
+    Docstring blocks that added by stubdoc before are recognized.
+    Only blocks whose docstring changed are replaced, and blocks are
+    added or removed for symbols that gained or lost docstrings.
+    Every other line is left untouched. A stub file that has no
+    docstring yet is also supported. If the stub file declares no
+    function, class or method, the original module is not imported.
+
+    Parameters
+    ----------
+    original_module_path : str
+        The path of stub file's original module.
+    stub_file_path : str
+        Target stub file path.
+    """
+    stub_str: str = stubdoc._read_txt(file_path=stub_file_path)
+    if not stubdoc._needs_docstring_index(
+            stub_str=stub_str, update_mode=True):
+        return
+    declared_names: List[str] = stubdoc._get_declared_names(
+        stub_str=stub_str)
+    docstring_index: Dict[str, str] = \
+        stubdoc._get_docstring_index_from_module_path(
+            module_path=original_module_path, names=declared_names)
+    _update_docstring_index_in_stubfile(
+        docstring_index=docstring_index, stub_file_path=stub_file_path)
+
+
+def _update_docstring_index_in_stubfile(
+        *, docstring_index: Dict[str, str], stub_file_path: str) -> None:
+    """
+    Update docstrings of a specified stub file incrementally with
+    a docstring index. The file is not rewritten if nothing changed.
+
+    Parameters
+    ----------
+    docstring_index : dict of str to str
+        A docstring index. Please see
+        `stubdoc._get_docstring_index_from_module` function for the
+        details.
+    stub_file_path : str
+        Target stub file path.
+    """
+    with tracing.span(name='rewrite'):
+        stub_str: str = stubdoc._read_txt(file_path=stub_file_path)
+        result_stub_str: str = _update_docstrings_in_stub_str(
+            stub_str=stub_str, docstring_index=docstring_index)
+    if result_stub_str == stub_str:
+        return
+    with tracing.span(name='write'):
+        stubdoc._write_txt(file_path=stub_file_path, txt=result_stub_str)
+
+
+def _update_docstrings_in_stub_str(
+        *, stub_str: str, docstring_index: Dict[str, str]) -> str:
+    """
+    Update docstrings in a stub string incrementally.
+
+    Parameters
+    ----------
+    stub_str : str
+        A target stub file string.
+    docstring_index : dict of str to str
+        A docstring index. Please see
+        `stubdoc._get_docstring_index_from_module` function for the
+        details. Empty docstrings are handled as not existing.
+
+    Returns
+    -------
+    result_stub_str : str
+        Stub file string after docstrings updated.
+    """
+    lines: List[str] = stub_str.splitlines()
+    result_lines: List[str] = []
+    class_name: Optional[str] = None
+    i: int = 0
+    while i < len(lines):
+        line: str = lines[i]
+        if line != '' and not line.startswith(' '):
+            class_name = None
+        header: Optional[Tuple[str, str]] = _get_header_name_and_indent(
+            line=line, class_name=class_name)
+        if line.startswith('class '):
+            class_match = _CLASS_PATTERN.match(string=line)
+            if class_match is not None:
+                class_name = class_match.group(1)
+        if header is None:
+            result_lines.append(line)
+            i += 1
+            continue
+        name, indent = header
+        block_end: int = _get_docstring_block_end(
+            lines=lines, header_index=i, indent=indent)
+        existing_block_lines: List[str] = lines[i + 1:block_end]
+        docstring: str = docstring_index.get(name, '')
+        header_line, header_rest = _split_header_line(
+            line=line, existing_block_lines=existing_block_lines,
+            indent=indent)
+        block_lines: List[str] = _get_docstring_block_lines(
+            line=line, docstring=docstring, indent=indent)
+        if block_lines:
+            block_lines[-1] += header_rest
+        if block_lines == existing_block_lines and (
+                not block_lines or header_line == line) or (
+                    docstring == ''
+                    and existing_block_lines == [f'{indent}"""'] * 2):
+            result_lines.extend(lines[i:block_end])
+            i = block_end
+            continue
+        if block_lines:
+            result_lines.append(header_line)
+            result_lines.extend(block_lines)
+            i = block_end
+            continue
+        if header_rest != '':
+            result_lines.append(f'{header_line}{header_rest}')
+        elif _has_body(lines=lines, start_index=block_end, indent=indent):
+            result_lines.append(header_line)
+        else:
+            result_lines.append(f'{header_line} ...')
+        i = block_end
+
+    result_stub_str: str = '\n'.join(result_lines)
+    if stub_str.endswith('\n'):
+        result_stub_str += '\n'
+    return result_stub_str
+
+
+def _get_header_name_and_indent(
+        *, line: str, class_name: Optional[str]) -> Optional[Tuple[str, str]]:
+    """
+    Get a qualified name and docstring indent if a specified line is
+    a header line of a top-level function, a top-level class or
+    a top-level class method.
+
+    Parameters
+    ----------
+    line : str
+        Target stub line.
+    class_name : str or None
+        The name of the top-level class that the line is in.
+
+    Returns
+    -------
+    header : tuple of str and str, or None
+        Qualified name (e.g., `SampleClass.sample_method`) and docstring
+        indent. None will be returned if the line is not a header line
+        or multi-line header.
+    """
+    if not stubdoc._remove_line_end_ellipsis_or_pass_keyword(
+            line=line).endswith(':'):
+        return None
+    match = _FUNCTION_PATTERN.match(string=line)
+    if match is not None:
+        return match.group(1), '    '
+    match = _CLASS_PATTERN.match(string=line)
+    if match is not None:
+        return match.group(1), '    '
+    if class_name is None:
+        return None
+    match = _METHOD_PATTERN.match(string=line)
+    if match is not None:
+        return f'{class_name}.{match.group(1)}', '        '
+    return None
+
+
+def _split_header_line(
+        *, line: str, existing_block_lines: List[str],
+        indent: str) -> Tuple[str, str]:
+    """
+    Split a header line into the part that a docstring block follows
+    and the rest that the docstring adding moves after the block's
+    closing triple quotes.
+
+    Notes
+    -----
+    The docstring adding keeps a one-line class's body (e.g., `...` of
+    `class SampleClass: ...`) after the closing triple quotes, while
+    a function's or a method's `...` or `pass` is removed.
+
+    Parameters
+    ----------
+    line : str
+        The header line.
+    existing_block_lines : list of str
+        The existing docstring block lines after the header line.
+    indent : str
+        The docstring indent.
+
+    Returns
+    -------
+    header_line : str
+        The header line without the rest. e.g., 'class SampleClass:'
+    header_rest : str
+        The class header's rest after the colon, or the rest after the
+        existing block's closing triple quotes. e.g., ' ...'
+    """
+    if not line.startswith('class '):
+        return stubdoc._remove_line_end_ellipsis_or_pass_keyword(
+            line=line), ''
+    colon_index: int = line.index(':')
+    header_rest: str = line[colon_index + 1:]
+    if existing_block_lines:
+        header_rest += existing_block_lines[-1][len(f'{indent}"""'):]
+    return line[:colon_index + 1], header_rest
+
+
+def _get_docstring_block_end(
+        *, lines: List[str], header_index: int, indent: str) -> int:
+    """
+    Get the end index of a docstring block that added by stubdoc
+    after a header line.
+
+    Parameters
+    ----------
+    lines : list of str
+        Stub lines.
+    header_index : int
+        The header line's index.
+    indent : str
+        The docstring indent.
+
+    Returns
+    -------
+    block_end : int
+        The index of the next line of the block's closing triple quotes.
+        The closing triple quotes can be followed by a one-line class's
+        body (e.g., `...`). If the block does not exist, the next index
+        of the header line will be returned.
+    """
+    quotes_line: str = f'{indent}"""'
+    start_index: int = header_index + 1
+    if start_index >= len(lines) or lines[start_index] != quotes_line:
+        return start_index
+    for i in range(start_index + 1, len(lines)):
+        if lines[i].startswith(quotes_line):
+            return i + 1
+    return start_index
+
+
+def _get_docstring_block_lines(
+        *, line: str, docstring: str, indent: str) -> List[str]:
+    """
+    Get docstring block lines as same as the docstring adding.
+
+    Parameters
+    ----------
+    line : str
+        The header line.
+    docstring : str
+        A docstring to add. Empty string means docstring not existing.
+    indent : str
+        The docstring indent.
+
+    Returns
+    -------
+    block_lines : list of str
+        Docstring block lines. Empty list if docstring is empty.
+    """
+    if docstring == '':
+        return []
+    block_str: str
+    if line.startswith('class '):
+        block_str = stubdoc._get_class_docstring_str(docstring=docstring)
+        return block_str.split('\n')
+    if indent == '    ':
+        block_str = stubdoc._add_docstring_to_top_level_func(
+            line='', docstring=docstring)
+    else:
+        block_str = stubdoc._add_docstring_to_top_level_class_method(
+            line='', docstring=docstring)
+    return block_str.split('\n')[1:]
+
+
+def _has_body(*, lines: List[str], start_index: int, indent: str) -> bool:
+    """
+    Get a boolean indicating whether a header has body lines after
+    a specified line index.
+
+    Parameters
+    ----------
+    lines : list of str
+        Stub lines.
+    start_index : int
+        The index to start checking.
+    indent : str
+        The body indent.
+
+    Returns
+    -------
+    result : bool
+        True if the next non-empty line is indented by the body indent.
+    """
+    for line in lines[start_index:]:
+        if line.strip() == '':
+            continue
+        return line.startswith(indent)
+    return False
@@ -0,0 +1,190 @@
+import asyncio
+import os
+import shutil
+import threading
+import time
+from typing import Dict, List, Optional
+
+import pytest
+
+from stubdoc import aio
+from stubdoc.batch import PairResult
+from stubdoc.session import StubdocSession
+
+_TEST_DIR_PATH: str = './tests/tmp_aio/'
+_TEST_PACKAGE_DIR_PATH: str = './tests/tmp_aio/root/aiopkg/'
+
+_TEST_MODULE_STR: str = '''
+def test_func_{i}(a: int) -> int:
+    """
+    Test function {i}.
+    """
+    return a
+'''
+
+
+def setup() -> None:
+    _delete_test_dir()
+
+
+def teardown() -> None:
+    _delete_test_dir()
+
+
+def _delete_test_dir() -> None:
+    """
+    Delete the directory added for testing.
+    """
+    shutil.rmtree(_TEST_DIR_PATH, ignore_errors=True)
+
+
+def _make_test_package(*, modules_num: int) -> None:
+    """
+    Make a package and stub files for testing.
+
+    Parameters
+    ----------
+    modules_num : int
+        The number of modules to make.
+    """
+    os.makedirs(_TEST_PACKAGE_DIR_PATH, exist_ok=True)
+    with open(os.path.join(_TEST_PACKAGE_DIR_PATH, '__init__.py'), 'w') as f:
+        f.write('\n')
+    for i in range(modules_num):
+        module_path: str = os.path.join(_TEST_PACKAGE_DIR_PATH, f'mod{i}.py')
+        with open(module_path, 'w') as f:
+            f.write(_TEST_MODULE_STR.format(i=i))
+        with open(module_path + 'i', 'w') as f:
+            f.write(f'def test_func_{i}(a: int) -> int: ...\n')
+
+
+def _read_test_stub(*, i: int) -> str:
+    """
+    Read a test stub file.
+
+    Parameters
+    ----------
+    i : int
+        The module number.
+
+    Returns
+    -------
+    stub_str : str
+        Read stub string.
+    """
+    with open(os.path.join(_TEST_PACKAGE_DIR_PATH, f'mod{i}.pyi')) as f:
+        stub_str: str = f.read()
+    return stub_str
+
+
+class _CountingSession(StubdocSession):
+
+    max_running_num: int
+    _running_num: int
+    _lock: threading.Lock
+
+    def __init__(self, root_dir_path: str) -> None:
+        """
+        The session that records the maximum number of docstring
+        extractions running at the same time.
+
+        Parameters
+        ----------
+        root_dir_path : str
+            The session's root directory path.
+        """
+        super().__init__(backend='static', root_dir_path=root_dir_path)
+        self.max_running_num = 0
+        self._running_num = 0
+        self._lock = threading.Lock()
+
+    def get_docstring_index(
+            self, module_path: str,
+            names: Optional[List[str]] = None) -> Dict[str, str]:
+        with self._lock:
+            self._running_num += 1
+            self.max_running_num = max(
+                self.max_running_num, self._running_num)
+        try:
+            time.sleep(0.05)
+            return super().get_docstring_index(
+                module_path=module_path, names=names)
+        finally:
+            with self._lock:
+                self._running_num -= 1
+
+
+def test_add_docstring_to_stubfile_async() -> None:
+    _make_test_package(modules_num=1)
+    session: StubdocSession = StubdocSession(
+        root_dir_path=os.path.join(_TEST_DIR_PATH, 'root'))
+    asyncio.run(aio.add_docstring_to_stubfile_async(
+        original_module_path='aiopkg/mod0.py',
+        stub_file_path='aiopkg/mod0.pyi', session=session))
+    assert _read_test_stub(i=0) == (
+        'def test_func_0(a: int) -> int:\n'
+        '    """\n'
+        '    Test function 0.\n'
+        '    """\n'
+    )
+    _delete_test_dir()
+
+
+def test__get_docstring_added_stub_str() -> None:
+    stub_str: str = aio._get_docstring_added_stub_str(
+        stub_str='def test_func(a: int) -> None: ...',
+        docstring_index={'test_func': 'Lorem ipsum.'})
+    assert stub_str == (
+        'def test_func(a: int) -> None:\n'
+        '    """\n'
+        '    Lorem ipsum.\n'
+        '    """\n'
+    )
+
+
+def test_add_docstring_to_stubfiles_async() -> None:
+    modules_num: int = 6
+    _make_test_package(modules_num=modules_num)
+    session: _CountingSession = _CountingSession(
+        root_dir_path=os.path.join(_TEST_DIR_PATH, 'root'))
+    pairs = [
+        (f'aiopkg/mod{i}.py', f'aiopkg/mod{i}.pyi')
+        for i in range(modules_num)]
+    pairs.append(('aiopkg/not_existing.py', 'aiopkg/not_existing.pyi'))
+
+    async def collect_results() -> List[PairResult]:
+        ticks: List[int] = []
+
+        async def tick() -> None:
+            while True:
+                ticks.append(1)
+                await asyncio.sleep(0.01)
+
+        ticker: asyncio.Task = asyncio.ensure_future(tick())
+        results: List[PairResult] = [
+            result async for result in aio.add_docstring_to_stubfiles_async(
+                pairs=pairs, concurrency=2, session=session)]
+        ticker.cancel()
+        assert len(ticks) > 5
+        return results
+
+    results: List[PairResult] = asyncio.run(collect_results())
+    assert sorted(result.module_path for result in results) == sorted(
+        module_path for module_path, _ in pairs)
+    failed_results: List[PairResult] = [
+        result for result in results if not result.succeeded]
+    assert len(failed_results) == 1
+    assert failed_results[0].module_path == 'aiopkg/not_existing.py'
+    assert 'FileNotFoundError' in failed_results[0].message
+    assert session.max_running_num == 2
+    for i in range(modules_num):
+        assert f'Test function {i}.' in _read_test_stub(i=i)
+
+    async def iterate_with_invalid_concurrency() -> None:
+        async for _ in aio.add_docstring_to_stubfiles_async(
+                pairs=pairs, concurrency=0):
+            pass
+
+    with pytest.raises(ValueError):  # type: ignore
+        asyncio.run(iterate_with_invalid_concurrency())
+    _delete_test_dir()
@@ -0,0 +1,140 @@
+import os
+import shutil
+import zipfile
+from typing import List
+
+import pytest
+
+from stubdoc import archive
+from stubdoc import update
+from stubdoc.batch import PairResult
+
+_TEST_DIR_PATH: str = './tests/tmp_archive/'
+_TEST_STUB_DIR_PATH: str = './tests/tmp_archive/out/'
+_TEST_ARCHIVE_PATH: str = './tests/tmp_archive/pkg-1.0-py3-none-any.whl'
+
+_TEST_MODULE_STR: str = '''
+import not_existing_module
+
+
+def test_func(a: int) -> int:
+    """
+    Lorem ipsum dolor sit amet.
+    """
+    return a
+'''
+
+_TEST_STUB_STR: str = 'def test_func(a: int) -> int: ...\n'
+
+
+def setup() -> None:
+    _delete_test_dir()
+
+
+def teardown() -> None:
+    _delete_test_dir()
+
+
+def _delete_test_dir() -> None:
+    """
+    Delete the directory added for testing.
+    """
+    shutil.rmtree(_TEST_DIR_PATH, ignore_errors=True)
+
+
+def _make_test_archive() -> None:
+    """
+    Make a wheel archive and stub files for testing.
+    """
+    os.makedirs(os.path.join(_TEST_STUB_DIR_PATH, 'pkg'), exist_ok=True)
+    with zipfile.ZipFile(_TEST_ARCHIVE_PATH, 'w') as zip_file:
+        zip_file.writestr('pkg/__init__.py', '')
+        zip_file.writestr('pkg/mod.py', _TEST_MODULE_STR)
+        zip_file.writestr('pkg/broken.py', 'def broken(:\n')
+        zip_file.writestr('pkg/no_stub.py', _TEST_MODULE_STR)
+        zip_file.writestr('pkg/__pycache__/mod.py', '')
+        zip_file.writestr('pkg-1.0.dist-info/METADATA', '')
+        zip_file.writestr(
+            'pkg-1.0.data/purelib/data_mod.py', _TEST_MODULE_STR)
+    for stub_name in ['pkg/mod.pyi', 'pkg/broken.pyi', 'data_mod.pyi']:
+        with open(os.path.join(_TEST_STUB_DIR_PATH, stub_name), 'w') as f:
+            f.write(_TEST_STUB_STR)
+
+
+def test_add_docstring_to_stubfiles_in_archive() -> None:
+    with pytest.raises(ValueError):  # type: ignore
+        list(archive.add_docstring_to_stubfiles_in_archive(
+            archive_path='./samples/sample.py',
+            stub_dir_path=_TEST_STUB_DIR_PATH))
+
+    _make_test_archive()
+    results: List[PairResult] = list(
+        archive.add_docstring_to_stubfiles_in_archive(
+            archive_path=_TEST_ARCHIVE_PATH,
+            stub_dir_path=_TEST_STUB_DIR_PATH))
+    assert [
+        (result.module_path, result.stub_path, result.succeeded)
+        for result in results] == [
+        (os.path.join(_TEST_ARCHIVE_PATH, 'pkg-1.0.data/purelib/data_mod.py'),
+         os.path.join(_TEST_STUB_DIR_PATH, 'data_mod.pyi'), True),
+        (os.path.join(_TEST_ARCHIVE_PATH, 'pkg/broken.py'),
+         os.path.join(_TEST_STUB_DIR_PATH, 'pkg', 'broken.pyi'), False),
+        (os.path.join(_TEST_ARCHIVE_PATH, 'pkg/mod.py'),
+         os.path.join(_TEST_STUB_DIR_PATH, 'pkg', 'mod.pyi'), True),
+    ]
+    assert 'SyntaxError' in results[1].message
+    stub_path: str = os.path.join(_TEST_STUB_DIR_PATH, 'pkg', 'mod.pyi')
+    with open(stub_path) as f:
+        stub_str: str = f.read()
+    assert stub_str == (
+        'def test_func(a: int) -> int:\n'
+        '    """\n'
+        '    Lorem ipsum dolor sit amet.\n'
+        '    """\n'
+    )
+
+    results = list(archive.add_docstring_to_stubfiles_in_archive(
+        archive_path=_TEST_ARCHIVE_PATH, stub_dir_path=_TEST_STUB_DIR_PATH))
+    with open(stub_path) as f:
+        assert f.read() == stub_str
+
+    results = list(archive.add_docstring_to_stubfiles_in_archive(
+        archive_path=_TEST_ARCHIVE_PATH, stub_dir_path=_TEST_STUB_DIR_PATH,
+        apply_docstring_index=update._update_docstring_index_in_stubfile,
+        update_mode=True))
+    with open(stub_path) as f:
+        assert f.read() == stub_str
+    _delete_test_dir()
+
+
+def test_get_module_member_names() -> None:
+    _make_test_archive()
+    with zipfile.ZipFile(_TEST_ARCHIVE_PATH) as zip_file:
+        member_names: List[str] = archive.get_module_member_names(
+            zip_file=zip_file)
+    assert member_names == [
+        'pkg-1.0.data/purelib/data_mod.py',
+        'pkg/__init__.py',
+        'pkg/broken.py',
+        'pkg/mod.py',
+        'pkg/no_stub.py',
+    ]
+    _delete_test_dir()
+
+
+def test_get_stub_path_of_member() -> None:
+    stub_path: str = archive.get_stub_path_of_member(
+        member_name='pkg/sub/mod.py', stub_dir_path='out')
+    assert stub_path == os.path.join('out', 'pkg', 'sub', 'mod.pyi')
+
+    stub_path = archive.get_stub_path_of_member(
+        member_name='pkg-1.0.data/platlib/pkg/mod.py', stub_dir_path='out')
+    assert stub_path == os.path.join('out', 'pkg', 'mod.pyi')
+
+
+def test_is_archive_path() -> None:
+    _make_test_archive()
+    assert archive.is_archive_path(path=_TEST_ARCHIVE_PATH)
+    assert not archive.is_archive_path(path='./samples/sample.py')
+    assert not archive.is_archive_path(path='./not_existing.zip')
+    _delete_test_dir()
@@ -0,0 +1,197 @@
+import os
+import pickle
+import shutil
+from functools import partial
+from types import ModuleType
+from typing import Callable, Dict, List
+
+import pytest
+
+from stubdoc import backends
+from stubdoc import stubdoc
+from stubdoc.symbols import SymbolTable
+
+_TEST_DIR_PATH: str = './tests/tmp_backends/'
+_TEST_STUB_PATH: str = './tmp_test_backends_stub.pyi'
+_TEST_STUB_STR: str = (
+    'def sample_func(a: int, b: str) -> bool: ...\n\n'
+    'class SampleClass:\n'
+    '    def __init__(self) -> None: ...\n'
+    '    @property\n'
+    '    def sample_property(self) -> int: ...\n')
+
+
+def test_add_docstring_to_stubfile_with_backend() -> None:
+    stub_strs = []
+    for backend in backends.DOCSTRING_INDEX_GETTERS:
+        if backend == 'bytecode':
+            continue
+        with open(_TEST_STUB_PATH, 'w') as f:
+            f.write(_TEST_STUB_STR)
+        add_docstring = pickle.loads(pickle.dumps(partial(
+            backends.add_docstring_to_stubfile_with_backend,
+            backend=backend, update_mode=True)))
+        add_docstring('samples/sample.py', _TEST_STUB_PATH)
+        add_docstring('samples/sample.py', _TEST_STUB_PATH)
+        with open(_TEST_STUB_PATH) as f:
+            stub_strs.append(f.read())
+    os.remove(_TEST_STUB_PATH)
+    assert len(stub_strs) == 2
+    assert stub_strs[0] == stub_strs[1]
+    assert stub_strs[0].count('"""') == 8
+
+
+def test_add_docstring_to_stubfile_with_backend_with_symbol_table() -> None:
+    with open(_TEST_STUB_PATH, 'w') as f:
+        f.write(_TEST_STUB_STR)
+    with pytest.raises(ValueError):  # type: ignore
+        backends.add_docstring_to_stubfile_with_backend(
+            'samples/sample.py', _TEST_STUB_PATH, backend='static',
+            symbol_table=SymbolTable())
+    with pytest.raises(ValueError):  # type: ignore
+        backends.add_docstring_to_stubfile_with_backend(
+            'samples/sample.py', _TEST_STUB_PATH,
+            cache_dir_path=_TEST_DIR_PATH, symbol_table=SymbolTable())
+    with open(_TEST_STUB_PATH) as f:
+        assert f.read() == _TEST_STUB_STR
+    assert not os.path.exists(_TEST_DIR_PATH)
+
+    backends.add_docstring_to_stubfile_with_backend(
+        'samples/sample.py', _TEST_STUB_PATH, symbol_table=SymbolTable())
+    with open(_TEST_STUB_PATH) as f:
+        assert f.read().count('"""') == 8
+    os.remove(_TEST_STUB_PATH)
+
+
+def test_add_docstring_to_stubfile_with_backend_with_fanout() -> None:
+    stub_dir_paths: List[str] = [
+        os.path.join(_TEST_DIR_PATH, 'py38'),
+        os.path.join(_TEST_DIR_PATH, 'py312')]
+    stub_paths: List[str] = [
+        os.path.join(stub_dir_path, 'samples', 'sample.pyi')
+        for stub_dir_path in stub_dir_paths]
+    stub_strs: List[str] = [
+        _TEST_STUB_STR, 'def sample_func(a: int, b: str) -> bool: ...\n']
+    for stub_path, stub_str in zip(stub_paths, stub_strs):
+        os.makedirs(os.path.dirname(stub_path), exist_ok=True)
+        with open(stub_path, 'w') as f:
+            f.write(stub_str)
+    expected_stub_strs: List[str] = []
+    for stub_str in stub_strs:
+        with open(_TEST_STUB_PATH, 'w') as f:
+            f.write(stub_str)
+        backends.add_docstring_to_stubfile_with_backend(
+            'samples/sample.py', _TEST_STUB_PATH)
+        with open(_TEST_STUB_PATH) as f:
+            expected_stub_strs.append(f.read())
+    os.remove(_TEST_STUB_PATH)
+
+    module_names: List[str] = []
+    original_read_module: Callable = stubdoc._read_module
+
+    def read_module(module_path: str) -> ModuleType:
+        module_names.append(module_path)
+        return original_read_module(module_path=module_path)
+
+    stubdoc._read_module = read_module
+    try:
+        backends.add_docstring_to_stubfile_with_backend(
+            'samples/sample.py', stub_paths[0],
+            fanout_stub_dir_paths=stub_dir_paths)
+    finally:
+        stubdoc._read_module = original_read_module
+    assert module_names == ['samples/sample.py']
+    for stub_path, expected_stub_str in zip(stub_paths, expected_stub_strs):
+        with open(stub_path) as f:
+            assert f.read() == expected_stub_str
+
+    with open(stub_paths[0], 'w') as f:
+        f.write(_TEST_STUB_STR)
+    with open(stub_paths[1], 'w') as f:
+        f.write(stub_strs[1])
+    with pytest.raises(Exception, match='1 of 2'):  # type: ignore
+        backends.add_docstring_to_stubfile_with_backend(
+            'samples/sample.py', stub_paths[0], backend='static',
+            fanout_stub_dir_paths=stub_dir_paths)
+    with open(stub_paths[0]) as f:
+        assert f.read().count('"""') == 8
+    shutil.rmtree(_TEST_DIR_PATH, ignore_errors=True)
+
+
+def test_add_docstring_to_stubfile_with_backend_skipping() -> None:
+    stub_dir_paths: List[str] = [
+        os.path.join(_TEST_DIR_PATH, 'py38'),
+        os.path.join(_TEST_DIR_PATH, 'py312')]
+    stub_paths: List[str] = [
+        os.path.join(stub_dir_path, 'samples', 'sample.pyi')
+        for stub_dir_path in stub_dir_paths]
+    stub_strs: List[str] = ['sample_int: int', _TEST_STUB_STR]
+    for stub_path, stub_str in zip(stub_paths, stub_strs):
+        os.makedirs(os.path.dirname(stub_path), exist_ok=True)
+        with open(stub_path, 'w') as f:
+            f.write(stub_str)
+    for backend in ('import', 'static'):
+        backends.add_docstring_to_stubfile_with_backend(
+            'not_existing_module.py', stub_paths[0], backend=backend,
+            update_mode=backend == 'static', write_depfile=True)
+        with open(stub_paths[0]) as f:
+            assert f.read() == stub_strs[0]
+        with open(f'{stub_paths[0]}.d') as f:
+            assert 'not_existing_module.py' in f.read()
+
+    backends.add_docstring_to_stubfile_with_backend(
+        'samples/sample.py', stub_paths[0],
+        fanout_stub_dir_paths=stub_dir_paths)
+    with open(stub_paths[0]) as f:
+        assert f.read() == stub_strs[0]
+    with open(stub_paths[1]) as f:
+        assert f.read().count('"""') == 8
+    shutil.rmtree(_TEST_DIR_PATH, ignore_errors=True)
+
+
+def test__get_docstring_index_of_stubs() -> None:
+    docstring_index, declared_names_list, imported_paths = \
+        backends._get_docstring_index_of_stubs(
+            module_path='samples/sample.py',
+            stub_strs=['def sample_func(a: int, b: str) -> bool: ...\n'],
+            backend='import', cache_dir_path=None, symbol_table=None,
+            record_imports=False)
+    assert list(docstring_index) == ['sample_func']
+    assert declared_names_list == [['sample_func']]
+    assert imported_paths is None
+
+    docstring_index, declared_names_list, _ = \
+        backends._get_docstring_index_of_stubs(
+            module_path='samples/sample.py', stub_strs=['', ''],
+            backend='static', cache_dir_path=None, symbol_table=None,
+            record_imports=False)
+    assert 'SampleClass.__init__' in docstring_index
+    assert declared_names_list == [None, None]
+
+
+def test_get_fanout_stub_paths() -> None:
+    stub_dir_paths: List[str] = [
+        os.path.join(_TEST_DIR_PATH, 'py38'),
+        os.path.join(_TEST_DIR_PATH, 'py312'),
+        os.path.join(_TEST_DIR_PATH, 'not_existing')]
+    for stub_dir_path in stub_dir_paths[:2]:
+        os.makedirs(os.path.join(stub_dir_path, 'samples'), exist_ok=True)
+        with open(
+                os.path.join(stub_dir_path, 'samples', 'sample.pyi'),
+                'w') as f:
+            f.write(_TEST_STUB_STR)
+    stub_paths: List[str] = backends.get_fanout_stub_paths(
+        module_path='samples/sample.py',
+        stub_path=f'./{stub_dir_paths[1]}/samples/sample.pyi',
+        stub_dir_paths=stub_dir_paths)
+    assert stub_paths == [
+        f'./{stub_dir_paths[1]}/samples/sample.pyi',
+        os.path.join(stub_dir_paths[0], 'samples', 'sample.pyi')]
+    shutil.rmtree(_TEST_DIR_PATH, ignore_errors=True)
+
+
+def test__filter_docstring_index() -> None:
+    docstring_index: Dict[str, str] = backends._filter_docstring_index(
+        docstring_index={'b': 'B.', 'a': 'A.', 'C.c': ''},
+        names=['C.c', 'b', 'd'])
+    assert list(docstring_index.items()) == [('b', 'B.'), ('C.c', '')]
@@ -0,0 +1,342 @@
+import gc
+import io
+import multiprocessing
+import os
+import shutil
+import sys
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import pytest
+
+from stubdoc import batch
+from stubdoc import tracing
+from stubdoc.batch import PairResult
+from stubdoc.config import Config
+
+_TEST_DIR_PATH: str = './tests/tmp_batch/'
+
+_TEST_MODULE_STR: str = '''
+def test_func(a: int) -> int:
+    """Lorem ipsum dolor sit amet.
+    """
+    return a
+'''
+
+
+def setup() -> None:
+    _delete_test_dir()
+
+
+def teardown() -> None:
+    _delete_test_dir()
+
+
+def _delete_test_dir() -> None:
+    """
+    Delete the directory added for testing.
+    """
+    shutil.rmtree(_TEST_DIR_PATH, ignore_errors=True)
+
+
+def _make_test_modules_and_stubs() -> None:
+    """
+    Make modules and stubs for testing.
+    """
+    for dir_path in (
+            _TEST_DIR_PATH,
+            os.path.join(_TEST_DIR_PATH, 'sub'),
+            os.path.join(_TEST_DIR_PATH, 'out/tests/tmp_batch/sub')):
+        os.makedirs(dir_path, exist_ok=True)
+    for file_path in (
+            '__init__.py', 'sub/__init__.py', 'out/__init__.py'):
+        with open(os.path.join(_TEST_DIR_PATH, file_path), 'w') as f:
+            f.write('\n')
+    for module_name in ('batch_mod_1', 'sub/batch_mod_2'):
+        with open(
+                os.path.join(_TEST_DIR_PATH, f'{module_name}.py'),
+                'w') as f:
+            f.write(_TEST_MODULE_STR)
+    with open(
+            os.path.join(
+                _TEST_DIR_PATH, 'out/tests/tmp_batch/sub/batch_mod_2.pyi'),
+            'w') as f:
+        f.write('def test_func(a: int) -> int: ...\n')
+
+
+def test_PairResult() -> None:
+    result: PairResult = PairResult(
+        module_path='sample/path.py',
+        stub_path='out/sample/path.pyi',
+        succeeded=True,
+        message='',
+        elapsed_seconds=0.1)
+    assert result.to_line() == 'ok\tsample/path.py\tout/sample/path.pyi'
+
+    result.succeeded = False
+    assert result.to_line() == \
+        'failed\tsample/path.py\tout/sample/path.pyi'
+
+
+def test_get_stub_path() -> None:
+    stub_path: str = batch.get_stub_path(
+        module_path='./sample/path.py', stub_dir_path='out')
+    assert stub_path == os.path.join('out', 'sample', 'path.pyi')
+
+
+def test_get_module_paths_in_dir() -> None:
+    _make_test_modules_and_stubs()
+    os.makedirs(
+        os.path.join(_TEST_DIR_PATH, '__pycache__'), exist_ok=True)
+    with open(
+            os.path.join(_TEST_DIR_PATH, '__pycache__/cached.py'),
+            'w') as f:
+        f.write('\n')
+    module_paths: List[str] = batch.get_module_paths_in_dir(
+        dir_path=os.path.join(_TEST_DIR_PATH, 'sub'))
+    assert module_paths == [
+        os.path.join(_TEST_DIR_PATH, 'sub', '__init__.py'),
+        os.path.join(_TEST_DIR_PATH, 'sub', 'batch_mod_2.py'),
+    ]
+    module_paths = batch.get_module_paths_in_dir(dir_path=_TEST_DIR_PATH)
+    assert os.path.join(_TEST_DIR_PATH, 'batch_mod_1.py') in module_paths
+    assert os.path.join(
+        _TEST_DIR_PATH, '__pycache__', 'cached.py') not in module_paths
+    _delete_test_dir()
+
+
+def test_get_module_paths_in_dir_with_config() -> None:
+
+    class _RecordingConfig(Config):
+
+        checked_paths: List[str] = []
+
+        def is_target_path(self, module_path: str) -> bool:
+            self.checked_paths.append(module_path)
+            return super().is_target_path(module_path=module_path)
+
+    _make_test_modules_and_stubs()
+    config: _RecordingConfig = _RecordingConfig(
+        root_dir_path=_TEST_DIR_PATH, exclude=['sub/**', '**/out'],
+        include=['**/*_mod_*.py', 'sub/*.py'])
+    module_paths: List[str] = batch.get_module_paths_in_dir(
+        dir_path=_TEST_DIR_PATH, config=config)
+    assert module_paths == [
+        os.path.join(_TEST_DIR_PATH, 'batch_mod_1.py')]
+    assert config.checked_paths == [
+        os.path.join(_TEST_DIR_PATH, '__init__.py'),
+        os.path.join(_TEST_DIR_PATH, 'batch_mod_1.py'),
+    ]
+    _delete_test_dir()
+
+
+def test_get_pairs() -> None:
+    _make_test_modules_and_stubs()
+    module_paths: List[str] = batch.get_module_paths_in_dir(
+        dir_path=_TEST_DIR_PATH)
+    pairs: List[Tuple[str, str]] = batch.get_pairs(
+        module_paths=module_paths,
+        stub_dir_path=os.path.join(_TEST_DIR_PATH, 'out'))
+    assert pairs == [(
+        os.path.join(_TEST_DIR_PATH, 'sub', 'batch_mod_2.py'),
+        os.path.join(
+            _TEST_DIR_PATH, 'out', 'tests', 'tmp_batch', 'sub',
+            'batch_mod_2.pyi'),
+    )]
+
+    fanout_stub_dir_path: str = os.path.join(_TEST_DIR_PATH, 'out_2')
+    fanout_stub_path: str = os.path.join(
+        fanout_stub_dir_path, 'tests', 'tmp_batch', 'batch_mod_1.pyi')
+    os.makedirs(os.path.dirname(fanout_stub_path))
+    with open(fanout_stub_path, 'w') as f:
+        f.write('def test_func(a: int) -> int: ...\n')
+    pairs = batch.get_pairs(
+        module_paths=module_paths,
+        stub_dir_path=os.path.join(_TEST_DIR_PATH, 'out'),
+        fanout_stub_dir_paths=[fanout_stub_dir_path])
+    assert pairs == [
+        (os.path.join(_TEST_DIR_PATH, 'batch_mod_1.py'), fanout_stub_path),
+        (os.path.join(_TEST_DIR_PATH, 'sub', 'batch_mod_2.py'),
+         os.path.join(
+             _TEST_DIR_PATH, 'out', 'tests', 'tmp_batch', 'sub',
+             'batch_mod_2.pyi')),
+    ]
+    _delete_test_dir()
+
+
+def test__get_existing_stub_path() -> None:
+    _make_test_modules_and_stubs()
+    stub_path: Optional[str] = batch._get_existing_stub_path(
+        module_path='./tests/tmp_batch/sub/batch_mod_2.py',
+        stub_dir_paths=[
+            os.path.join(_TEST_DIR_PATH, 'not_existing_out'),
+            os.path.join(_TEST_DIR_PATH, 'out')])
+    assert stub_path == os.path.join(
+        _TEST_DIR_PATH, 'out', 'tests', 'tmp_batch', 'sub',
+        'batch_mod_2.pyi')
+    stub_path = batch._get_existing_stub_path(
+        module_path='./tests/tmp_batch/batch_mod_1.py',
+        stub_dir_paths=[os.path.join(_TEST_DIR_PATH, 'out')])
+    assert stub_path is None
+    _delete_test_dir()
+
+
+def test_add_docstring_to_stubfiles() -> None:
+    _make_test_modules_and_stubs()
+    stub_path: str = os.path.join(
+        _TEST_DIR_PATH, 'out/tests/tmp_batch/sub/batch_mod_2.pyi')
+    results: List[PairResult] = list(batch.add_docstring_to_stubfiles(
+        pairs=[
+            ('./tests/tmp_batch/not_existing_module.py', stub_path),
+            ('./tests/tmp_batch/sub/batch_mod_2.py', stub_path),
+        ]))
+    assert [result.succeeded for result in results] == [False, True]
+    assert 'not_existing_module' in results[0].message
+    assert results[1].message == ''
+    with open(stub_path) as f:
+        stub_str: str = f.read()
+    assert stub_str == (
+        'def test_func(a: int) -> int:'
+        '\n    """'
+        '\n    Lorem ipsum dolor sit amet.'
+        '\n    """\n'
+    )
+    _delete_test_dir()
+
+
+def test_add_docstring_to_stubfiles_in_parallel() -> None:
+    _make_test_modules_and_stubs()
+    stub_path: str = os.path.join(
+        _TEST_DIR_PATH, 'out/tests/tmp_batch/sub/batch_mod_2.pyi')
+    # The failed pair has its own stub file, so that the other pair's
+    # added docstrings do not make it have nothing to document.
+    failed_stub_path: str = os.path.join(
+        _TEST_DIR_PATH, 'out/tests/tmp_batch/not_existing_module.pyi')
+    shutil.copyfile(stub_path, failed_stub_path)
+    tracing.enable()
+    try:
+        results: List[PairResult] = list(
+            batch.add_docstring_to_stubfiles_in_parallel(
+                pairs=iter([
+                    ('./tests/tmp_batch/not_existing_module.py',
+                     failed_stub_path),
+                    ('./tests/tmp_batch/sub/batch_mod_2.py', stub_path),
+                ]),
+                jobs=2))
+        events: List[Dict[str, Any]] = tracing.pop_events()
+    finally:
+        tracing.disable()
+    results = sorted(results, key=lambda result: result.module_path)
+    assert [result.succeeded for result in results] == [False, True]
+    assert 'not_existing_module' in results[0].message
+    with open(stub_path) as f:
+        stub_str: str = f.read()
+    assert '    Lorem ipsum dolor sit amet.\n' in stub_str
+
+    worker_pids: Set[int] = {
+        event['pid'] for event in events
+        if event['name'] == './tests/tmp_batch/sub/batch_mod_2.py'}
+    assert len(worker_pids) == 1
+    assert os.getpid() not in worker_pids
+    names: List[str] = [
+        event['name'] for event in events
+        if event['pid'] in worker_pids and event['ph'] == 'B']
+    assert names[-5:] == [
+        './tests/tmp_batch/sub/batch_mod_2.py',
+        'import', 'enumerate', 'rewrite', 'write']
+    _delete_test_dir()
+
+
+def test_add_docstring_to_stubfiles_in_parallel_with_preload() -> None:
+    _make_test_modules_and_stubs()
+    stub_path: str = os.path.join(
+        _TEST_DIR_PATH, 'out/tests/tmp_batch/sub/batch_mod_2.pyi')
+    results: List[PairResult] = list(
+        batch.add_docstring_to_stubfiles_in_parallel(
+            pairs=[('./tests/tmp_batch/sub/batch_mod_2.py', stub_path)],
+            jobs=2,
+            preload_module_names=['tests.tmp_batch.batch_mod_1']))
+    assert [result.succeeded for result in results] == [True]
+    assert 'tests.tmp_batch.batch_mod_1' in sys.modules
+    assert gc.get_freeze_count() == 0
+    with open(stub_path) as f:
+        stub_str: str = f.read()
+    assert '    Lorem ipsum dolor sit amet.\n' in stub_str
+    sys.modules.pop('tests.tmp_batch.batch_mod_1')
+    _delete_test_dir()
+
+
+def test_preload_modules() -> None:
+    _make_test_modules_and_stubs()
+    batch.preload_modules(module_names=['tests.tmp_batch.batch_mod_1'])
+    assert 'tests.tmp_batch.batch_mod_1' in sys.modules
+    sys.modules.pop('tests.tmp_batch.batch_mod_1')
+
+    with pytest.raises(Exception, match='not_existing_module'):  # type: ignore
+        batch.preload_modules(
+            module_names=['tests.tmp_batch.not_existing_module'])
+    _delete_test_dir()
+
+
+def test__get_fork_context() -> None:
+    if 'fork' not in multiprocessing.get_all_start_methods():
+        with pytest.raises(ValueError):  # type: ignore
+            batch._get_fork_context()
+        return
+    assert batch._get_fork_context().get_start_method() == 'fork'
+
+
+def test__read_records() -> None:
+    records: List[str] = list(batch._read_records(
+        stream=io.StringIO('a.py\tb.pyi\n\nc.py\r\nd.py'),
+        separator='\n'))
+    assert records == ['a.py\tb.pyi', 'c.py', 'd.py']
+
+    records = list(batch._read_records(
+        stream=io.StringIO('a b.py\0\0c.py\nd.py\0e.py'),
+        separator='\0'))
+    assert records == ['a b.py', 'c.py\nd.py', 'e.py']
+
+
+def test_read_pairs() -> None:
+    _make_test_modules_and_stubs()
+    stream: io.StringIO = io.StringIO(
+        'a.py\tout/a.pyi\n'
+        './tests/tmp_batch/batch_mod_1.py\n'
+        './tests/tmp_batch/sub/batch_mod_2.py\n')
+    pairs: List[Tuple[str, str]] = list(batch.read_pairs(
+        stream=stream,
+        stub_dir_path=os.path.join(_TEST_DIR_PATH, 'out')))
+    assert pairs == [
+        ('a.py', 'out/a.pyi'),
+        ('./tests/tmp_batch/sub/batch_mod_2.py',
+         os.path.join(
+             _TEST_DIR_PATH, 'out', 'tests', 'tmp_batch', 'sub',
+             'batch_mod_2.pyi')),
+    ]
+
+    stream = io.StringIO('./tests/tmp_batch/sub/batch_mod_2.py\n')
+    pairs = list(batch.read_pairs(
+        stream=stream,
+        stub_dir_path=os.path.join(_TEST_DIR_PATH, 'not_existing_out'),
+        fanout_stub_dir_paths=[os.path.join(_TEST_DIR_PATH, 'out')]))
+    assert pairs == [
+        ('./tests/tmp_batch/sub/batch_mod_2.py',
+         os.path.join(
+             _TEST_DIR_PATH, 'out', 'tests', 'tmp_batch', 'sub',
+             'batch_mod_2.pyi')),
+    ]
+
+    with pytest.raises(ValueError):  # type: ignore
+        list(batch.read_pairs(stream=io.StringIO('a.py\n')))
+    _delete_test_dir()
+
+
+def test_PairResult_dict_conversion() -> None:
+    result: PairResult = PairResult(
+        module_path='sample/path.py',
+        stub_path='out/sample/path.pyi',
+        succeeded=False,
+        message='error',
+        elapsed_seconds=0.1)
+    converted: PairResult = PairResult.from_dict(result.to_dict())
+    assert converted.to_dict() == result.to_dict()
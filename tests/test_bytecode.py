@@ -0,0 +1,239 @@
+import os
+import py_compile
+import shutil
+import sys
+from types import CodeType
+from typing import Dict, List
+
+import pytest
+
+from stubdoc import bytecode
+from stubdoc import stubdoc
+
+_TEST_DIR_PATH: str = './tests/tmp_bytecode/'
+_TEST_MODULE_PATH: str = './tests/tmp_bytecode/bytecode_mod.py'
+
+_TEST_MODULE_STR: str = '''
+import os
+
+test_value: int = 100
+
+
+def test_func_1(a: int) -> int:
+    """
+    Lorem ipsum dolor sit amet.
+
+    Parameters
+    ----------
+    a : int
+        Test argument.
+    """
+    return a
+
+
+def test_func_2() -> str:
+    return 'Not a docstring.'
+
+
+def _test_decorator(func):
+    return func
+
+
+class TestClass1:
+    """Test class 1.
+    """
+
+    test_attr: int = 10
+
+    def __init__(self) -> None:
+        """Test constructor.
+        """
+        self._value = [i for i in range(3)]
+
+    @property
+    def test_property(self) -> int:
+        """Test property.
+        """
+        return self._value
+
+    @test_property.setter
+    def test_property(self, value: int) -> None:
+        self._value = value
+
+    @_test_decorator
+    def test_method(self) -> None:
+        pass
+
+    def __eq__(self, other) -> bool:
+        """Not included."""
+        return True
+
+    class NestedClass:
+        """Not included."""
+
+
+class TestClass2(TestClass1):
+    test_attr = 20
+'''
+
+
+def setup() -> None:
+    _delete_test_dir()
+
+
+def teardown() -> None:
+    _delete_test_dir()
+
+
+def _delete_test_dir() -> None:
+    """
+    Delete the directory added for testing.
+    """
+    shutil.rmtree(_TEST_DIR_PATH, ignore_errors=True)
+
+
+def _make_test_module(
+        *, invalidation_mode: py_compile.PycInvalidationMode = (
+            py_compile.PycInvalidationMode.TIMESTAMP)) -> None:
+    """
+    Make a module and its cached bytecode for testing.
+
+    Parameters
+    ----------
+    invalidation_mode : PycInvalidationMode, default TIMESTAMP
+        The cached bytecode's invalidation mode.
+    """
+    os.makedirs(_TEST_DIR_PATH, exist_ok=True)
+    with open(os.path.join(_TEST_DIR_PATH, '__init__.py'), 'w') as f:
+        f.write('\n')
+    with open(_TEST_MODULE_PATH, 'w') as f:
+        f.write(_TEST_MODULE_STR)
+    py_compile.compile(
+        _TEST_MODULE_PATH, doraise=True,
+        invalidation_mode=invalidation_mode)
+
+
+def test__read_fresh_bytecode() -> None:
+    _make_test_module()
+    code: CodeType = bytecode._read_fresh_bytecode(
+        module_path=_TEST_MODULE_PATH)
+    assert 'test_func_1' in code.co_names
+
+    stat: os.stat_result = os.stat(_TEST_MODULE_PATH)
+    os.utime(_TEST_MODULE_PATH, ns=(
+        stat.st_atime_ns, stat.st_mtime_ns + 10 ** 10))
+    with pytest.raises(ValueError):  # type: ignore
+        bytecode._read_fresh_bytecode(module_path=_TEST_MODULE_PATH)
+
+    _make_test_module(
+        invalidation_mode=py_compile.PycInvalidationMode.CHECKED_HASH)
+    bytecode._read_fresh_bytecode(module_path=_TEST_MODULE_PATH)
+    with open(_TEST_MODULE_PATH, 'a') as f:
+        f.write('\n')
+    with pytest.raises(ValueError):  # type: ignore
+        bytecode._read_fresh_bytecode(module_path=_TEST_MODULE_PATH)
+
+    with pytest.raises(ValueError):  # type: ignore
+        bytecode._read_fresh_bytecode(
+            module_path=os.path.join(_TEST_DIR_PATH, '__init__.py'))
+    _delete_test_dir()
+
+
+def test_get_docstring_index_from_bytecode() -> None:
+    _make_test_module()
+    # The compiler of Python 3.13 or later dedents docstrings.
+    indent: str = '' if sys.version_info >= (3, 13) else '    '
+    docstring_index: Dict[str, str] = \
+        bytecode.get_docstring_index_from_bytecode(
+            module_path=_TEST_MODULE_PATH)
+    assert list(docstring_index.items()) == [
+        ('TestClass1.__init__', 'Test constructor.'),
+        ('TestClass1.test_method', ''),
+        ('TestClass1.test_property', 'Test property.'),
+        ('test_func_1', (
+            'Lorem ipsum dolor sit amet.\n\n'
+            f'{indent}Parameters\n'
+            f'{indent}----------\n'
+            f'{indent}a : int\n'
+            f'{indent}    Test argument.')),
+        ('TestClass1', 'Test class 1.'),
+    ]
+
+    module_docstring_index: Dict[str, str] = \
+        stubdoc._get_docstring_index_from_module_path(
+            module_path=_TEST_MODULE_PATH)
+    for name, docstring in docstring_index.items():
+        assert module_docstring_index[name] == docstring
+    _delete_test_dir()
+
+
+def test__is_class_body() -> None:
+    code: CodeType = compile(
+        'class A:\n    pass\ndef b():\n    pass\n', '<test>', 'exec')
+    child_codes = bytecode._get_child_codes(code=code)
+    assert [bytecode._is_class_body(code=child_code)
+            for child_code in child_codes] == [True, False]
+
+
+def test__get_class_docstring() -> None:
+    code: CodeType = compile(
+        'class A:\n    """Lorem ipsum. """\n'
+        'class B:\n    a = "Not a docstring."\n'
+        'class C:\n    __doc__ = 1\n',
+        '<test>', 'exec')
+    docstrings = [
+        bytecode._get_class_docstring(code=child_code)
+        for child_code in bytecode._get_child_codes(code=code)]
+    assert docstrings == ['Lorem ipsum.', '', '']
+
+
+def test_add_docstring_to_stubfile_from_bytecode() -> None:
+    _make_test_module()
+    stub_path: str = os.path.join(_TEST_DIR_PATH, 'bytecode_mod.pyi')
+    with open(stub_path, 'w') as f:
+        f.write(
+            'def test_func_1(a: int) -> int: ...\n\n'
+            'class TestClass1:\n'
+            '    def __init__(self) -> None: ...\n'
+            '    def test_method(self) -> None: ...\n'
+            '    @property\n'
+            '    def test_property(self) -> int: ...\n')
+    bytecode.add_docstring_to_stubfile_from_bytecode(
+        original_module_path=_TEST_MODULE_PATH, stub_file_path=stub_path)
+    with open(stub_path) as f:
+        stub_str: str = f.read()
+    assert stub_str.startswith(
+        'def test_func_1(a: int) -> int:\n    """\n    Lorem ipsum')
+    assert 'class TestClass1:\n    """\n    Test class 1.\n' in stub_str
+    assert '        Test property.\n' in stub_str
+
+    bytecode.add_docstring_to_stubfile_from_bytecode(
+        original_module_path=_TEST_MODULE_PATH, stub_file_path=stub_path)
+    with open(stub_path) as f:
+        assert f.read() == stub_str
+
+    with open(stub_path, 'w') as f:
+        f.write('test_value: int\n')
+    stat_result: os.stat_result = os.stat(stub_path)
+    bytecode.add_docstring_to_stubfile_from_bytecode(
+        original_module_path='./not_existing_module.py',
+        stub_file_path=stub_path)
+    assert os.stat(stub_path).st_mtime_ns == stat_result.st_mtime_ns
+    _delete_test_dir()
+
+
+def test__get_property_accessor_codes() -> None:
+    code: CodeType = compile(
+        'class A:\n'
+        '    @property\n    def a(self): ...\n'
+        '    @a.setter\n    def a(self, value): """Not used."""\n'
+        '    @a.deleter\n    def a(self): ...\n',
+        '<test>', 'exec')
+    class_code: CodeType = bytecode._get_child_codes(code=code)[0]
+    method_codes: List[CodeType] = bytecode._get_child_codes(
+        code=class_code)
+    accessor_codes: List[CodeType] = \
+        bytecode._get_property_accessor_codes(code=class_code)
+    assert len(accessor_codes) == 2
+    assert accessor_codes[0] is method_codes[1]
+    assert accessor_codes[1] is method_codes[2]
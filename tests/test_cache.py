@@ -0,0 +1,131 @@
+import os
+import shutil
+from typing import Dict, List, Optional
+
+from stubdoc import cache
+from stubdoc import index
+
+_TEST_DIR_PATH: str = './tests/tmp_cache/'
+_TEST_CACHE_DIR_PATH: str = './tests/tmp_cache/cache/'
+_TEST_MODULE_PATH: str = './tests/tmp_cache/cache_mod.py'
+
+
+def setup() -> None:
+    _delete_test_dir()
+
+
+def teardown() -> None:
+    _delete_test_dir()
+
+
+def _delete_test_dir() -> None:
+    """
+    Delete the directory added for testing.
+    """
+    shutil.rmtree(_TEST_DIR_PATH, ignore_errors=True)
+
+
+def test_get_docstring_index_with_cache() -> None:
+    os.makedirs(_TEST_DIR_PATH, exist_ok=True)
+    with open(_TEST_MODULE_PATH, 'w') as f:
+        f.write('def test_func():\n    """Lorem ipsum."""\n')
+    extracted_paths: List[str] = []
+
+    def get_docstring_index(module_path: str) -> Dict[str, str]:
+        extracted_paths.append(module_path)
+        return {'test_func': f'Lorem ipsum {len(extracted_paths)}.'}
+
+    for _ in range(2):
+        docstring_index: Dict[str, str] = \
+            cache.get_docstring_index_with_cache(
+                module_path=_TEST_MODULE_PATH, backend='static',
+                cache_dir_path=_TEST_CACHE_DIR_PATH,
+                get_docstring_index=get_docstring_index)
+        assert docstring_index == {'test_func': 'Lorem ipsum 1.'}
+    assert len(extracted_paths) == 1
+    assert os.listdir(_TEST_CACHE_DIR_PATH) == [os.path.basename(
+        cache._get_cache_file_path(
+            module_path=_TEST_MODULE_PATH, backend='static',
+            cache_dir_path=_TEST_CACHE_DIR_PATH))]
+
+    cache.get_docstring_index_with_cache(
+        module_path=_TEST_MODULE_PATH, backend='import',
+        cache_dir_path=_TEST_CACHE_DIR_PATH,
+        get_docstring_index=get_docstring_index)
+    assert len(extracted_paths) == 2
+
+    with open(_TEST_MODULE_PATH, 'a') as f:
+        f.write('\n')
+    docstring_index = cache.get_docstring_index_with_cache(
+        module_path=_TEST_MODULE_PATH, backend='static',
+        cache_dir_path=_TEST_CACHE_DIR_PATH,
+        get_docstring_index=get_docstring_index)
+    assert docstring_index == {'test_func': 'Lorem ipsum 3.'}
+    _delete_test_dir()
+
+
+def test_get_docstring_index_and_imported_paths_with_cache() -> None:
+    os.makedirs(_TEST_DIR_PATH, exist_ok=True)
+    with open(_TEST_MODULE_PATH, 'w') as f:
+        f.write('def test_func():\n    """Lorem ipsum."""\n')
+    extracted_paths: List[str] = []
+
+    def get_docstring_index(module_path: str) -> Dict[str, str]:
+        extracted_paths.append(module_path)
+        return {'test_func': 'Lorem ipsum.'}
+
+    docstring_index, imported_paths = \
+        cache.get_docstring_index_and_imported_paths_with_cache(
+            module_path=_TEST_MODULE_PATH, backend='import',
+            cache_dir_path=_TEST_CACHE_DIR_PATH,
+            get_docstring_index=get_docstring_index)
+    assert docstring_index == {'test_func': 'Lorem ipsum.'}
+    assert imported_paths is None
+
+    imported_paths_list: List[Optional[List[str]]] = []
+    for _ in range(2):
+        docstring_index, imported_paths = \
+            cache.get_docstring_index_and_imported_paths_with_cache(
+                module_path=_TEST_MODULE_PATH, backend='import',
+                cache_dir_path=_TEST_CACHE_DIR_PATH,
+                get_docstring_index=get_docstring_index,
+                record_imports=True)
+        assert docstring_index == {'test_func': 'Lorem ipsum.'}
+        imported_paths_list.append(imported_paths)
+    assert len(extracted_paths) == 2
+    assert isinstance(imported_paths_list[0], list)
+    assert imported_paths_list[0] == imported_paths_list[1]
+
+    _, imported_paths = \
+        cache.get_docstring_index_and_imported_paths_with_cache(
+            module_path=_TEST_MODULE_PATH, backend='import',
+            cache_dir_path=_TEST_CACHE_DIR_PATH,
+            get_docstring_index=get_docstring_index)
+    assert imported_paths is None
+    assert len(extracted_paths) == 2
+    _delete_test_dir()
+
+
+def test_get_timings_file_path() -> None:
+    timings_file_path: str = cache.get_timings_file_path(
+        cache_dir_path=_TEST_CACHE_DIR_PATH)
+    assert timings_file_path == os.path.join(
+        _TEST_CACHE_DIR_PATH, 'timings.json')
+
+
+def test__read_cache() -> None:
+    os.makedirs(_TEST_DIR_PATH, exist_ok=True)
+    cache_file_path: str = os.path.join(_TEST_DIR_PATH, 'cache.json')
+    assert cache._read_cache(cache_file_path=cache_file_path) is None
+
+    with open(cache_file_path, 'w') as f:
+        f.write('{broken')
+    assert cache._read_cache(cache_file_path=cache_file_path) is None
+
+    index._write_index(
+        index_file_path=cache_file_path, module_name='sample.path',
+        source_hash='abc', docstring_index={'sample_func': 'Lorem ipsum.'})
+    index_data = cache._read_cache(cache_file_path=cache_file_path)
+    assert index_data is not None
+    assert index_data['docstrings'] == {'sample_func': 'Lorem ipsum.'}
+    _delete_test_dir()
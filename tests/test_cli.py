@@ -1,10 +1,20 @@
 from argparse import ArgumentParser
 from argparse import Namespace
+from contextlib import ExitStack
 import os
+import shutil
+from typing import Iterable, Iterator, List, Tuple
 
 import pytest
 
 from stubdoc import cli
+from stubdoc import shard
+from stubdoc import stubdoc
+from stubdoc import update
+from stubdoc.batch import PairResult
+from stubdoc.config import Config
+from stubdoc.profiling import ImportProfiler
+from stubdoc.symbols import SymbolTable
 
 
 def test__add_arg() -> None:
@@ -49,6 +59,19 @@ def test__add_arg() -> None:
             help='test help.',
         ))
 
+    cli._add_arg(
+        parser=parser,
+        arg=cli.Arg(
+            short_name='-f',
+            long_name='--test_flag',
+            type_=bool,
+            help='test help.',
+            action='store_true',
+        ))
+    args: Namespace = parser.parse_args(['-t', 'a', '-f'])
+    assert args.test_arg == 'a'
+    assert args.test_flag is True
+
 
 def test__validate_module_path_arg() -> None:
     with pytest.raises(ValueError):  # type: ignore
@@ -85,3 +108,357 @@ def test__validate_stub_path_arg() -> None:
         f.write('\n')
     cli._validate_stub_path_arg(stub_path_arg=test_tmp_stub_file_path)
     os.remove(test_tmp_stub_file_path)
+
+
+def test__validate_index_path_arg() -> None:
+    with pytest.raises(ValueError):  # type: ignore
+        cli._validate_index_path_arg(
+            index_path_arg='not_existing_index.json')
+
+    cli._validate_index_path_arg(index_path_arg='pyproject.toml')
+
+
+def test__validate_stub_dir_arg() -> None:
+    with pytest.raises(ValueError):  # type: ignore
+        cli._validate_stub_dir_arg(stub_dir_arg=None)
+
+    with pytest.raises(ValueError):  # type: ignore
+        cli._validate_stub_dir_arg(stub_dir_arg='not_existing_dir')
+
+    cli._validate_stub_dir_arg(stub_dir_arg='stubdoc')
+    cli._validate_stub_dir_arg(stub_dir_arg='stubdoc,tests')
+
+    with pytest.raises(ValueError):  # type: ignore
+        cli._validate_stub_dir_arg(stub_dir_arg='stubdoc,not_existing_dir')
+
+
+def test__get_stub_dir_paths() -> None:
+    assert cli._get_stub_dir_paths(stub_dir_arg=None) == []
+    assert cli._get_stub_dir_paths(stub_dir_arg='out') == ['out']
+    assert cli._get_stub_dir_paths(
+        stub_dir_arg='out/py38, out/py312,') == ['out/py38', 'out/py312']
+
+
+def test__validate_module_name_args() -> None:
+    args: Namespace = Namespace(
+        module_path='stubdoc', pairs_path=None, changed_since=None,
+        stub_dir=None)
+    with pytest.raises(ValueError):  # type: ignore
+        cli._validate_module_name_args(args=args)
+
+    args.module_path = None
+    args.stub_dir = 'stubdoc,tests'
+    with pytest.raises(ValueError):  # type: ignore
+        cli._validate_module_name_args(args=args)
+
+    args.stub_dir = 'not_existing_dir'
+    with pytest.raises(ValueError):  # type: ignore
+        cli._validate_module_name_args(args=args)
+
+    args.stub_dir = 'stubdoc'
+    cli._validate_module_name_args(args=args)
+    args.stub_dir = None
+    cli._validate_module_name_args(args=args)
+
+
+def test__get_module_names() -> None:
+    assert cli._get_module_names(module_name_arg=' requests, urllib3,') == [
+        'requests', 'urllib3']
+
+
+def test__get_batch_pairs() -> None:
+    stub_dir_path: str = './tests/tmp_cli_stubs/'
+    os.makedirs(os.path.join(stub_dir_path, 'stubdoc'), exist_ok=True)
+    stub_path: str = os.path.join(stub_dir_path, 'stubdoc', 'cli.pyi')
+    with open(stub_path, 'w') as f:
+        f.write('def main() -> None: ...\n')
+    args: Namespace = Namespace(
+        module_name='stubdoc', module_path=None, pairs_path=None,
+        changed_since=None, stub_dir=stub_dir_path)
+    with ExitStack() as exit_stack:
+        pairs = cli._get_batch_pairs(args=args, exit_stack=exit_stack)
+    shutil.rmtree(stub_dir_path, ignore_errors=True)
+    assert pairs == [(os.path.abspath('stubdoc/cli.py'), stub_path)]
+
+
+def test__get_batch_module_paths() -> None:
+    args: Namespace = Namespace(module_path='stubdoc', changed_since=None)
+    module_paths: List[str] = cli._get_batch_module_paths(args=args)
+    assert os.path.join('stubdoc', 'cli.py') in module_paths
+    assert os.path.join('tests', 'test_cli.py') not in module_paths
+
+
+def test__validate_backend_arg() -> None:
+    with pytest.raises(ValueError):  # type: ignore
+        cli._validate_backend_arg(backend_arg='not_existing_backend')
+
+    cli._validate_backend_arg(backend_arg=None)
+    cli._validate_backend_arg(backend_arg='bytecode')
+
+
+def test__get_add_docstring() -> None:
+    profiler: ImportProfiler = ImportProfiler()
+    args: Namespace = Namespace(
+        backend='bytecode', profile_imports=True, update=False,
+        depfile=False, stub_dir=None)
+    with pytest.raises(ValueError):  # type: ignore
+        cli._get_add_docstring(args=args, profiler=profiler)
+
+    args = Namespace(
+        backend=None, profile_imports=True, update=False, depfile=True,
+        stub_dir=None)
+    with pytest.raises(ValueError):  # type: ignore
+        cli._get_add_docstring(args=args, profiler=profiler)
+
+    args = Namespace(
+        backend=None, profile_imports=True, update=False, depfile=False,
+        stub_dir='out/py38,out/py312')
+    with pytest.raises(ValueError):  # type: ignore
+        cli._get_add_docstring(args=args, profiler=profiler)
+
+    test_tmp_stub_file_path = './tmp_test_stub.pyi'
+    with open(test_tmp_stub_file_path, 'w') as f:
+        f.write('sample_int: int\n\ndef sample_func(a: int, b: str)'
+                ' -> bool: ...\n')
+    args = Namespace(
+        backend=None, profile_imports=True, update=True, depfile=False,
+        stub_dir=None)
+    add_docstring = cli._get_add_docstring(args=args, profiler=profiler)
+    add_docstring('samples/sample.py', test_tmp_stub_file_path)
+    add_docstring('samples/sample.py', test_tmp_stub_file_path)
+    with open(test_tmp_stub_file_path) as f:
+        stub_str: str = f.read()
+    os.remove(test_tmp_stub_file_path)
+    assert stub_str.count('"""') == 2
+    assert len(profiler.profiles) == 2
+
+    args = Namespace(
+        backend=None, profile_imports=False, update=False, cache_dir=None,
+        depfile=True, stub_dir='out')
+    add_docstring = cli._get_add_docstring(args=args, profiler=profiler)
+    assert isinstance(add_docstring.keywords['symbol_table'], SymbolTable)
+    assert add_docstring.keywords['write_depfile']
+
+    args = Namespace(
+        backend='static', profile_imports=False, update=False,
+        cache_dir=None, depfile=False, stub_dir='out')
+    add_docstring = cli._get_add_docstring(args=args, profiler=profiler)
+    assert add_docstring.keywords['symbol_table'] is None
+
+    args = Namespace(
+        backend=None, profile_imports=False, update=False,
+        cache_dir='.stubdoc_cache', depfile=False, stub_dir='out')
+    add_docstring = cli._get_add_docstring(args=args, profiler=profiler)
+    assert add_docstring.keywords['symbol_table'] is None
+    assert add_docstring.keywords['fanout_stub_dir_paths'] is None
+
+    args.stub_dir = 'out/py38, out/py312'
+    add_docstring = cli._get_add_docstring(args=args, profiler=profiler)
+    assert add_docstring.keywords['fanout_stub_dir_paths'] == [
+        'out/py38', 'out/py312']
+
+
+def test__get_apply_docstring_index() -> None:
+    apply_docstring_index = cli._get_apply_docstring_index(
+        args=Namespace(update=True))
+    assert apply_docstring_index == \
+        update._update_docstring_index_in_stubfile
+    apply_docstring_index = cli._get_apply_docstring_index(
+        args=Namespace(update=False))
+    assert apply_docstring_index == \
+        stubdoc._add_docstring_index_to_stubfile
+
+
+def test__run_archive() -> None:
+    args: Namespace = Namespace(
+        module_path='not_existing.whl', stub_dir='out', backend='bytecode',
+        profile_imports=False, connect=None, changed_since=None,
+        update=False)
+    with pytest.raises(ValueError):  # type: ignore
+        cli._run_archive(args=args)
+
+
+def test__validate_jobs_arg() -> None:
+    with pytest.raises(ValueError):  # type: ignore
+        cli._validate_jobs_arg(jobs_arg=0)
+
+    cli._validate_jobs_arg(jobs_arg=None)
+    cli._validate_jobs_arg(jobs_arg=2)
+
+
+def test__apply_config() -> None:
+    config: Config = Config(
+        backend='static', jobs=4, cache_dir='.stubdoc_cache',
+        preload=['json', 'csv'])
+    args: Namespace = Namespace(
+        backend=None, jobs=None, cache_dir=None, profile_imports=False,
+        preload=None)
+    cli._apply_config(args=args, config=config)
+    assert args.backend == 'static'
+    assert args.jobs == 4
+    assert args.cache_dir == os.path.join('.', '.stubdoc_cache')
+    assert args.preload == 'json,csv'
+
+    args = Namespace(
+        backend='bytecode', jobs=2, cache_dir='cache',
+        profile_imports=False, preload='numpy')
+    cli._apply_config(args=args, config=config)
+    assert args.backend == 'bytecode'
+    assert args.jobs == 2
+    assert args.cache_dir == 'cache'
+    assert args.preload == 'numpy'
+
+    args = Namespace(
+        backend=None, jobs=None, cache_dir=None, profile_imports=True,
+        preload=None)
+    cli._apply_config(args=args, config=config)
+    assert args.jobs is None
+
+
+def test__get_preload_module_names() -> None:
+    assert cli._get_preload_module_names(
+        args=Namespace(preload=None)) is None
+    assert cli._get_preload_module_names(
+        args=Namespace(preload=' numpy, pandas,')) == ['numpy', 'pandas']
+
+
+def test__get_shard_pairs() -> None:
+    pairs: List[Tuple[str, str]] = [
+        ('stubdoc/stubdoc.py', 'out/stubdoc/stubdoc.pyi'),
+        ('stubdoc/__init__.py', 'out/stubdoc/__init__.pyi'),
+        ('stubdoc/cli.py', 'out/stubdoc/cli.pyi'),
+    ]
+    shard_pairs: List[Tuple[str, str]] = cli._get_shard_pairs(
+        args=Namespace(shard='1/2', timings_path=None, cache_dir=None),
+        pairs=pairs)
+    assert shard_pairs == [pairs[0]]
+    shard_pairs = cli._get_shard_pairs(
+        args=Namespace(shard='2/2', timings_path=None, cache_dir=None),
+        pairs=pairs)
+    assert shard_pairs == [pairs[2], pairs[1]]
+
+    cache_dir_paths: List[str] = [
+        './tmp_test_cli_cache_1/', './tmp_test_cli_cache_2/']
+    for cache_dir_path, module_path in zip(cache_dir_paths, [
+            'stubdoc/__init__.py', 'stubdoc/cli.py']):
+        shard.update_timings_file(
+            results=[PairResult(
+                module_path=module_path, stub_path='out/stubdoc/path.pyi',
+                succeeded=True, message='', elapsed_seconds=100.0)],
+            file_path=cli._get_timings_file_path(
+                args=Namespace(cache_dir=cache_dir_path)))
+    shard_pairs = cli._get_shard_pairs(
+        args=Namespace(
+            shard='1/2', timings_path=None, cache_dir=cache_dir_paths[0]),
+        pairs=pairs)
+    shard_pairs += cli._get_shard_pairs(
+        args=Namespace(
+            shard='2/2', timings_path=None, cache_dir=cache_dir_paths[1]),
+        pairs=pairs)
+    for cache_dir_path in cache_dir_paths:
+        shutil.rmtree(cache_dir_path)
+    assert shard_pairs == [pairs[0], pairs[2], pairs[1]]
+
+
+def test__get_ordered_pairs() -> None:
+    pairs: List[Tuple[str, str]] = [
+        ('stubdoc/__init__.py', 'out/stubdoc/__init__.pyi'),
+        ('stubdoc/stubdoc.py', 'out/stubdoc/stubdoc.pyi'),
+    ]
+    args: Namespace = Namespace(
+        connect=None, jobs=2, pairs_path=None, shard=None,
+        timings_path=None, cache_dir=None)
+    assert cli._get_ordered_pairs(args=args, pairs=pairs) == [
+        pairs[1], pairs[0]]
+
+    args.jobs = 1
+    assert cli._get_ordered_pairs(args=args, pairs=pairs) is pairs
+
+    args.jobs = 2
+    args.pairs_path = '-'
+    pairs_iterator: Iterator[Tuple[str, str]] = iter(pairs)
+    ordered_pairs: Iterable[Tuple[str, str]] = cli._get_ordered_pairs(
+        args=args, pairs=pairs_iterator)
+    assert ordered_pairs is pairs_iterator
+    assert next(pairs_iterator) == pairs[0]
+
+    args.pairs_path = 'pairs_manifest.txt'
+    args.shard = '1/1'
+    cache_dir_path: str = './tmp_test_cli_cache/'
+    args.cache_dir = cache_dir_path
+    shard.update_timings_file(
+        results=[
+            PairResult(
+                module_path=module_path, stub_path=stub_path,
+                succeeded=True, message='', elapsed_seconds=seconds)
+            for (module_path, stub_path), seconds in zip(
+                pairs, [100.0, 1.0])],
+        file_path=cli._get_timings_file_path(args=args))
+    shard_pairs: List[Tuple[str, str]] = cli._get_shard_pairs(
+        args=args, pairs=pairs)
+    ordered_pairs = cli._get_ordered_pairs(args=args, pairs=shard_pairs)
+    shutil.rmtree(cache_dir_path)
+    assert shard_pairs == [pairs[1], pairs[0]]
+    assert ordered_pairs == [pairs[0], pairs[1]]
+
+
+def test__get_timings() -> None:
+    cache_dir_path: str = './tmp_test_cli_cache/'
+    args: Namespace = Namespace(timings_path=None, cache_dir=None)
+    assert cli._get_timings(args=args) is None
+    args.cache_dir = cache_dir_path
+    assert cli._get_timings(args=args) is None
+
+    shard.update_timings_file(
+        results=[PairResult(
+            module_path='sample/path.py', stub_path='out/sample/path.pyi',
+            succeeded=True, message='', elapsed_seconds=0.5)],
+        file_path=cli._get_timings_file_path(args=args))
+    assert cli._get_timings(args=args) == {'sample/path.py': 0.5}
+    assert cli._get_timings(args=args, use_cache_dir=False) is None
+
+    results_path: str = os.path.join(cache_dir_path, 'results.json')
+    shard.write_results(results=[], file_path=results_path)
+    args.timings_path = results_path
+    assert cli._get_timings(args=args) == {}
+
+    args.timings_path = None
+    with open(cli._get_timings_file_path(args=args), 'w') as f:
+        f.write('broken')
+    assert cli._get_timings(args=args) is None
+    shutil.rmtree(cache_dir_path)
+
+
+def test__get_timings_file_path() -> None:
+    assert cli._get_timings_file_path(
+        args=Namespace(cache_dir=None)) is None
+    assert cli._get_timings_file_path(
+        args=Namespace(cache_dir='.stubdoc_cache')) == os.path.join(
+            '.stubdoc_cache', 'timings.json')
+
+
+def test__print_results() -> None:
+    results_path: str = './tmp_test_cli_results.json'
+    results: List[PairResult] = [
+        PairResult(
+            module_path='sample/path.py', stub_path='out/sample/path.pyi',
+            succeeded=True, message='', elapsed_seconds=0.5),
+    ]
+    timings_file_path: str = './tmp_test_cli_timings.json'
+    cli._print_results(
+        results=iter(results), results_path=results_path, sharding=(1, 2),
+        timings_file_path=timings_file_path)
+    written_results: List[PairResult] = shard.read_results(
+        file_path=results_path)
+    os.remove(results_path)
+    assert [result.to_dict() for result in written_results] == [
+        result.to_dict() for result in results]
+    assert shard.read_timings(file_path=timings_file_path) == {
+        'sample/path.py': 0.5}
+    os.remove(timings_file_path)
+
+    results.append(PairResult(
+        module_path='sample/path_2.py', stub_path='out/sample/path_2.pyi',
+        succeeded=False, message='error', elapsed_seconds=0.1))
+    with pytest.raises(SystemExit):  # type: ignore
+        cli._print_results(results=results)
@@ -0,0 +1,124 @@
+import os
+import shutil
+
+import pytest
+
+from stubdoc import config as config_module
+from stubdoc.config import Config
+
+_TEST_DIR_PATH: str = './tests/tmp_config/'
+
+
+def setup() -> None:
+    _delete_test_dir()
+
+
+def teardown() -> None:
+    _delete_test_dir()
+
+
+def _delete_test_dir() -> None:
+    """
+    Delete the directory added for testing.
+    """
+    shutil.rmtree(_TEST_DIR_PATH, ignore_errors=True)
+
+
+def _write_pyproject(*, toml_str: str) -> None:
+    """
+    Write a pyproject.toml for testing.
+
+    Parameters
+    ----------
+    toml_str : str
+        The file content.
+    """
+    os.makedirs(_TEST_DIR_PATH, exist_ok=True)
+    with open(os.path.join(_TEST_DIR_PATH, 'pyproject.toml'), 'w') as f:
+        f.write(toml_str)
+
+
+def test_Config() -> None:
+    config: Config = Config(
+        root_dir_path='root', include=['src/**'],
+        exclude=['src/_vendor', '**/*_pb2.py'], cache_dir='.cache')
+    assert config.cache_dir == os.path.join('root', '.cache')
+    assert config.is_target_path(
+        module_path=os.path.join('root', 'src', 'pkg', 'mod.py'))
+    assert not config.is_target_path(
+        module_path=os.path.join('root', 'tests', 'test_mod.py'))
+    assert not config.is_target_path(
+        module_path=os.path.join('root', 'src', 'pkg', 'mod_pb2.py'))
+    assert config.is_excluded_dir(
+        dir_path=os.path.join('root', 'src', '_vendor'))
+    assert not config.is_excluded_dir(
+        dir_path=os.path.join('root', 'src', 'pkg'))
+
+    config = Config(root_dir_path='root', exclude=['tests/**'])
+    assert config.is_excluded_dir(dir_path=os.path.join('root', 'tests'))
+    assert config.is_target_path(
+        module_path=os.path.join('root', 'src', 'mod.py'))
+
+    config = Config()
+    assert config.is_target_path(module_path='sample/path.py')
+    assert not config.is_excluded_dir(dir_path='sample')
+    assert config.backend is None
+    assert config.jobs is None
+    assert config.cache_dir is None
+    assert config.preload == []
+
+
+def test_read_config() -> None:
+    config: Config = config_module.read_config(dir_path=_TEST_DIR_PATH)
+    assert config.include == []
+    assert config.root_dir_path == _TEST_DIR_PATH
+
+    _write_pyproject(toml_str='[tool.poetry]\nname = "sample"\n')
+    config = config_module.read_config(dir_path=_TEST_DIR_PATH)
+    assert config.exclude == []
+
+    _write_pyproject(toml_str=(
+        '[tool.stubdoc]\n'
+        'include = ["src/**"]\n'
+        'exclude = ["tests/**"]\n'
+        'backend = "static"\n'
+        'jobs = 4\n'
+        'cache_dir = ".stubdoc_cache"\n'
+        'preload = ["numpy"]\n'))
+    config = config_module.read_config(dir_path=_TEST_DIR_PATH)
+    assert config.include == ['src/**']
+    assert config.exclude == ['tests/**']
+    assert config.backend == 'static'
+    assert config.jobs == 4
+    assert config.cache_dir == os.path.join(
+        _TEST_DIR_PATH, '.stubdoc_cache')
+    assert config.preload == ['numpy']
+
+    for toml_str in (
+            'unknown_key = 1\n',
+            'include = "src/**"\n',
+            'backend = "not_existing_backend"\n',
+            'jobs = 0\n',
+            'jobs = true\n',
+            'cache_dir = 1\n',
+            'preload = "numpy"\n'):
+        _write_pyproject(toml_str=f'[tool.stubdoc]\n{toml_str}')
+        with pytest.raises(ValueError):  # type: ignore
+            config_module.read_config(dir_path=_TEST_DIR_PATH)
+    _delete_test_dir()
+
+
+def test__glob_to_pattern() -> None:
+    pattern = config_module._glob_to_pattern(glob='**/_vendor/**')
+    assert pattern.match('_vendor/mod.py')
+    assert pattern.match('pkg/sub/_vendor/mod.py')
+    assert not pattern.match('pkg/vendor/mod.py')
+
+    pattern = config_module._glob_to_pattern(glob='pkg/*.py')
+    assert pattern.match('pkg/mod.py')
+    assert not pattern.match('pkg/sub/mod.py')
+    assert not pattern.match('pkg/mod.pyi')
+
+    pattern = config_module._glob_to_pattern(glob='pkg/mod?.py')
+    assert pattern.match('pkg/mod1.py')
+    assert not pattern.match('pkg/mod/.py')
@@ -0,0 +1,246 @@
+import os
+import shutil
+import sys
+from typing import List, Set
+
+import pytest
+
+from stubdoc import backends
+from stubdoc import depfile
+
+_TEST_DIR_PATH: str = './tests/tmp_depfile/'
+_TEST_PACKAGE_NAME: str = 'tests.tmp_depfile.depfilepkg'
+
+_TEST_MODULE_STR: str = '''
+from . import helper
+from .sub import constants
+
+
+def sample_func(a: int) -> int:
+    """
+    Sample function.
+    """
+    return a + constants.VALUE
+'''
+
+
+def setup() -> None:
+    _delete_test_package()
+
+
+def teardown() -> None:
+    _delete_test_package()
+
+
+def _delete_test_package() -> None:
+    """
+    Delete the package added for testing and its imported modules.
+    """
+    shutil.rmtree(_TEST_DIR_PATH, ignore_errors=True)
+    for module_name in list(sys.modules):
+        if module_name.startswith('tests.tmp_depfile'):
+            sys.modules.pop(module_name)
+
+
+def _make_test_package() -> None:
+    """
+    Make a package whose module imports the package's other modules,
+    and the module's stub.
+    """
+    package_dir_path: str = os.path.join(_TEST_DIR_PATH, 'depfilepkg')
+    os.makedirs(os.path.join(package_dir_path, 'sub'), exist_ok=True)
+    for file_path, file_str in (
+            ('__init__.py', '\n'),
+            ('module.py', _TEST_MODULE_STR),
+            ('helper.py', 'import json\n'),
+            ('sub/__init__.py', '\n'),
+            ('sub/constants.py', 'VALUE: int = 1\n'),
+            ('module.pyi', 'def sample_func(a: int) -> int: ...\n')):
+        with open(os.path.join(package_dir_path, file_path), 'w') as f:
+            f.write(file_str)
+
+
+def test_get_depfile_path() -> None:
+    depfile_path: str = depfile.get_depfile_path(
+        stub_path='out/sample/path.pyi')
+    assert depfile_path == 'out/sample/path.pyi.d'
+
+
+def test_record_imports() -> None:
+    _make_test_package()
+    with depfile.record_imports() as new_module_names:
+        __import__(f'{_TEST_PACKAGE_NAME}.module')
+    assert f'{_TEST_PACKAGE_NAME}.module' in new_module_names
+    assert f'{_TEST_PACKAGE_NAME}.sub.constants' in new_module_names
+    assert depfile._IMPORT_GRAPH[f'{_TEST_PACKAGE_NAME}.module'] >= {
+        _TEST_PACKAGE_NAME, f'{_TEST_PACKAGE_NAME}.helper',
+        f'{_TEST_PACKAGE_NAME}.sub', f'{_TEST_PACKAGE_NAME}.sub.constants'}
+    assert 'json' in depfile._IMPORT_GRAPH[f'{_TEST_PACKAGE_NAME}.helper']
+    assert depfile._hook_count == 0
+    assert depfile._original_import is None
+    _delete_test_package()
+
+
+def test__get_imported_names() -> None:
+    imported_names: Set[str] = depfile._get_imported_names(
+        name='os.path', globals={}, fromlist=None, level=0)
+    assert imported_names == {'os', 'os.path'}
+
+    imported_names = depfile._get_imported_names(
+        name='', globals={'__package__': 'stubdoc'},
+        fromlist=('stubdoc', 'not_existing_module', '*'), level=1)
+    assert imported_names == {'stubdoc', 'stubdoc.stubdoc'}
+
+    imported_names = depfile._get_imported_names(
+        name='sample', globals={'__package__': ''}, fromlist=None,
+        level=2)
+    assert imported_names == set()
+
+
+def test_get_imported_module_names() -> None:
+    _make_test_package()
+    with depfile.record_imports():
+        __import__(f'{_TEST_PACKAGE_NAME}.module')
+    module_names: Set[str] = depfile.get_imported_module_names(
+        module_name=f'{_TEST_PACKAGE_NAME}.module')
+    assert module_names >= {
+        'tests', 'tests.tmp_depfile', _TEST_PACKAGE_NAME,
+        f'{_TEST_PACKAGE_NAME}.module', f'{_TEST_PACKAGE_NAME}.helper',
+        f'{_TEST_PACKAGE_NAME}.sub.constants', 'json'}
+    _delete_test_package()
+
+
+def test_get_imported_paths() -> None:
+    _make_test_package()
+    module_path: str = os.path.join(
+        _TEST_DIR_PATH, 'depfilepkg', 'module.py')
+    with depfile.record_imports() as new_module_names:
+        __import__(f'{_TEST_PACKAGE_NAME}.module')
+    imported_paths: List[str] = depfile.get_imported_paths(
+        module_path=module_path, new_module_names=new_module_names)
+    package_dir_path: str = os.path.abspath(
+        os.path.join(_TEST_DIR_PATH, 'depfilepkg'))
+    assert os.path.join(package_dir_path, 'helper.py') in imported_paths
+    assert os.path.abspath(module_path) in imported_paths
+    assert imported_paths == sorted(imported_paths)
+    assert all(os.path.isabs(path) for path in imported_paths)
+    _delete_test_package()
+
+
+def test_get_dependency_paths() -> None:
+    _make_test_package()
+    module_path: str = os.path.join(
+        _TEST_DIR_PATH, 'depfilepkg', 'module.py')
+    stub_path: str = os.path.join(_TEST_DIR_PATH, 'depfilepkg', 'module.pyi')
+    dependency_paths: List[str] = depfile.get_dependency_paths(
+        module_path=module_path, stub_path=stub_path)
+    assert dependency_paths == [module_path, stub_path]
+
+    with depfile.record_imports() as new_module_names:
+        __import__(f'{_TEST_PACKAGE_NAME}.module')
+    dependency_paths = depfile.get_dependency_paths(
+        module_path=module_path, stub_path=stub_path,
+        new_module_names=new_module_names)
+    package_dir_path: str = os.path.join('tests', 'tmp_depfile', 'depfilepkg')
+    assert dependency_paths == [
+        module_path, stub_path,
+        os.path.join('tests', '__init__.py'),
+        os.path.join(package_dir_path, '__init__.py'),
+        os.path.join(package_dir_path, 'helper.py'),
+        os.path.join(package_dir_path, 'sub', '__init__.py'),
+        os.path.join(package_dir_path, 'sub', 'constants.py'),
+    ]
+
+    dependency_paths = depfile.get_dependency_paths(
+        module_path=module_path, stub_path=stub_path,
+        new_module_names=set())
+    assert os.path.join(package_dir_path, 'helper.py') in dependency_paths
+
+    dependency_paths = depfile.get_dependency_paths(
+        module_path=module_path, stub_path=stub_path,
+        imported_paths=[
+            os.path.abspath(module_path),
+            os.path.abspath(os.path.join(package_dir_path, 'helper.py'))])
+    assert dependency_paths == [
+        module_path, stub_path, os.path.join(package_dir_path, 'helper.py')]
+    _delete_test_package()
+
+
+def test__is_project_local_path() -> None:
+    assert depfile._is_project_local_path(path='stubdoc/depfile.py')
+    assert not depfile._is_project_local_path(path='not_existing.py')
+    assert not depfile._is_project_local_path(path=os.__file__)
+    assert not depfile._is_project_local_path(path=pytest.__file__)
+
+
+def test_write_depfile() -> None:
+    os.makedirs(_TEST_DIR_PATH, exist_ok=True)
+    stub_path: str = os.path.join(_TEST_DIR_PATH, 'sample.pyi')
+    depfile.write_depfile(
+        stub_path=stub_path,
+        dependency_paths=['sample dir/sample.py', stub_path])
+    with open(f'{stub_path}.d') as f:
+        depfile_str: str = f.read()
+    assert depfile_str == (
+        f'{stub_path}: \\\n'
+        '  sample\\ dir/sample.py \\\n'
+        f'  {stub_path}\n')
+    assert os.listdir(_TEST_DIR_PATH) == ['sample.pyi.d']
+    _delete_test_package()
+
+
+def test__escape_path() -> None:
+    assert depfile._escape_path(path='sample/path.py') == 'sample/path.py'
+    assert depfile._escape_path(path='a b\\c#$.py') == 'a\\ b/c\\#$$.py'
+
+
+def test_add_docstring_to_stubfile_with_backend() -> None:
+    _make_test_package()
+    module_path: str = os.path.join(
+        _TEST_DIR_PATH, 'depfilepkg', 'module.py')
+    stub_path: str = os.path.join(_TEST_DIR_PATH, 'depfilepkg', 'module.pyi')
+    backends.add_docstring_to_stubfile_with_backend(
+        module_path, stub_path, write_depfile=True)
+    with open(stub_path) as f:
+        stub_str: str = f.read()
+    assert 'Sample function.' in stub_str
+    with open(f'{stub_path}.d') as f:
+        depfile_str: str = f.read()
+    assert 'sub/constants.py' in depfile_str
+
+    backends.add_docstring_to_stubfile_with_backend(
+        module_path, stub_path, backend='static', write_depfile=True)
+    with open(f'{stub_path}.d') as f:
+        depfile_str = f.read()
+    assert depfile_str == f'{stub_path}: \\\n  {module_path} \\\n' \
+        f'  {stub_path}\n'
+    _delete_test_package()
+
+
+def test_add_docstring_to_stubfile_with_backend_with_cache_dir() -> None:
+    _make_test_package()
+    package_dir_path: str = os.path.join(_TEST_DIR_PATH, 'depfilepkg')
+    module_path: str = os.path.join(package_dir_path, 'module.py')
+    stub_path: str = os.path.join(package_dir_path, 'module.pyi')
+    cache_dir_path: str = os.path.join(_TEST_DIR_PATH, 'cache')
+    backends.add_docstring_to_stubfile_with_backend(
+        module_path, stub_path, cache_dir_path=cache_dir_path)
+    depfile_strs: List[str] = []
+    for _ in range(2):
+        for module_name in list(sys.modules):
+            if module_name.startswith('tests.tmp_depfile'):
+                sys.modules.pop(module_name)
+        with open(stub_path, 'w') as f:
+            f.write('def sample_func(a: int) -> int: ...\n')
+        backends.add_docstring_to_stubfile_with_backend(
+            module_path, stub_path, cache_dir_path=cache_dir_path,
+            write_depfile=True)
+        with open(stub_path) as f:
+            assert 'Sample function.' in f.read()
+        with open(f'{stub_path}.d') as f:
+            depfile_strs.append(f.read())
+    assert f'{_TEST_PACKAGE_NAME}.module' not in sys.modules
+    assert depfile_strs[0] == depfile_strs[1]
+    assert 'sub/constants.py' in depfile_strs[1]
+    assert 'helper.py' in depfile_strs[1]
+    _delete_test_package()
@@ -0,0 +1,760 @@
+"""Differential tests that check each optimized docstring adding path
+against the reference implementation (a frozen copy of the first
+release's import backend that enumerates all module members and adds
+docstrings name by name, see `_add_docstring_by_reference`).
+
+Random module and stub pairs are generated from fixed seeds, and each
+path's resulting stub (or raised exception type) needs to be
+byte-identical to the reference's. A divergence is reported with a
+minimized reproducer (module source, stub and both results).
+
+The number of cases can be increased by the STUBDOC_DIFFERENTIAL_CASES
+environment variable (e.g., before upgrading an optimized path):
+
+    $ STUBDOC_DIFFERENTIAL_CASES=5000 pytest tests/test_differential.py
+"""
+
+import difflib
+import importlib
+import os
+import py_compile
+import random
+import re
+import shutil
+import zipfile
+from typing import Callable, Dict, List, Optional, Tuple
+
+from stubdoc import archive
+from stubdoc import backends
+from stubdoc import batch
+from stubdoc import index
+from stubdoc import stubdoc
+from stubdoc.session import StubdocSession
+from stubdoc.symbols import SymbolTable
+from tests import baseline_stubdoc
+
+_TEST_DIR_PATH: str = './tests/tmp_differential/'
+_CASES_NUM: int = int(os.environ.get('STUBDOC_DIFFERENTIAL_CASES', '100'))
+
+_WORDS: List[str] = [
+    'Lorem', 'ipsum', 'dolor', 'sit', 'amet,', 'consectetur', 'elit.',
+    'sed', 'do', 'eiusmod', '`tempor`', 'a : int', 'b : str', '-', '*',
+    'e.g.,', '(default)', "isn't", 'ut:', '{labore}', '[dolore]', '...',
+    'pass',
+]
+
+_DECORATOR_STR: str = '''import functools
+
+
+def _keep_doc(func):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        return func(*args, **kwargs)
+    return wrapper
+'''
+
+
+class _Member:
+
+    source_lines: List[str]
+    stub_lines: List[str]
+
+    def __init__(
+            self, source_lines: List[str], stub_lines: List[str]) -> None:
+        """
+        The class that stores a generated definition's module source
+        lines and stub lines (a top-level definition or a class member).
+
+        Parameters
+        ----------
+        source_lines : list of str
+            Module source lines.
+        stub_lines : list of str
+            Stub lines. Empty list if the stub does not declare it.
+        """
+        self.source_lines = source_lines
+        self.stub_lines = stub_lines
+
+
+class _Definition:
+
+    header_source_lines: List[str]
+    header_stub_lines: List[str]
+    members: List[_Member]
+    empty_stub_line: Optional[str]
+
+    def __init__(
+            self, header_source_lines: List[str],
+            header_stub_lines: List[str], members: List[_Member],
+            empty_stub_line: Optional[str] = None) -> None:
+        """
+        The class that stores a generated top-level definition (a
+        function or a class with members).
+
+        Parameters
+        ----------
+        header_source_lines : list of str
+            Module source lines before members (e.g., class line and
+            class docstring). All lines of a function.
+        header_stub_lines : list of str
+            Stub lines before members.
+        members : list of _Member
+            Class members. Empty list for a function.
+        empty_stub_line : str or None, default None
+            The class stub line to use if no member is declared in the
+            stub (e.g., `class SampleClass: ...`).
+        """
+        self.header_source_lines = header_source_lines
+        self.header_stub_lines = header_stub_lines
+        self.members = members
+        self.empty_stub_line = empty_stub_line
+
+
+class _Case:
+
+    seed: int
+    definitions: List[_Definition]
+    stub_blank_lines: List[int]
+
+    def __init__(
+            self, seed: int, definitions: List[_Definition],
+            stub_blank_lines: List[int]) -> None:
+        """
+        The class that stores a generated module and stub pair.
+
+        Parameters
+        ----------
+        seed : int
+            The random seed that the case generated from.
+        definitions : list of _Definition
+            Top-level definitions.
+        stub_blank_lines : list of int
+            The number of stub blank lines before each definition.
+        """
+        self.seed = seed
+        self.definitions = definitions
+        self.stub_blank_lines = stub_blank_lines
+
+    def get_module_str(self) -> str:
+        """
+        Get the module source string.
+
+        Returns
+        -------
+        module_str : str
+            The module source string.
+        """
+        lines: List[str] = [_DECORATOR_STR]
+        for definition in self.definitions:
+            lines.append('')
+            lines.extend(definition.header_source_lines)
+            for member in definition.members:
+                lines.extend(member.source_lines)
+            if definition.members == [] \
+                    and definition.empty_stub_line is not None:
+                lines.append('    pass')
+        return '\n'.join(lines) + '\n'
+
+    def get_stub_str(self) -> str:
+        """
+        Get the stub string (in stubgen's style, ends with a single
+        newline).
+
+        Returns
+        -------
+        stub_str : str
+            The stub string.
+        """
+        lines: List[str] = []
+        for definition, blank_lines in zip(
+                self.definitions, self.stub_blank_lines):
+            member_lines: List[str] = []
+            for member in definition.members:
+                member_lines.extend(member.stub_lines)
+            definition_lines: List[str] = [
+                *definition.header_stub_lines, *member_lines]
+            if member_lines == [] \
+                    and definition.empty_stub_line is not None:
+                definition_lines = [definition.empty_stub_line]
+            if lines and definition_lines:
+                lines.extend([''] * blank_lines)
+            lines.extend(definition_lines)
+        return '\n'.join(lines) + '\n'
+
+
+def setup() -> None:
+    _delete_test_dir()
+
+
+def teardown() -> None:
+    _delete_test_dir()
+
+
+def _delete_test_dir() -> None:
+    """
+    Delete the directory added for testing.
+    """
+    shutil.rmtree(_TEST_DIR_PATH, ignore_errors=True)
+
+
+def _make_docstring_lines(
+        *, rng: random.Random, indent: str) -> List[str]:
+    """
+    Make random docstring source lines (including quotes) with odd
+    indentation, empty lines and trailing spaces.
+
+    Parameters
+    ----------
+    rng : Random
+        Random number generator.
+    indent : str
+        The body indent of the definition.
+
+    Returns
+    -------
+    docstring_lines : list of str
+        Docstring source lines. Empty list means docstring not existing.
+    """
+    kind: int = rng.randrange(7)
+    if kind == 0:
+        return []
+    quotes: str = rng.choice(['"""', "'''"])
+    if kind == 1:
+        return [f'{indent}{quotes}{quotes}']
+
+    def make_text() -> str:
+        return ' '.join(
+            rng.choice(_WORDS) for _ in range(rng.randint(1, 6)))
+
+    if kind == 2:
+        return [f'{indent}{quotes}{make_text()}{quotes}']
+    lines: List[str] = []
+    first_line: str = '' if rng.random() < 0.5 else make_text()
+    lines.append(f'{indent}{quotes}{first_line}')
+    for _ in range(rng.randint(1, 6)):
+        line_kind: int = rng.randrange(5)
+        if line_kind == 0:
+            lines.append('')
+            continue
+        if line_kind == 1:
+            lines.append(f'{indent}{" " * rng.randint(1, 8)}{make_text()}')
+            continue
+        if line_kind == 2:
+            lines.append(f'{" " * rng.randint(0, 3)}{make_text()}')
+            continue
+        if line_kind == 3:
+            lines.append(f'{indent}{make_text()}   ')
+            continue
+        lines.append(f'{indent}{make_text()}')
+    if rng.random() < 0.5:
+        lines.append(f'{indent}{quotes}')
+    else:
+        lines[-1] += quotes
+    return lines
+
+
+def _make_function(*, rng: random.Random, name: str) -> _Definition:
+    """
+    Make a random top-level function.
+
+    Parameters
+    ----------
+    rng : Random
+        Random number generator.
+    name : str
+        The function name.
+
+    Returns
+    -------
+    definition : _Definition
+        Created function definition.
+    """
+    source_lines: List[str] = []
+    if rng.random() < 0.3:
+        source_lines.append('@_keep_doc')
+    async_str: str = 'async ' if rng.random() < 0.2 else ''
+    source_lines.append(f'{async_str}def {name}(a: int, b: str) -> None:')
+    source_lines.extend(_make_docstring_lines(rng=rng, indent='    '))
+    source_lines.append(rng.choice(['    pass', '    return None']))
+    stub_lines: List[str] = []
+    if rng.random() < 0.9:
+        body: str = rng.choice([' ...', ' ...', ' pass'])
+        stub_lines.append(
+            f'{async_str}def {name}(a: int, b: str) -> None:{body}')
+    return _Definition(
+        header_source_lines=source_lines, header_stub_lines=stub_lines,
+        members=[])
+
+
+def _make_method(*, rng: random.Random, name: str) -> _Member:
+    """
+    Make a random class member (a method, a property with setter, a
+    static method, a class method or an attribute).
+
+    Parameters
+    ----------
+    rng : Random
+        Random number generator.
+    name : str
+        The member name.
+
+    Returns
+    -------
+    member : _Member
+        Created class member.
+    """
+    kind: int = rng.randrange(7)
+    body: str = rng.choice([' ...', ' ...', ' pass'])
+    declared: bool = rng.random() < 0.9
+    if kind == 0:
+        return _Member(
+            source_lines=[f'    {name}: int = 1'],
+            stub_lines=[f'    {name}: int'] if declared else [])
+    if kind == 1:
+        name = '__init__'
+    source_lines: List[str] = []
+    stub_lines: List[str] = []
+    args_str: str = '(self, a: int)'
+    if kind == 2:
+        source_lines.append('    @property')
+        stub_lines.append('    @property')
+        args_str = '(self)'
+    elif kind == 3:
+        source_lines.append('    @staticmethod')
+        stub_lines.append('    @staticmethod')
+        args_str = '(a: int)'
+    elif kind == 4:
+        source_lines.append('    @classmethod')
+        stub_lines.append('    @classmethod')
+        args_str = '(cls, a: int)'
+    elif kind == 5:
+        source_lines.append('    @_keep_doc')
+    source_lines.append(f'    def {name}{args_str} -> None:')
+    source_lines.extend(_make_docstring_lines(rng=rng, indent='        '))
+    source_lines.append('        pass')
+    stub_lines.append(f'    def {name}{args_str} -> None:{body}')
+    if kind == 2 and rng.random() < 0.5:
+        source_lines.append(f'    @{name}.setter')
+        source_lines.append(f'    def {name}(self, value: int) -> None:')
+        source_lines.extend(
+            _make_docstring_lines(rng=rng, indent='        '))
+        source_lines.append('        pass')
+        stub_lines.append(f'    @{name}.setter')
+        stub_lines.append(
+            f'    def {name}(self, value: int) -> None:{body}')
+    if not declared:
+        stub_lines = []
+    return _Member(source_lines=source_lines, stub_lines=stub_lines)
+
+
+def _make_class(*, rng: random.Random, name: str) -> _Definition:
+    """
+    Make a random top-level class.
+
+    Parameters
+    ----------
+    rng : Random
+        Random number generator.
+    name : str
+        The class name.
+
+    Returns
+    -------
+    definition : _Definition
+        Created class definition.
+    """
+    source_lines: List[str] = [f'class {name}:']
+    source_lines.extend(_make_docstring_lines(rng=rng, indent='    '))
+    members: List[_Member] = []
+    has_init: bool = False
+    for i in range(rng.randint(0, 5)):
+        member: _Member = _make_method(rng=rng, name=f'method_{i}')
+        if any(' def __init__(' in line for line in member.source_lines):
+            if has_init:
+                continue
+            has_init = True
+        members.append(member)
+    # A class line whose colon is on a later line needs the per-name
+    # processing of class docstrings.
+    header_stub_lines: List[str] = rng.choice([
+        [f'class {name}:']] * 9 + [[f'class {name}(', '        object):']])
+    return _Definition(
+        header_source_lines=source_lines, header_stub_lines=header_stub_lines,
+        members=members,
+        empty_stub_line=f'class {name}:{rng.choice([" ...", " pass"])}')
+
+
+def _make_case(*, seed: int) -> _Case:
+    """
+    Make a random module and stub pair.
+
+    Parameters
+    ----------
+    seed : int
+        The random seed.
+
+    Returns
+    -------
+    case : _Case
+        Created case.
+    """
+    rng: random.Random = random.Random(seed)
+    definitions: List[_Definition] = []
+    for i in range(rng.randint(1, 6)):
+        if rng.random() < 0.5:
+            definitions.append(_make_function(rng=rng, name=f'func_{i}'))
+            continue
+        definitions.append(_make_class(rng=rng, name=f'Class{i}'))
+    stub_blank_lines: List[int] = [
+        rng.choice([0, 1, 1, 2]) for _ in definitions]
+    return _Case(
+        seed=seed, definitions=definitions,
+        stub_blank_lines=stub_blank_lines)
+
+
+_module_num: int = 0
+
+
+def _write_case(*, case: _Case) -> Tuple[str, str]:
+    """
+    Write a case's module (with a unique module name, so that modules
+    are not shared between runs) and stub files.
+
+    Parameters
+    ----------
+    case : _Case
+        Target case.
+
+    Returns
+    -------
+    module_path : str
+        Written module path.
+    stub_path : str
+        Written stub file path.
+    """
+    global _module_num
+    _module_num += 1
+    os.makedirs(_TEST_DIR_PATH, exist_ok=True)
+    init_path: str = os.path.join(_TEST_DIR_PATH, '__init__.py')
+    if not os.path.isfile(init_path):
+        with open(init_path, 'w') as f:
+            f.write('\n')
+    module_name: str = f'case_{case.seed}_{_module_num}'
+    module_path: str = os.path.join(_TEST_DIR_PATH, f'{module_name}.py')
+    with open(module_path, 'w') as f:
+        f.write(case.get_module_str())
+    stub_path: str = os.path.join(_TEST_DIR_PATH, f'{module_name}.pyi')
+    with open(stub_path, 'w') as f:
+        f.write(case.get_stub_str())
+    importlib.invalidate_caches()
+    return module_path, stub_path
+
+
+def _run_path(
+        *, add_docstring: Callable[[str, str], None], module_path: str,
+        stub_path: str, stub_str: str) -> str:
+    """
+    Run a docstring adding path against a fresh stub file.
+
+    Parameters
+    ----------
+    add_docstring : Callable
+        The path's function that receives the module path and the stub
+        file path.
+    module_path : str
+        The module path.
+    stub_path : str
+        The stub file path.
+    stub_str : str
+        The original stub string to write before running.
+
+    Returns
+    -------
+    result : str
+        The resulting stub string, or the raised exception type name.
+    """
+    with open(stub_path, 'w') as f:
+        f.write(stub_str)
+    try:
+        add_docstring(module_path, stub_path)
+    except Exception as e:
+        return f'<raised {type(e).__name__}>'
+    with open(stub_path) as f:
+        return f.read()
+
+
+def _add_docstring_by_reference(module_path: str, stub_path: str) -> None:
+    with open(stub_path) as f:
+        stub_str: str = f.read()
+    # Generated stubs have no docstrings, so a stub has nothing to
+    # document only if it declares nothing, and it is left untouched.
+    if re.search(
+            pattern=r'^(?:    )?(?:async )?(?:def|class) ', string=stub_str,
+            flags=re.MULTILINE) is None:
+        return
+    baseline_stubdoc.add_docstring_to_stubfile(module_path, stub_path)
+
+
+def _add_docstring_by_enumeration(
+        module_path: str, stub_path: str) -> None:
+    if not stubdoc._needs_docstring_index(
+            stub_str=stubdoc._read_txt(file_path=stub_path)):
+        return
+    docstring_index: Dict[str, str] = \
+        stubdoc._get_docstring_index_from_module_path(
+            module_path=module_path)
+    stubdoc._add_docstring_index_to_stubfile(
+        docstring_index=docstring_index, stub_file_path=stub_path)
+
+
+def _add_docstring_by_bytecode(module_path: str, stub_path: str) -> None:
+    py_compile.compile(module_path, doraise=True)
+    backends.add_docstring_to_stubfile_with_backend(
+        module_path, stub_path, backend='bytecode')
+
+
+def _add_docstring_by_static(module_path: str, stub_path: str) -> None:
+    backends.add_docstring_to_stubfile_with_backend(
+        module_path, stub_path, backend='static')
+
+
+def _add_docstring_by_symbols(module_path: str, stub_path: str) -> None:
+    backends.add_docstring_to_stubfile_with_backend(
+        module_path, stub_path, symbol_table=SymbolTable())
+
+
+def _add_docstring_by_session(module_path: str, stub_path: str) -> None:
+    session: StubdocSession = StubdocSession()
+    session.add_docstring_to_stubfile(module_path, stub_path)
+
+
+def _add_docstring_by_index(module_path: str, stub_path: str) -> None:
+    index_path: str = f'{stub_path}.json'
+    index.export_docstring_index(module_path, index_path)
+    index.add_docstring_to_stubfile_from_index(
+        index_path, stub_path, original_module_path=module_path)
+
+
+def _add_docstring_by_cache(module_path: str, stub_path: str) -> None:
+    cache_dir_path: str = os.path.join(_TEST_DIR_PATH, 'cache')
+    with open(stub_path) as f:
+        stub_str: str = f.read()
+    backends.add_docstring_to_stubfile_with_backend(
+        module_path, stub_path, backend='static',
+        cache_dir_path=cache_dir_path)
+    with open(stub_path, 'w') as f:
+        f.write(stub_str)
+    backends.add_docstring_to_stubfile_with_backend(
+        module_path, stub_path, backend='static',
+        cache_dir_path=cache_dir_path)
+
+
+def _add_docstring_by_archive(module_path: str, stub_path: str) -> None:
+    archive_path: str = f'{module_path}.zip'
+    member_name: str = os.path.basename(module_path)
+    with zipfile.ZipFile(archive_path, 'w') as zip_file:
+        zip_file.write(module_path, member_name)
+    stub_dir_path: str = f'{module_path}.out'
+    os.makedirs(stub_dir_path, exist_ok=True)
+    archive_stub_path: str = archive.get_stub_path_of_member(
+        member_name=member_name, stub_dir_path=stub_dir_path)
+    shutil.copyfile(stub_path, archive_stub_path)
+    for result in archive.add_docstring_to_stubfiles_in_archive(
+            archive_path=archive_path, stub_dir_path=stub_dir_path):
+        if not result.succeeded:
+            raise Exception(result.message)
+    shutil.copyfile(archive_stub_path, stub_path)
+
+
+def _add_docstring_by_fanout(module_path: str, stub_path: str) -> None:
+    stub_dir_path: str = f'{module_path}.fanout'
+    tree_stub_path: str = batch.get_stub_path(
+        module_path=module_path, stub_dir_path=stub_dir_path)
+    with open(stub_path) as f:
+        stub_lines: List[str] = f.read().splitlines(keepends=True)
+    top_level_line_indexes: List[int] = [
+        i for i, line in enumerate(stub_lines)
+        if line.strip() != '' and not line.startswith(' ')]
+    tree_stub_str: str = ''.join(stub_lines[:(top_level_line_indexes + [
+        len(stub_lines), len(stub_lines)])[1]])
+    os.makedirs(os.path.dirname(tree_stub_path), exist_ok=True)
+    expected_tree_stub_str: str = _run_path(
+        add_docstring=backends.add_docstring_to_stubfile_with_backend,
+        module_path=module_path, stub_path=f'{tree_stub_path}.expected',
+        stub_str=tree_stub_str)
+    if expected_tree_stub_str.startswith('<raised'):
+        tree_stub_str = ''
+    with open(tree_stub_path, 'w') as f:
+        f.write(tree_stub_str)
+    backends.add_docstring_to_stubfile_with_backend(
+        module_path, stub_path, fanout_stub_dir_paths=[stub_dir_path])
+    with open(tree_stub_path) as f:
+        if tree_stub_str != '' and f.read() != expected_tree_stub_str:
+            raise Exception('The other stub tree\'s stub diverged.')
+
+
+_PATHS: Dict[str, Callable[[str, str], None]] = {
+    'enumeration': _add_docstring_by_enumeration,
+    'demand': stubdoc.add_docstring_to_stubfile,
+    'bytecode': _add_docstring_by_bytecode,
+    'static': _add_docstring_by_static,
+    'symbols': _add_docstring_by_symbols,
+    'session': _add_docstring_by_session,
+    'index': _add_docstring_by_index,
+    'cache': _add_docstring_by_cache,
+    'archive': _add_docstring_by_archive,
+    'fanout': _add_docstring_by_fanout,
+}
+
+
+def _get_divergence(
+        *, case: _Case, path_name: str) -> Optional[Tuple[str, str]]:
+    """
+    Run the reference and a specified path on a case.
+
+    Parameters
+    ----------
+    case : _Case
+        Target case.
+    path_name : str
+        Target path name.
+
+    Returns
+    -------
+    divergence : tuple of str and str, or None
+        The reference's and the path's results if they are different.
+        None will be returned if the results are the same.
+    """
+    module_path, stub_path = _write_case(case=case)
+    stub_str: str = case.get_stub_str()
+    reference_result: str = _run_path(
+        add_docstring=_add_docstring_by_reference,
+        module_path=module_path, stub_path=stub_path, stub_str=stub_str)
+    path_result: str = _run_path(
+        add_docstring=_PATHS[path_name], module_path=module_path,
+        stub_path=stub_path, stub_str=stub_str)
+    if path_result == reference_result:
+        return None
+    return reference_result, path_result
+
+
+def _minimize_case(*, case: _Case, path_name: str) -> _Case:
+    """
+    Minimize a diverging case by removing definitions and class members
+    while the divergence remains.
+
+    Parameters
+    ----------
+    case : _Case
+        Target diverging case.
+    path_name : str
+        The diverging path name.
+
+    Returns
+    -------
+    case : _Case
+        Minimized case.
+    """
+    changed: bool = True
+    while changed:
+        changed = False
+        for i in range(len(case.definitions)):
+            candidate: _Case = _Case(
+                seed=case.seed,
+                definitions=case.definitions[:i] + case.definitions[i + 1:],
+                stub_blank_lines=(
+                    case.stub_blank_lines[:i]
+                    + case.stub_blank_lines[i + 1:]))
+            if candidate.definitions and _get_divergence(
+                    case=candidate, path_name=path_name) is not None:
+                case = candidate
+                changed = True
+                break
+        if changed:
+            continue
+        for definition in case.definitions:
+            for i in range(len(definition.members)):
+                members: List[_Member] = definition.members
+                definition.members = members[:i] + members[i + 1:]
+                if _get_divergence(
+                        case=case, path_name=path_name) is not None:
+                    changed = True
+                    break
+                definition.members = members
+            if changed:
+                break
+    return case
+
+
+def _get_reproducer(*, case: _Case, path_name: str) -> str:
+    """
+    Get a reproducer report of a diverging case.
+
+    Parameters
+    ----------
+    case : _Case
+        Target diverging case.
+    path_name : str
+        The diverging path name.
+
+    Returns
+    -------
+    reproducer : str
+        A report that contains the module source, the stub and the
+        difference of the results.
+    """
+    case = _minimize_case(case=case, path_name=path_name)
+    divergence: Optional[Tuple[str, str]] = _get_divergence(
+        case=case, path_name=path_name)
+    assert divergence is not None
+    reference_result, path_result = divergence
+    diff_str: str = '\n'.join(difflib.unified_diff(
+        reference_result.splitlines(), path_result.splitlines(),
+        fromfile='reference', tofile=path_name, lineterm=''))
+    return (
+        f'{path_name} path diverged from the reference'
+        f' (seed: {case.seed}).\n'
+        f'--- module ---\n{case.get_module_str()}'
+        f'--- stub ---\n{case.get_stub_str()}'
+        f'--- diff ---\n{diff_str}\n'
+        f'--- reference result ---\n{reference_result!r}\n'
+        f'--- {path_name} result ---\n{path_result!r}\n')
+
+
+def test_paths_match_reference() -> None:
+    for seed in range(_CASES_NUM):
+        case: _Case = _make_case(seed=seed)
+        for path_name in _PATHS:
+            if _get_divergence(case=case, path_name=path_name) is None:
+                continue
+            raise AssertionError(
+                _get_reproducer(case=case, path_name=path_name))
+    _delete_test_dir()
+
+
+def test__get_reproducer() -> None:
+
+    def add_docstring_without_newline(
+            module_path: str, stub_path: str) -> None:
+        _add_docstring_by_reference(module_path, stub_path)
+        with open(stub_path) as f:
+            stub_str: str = f.read()
+        with open(stub_path, 'w') as f:
+            f.write(stub_str.rstrip('\n'))
+
+    _PATHS['broken'] = add_docstring_without_newline
+    try:
+        case: _Case = _make_case(seed=3)
+        assert _get_divergence(case=case, path_name='broken') is not None
+        reproducer: str = _get_reproducer(case=case, path_name='broken')
+        minimized_case: _Case = _minimize_case(
+            case=case, path_name='broken')
+    finally:
+        del _PATHS['broken']
+    assert reproducer.startswith(
+        'broken path diverged from the reference (seed: 3).')
+    assert len(minimized_case.definitions) == 1
+    assert all(
+        definition.members == []
+        for definition in minimized_case.definitions)
+    _delete_test_dir()
@@ -0,0 +1,89 @@
+import os
+import shutil
+import subprocess as sp
+from typing import List
+
+import pytest
+
+from stubdoc import git
+
+_TEST_REPO_DIR_PATH: str = './tests/tmp_git_repo/'
+
+
+def setup() -> None:
+    _delete_test_repo()
+
+
+def teardown() -> None:
+    _delete_test_repo()
+
+
+def _delete_test_repo() -> None:
+    """
+    Delete the git repository added for testing.
+    """
+    shutil.rmtree(_TEST_REPO_DIR_PATH, ignore_errors=True)
+
+
+def _write_file(*, file_path: str, txt: str) -> None:
+    """
+    Write a text to a specified file path in the test repository.
+
+    Parameters
+    ----------
+    file_path : str
+        Relative file path in the test repository.
+    txt : str
+        A text to write.
+    """
+    file_path = os.path.join(_TEST_REPO_DIR_PATH, file_path)
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    with open(file_path, 'w') as f:
+        f.write(txt)
+
+
+def _run_git(*args: str) -> None:
+    """
+    Run a git command in the test repository.
+
+    Parameters
+    ----------
+    *args : str
+        The git command arguments.
+    """
+    sp.run(
+        ['git', '-c', 'user.name=test', '-c', 'user.email=test@test',
+         *args],
+        cwd=_TEST_REPO_DIR_PATH, check=True, stdout=sp.DEVNULL)
+
+
+def test_get_changed_module_paths() -> None:
+    _delete_test_repo()
+    os.makedirs(_TEST_REPO_DIR_PATH)
+    _run_git('init', '-q')
+    for file_path in (
+            'pkg/mod_1.py', 'pkg/mod_2.py', 'pkg/mod_3.py', 'README.md'):
+        _write_file(file_path=file_path, txt='a = 1\n')
+    _run_git('add', '-A')
+    _run_git('commit', '-q', '-m', 'initial')
+
+    _write_file(file_path='pkg/mod_1.py', txt='a = 2\n')
+    _write_file(file_path='pkg/mod_4.py', txt='a = 1\n')
+    _write_file(file_path='README.md', txt='changed\n')
+    os.remove(os.path.join(_TEST_REPO_DIR_PATH, 'pkg/mod_3.py'))
+
+    current_dir_path: str = os.getcwd()
+    os.chdir(_TEST_REPO_DIR_PATH)
+    try:
+        module_paths: List[str] = git.get_changed_module_paths(ref='HEAD')
+        assert module_paths == ['pkg/mod_1.py', 'pkg/mod_4.py']
+
+        os.chdir('pkg')
+        module_paths = git.get_changed_module_paths(ref='HEAD')
+        assert module_paths == ['mod_1.py', 'mod_4.py']
+
+        with pytest.raises(Exception):  # type: ignore
+            git.get_changed_module_paths(ref='not_existing_ref')
+    finally:
+        os.chdir(current_dir_path)
+    _delete_test_repo()
@@ -0,0 +1,126 @@
+import json
+import os
+import shutil
+from typing import Any, Dict
+
+import pytest
+
+from stubdoc import index
+from stubdoc import stubdoc
+
+_TEST_DIR_PATH: str = './tests/tmp_index/'
+
+_TEST_STUB_STR: str = """sample_int: int
+
+def sample_func(a: int, b: str) -> bool: ...
+
+class SampleClass:
+    def __init__(self) -> None: ...
+    @property
+    def sample_property(self) -> int: ...
+"""
+
+
+def setup() -> None:
+    _delete_test_dir()
+
+
+def teardown() -> None:
+    _delete_test_dir()
+
+
+def _delete_test_dir() -> None:
+    """
+    Delete the directory added for testing.
+    """
+    shutil.rmtree(_TEST_DIR_PATH, ignore_errors=True)
+
+
+def _make_test_stub() -> str:
+    """
+    Make a stub file of the sample module for testing.
+
+    Returns
+    -------
+    stub_path : str
+        Created stub file path.
+    """
+    os.makedirs(_TEST_DIR_PATH, exist_ok=True)
+    stub_path: str = os.path.join(_TEST_DIR_PATH, 'sample.pyi')
+    with open(stub_path, 'w') as f:
+        f.write(_TEST_STUB_STR)
+    return stub_path
+
+
+def test__get_source_hash() -> None:
+    source_hash: str = index._get_source_hash(
+        module_path='samples/sample.py')
+    assert len(source_hash) == 64
+    assert source_hash == index._get_source_hash(
+        module_path='samples/sample.py')
+    assert source_hash != index._get_source_hash(
+        module_path='samples/__init__.py')
+
+
+def test_export_docstring_index() -> None:
+    _make_test_stub()
+    index_path: str = os.path.join(_TEST_DIR_PATH, 'sample.json')
+    index.export_docstring_index(
+        original_module_path='samples/sample.py',
+        index_file_path=index_path)
+    with open(index_path) as f:
+        index_data: Dict[str, Any] = json.load(f)
+    assert index_data['format_version'] == 1
+    assert index_data['module_name'] == 'samples.sample'
+    assert index_data['source_hash'] == index._get_source_hash(
+        module_path='samples/sample.py')
+    assert index_data['docstrings']['sample_func'].startswith(
+        'Lorem ipsum dolor sit amet')
+    assert 'SampleClass.sample_property' in index_data['docstrings']
+    _delete_test_dir()
+
+
+def test__read_index() -> None:
+    os.makedirs(_TEST_DIR_PATH, exist_ok=True)
+    index_path: str = os.path.join(_TEST_DIR_PATH, 'sample.json')
+    with open(index_path, 'w') as f:
+        json.dump({'format_version': 0, 'docstrings': {}}, f)
+    with pytest.raises(ValueError):  # type: ignore
+        index._read_index(index_file_path=index_path)
+
+    index.export_docstring_index(
+        original_module_path='samples/sample.py',
+        index_file_path=index_path)
+    index_data: Dict[str, Any] = index._read_index(
+        index_file_path=index_path)
+    assert 'sample_func' in index_data['docstrings']
+    _delete_test_dir()
+
+
+def test_add_docstring_to_stubfile_from_index() -> None:
+    stub_path: str = _make_test_stub()
+    stubdoc.add_docstring_to_stubfile(
+        original_module_path='samples/sample.py',
+        stub_file_path=stub_path)
+    with open(stub_path) as f:
+        expected_stub_str: str = f.read()
+
+    stub_path = _make_test_stub()
+    index_path: str = os.path.join(_TEST_DIR_PATH, 'sample.json')
+    index.export_docstring_index(
+        original_module_path='samples/sample.py',
+        index_file_path=index_path)
+    index.add_docstring_to_stubfile_from_index(
+        index_file_path=index_path,
+        stub_file_path=stub_path,
+        original_module_path='samples/sample.py')
+    with open(stub_path) as f:
+        result_stub_str: str = f.read()
+    assert result_stub_str == expected_stub_str
+
+    with pytest.raises(ValueError):  # type: ignore
+        index.add_docstring_to_stubfile_from_index(
+            index_file_path=index_path,
+            stub_file_path=stub_path,
+            original_module_path='samples/__init__.py')
+    _delete_test_dir()
@@ -0,0 +1,211 @@
+import importlib
+import os
+import shutil
+import sys
+from typing import Dict, List, Tuple
+
+import pytest
+
+from stubdoc import backends
+from stubdoc import installed
+
+_TEST_DIR_PATH: str = './tests/tmp_installed/'
+_TEST_SITE_DIR_PATH: str = os.path.abspath(
+    './tests/tmp_installed/site-packages/')
+
+_TEST_MODULE_STR: str = '''
+def sample_func(a: int) -> int:
+    """
+    Sample function.
+    """
+    return a
+'''
+
+_TEST_STUB_STR: str = 'def sample_func(a: int) -> int: ...\n'
+
+_TEST_FILES: Dict[str, str] = {
+    'instpkg/__init__.py': _TEST_MODULE_STR,
+    'instpkg/sub.py': _TEST_MODULE_STR,
+    'instpkg/sub.pyi': _TEST_STUB_STR,
+    'instpkg/nested/__init__.py': '',
+    'instpkg/nested/deep.py': _TEST_MODULE_STR,
+    'instpkg/test-data/skipped.py': _TEST_MODULE_STR,
+    'instpkg-stubs/__init__.pyi': _TEST_STUB_STR,
+    'instpkg-stubs/nested/deep.pyi': _TEST_STUB_STR,
+    'instmod.py': _TEST_MODULE_STR,
+    'instmod-stubs/__init__.pyi': _TEST_STUB_STR,
+    'instns/portion.py': _TEST_MODULE_STR,
+}
+
+
+def setup() -> None:
+    _delete_test_site_dir()
+
+
+def teardown() -> None:
+    _delete_test_site_dir()
+
+
+def _delete_test_site_dir() -> None:
+    """
+    Delete the site directory added for testing, its `sys.path` entry
+    and its imported modules.
+    """
+    shutil.rmtree(_TEST_DIR_PATH, ignore_errors=True)
+    while _TEST_SITE_DIR_PATH in sys.path:
+        sys.path.remove(_TEST_SITE_DIR_PATH)
+    for module_name in list(sys.modules):
+        if module_name.split('.')[0] in ('instpkg', 'instmod', 'instns'):
+            sys.modules.pop(module_name)
+
+
+def _make_test_site_dir() -> None:
+    """
+    Make a site directory that has a package with a stub package and
+    an inline stub file, a single module with a stub package and
+    a namespace package, and add it to `sys.path`.
+    """
+    for file_path, file_str in _TEST_FILES.items():
+        path: str = os.path.join(_TEST_SITE_DIR_PATH, file_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(file_str)
+    sys.path.append(_TEST_SITE_DIR_PATH)
+    importlib.invalidate_caches()
+
+
+def _get_path(file_path: str) -> str:
+    """
+    Get a file's absolute path in the test site directory.
+
+    Parameters
+    ----------
+    file_path : str
+        The file path relative to the site directory.
+
+    Returns
+    -------
+    path : str
+        The absolute path.
+    """
+    return os.path.join(_TEST_SITE_DIR_PATH, file_path)
+
+
+def test_get_pairs() -> None:
+    _make_test_site_dir()
+    pairs: List[Tuple[str, str]] = installed.get_pairs(
+        module_names=['instpkg', 'instpkg.sub', 'instmod', 'instns'])
+    assert pairs == [
+        (_get_path('instpkg/__init__.py'),
+         _get_path('instpkg-stubs/__init__.pyi')),
+        (_get_path('instpkg/sub.py'), _get_path('instpkg/sub.pyi')),
+        (_get_path('instpkg/nested/deep.py'),
+         _get_path('instpkg-stubs/nested/deep.pyi')),
+        (_get_path('instmod.py'), _get_path('instmod-stubs/__init__.pyi')),
+    ]
+    assert 'instpkg' not in sys.modules
+
+    stub_dir_path: str = os.path.join(_TEST_DIR_PATH, 'out')
+    os.makedirs(os.path.join(stub_dir_path, 'instpkg'))
+    with open(os.path.join(stub_dir_path, 'instpkg', 'sub.pyi'), 'w') as f:
+        f.write(_TEST_STUB_STR)
+    pairs = installed.get_pairs(
+        module_names=['instpkg'], stub_dir_path=stub_dir_path)
+    assert pairs == [(
+        _get_path('instpkg/sub.py'),
+        os.path.join(stub_dir_path, 'instpkg', 'sub.pyi'))]
+
+    with pytest.raises(ValueError):  # type: ignore
+        installed.get_pairs(module_names=['not_existing_module'])
+    _delete_test_site_dir()
+
+
+def test_get_module_paths() -> None:
+    _make_test_site_dir()
+    module_paths: List[Tuple[str, str]] = installed.get_module_paths(
+        module_name='instpkg')
+    assert module_paths == [
+        ('instpkg', _get_path('instpkg/__init__.py')),
+        ('instpkg.sub', _get_path('instpkg/sub.py')),
+        ('instpkg.nested', _get_path('instpkg/nested/__init__.py')),
+        ('instpkg.nested.deep', _get_path('instpkg/nested/deep.py')),
+    ]
+    assert installed.get_module_paths(module_name='instpkg.nested.deep') \
+        == [('instpkg.nested.deep', _get_path('instpkg/nested/deep.py'))]
+    assert installed.get_module_paths(module_name='instns') == [
+        ('instns.portion', _get_path('instns/portion.py'))]
+    assert installed.get_module_paths(module_name='sys') == []
+    _delete_test_site_dir()
+
+
+def test__find_module() -> None:
+    _make_test_site_dir()
+    assert installed._find_module(module_name='instpkg') == (
+        _get_path('instpkg/__init__.py'), [_get_path('instpkg')])
+    assert installed._find_module(module_name='instpkg.nested') == (
+        _get_path('instpkg/nested/__init__.py'),
+        [_get_path('instpkg/nested')])
+    assert installed._find_module(module_name='instpkg.sub') == (
+        _get_path('instpkg/sub.py'), [])
+    assert installed._find_module(module_name='instmod') == (
+        _get_path('instmod.py'), [])
+    assert installed._find_module(module_name='instns') == (
+        None, [_get_path('instns')])
+
+    with pytest.raises(ValueError):  # type: ignore
+        installed._find_module(module_name='instpkg.not_existing')
+    with pytest.raises(ValueError):  # type: ignore
+        installed._find_module(module_name='instmod.not_existing')
+    with pytest.raises(ValueError):  # type: ignore
+        installed._find_module(module_name='instpkg.test-data')
+    assert 'instpkg' not in sys.modules
+    _delete_test_site_dir()
+
+
+def test_get_stub_path() -> None:
+    _make_test_site_dir()
+    assert installed.get_stub_path(
+        module_name='instpkg',
+        module_path=_get_path('instpkg/__init__.py')) == _get_path(
+            'instpkg-stubs/__init__.pyi')
+    assert installed.get_stub_path(
+        module_name='instpkg.sub',
+        module_path=_get_path('instpkg/sub.py')) == _get_path(
+            'instpkg/sub.pyi')
+    assert installed.get_stub_path(
+        module_name='instpkg.nested',
+        module_path=_get_path('instpkg/nested/__init__.py')) is None
+    assert installed.get_stub_path(
+        module_name='instmod',
+        module_path=_get_path('instmod.py')) == _get_path(
+            'instmod-stubs/__init__.pyi')
+    assert installed.get_stub_path(
+        module_name='instmod', module_path=_get_path('instmod.py'),
+        stub_dir_path=_TEST_SITE_DIR_PATH) is None
+    _delete_test_site_dir()
+
+
+def test__get_stub_path_in_dir() -> None:
+    assert installed._get_stub_path_in_dir(
+        dir_path='out', names=['a', 'b'], is_package=False) == os.path.join(
+            'out', 'a', 'b.pyi')
+    assert installed._get_stub_path_in_dir(
+        dir_path='out', names=['a', 'b'], is_package=True) == os.path.join(
+            'out', 'a', 'b', '__init__.pyi')
+    assert installed._get_stub_path_in_dir(
+        dir_path='a-stubs', names=[], is_package=True) == os.path.join(
+            'a-stubs', '__init__.pyi')
+
+
+def test_add_docstring_to_stubfile_with_backend() -> None:
+    _make_test_site_dir()
+    sys_path: List[str] = list(sys.path)
+    for module_path, stub_path in installed.get_pairs(
+            module_names=['instpkg']):
+        backends.add_docstring_to_stubfile_with_backend(
+            module_path, stub_path)
+        with open(stub_path) as f:
+            assert 'Sample function.' in f.read()
+    assert 'instpkg.sub' in sys.modules
+    assert sys.path == sys_path
+    _delete_test_site_dir()
@@ -0,0 +1,110 @@
+import os
+import shutil
+import sys
+from typing import Dict
+
+from stubdoc import profiling
+from stubdoc.profiling import ImportProfile, ImportProfiler
+
+_TEST_DIR_PATH: str = './tests/tmp_profiling/'
+_TEST_SITE_DIR_PATH: str = os.path.abspath('./tests/tmp_profiling/site/')
+
+
+def setup() -> None:
+    _delete_test_dir()
+
+
+def teardown() -> None:
+    _delete_test_dir()
+
+
+def _delete_test_dir() -> None:
+    """
+    Delete the directory added for testing, its `sys.path` entry and
+    its imported modules.
+    """
+    shutil.rmtree(_TEST_DIR_PATH, ignore_errors=True)
+    while _TEST_SITE_DIR_PATH in sys.path:
+        sys.path.remove(_TEST_SITE_DIR_PATH)
+    sys.modules.pop('profiling_ext_dep', None)
+
+
+def _make_test_modules() -> None:
+    """
+    Make a module, its slow sibling module and its slow dependency
+    module (in a directory added to `sys.path`) for testing.
+    """
+    os.makedirs(_TEST_SITE_DIR_PATH, exist_ok=True)
+    file_strs = {
+        '__init__.py': '\n',
+        'profiling_slow_sibling.py': 'import time\ntime.sleep(0.05)\n',
+        'site/profiling_ext_dep.py': 'import time\ntime.sleep(0.05)\n',
+        'profiling_mod.py': (
+            'from . import profiling_slow_sibling\n'
+            'import profiling_ext_dep\n'
+            'import os\n\n\n'
+            'def test_func() -> None:\n'
+            '    """Lorem ipsum."""\n'
+        ),
+    }
+    for file_name, file_str in file_strs.items():
+        with open(os.path.join(_TEST_DIR_PATH, file_name), 'w') as f:
+            f.write(file_str)
+    sys.path.append(_TEST_SITE_DIR_PATH)
+
+
+def test_ImportProfile() -> None:
+    profile: ImportProfile = ImportProfile(module_path='sample/path.py')
+    profile.total_seconds = 3.0
+    profile.dependency_seconds = {'numpy': 1.5, 'pandas': 0.5}
+    assert profile.dependencies_total_seconds == 2.0
+    assert profile.self_seconds == 1.0
+
+
+def test__get_top_level_package_name() -> None:
+    package_name: str = profiling._get_top_level_package_name(
+        name='numpy.linalg', globals=None, level=0)
+    assert package_name == 'numpy'
+
+    package_name = profiling._get_top_level_package_name(
+        name='sub', globals={'__package__': 'pkg.sub_pkg'}, level=1)
+    assert package_name == 'pkg'
+
+    package_name = profiling._get_top_level_package_name(
+        name='', globals={'__package__': 'pkg'}, level=1)
+    assert package_name == 'pkg'
+
+    package_name = profiling._get_top_level_package_name(
+        name='sub', globals={'__package__': 'pkg'}, level=2)
+    assert package_name == ''
+
+    package_name = profiling._get_top_level_package_name(
+        name='sub', globals={'__package__': None}, level=1)
+    assert package_name == ''
+
+
+def test_ImportProfiler() -> None:
+    _make_test_modules()
+    profiler: ImportProfiler = ImportProfiler()
+    docstring_index: Dict[str, str] = profiler.get_docstring_index(
+        module_path='./tests/tmp_profiling/profiling_mod.py')
+    assert docstring_index == {'test_func': 'Lorem ipsum.'}
+
+    assert len(profiler.profiles) == 1
+    profile: ImportProfile = profiler.profiles[0]
+    assert profile.dependency_seconds['profiling_ext_dep'] >= 0.04
+    assert 'tests' not in profile.dependency_seconds
+    assert 'time' not in profile.dependency_seconds
+    assert profile.total_seconds >= profile.dependencies_total_seconds
+    assert profile.self_seconds >= 0.04
+
+    profiler.read_module(
+        module_path='./tests/tmp_profiling/profiling_mod.py')
+    report: str = profiler.get_report()
+    lines = report.splitlines()
+    assert lines[0].startswith('Import cost profile')
+    assert './tests/tmp_profiling/profiling_mod.py  (profiling_ext_dep 0.0' \
+        in lines[2]
+    assert lines[3].endswith('./tests/tmp_profiling/profiling_mod.py')
+    assert len(lines) == 4
+    _delete_test_dir()
@@ -0,0 +1,217 @@
+"""Tests that check the docstring adding processing time grows linearly
+with the input size.
+
+Each case makes generated inputs of size N, 2N and 4N, and checks the
+growth ratios of the processing time. A linear implementation takes
+about 2 and 4 times, and a quadratic one takes about 4 and 16 times, so
+the bounds are set between them (with a margin for timing noise).
+"""
+
+import gc
+import time
+from types import ModuleType
+from typing import Callable, Dict, List, Tuple
+
+from stubdoc import stubdoc
+
+_REPEAT_NUM: int = 7
+_MAX_DOUBLE_RATIO: float = 3.5
+_MAX_QUADRUPLE_RATIO: float = 8.0
+
+
+def _make_functions_input(*, size: int) -> Tuple[str, str]:
+    """
+    Make a module source and a stub string that have many functions.
+
+    Parameters
+    ----------
+    size : int
+        The number of functions.
+
+    Returns
+    -------
+    module_str : str
+        Made module source.
+    stub_str : str
+        Made stub string.
+    """
+    module_lines: List[str] = []
+    stub_lines: List[str] = []
+    for i in range(size):
+        module_lines.append(
+            f'def func_{i}(a: int) -> int:\n'
+            f'    """\n'
+            f'    Function {i}.\n'
+            f'    """\n'
+            f'    return a\n')
+        stub_lines.append(f'def func_{i}(a: int) -> int: ...\n')
+    return '\n'.join(module_lines), '\n'.join(stub_lines)
+
+
+def _make_methods_input(*, size: int) -> Tuple[str, str]:
+    """
+    Make a module source and a stub string that have a class with many
+    methods.
+
+    Parameters
+    ----------
+    size : int
+        The number of methods.
+
+    Returns
+    -------
+    module_str : str
+        Made module source.
+    stub_str : str
+        Made stub string.
+    """
+    module_lines: List[str] = [
+        'class SampleClass:\n'
+        '    """\n'
+        '    Sample class.\n'
+        '    """\n']
+    stub_lines: List[str] = ['class SampleClass:']
+    for i in range(size):
+        module_lines.append(
+            f'    def method_{i}(self, a: int) -> int:\n'
+            f'        """\n'
+            f'        Method {i}.\n'
+            f'        """\n'
+            f'        return a\n')
+        stub_lines.append(f'    def method_{i}(self, a: int) -> int: ...')
+    return '\n'.join(module_lines), '\n'.join(stub_lines) + '\n'
+
+
+def _make_long_docstrings_input(*, size: int) -> Tuple[str, str]:
+    """
+    Make a module source and a stub string that have a function and
+    a class that have long docstrings.
+
+    Parameters
+    ----------
+    size : int
+        The number of each docstring's lines.
+
+    Returns
+    -------
+    module_str : str
+        Made module source.
+    stub_str : str
+        Made stub string.
+    """
+    docstring_lines: List[str] = [
+        f'Lorem ipsum dolor sit amet {i}.' for i in range(size)]
+    function_docstring: str = '\n    '.join(docstring_lines)
+    method_docstring: str = '\n        '.join(docstring_lines)
+    module_str: str = (
+        f'def sample_func(a: int) -> int:\n'
+        f'    """\n'
+        f'    {function_docstring}\n'
+        f'    """\n'
+        f'    return a\n'
+        f'\n'
+        f'\n'
+        f'class SampleClass:\n'
+        f'    """\n'
+        f'    {function_docstring}\n'
+        f'    """\n'
+        f'\n'
+        f'    def sample_method(self, a: int) -> int:\n'
+        f'        """\n'
+        f'        {method_docstring}\n'
+        f'        """\n'
+        f'        return a\n'
+    )
+    stub_str: str = (
+        'def sample_func(a: int) -> int: ...\n'
+        '\n'
+        'class SampleClass:\n'
+        '    def sample_method(self, a: int) -> int: ...\n'
+    )
+    return module_str, stub_str
+
+
+def _get_processing_seconds(*, module: ModuleType, stub_str: str) -> float:
+    """
+    Get the processing time of adding docstrings to a stub string
+    (declared names extraction, docstring lookup and docstring adding).
+
+    Parameters
+    ----------
+    module : ModuleType
+        A module to get docstrings from.
+    stub_str : str
+        A target stub string.
+
+    Returns
+    -------
+    seconds : float
+        The processing time.
+    """
+    start_time: float = time.perf_counter()
+    names: List[str] = stubdoc._get_declared_names(stub_str=stub_str)
+    docstring_index: Dict[str, str] = \
+        stubdoc._get_docstring_index_from_module_by_names(
+            module=module, names=names)
+    stubdoc._add_docstrings_to_stub_str(
+        stub_str=stub_str, docstring_index=docstring_index)
+    return time.perf_counter() - start_time
+
+
+def _assert_linear_growth(
+        *, make_input: Callable[..., Tuple[str, str]], size: int) -> None:
+    """
+    Check that processing time of the N, 2N and 4N size inputs grows
+    linearly.
+
+    Notes
+    -----
+    Each size is measured in turn for the repetitions and the shortest
+    time of each size is used, so that a temporary slowdown of the
+    machine does not affect only one size. Garbage collection is
+    disabled while measuring (same as the timeit module).
+
+    Parameters
+    ----------
+    make_input : Callable
+        The function that makes a module source and a stub string of
+        a specified size.
+    size : int
+        The base size (N) of the inputs.
+    """
+    inputs: List[Tuple[ModuleType, str]] = []
+    for input_size in (size, size * 2, size * 4):
+        module_str, stub_str = make_input(size=input_size)
+        module: ModuleType = ModuleType('stubdoc_scaling_test_module')
+        exec(module_str, module.__dict__)
+        inputs.append((module, stub_str))
+
+    seconds_list: List[float] = [float('inf')] * len(inputs)
+    gc_enabled: bool = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(_REPEAT_NUM):
+            for i, (module, stub_str) in enumerate(inputs):
+                seconds_list[i] = min(
+                    seconds_list[i],
+                    _get_processing_seconds(module=module, stub_str=stub_str))
+    finally:
+        if gc_enabled:
+            gc.enable()
+    double_ratio: float = seconds_list[1] / seconds_list[0]
+    quadruple_ratio: float = seconds_list[2] / seconds_list[0]
+    assert double_ratio < _MAX_DOUBLE_RATIO, seconds_list
+    assert quadruple_ratio < _MAX_QUADRUPLE_RATIO, seconds_list
+
+
+def test_functions_scale_linearly() -> None:
+    _assert_linear_growth(make_input=_make_functions_input, size=1000)
+
+
+def test_methods_scale_linearly() -> None:
+    _assert_linear_growth(make_input=_make_methods_input, size=1000)
+
+
+def test_long_docstrings_scale_linearly() -> None:
+    _assert_linear_growth(
+        make_input=_make_long_docstrings_input, size=8000)
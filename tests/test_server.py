@@ -0,0 +1,151 @@
+import os
+import shutil
+import sys
+import threading
+from typing import Dict, List
+
+from stubdoc import server
+from stubdoc.batch import PairResult
+
+_TEST_DIR_PATH: str = './tests/tmp_server/'
+_TEST_MODULE_PATH: str = './tests/tmp_server/server_mod.py'
+_TEST_STUB_PATH: str = './tests/tmp_server/server_mod.pyi'
+_TEST_SOCKET_PATH: str = './tests/tmp_server/stubdoc.sock'
+
+
+def setup() -> None:
+    _delete_test_dir()
+
+
+def teardown() -> None:
+    _delete_test_dir()
+
+
+def _delete_test_dir() -> None:
+    """
+    Delete the directory added for testing.
+    """
+    shutil.rmtree(_TEST_DIR_PATH, ignore_errors=True)
+
+
+def _write_test_module(*, docstring: str, mtime_ns: int) -> None:
+    """
+    Write a module and its stub file for testing.
+
+    Parameters
+    ----------
+    docstring : str
+        The module function's docstring.
+    mtime_ns : int
+        The module's modification time to set.
+    """
+    os.makedirs(_TEST_DIR_PATH, exist_ok=True)
+    with open(os.path.join(_TEST_DIR_PATH, '__init__.py'), 'w') as f:
+        f.write('\n')
+    with open(_TEST_MODULE_PATH, 'w') as f:
+        f.write(f'def test_func() -> None:\n    """{docstring}"""\n')
+    os.utime(_TEST_MODULE_PATH, ns=(mtime_ns, mtime_ns))
+    with open(_TEST_STUB_PATH, 'w') as f:
+        f.write('def test_func() -> None: ...\n')
+
+
+def test__DocstringIndexCache() -> None:
+    _write_test_module(docstring='Lorem ipsum.', mtime_ns=10 ** 18)
+    cache = server._DocstringIndexCache()
+    docstring_index: Dict[str, str] = cache.get_docstring_index(
+        module_path=_TEST_MODULE_PATH)
+    assert docstring_index == {'test_func': 'Lorem ipsum.'}
+    assert cache.get_docstring_index(
+        module_path=_TEST_MODULE_PATH) is docstring_index
+
+    _write_test_module(docstring='Dolor sit amet.', mtime_ns=10 ** 18 + 1)
+    docstring_index = cache.get_docstring_index(
+        module_path=_TEST_MODULE_PATH)
+    assert docstring_index == {'test_func': 'Dolor sit amet.'}
+    _delete_test_dir()
+
+
+def test__get_docstring_index_by_sys_path() -> None:
+    site_dir_path: str = os.path.abspath(
+        os.path.join(_TEST_DIR_PATH, 'site'))
+    os.makedirs(site_dir_path)
+    module_path: str = os.path.join(site_dir_path, 'server_site_mod.py')
+    with open(module_path, 'w') as f:
+        f.write('def test_func() -> None:\n    """Lorem ipsum."""\n')
+    sys.path.append(site_dir_path)
+    try:
+        assert server._get_docstring_index_by_sys_path(
+            module_path=module_path) == {'test_func': 'Lorem ipsum.'}
+        with open(module_path, 'w') as f:
+            f.write('def test_func() -> None:\n    """Dolor sit."""\n')
+        assert server._get_docstring_index_by_sys_path(
+            module_path=module_path) == {'test_func': 'Dolor sit.'}
+    finally:
+        sys.path.remove(site_dir_path)
+        sys.modules.pop('server_site_mod', None)
+    _delete_test_dir()
+
+
+def test_request() -> None:
+    _write_test_module(docstring='Lorem ipsum.', mtime_ns=10 ** 18)
+    stubdoc_server = server._make_server(socket_path=_TEST_SOCKET_PATH)
+    thread = threading.Thread(target=stubdoc_server.serve_forever)
+    thread.start()
+    try:
+        results: List[PairResult] = list(server.request(
+            socket_path=_TEST_SOCKET_PATH,
+            pairs=[
+                (_TEST_MODULE_PATH, _TEST_STUB_PATH),
+                (_TEST_MODULE_PATH, './tests/tmp_server/not_existing.pyi'),
+            ]))
+    finally:
+        stubdoc_server.shutdown()
+        stubdoc_server.server_close()
+        thread.join()
+    assert [result.succeeded for result in results] == [True, False]
+    assert results[0].module_path == _TEST_MODULE_PATH
+    with open(_TEST_STUB_PATH) as f:
+        stub_str: str = f.read()
+    assert stub_str == (
+        'def test_func() -> None:'
+        '\n    """'
+        '\n    Lorem ipsum.'
+        '\n    """\n'
+    )
+    _delete_test_dir()
+
+
+def test_request_with_cwd() -> None:
+    for i in (1, 2):
+        dir_path: str = os.path.join(_TEST_DIR_PATH, f'cwd_{i}', 'pkg')
+        os.makedirs(dir_path)
+        with open(os.path.join(dir_path, '__init__.py'), 'w') as f:
+            f.write('\n')
+        with open(os.path.join(dir_path, 'mod.py'), 'w') as f:
+            f.write(f'def test_func() -> None:\n    """Lorem {i}."""\n')
+        with open(os.path.join(dir_path, 'mod.pyi'), 'w') as f:
+            f.write('def test_func() -> None: ...\n')
+    cwd: str = os.getcwd()
+    stubdoc_server = server._make_server(socket_path=_TEST_SOCKET_PATH)
+    thread = threading.Thread(target=stubdoc_server.serve_forever)
+    thread.start()
+    try:
+        for i in (1, 2):
+            results: List[PairResult] = list(server.request(
+                socket_path=_TEST_SOCKET_PATH,
+                pairs=[('pkg/mod.py', 'pkg/mod.pyi')],
+                cwd=os.path.join(_TEST_DIR_PATH, f'cwd_{i}')))
+            assert [result.succeeded for result in results] == [True]
+            assert os.getcwd() == cwd
+    finally:
+        stubdoc_server.shutdown()
+        stubdoc_server.server_close()
+        thread.join()
+    for i in (1, 2):
+        with open(os.path.join(
+                _TEST_DIR_PATH, f'cwd_{i}', 'pkg', 'mod.pyi')) as f:
+            stub_str: str = f.read()
+        assert f'Lorem {i}.' in stub_str
+        assert f'Lorem {3 - i}.' not in stub_str
+    assert 'pkg.mod' not in sys.modules
+    _delete_test_dir()
@@ -0,0 +1,214 @@
+import os
+import shutil
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from types import ModuleType
+from typing import Dict, List
+
+import pytest
+
+from stubdoc.session import StubdocSession
+from stubdoc import session as session_module
+
+_TEST_DIR_PATH: str = './tests/tmp_session/'
+_TEST_PACKAGE_DIR_PATH: str = './tests/tmp_session/root/nspkg/pkg/'
+
+_TEST_MODULE_STR: str = '''
+from .sibling import sibling_func
+
+
+def test_func_{i}(a: int) -> int:
+    """
+    Test function {i}.
+    """
+    return sibling_func(a)
+'''
+
+_TEST_STUB_STR: str = 'def test_func_{i}(a: int) -> int: ...\n'
+
+
+def setup() -> None:
+    _delete_test_dir()
+
+
+def teardown() -> None:
+    _delete_test_dir()
+
+
+def _delete_test_dir() -> None:
+    """
+    Delete the directory added for testing.
+    """
+    shutil.rmtree(_TEST_DIR_PATH, ignore_errors=True)
+
+
+def _make_test_package(*, modules_num: int) -> None:
+    """
+    Make a package (in a namespace package) and stub files for testing.
+
+    Parameters
+    ----------
+    modules_num : int
+        The number of modules to make.
+    """
+    os.makedirs(_TEST_PACKAGE_DIR_PATH, exist_ok=True)
+    with open(os.path.join(_TEST_PACKAGE_DIR_PATH, '__init__.py'), 'w') as f:
+        f.write('"""Test package."""\n')
+    with open(os.path.join(_TEST_PACKAGE_DIR_PATH, 'sibling.py'), 'w') as f:
+        f.write('def sibling_func(a):\n    return a\n')
+    for i in range(modules_num):
+        module_path: str = os.path.join(_TEST_PACKAGE_DIR_PATH, f'mod{i}.py')
+        with open(module_path, 'w') as f:
+            f.write(_TEST_MODULE_STR.format(i=i))
+        with open(module_path + 'i', 'w') as f:
+            f.write(_TEST_STUB_STR.format(i=i))
+
+
+def test_StubdocSession___init__() -> None:
+    with pytest.raises(ValueError):  # type: ignore
+        StubdocSession(backend='not_existing_backend')
+
+    session: StubdocSession = StubdocSession()
+    assert session.root_dir_path == os.getcwd()
+    assert session.backend == 'import'
+
+
+def test_StubdocSession_add_docstring_to_stubfile() -> None:
+    modules_num: int = 8
+    _make_test_package(modules_num=modules_num)
+    sys_path: List[str] = list(sys.path)
+    session: StubdocSession = StubdocSession(
+        root_dir_path=os.path.join(_TEST_DIR_PATH, 'root'))
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [
+            executor.submit(
+                session.add_docstring_to_stubfile,
+                f'nspkg/pkg/mod{i}.py', f'nspkg/pkg/mod{i}.pyi')
+            for i in range(modules_num)]
+        for future in futures:
+            future.result()
+    assert sys.path == sys_path
+    assert 'nspkg' not in sys.modules
+    assert 'nspkg.pkg.mod0' not in sys.modules
+    assert 'nspkg.pkg.sibling' in session._modules
+
+    for i in range(modules_num):
+        stub_path: str = os.path.join(
+            _TEST_PACKAGE_DIR_PATH, f'mod{i}.pyi')
+        with open(stub_path) as f:
+            stub_str: str = f.read()
+        assert stub_str == (
+            f'def test_func_{i}(a: int) -> int:\n'
+            '    """\n'
+            f'    Test function {i}.\n'
+            '    """\n'
+        )
+
+    session.update_docstrings_in_stubfile(
+        'nspkg/pkg/mod0.py', 'nspkg/pkg/mod0.pyi')
+    with open(os.path.join(_TEST_PACKAGE_DIR_PATH, 'mod0.pyi')) as f:
+        assert f.read().count('Test function 0.') == 1
+
+    session = StubdocSession(
+        root_dir_path=os.path.join(_TEST_DIR_PATH, 'root'))
+    session.add_docstring_to_stubfile(
+        'nspkg/pkg/mod1.py', 'nspkg/pkg/mod1.pyi')
+    assert session._modules == {}
+    with open(os.path.join(_TEST_PACKAGE_DIR_PATH, 'mod1.pyi')) as f:
+        assert f.read().count('Test function 1.') == 1
+    _delete_test_dir()
+
+
+def test_StubdocSession_get_docstring_index() -> None:
+    _make_test_package(modules_num=1)
+    session: StubdocSession = StubdocSession(
+        root_dir_path=os.path.join(_TEST_DIR_PATH, 'root'))
+    docstring_index: Dict[str, str] = session.get_docstring_index(
+        module_path='nspkg/pkg/__init__.py')
+    assert docstring_index == {}
+    assert session._modules['nspkg.pkg'].__doc__ == 'Test package.'
+
+    with pytest.raises(Exception):  # type: ignore
+        session.get_docstring_index(module_path='../outside.py')
+
+    with open(os.path.join(_TEST_PACKAGE_DIR_PATH, 'broken.py'), 'w') as f:
+        f.write('raise ValueError\n')
+    with pytest.raises(Exception):  # type: ignore
+        session.get_docstring_index(module_path='nspkg/pkg/broken.py')
+    assert 'nspkg.pkg.broken' not in session._modules
+    assert 'nspkg.pkg.broken' not in sys.modules
+
+    session = StubdocSession(backend='static')
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        docstring_indexes: List[Dict[str, str]] = list(executor.map(
+            session.get_docstring_index,
+            ['samples/sample.py', 'samples/sample.py']))
+    assert docstring_indexes[0] == docstring_indexes[1]
+    assert 'sample_func' in docstring_indexes[0]
+    _delete_test_dir()
+
+
+def test_StubdocSession_get_docstring_index_isolation() -> None:
+    _make_test_package(modules_num=1)
+    host_module: ModuleType = ModuleType('nspkg.pkg.mod0')
+    host_module.test_func_0 = lambda: None  # type: ignore
+    host_module.test_func_0.__doc__ = 'Host function.'  # type: ignore
+    host_modules: Dict[str, ModuleType] = {
+        'nspkg': ModuleType('nspkg'),
+        'nspkg.pkg': ModuleType('nspkg.pkg'),
+        'nspkg.pkg.mod0': host_module,
+    }
+    sys.modules.update(host_modules)
+    root_dir_path: str = os.path.join(_TEST_DIR_PATH, 'root')
+    with open(os.path.join(root_dir_path, 'session_helper.py'), 'w') as f:
+        f.write('def helper_func():\n    """Helper function."""\n')
+    with open(os.path.join(root_dir_path, 'session_top.py'), 'w') as f:
+        f.write('from session_helper import helper_func\n')
+    try:
+        session: StubdocSession = StubdocSession(
+            root_dir_path=root_dir_path)
+        assert session.get_docstring_index(
+            module_path='nspkg/pkg/mod0.py') == {
+                'test_func_0': 'Test function 0.'}
+        assert session.get_docstring_index(
+            module_path='session_top.py') == {}
+        for name, module in host_modules.items():
+            assert sys.modules[name] is module
+        assert 'nspkg.pkg.sibling' not in sys.modules
+        assert 'session_helper' not in sys.modules
+        assert session._modules['session_helper'].__doc__ is None
+    finally:
+        for name in host_modules:
+            sys.modules.pop(name, None)
+    _delete_test_dir()
+
+
+def test__RootFinder_find_spec() -> None:
+    finder = session_module._RootFinder(
+        root_dir_path=os.path.abspath('./samples'), names={'sample'})
+    spec = finder.find_spec('sample', None)
+    assert spec is not None
+    assert spec.origin == os.path.abspath('./samples/sample.py')
+    assert finder.find_spec('sample', ['./samples']) is None
+    assert finder.find_spec('os', None) is None
+
+
+def test__get_project_names() -> None:
+    _make_test_package(modules_num=1)
+    root_dir_path: str = os.path.join(_TEST_DIR_PATH, 'root')
+    os.makedirs(os.path.join(root_dir_path, 'not-package'))
+    with open(os.path.join(root_dir_path, 'top_mod.py'), 'w') as f:
+        f.write('\n')
+    with open(os.path.join(root_dir_path, 'top_mod.pyi'), 'w') as f:
+        f.write('\n')
+    assert session_module._get_project_names(
+        root_dir_path=root_dir_path, package_name='nspkg') == {
+            'nspkg', 'top_mod'}
+    _delete_test_dir()
+
+
+def test__make_namespace_package() -> None:
+    package = session_module._make_namespace_package(
+        package_name='sample_namespace', dir_path='./samples')
+    assert package.__name__ == 'sample_namespace'
+    assert list(package.__path__) == ['./samples']
@@ -0,0 +1,298 @@
+import json
+import os
+import shutil
+from typing import Dict, List, Set, Tuple
+
+import pytest
+
+from stubdoc import shard
+from stubdoc.batch import PairResult
+
+_TEST_DIR_PATH: str = './tests/tmp_shard/'
+
+
+def setup() -> None:
+    _delete_test_dir()
+
+
+def teardown() -> None:
+    _delete_test_dir()
+
+
+def _delete_test_dir() -> None:
+    """
+    Delete the directory added for testing.
+    """
+    shutil.rmtree(_TEST_DIR_PATH, ignore_errors=True)
+
+
+def _make_test_modules(*, sizes: List[int]) -> List[Tuple[str, str]]:
+    """
+    Make modules of specified source sizes for testing.
+
+    Parameters
+    ----------
+    sizes : list of int
+        Each module's source size.
+
+    Returns
+    -------
+    pairs : list of tuple of str and str
+        Pairs of the made module path and its stub file path.
+    """
+    os.makedirs(_TEST_DIR_PATH, exist_ok=True)
+    pairs: List[Tuple[str, str]] = []
+    for i, size in enumerate(sizes):
+        module_path: str = os.path.join(_TEST_DIR_PATH, f'mod_{i}.py')
+        with open(module_path, 'w') as f:
+            f.write('#' * size)
+        pairs.append((module_path, f'out/mod_{i}.pyi'))
+    return pairs
+
+
+def _make_result(
+        *, module_path: str, succeeded: bool = True,
+        elapsed_seconds: float = 1.0) -> PairResult:
+    """
+    Make a processing result for testing.
+
+    Parameters
+    ----------
+    module_path : str
+        The result's module path.
+    succeeded : bool, default True
+        Whether the processing succeeded.
+    elapsed_seconds : float, default 1.0
+        The processing time.
+
+    Returns
+    -------
+    result : PairResult
+        Made result.
+    """
+    return PairResult(
+        module_path=module_path, stub_path=f'out/{module_path}i',
+        succeeded=succeeded, message='' if succeeded else 'error',
+        elapsed_seconds=elapsed_seconds)
+
+
+def test_parse_shard() -> None:
+    assert shard.parse_shard('2/4') == (2, 4)
+    assert shard.parse_shard('1/1') == (1, 1)
+    for shard_str in ('0/4', '5/4', '2', '2/', 'a/4', '-1/4', '2/4/1'):
+        with pytest.raises(ValueError):  # type: ignore
+            shard.parse_shard(shard_str)
+
+
+def test_get_shard_pairs() -> None:
+    pairs: List[Tuple[str, str]] = _make_test_modules(
+        sizes=[100, 10, 60, 50, 30, 10, 20])
+    shard_pairs_list: List[List[Tuple[str, str]]] = [
+        shard.get_shard_pairs(
+            pairs=pairs, shard_index=shard_index, shard_count=3)
+        for shard_index in (1, 2, 3)]
+    assert sorted(sum(shard_pairs_list, [])) == sorted(pairs)
+    assert shard_pairs_list[0] == [pairs[0]]
+    assert shard_pairs_list[1] == [pairs[2], pairs[6], pairs[1]]
+    assert shard_pairs_list[2] == [pairs[3], pairs[4], pairs[5]]
+
+    reversed_shard_pairs: List[Tuple[str, str]] = shard.get_shard_pairs(
+        pairs=reversed(pairs), shard_index=2, shard_count=3)
+    assert reversed_shard_pairs == shard_pairs_list[1]
+
+    timings: Dict[str, float] = {
+        shard._get_path_key(path=module_path): 1.0
+        for module_path, _ in pairs}
+    timings[shard._get_path_key(path=pairs[1][0])] = 10.0
+    shard_pairs: List[Tuple[str, str]] = shard.get_shard_pairs(
+        pairs=pairs, shard_index=1, shard_count=2, timings=timings)
+    assert shard_pairs == [pairs[1]]
+
+    shard_pairs = shard.get_shard_pairs(
+        pairs=pairs, shard_index=2, shard_count=10)
+    assert shard_pairs == [pairs[2]]
+    _delete_test_dir()
+
+
+def test_get_longest_first_pairs() -> None:
+    pairs: List[Tuple[str, str]] = _make_test_modules(
+        sizes=[10, 100, 50, 50])
+    assert shard.get_longest_first_pairs(pairs=reversed(pairs)) == [
+        pairs[1], pairs[2], pairs[3], pairs[0]]
+
+    timings: Dict[str, float] = {
+        shard._get_path_key(path=pairs[0][0]): 3.0,
+        shard._get_path_key(path=pairs[1][0]): 1.0}
+    assert shard.get_longest_first_pairs(pairs=pairs, timings=timings) == [
+        pairs[0], pairs[2], pairs[3], pairs[1]]
+
+    timings[shard._get_path_key(path=pairs[1][0])] = 10.0
+    assert shard.get_longest_first_pairs(pairs=pairs, timings=timings) == [
+        pairs[1], pairs[2], pairs[3], pairs[0]]
+    _delete_test_dir()
+
+
+def test__get_sorted_pair_weights() -> None:
+    pairs: List[Tuple[str, str]] = _make_test_modules(sizes=[10, 100, 10])
+    pair_weights: List[Tuple[Tuple[str, str], float]] = \
+        shard._get_sorted_pair_weights(pairs=pairs, timings=None)
+    assert pair_weights == [
+        (pairs[1], 100.0), (pairs[0], 10.0), (pairs[2], 10.0)]
+    _delete_test_dir()
+
+
+def test__get_pair_weights() -> None:
+    pairs: List[Tuple[str, str]] = _make_test_modules(sizes=[100, 10, 50])
+    pairs.append(('not_existing_module.py', 'out/not_existing_module.pyi'))
+    pair_weights: List[Tuple[Tuple[str, str], float]] = \
+        shard._get_pair_weights(pairs=pairs, timings={})
+    assert pair_weights == [
+        (pairs[0], 100.0), (pairs[1], 10.0), (pairs[2], 50.0),
+        (pairs[3], 0.0)]
+
+    pair_weights = shard._get_pair_weights(
+        pairs=pairs, timings={
+            shard._get_path_key(path=pairs[0][0]): 2.0,
+            shard._get_path_key(path=pairs[1][0]): 0.2})
+    assert [weight for _, weight in pair_weights] == pytest.approx(
+        [2.0, 0.2, 1.0, 0.0])
+    _delete_test_dir()
+
+
+def test__get_source_size() -> None:
+    pairs: List[Tuple[str, str]] = _make_test_modules(sizes=[100])
+    assert shard._get_source_size(module_path=pairs[0][0]) == 100
+    assert shard._get_source_size(module_path='not_existing.py') == 0
+    _delete_test_dir()
+
+
+def test__get_path_key() -> None:
+    assert shard._get_path_key(path='./sample/path.py') == 'sample/path.py'
+    assert shard._get_path_key(path='sample//path.py') == 'sample/path.py'
+
+
+def test_write_results() -> None:
+    file_path: str = os.path.join(_TEST_DIR_PATH, 'results', 'shard.json')
+    results: List[PairResult] = [_make_result(module_path='sample/a.py')]
+    shard.write_results(results=results, file_path=file_path, shard=(2, 4))
+    with open(file_path) as f:
+        results_data: Dict = json.load(f)
+    assert results_data['format_version'] == 1
+    assert results_data['shard'] == [2, 4]
+    assert results_data['results'] == [results[0].to_dict()]
+    _delete_test_dir()
+
+
+def test_read_results() -> None:
+    file_path: str = os.path.join(_TEST_DIR_PATH, 'results.json')
+    results: List[PairResult] = [
+        _make_result(module_path='sample/a.py'),
+        _make_result(module_path='sample/b.py', succeeded=False)]
+    shard.write_results(results=results, file_path=file_path)
+    read_results: List[PairResult] = shard.read_results(file_path=file_path)
+    assert [result.to_dict() for result in read_results] == [
+        result.to_dict() for result in results]
+
+    with open(file_path, 'w') as f:
+        json.dump({'format_version': 0, 'results': []}, f)
+    with pytest.raises(ValueError):  # type: ignore
+        shard.read_results(file_path=file_path)
+    _delete_test_dir()
+
+
+def test_read_timings() -> None:
+    file_path: str = os.path.join(_TEST_DIR_PATH, 'results.json')
+    shard.write_results(
+        results=[
+            _make_result(module_path='./sample/a.py', elapsed_seconds=1.5),
+            _make_result(module_path='sample/b.py', elapsed_seconds=0.5)],
+        file_path=file_path)
+    timings: Dict[str, float] = shard.read_timings(file_path=file_path)
+    assert timings == {'sample/a.py': 1.5, 'sample/b.py': 0.5}
+    _delete_test_dir()
+
+
+def test_update_timings_file() -> None:
+    file_path: str = os.path.join(_TEST_DIR_PATH, 'cache', 'timings.json')
+    shard.update_timings_file(
+        results=[
+            _make_result(module_path='sample/b.py', elapsed_seconds=2.0),
+            _make_result(module_path='sample/a.py', elapsed_seconds=1.0)],
+        file_path=file_path)
+    assert shard.read_timings(file_path=file_path) == {
+        'sample/a.py': 1.0, 'sample/b.py': 2.0}
+
+    shard.update_timings_file(
+        results=[
+            _make_result(module_path='./sample/b.py', elapsed_seconds=0.5),
+            _make_result(module_path='sample/c.py', elapsed_seconds=3.0)],
+        file_path=file_path)
+    assert shard.read_timings(file_path=file_path) == {
+        'sample/a.py': 1.0, 'sample/b.py': 0.5, 'sample/c.py': 3.0}
+    assert os.listdir(os.path.dirname(file_path)) == ['timings.json']
+
+    with open(file_path, 'w') as f:
+        f.write('broken')
+    shard.update_timings_file(
+        results=[_make_result(module_path='sample/d.py')],
+        file_path=file_path)
+    assert shard.read_timings(file_path=file_path) == {'sample/d.py': 1.0}
+    _delete_test_dir()
+
+
+def test_get_results_file_paths() -> None:
+    for shard_index in (1, 2):
+        shard.write_results(
+            results=[], shard=(shard_index, 2),
+            file_path=os.path.join(
+                _TEST_DIR_PATH, f'shard-{shard_index}.json'))
+    file_paths: List[str] = shard.get_results_file_paths(
+        patterns=f'{_TEST_DIR_PATH}shard-*.json,'
+                 f' {_TEST_DIR_PATH}shard-1.json,')
+    assert file_paths == [
+        os.path.join(_TEST_DIR_PATH, 'shard-1.json'),
+        os.path.join(_TEST_DIR_PATH, 'shard-2.json')]
+
+    with pytest.raises(ValueError):  # type: ignore
+        shard.get_results_file_paths(
+            patterns=f'{_TEST_DIR_PATH}not_existing-*.json')
+    _delete_test_dir()
+
+
+def test_merge_results_files() -> None:
+    pairs: List[Tuple[str, str]] = _make_test_modules(
+        sizes=[100, 10, 60, 50, 30])
+    file_paths: List[str] = []
+    for shard_index in (1, 2, 3):
+        file_path: str = os.path.join(
+            _TEST_DIR_PATH, f'shard-{shard_index}.json')
+        shard.write_results(
+            results=[
+                _make_result(module_path=module_path)
+                for module_path, _ in shard.get_shard_pairs(
+                    pairs=pairs, shard_index=shard_index, shard_count=3)],
+            file_path=file_path, shard=(shard_index, 3))
+        file_paths.append(file_path)
+    results: List[PairResult] = shard.merge_results_files(
+        file_paths=file_paths)
+    assert [result.module_path for result in results] == sorted(
+        module_path for module_path, _ in pairs)
+
+    with pytest.raises(ValueError):  # type: ignore
+        shard.merge_results_files(file_paths=file_paths[:2])
+    with pytest.raises(ValueError):  # type: ignore
+        shard.merge_results_files(
+            file_paths=file_paths + [file_paths[0]])
+
+    shard.write_results(
+        results=[], file_path=file_paths[2], shard=(3, 4))
+    with pytest.raises(ValueError):  # type: ignore
+        shard.merge_results_files(file_paths=file_paths)
+
+    merged_file_path: str = os.path.join(_TEST_DIR_PATH, 'merged.json')
+    shard.write_results(results=results, file_path=merged_file_path)
+    merged_module_paths: Set[str] = {
+        result.module_path for result in shard.merge_results_files(
+            file_paths=[merged_file_path])}
+    assert merged_module_paths == {module_path for module_path, _ in pairs}
+    _delete_test_dir()
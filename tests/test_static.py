@@ -0,0 +1,130 @@
+import ast
+import sys
+from typing import Dict, List
+
+from stubdoc import static
+from stubdoc import stubdoc
+
+_TEST_SOURCE_STR: str = '''
+import sys
+
+try:
+    from os import path
+except ImportError:
+    def path() -> None:
+        """Fallback function."""
+
+if sys.version_info >= (3, 0):
+    async def test_func_1() -> None:
+        """
+        Lorem ipsum dolor sit amet.
+        """
+else:
+    def test_func_1() -> None:
+        pass
+
+
+def test_func_2() -> str:
+    return 'Not a docstring.'
+
+
+class TestClass1:
+    """Test class 1.
+    """
+
+    @property
+    def test_property(self) -> int:
+        """Test property."""
+        return 1
+
+    @test_property.setter
+    def test_property(self, value: int) -> None:
+        pass
+
+    def test_method(self) -> None:
+        def nested_func() -> None:
+            """Not included."""
+
+    def __eq__(self, other) -> bool:
+        """Not included."""
+        return True
+
+    class NestedClass:
+        """Not included."""
+'''
+
+
+def test_get_docstring_index_from_source() -> None:
+    docstring_index: Dict[str, str] = \
+        static.get_docstring_index_from_source(source=_TEST_SOURCE_STR)
+    assert list(docstring_index.items()) == [
+        ('TestClass1.test_method', ''),
+        ('TestClass1.test_property', 'Test property.'),
+        ('path', 'Fallback function.'),
+        ('test_func_1', 'Lorem ipsum dolor sit amet.'),
+        ('TestClass1', 'Test class 1.'),
+    ]
+
+    docstring_index = static.get_docstring_index_from_source(
+        source='# -*- coding: latin-1 -*-\ndef a():\n    "\xe9"\n'.encode(
+            'latin-1'))
+    assert docstring_index == {'a': '\xe9'}
+
+
+def test_get_docstring_index_from_module_path() -> None:
+    docstring_index: Dict[str, str] = \
+        static.get_docstring_index_from_module_path(
+            module_path='samples/sample.py')
+    module_docstring_index: Dict[str, str] = \
+        stubdoc._get_docstring_index_from_module_path(
+            module_path='samples/sample.py')
+    assert list(docstring_index.items()) == list(
+        module_docstring_index.items())
+
+
+def test__get_definition_nodes() -> None:
+    module_node: ast.Module = ast.parse(_TEST_SOURCE_STR)
+    definition_nodes: List[static._DefinitionNode] = \
+        static._get_definition_nodes(body=module_node.body)
+    names: List[str] = [node.name for node in definition_nodes]
+    assert names == [
+        'path', 'test_func_1', 'test_func_1', 'test_func_2', 'TestClass1']
+
+
+def test__get_docstring() -> None:
+    module_node: ast.Module = ast.parse(
+        'def a():\n    """  Lorem ipsum.\n    """\n'
+        'def b():\n    c = "Not a docstring."\n')
+    docstrings: List[str] = [
+        static._get_docstring(node=node)  # type: ignore
+        for node in module_node.body]
+    assert docstrings == ['Lorem ipsum.', '']
+
+    module_node = ast.parse(
+        'def a():\n    """\n    Lorem ipsum.\n\n        dolor sit.\n    """\n')
+    function_node: ast.FunctionDef = module_node.body[0]  # type: ignore
+    docstring: str = static._get_docstring(node=function_node)
+    if sys.version_info >= (3, 13):
+        assert docstring == 'Lorem ipsum.\n\n    dolor sit.'
+    else:
+        assert docstring == 'Lorem ipsum.\n\n        dolor sit.'
+
+
+def test__dedent_docstring() -> None:
+    docstring: str = static._dedent_docstring(
+        docstring='  Lorem\n      ipsum\n\t  dolor\n  \n    sit\n    ')
+    assert docstring == 'Lorem\n  ipsum\n      dolor\n\nsit\n'
+    assert static._dedent_docstring(docstring='Lorem') == 'Lorem'
+
+
+def test__is_property_accessor() -> None:
+    module_node: ast.Module = ast.parse(
+        'class A:\n'
+        '    @property\n    def a(self): ...\n'
+        '    @a.setter\n    def a(self, value): """Not used."""\n'
+        '    @a.deleter\n    def a(self): ...\n')
+    class_node: ast.ClassDef = module_node.body[0]  # type: ignore
+    results: List[bool] = [
+        static._is_property_accessor(node=node)  # type: ignore
+        for node in class_node.body]
+    assert results == [False, True, True]
@@ -1,7 +1,8 @@
 import os
+import re
 import shutil
 from types import ModuleType
-from typing import List
+from typing import Dict, List, Match, Optional, Tuple
 import sys
 
 import pytest
@@ -50,6 +51,10 @@ def test__read_module() -> None:
         module = stubdoc._read_module(
             './not_existing_module.py')
 
+    sys_path_len: int = len(sys.path)
+    stubdoc._read_module(module_path='./stubdoc/stubdoc.py')
+    assert len(sys.path) == sys_path_len
+
 
 class _TestClass1:
 
@@ -470,6 +475,36 @@ class TestClass1:
     _delete_test_modules_and_stubs()
 
 
+def test_add_docstring_to_stubfile_with_nothing_to_document() -> None:
+    _delete_test_modules_and_stubs()
+    os.makedirs(_TEST_MODS_AND_STUBS_DIR_PATH, exist_ok=True)
+    tmp_module_path: str = os.path.join(
+        _TEST_MODS_AND_STUBS_DIR_PATH, 'not_importable_module.py')
+    with open(tmp_module_path, 'w') as f:
+        f.write('raise Exception(\'Imported.\')\n')
+    tmp_stub_path: str = os.path.join(
+        _TEST_MODS_AND_STUBS_DIR_PATH, 'not_importable_module.pyi')
+    for test_stub_str in (
+            '\nfrom .sub import sample_func as sample_func',
+            'test_value_1: int\nTestAlias = int\n\n',
+            'def test_function_1() -> None:\n    """\n    Doc.\n    """\n'):
+        with open(tmp_stub_path, 'w') as f:
+            f.write(test_stub_str)
+        stubdoc.add_docstring_to_stubfile(
+            original_module_path=tmp_module_path,
+            stub_file_path=tmp_stub_path)
+        with open(tmp_stub_path) as f:
+            assert f.read() == test_stub_str
+
+    with open(tmp_stub_path, 'w') as f:
+        f.write('def test_function_1() -> None: ...\n')
+    with pytest.raises(Exception, match='Imported.'):  # type: ignore
+        stubdoc.add_docstring_to_stubfile(
+            original_module_path=tmp_module_path,
+            stub_file_path=tmp_stub_path)
+    _delete_test_modules_and_stubs()
+
+
 def test__get_top_level_class_names() -> None:
     stub_str: str = '''
 test_value: int = 10
@@ -578,3 +613,540 @@ class _TestClass4(_TestClass3):
     def __init__(self) -> None:
         ...
     '''.strip()
+
+
+def test__write_txt() -> None:
+    _delete_test_modules_and_stubs()
+    os.makedirs(_TEST_MODS_AND_STUBS_DIR_PATH, exist_ok=True)
+    file_path: str = os.path.join(
+        _TEST_MODS_AND_STUBS_DIR_PATH, 'test_write_txt.txt')
+    stubdoc._write_txt(file_path=file_path, txt='Lorem ipsum')
+    assert stubdoc._read_txt(file_path=file_path) == 'Lorem ipsum'
+    _delete_test_modules_and_stubs()
+
+
+def test__get_docstring_index_from_module() -> None:
+    this_module: ModuleType = sys.modules[__name__]
+    docstring_index: Dict[str, str] = \
+        stubdoc._get_docstring_index_from_module(module=this_module)
+    assert docstring_index['_test_docstring_existing_func'].startswith(
+        'Lorem ipsum dolor sit amet,')
+    assert '_test_docstring_not_existing_func' not in docstring_index
+    assert docstring_index['_TestClass1.__init__'] == \
+        'Test docstring of __init__.'
+    assert docstring_index['_TestClass1.test_no_docstring_method'] == ''
+    assert docstring_index['_TestClass4'] == 'Lorem ipsum dolor sit amet.'
+    assert '_TestClass1' not in docstring_index
+    names: List[str] = list(docstring_index.keys())
+    assert names.index('_TestClass1.__init__') < names.index('_TestClass3')
+
+
+def test__add_docstrings_to_stub_str() -> None:
+    stub_str: str = """test_value: int = 100
+
+def _test_docstring_existing_func(a: int) -> int: ...
+
+class _TestClass4(_TestClass3):
+    def __init__(self) -> None: ...
+"""
+    result_stub_str: str = stubdoc._add_docstrings_to_stub_str(
+        stub_str=stub_str,
+        docstring_index={
+            '_test_docstring_existing_func': 'Lorem ipsum.',
+            '_TestClass4.__init__': 'Test constructor.',
+            '_TestClass4': 'Test class.',
+        })
+    expected: str = '''test_value: int = 100
+
+def _test_docstring_existing_func(a: int) -> int:
+    """
+    Lorem ipsum.
+    """
+
+class _TestClass4(_TestClass3):
+    """
+    Test class.
+    """
+    def __init__(self) -> None:
+        """
+        Test constructor.
+        """'''
+    assert result_stub_str == expected
+
+
+def test__add_docstrings_to_stub_str_with_per_name_fallback() -> None:
+    stub_str: str = """
+def test_func(a: int) -> int: ...
+
+class TestClass(
+        Base):
+    def test_method(self) -> None: ...
+"""
+    docstring_index: Dict[str, str] = {
+        'test_func': 'Lorem ipsum.',
+        'TestClass.test_method': 'Test method.',
+        'TestClass': 'Test class.',
+    }
+    expected: str = stubdoc._add_docstrings_to_stub_str_per_name(
+        stub_str=stub_str, docstring_index=docstring_index)
+    assert '    Test class.\n' in expected
+    assert stubdoc._add_docstrings_to_stub_str(
+        stub_str=stub_str, docstring_index=docstring_index) == expected
+
+    docstring_index['test-value'] = 'Dolor.'
+    expected = stubdoc._add_docstrings_to_stub_str_per_name(
+        stub_str=stub_str, docstring_index=docstring_index)
+    assert stubdoc._add_docstrings_to_stub_str(
+        stub_str=stub_str, docstring_index=docstring_index) == expected
+
+
+def test__needs_per_name_processing() -> None:
+    assert not stubdoc._needs_per_name_processing(
+        names=['test_func', 'TestClass.test_method'])
+    assert stubdoc._needs_per_name_processing(
+        names=['test_func', 'test-value'])
+    assert stubdoc._needs_per_name_processing(
+        names=['TestClass.Inner.test_method'])
+
+
+def test__add_docstrings_to_stub_str_per_name() -> None:
+    stub_str: str = """
+def test_func(a: int) -> int: ...
+
+class TestClass:
+    def test_method(self) -> None: ...
+"""
+    docstring_index: Dict[str, str] = {
+        'test_func': 'Lorem ipsum.',
+        'TestClass.test_method': 'Test method.',
+        'TestClass': 'Test class.',
+    }
+    result_stub_str: str = stubdoc._add_docstrings_to_stub_str_per_name(
+        stub_str=stub_str, docstring_index=docstring_index)
+    expected: str = '''def test_func(a: int) -> int:
+    """
+    Lorem ipsum.
+    """
+
+class TestClass:
+    """
+    Test class.
+    """
+    def test_method(self) -> None:
+        """
+        Test method.
+        """'''
+    assert result_stub_str == expected
+    assert stubdoc._add_docstrings_to_stub_str(
+        stub_str=stub_str, docstring_index=docstring_index) == expected
+
+
+def test__add_docstrings_to_classes_per_name() -> None:
+    result_stub_str: str = stubdoc._add_docstrings_to_classes_per_name(
+        stub_str='class TestClass1:\n    ...\nclass TestClass2: ...\n',
+        class_names=['TestClass1', 'TestClass2'],
+        docstring_index={'TestClass1': 'Test class.', 'TestClass2': ''})
+    assert result_stub_str == (
+        'class TestClass1:\n'
+        '    """\n'
+        '    Test class.\n'
+        '    """\n'
+        '    ...\n'
+        'class TestClass2: ...\n'
+    )
+
+
+def test__add_docstrings_to_callables_in_stub_str() -> None:
+    stub_str: str = (
+        '\n'
+        'def test_func(a: int) -> int: ...\n'
+        'class TestClass:\n'
+        '    def test_method(self) -> None: ...\n'
+        '\n'
+        '\n'
+    )
+    result_stub_str: str = stubdoc._add_docstrings_to_callables_in_stub_str(
+        stub_str=stub_str,
+        docstring_index={
+            'test_func': 'Lorem ipsum.',
+            'TestClass.test_method': 'Test method.',
+        })
+    assert result_stub_str == (
+        'def test_func(a: int) -> int:\n'
+        '    """\n'
+        '    Lorem ipsum.\n'
+        '    """\n'
+        'class TestClass:\n'
+        '    def test_method(self) -> None:\n'
+        '        """\n'
+        '        Test method.\n'
+        '        """\n'
+    )
+
+    with pytest.raises(Exception):  # type: ignore
+        stubdoc._add_docstrings_to_callables_in_stub_str(
+            stub_str=stub_str,
+            docstring_index={'NotExistingClass.test_method': 'Lorem.'})
+
+
+def test__get_first_non_empty_line_index() -> None:
+    assert stubdoc._get_first_non_empty_line_index(
+        lines=['', '', 'def test_func() -> None: ...', '']) == 2
+    assert stubdoc._get_first_non_empty_line_index(lines=['', '']) == 2
+    assert stubdoc._get_first_non_empty_line_index(lines=['    ']) == 0
+
+
+def test__remove_per_name_trailing_newlines() -> None:
+    assert stubdoc._remove_per_name_trailing_newlines(
+        stub_str='a: int\n\n\n', names_num=1) == 'a: int\n\n\n'
+    assert stubdoc._remove_per_name_trailing_newlines(
+        stub_str='a: int\n\n\n', names_num=3) == 'a: int\n'
+    assert stubdoc._remove_per_name_trailing_newlines(
+        stub_str='a: int\n', names_num=5) == 'a: int'
+
+
+def test__get_scope_class_names() -> None:
+    scope_class_names: List[Optional[str]] = \
+        stubdoc._get_scope_class_names(lines=[
+            'class TestClass1:',
+            '    def test_method(self) -> None: ...',
+            '',
+            'def test_func() -> None: ...',
+            'class TestClass2(TestClass1):',
+            '    ',
+            'class TestClass1: ...',
+            '    def test_method(self) -> None: ...',
+        ])
+    assert scope_class_names == [
+        'TestClass1', 'TestClass1', 'TestClass1', None, 'TestClass2',
+        'TestClass2', None, None]
+
+
+def test__add_docstrings_to_method_line() -> None:
+    line: str = stubdoc._add_docstrings_to_method_line(
+        line='    def test_method_1(self) -> None: ...',
+        method_docstrings={
+            'test_method_1': (0, 'Lorem.\n    def test_method_2(self): ...'),
+            'test_method_2': (1, 'Ipsum.'),
+        },
+        min_order=-1)
+    assert line == (
+        '    def test_method_1(self) -> None:\n'
+        '        """\n'
+        '        Lorem.\n'
+        '            def test_method_2(self):\n'
+        '        """\n'
+        '        Ipsum.\n'
+        '        """\n'
+        '        """'
+    )
+
+    line = stubdoc._add_docstrings_to_method_line(
+        line='    def test_method_1(self) -> None: ...',
+        method_docstrings={'test_method_1': (0, 'Lorem.')},
+        min_order=0)
+    assert line == '    def test_method_1(self) -> None: ...'
+
+
+def test__add_docstrings_to_classes_in_stub_str() -> None:
+    result_stub_str: Optional[str] = \
+        stubdoc._add_docstrings_to_classes_in_stub_str(
+            stub_str='class TestClassA(Base):\n    ...\nclass TestClass: ...',
+            class_names=['TestClassA', 'TestClass'],
+            docstring_index={
+                'TestClassA': 'Lorem.',
+                'TestClass': 'Ipsum.',
+            })
+    assert result_stub_str == (
+        'class TestClassA(Base):\n'
+        '    """\n'
+        '    Ipsum.\n'
+        '    """\n'
+        '    """\n'
+        '    Lorem.\n'
+        '    """\n'
+        '    ...\n'
+        'class TestClass: ...'
+    )
+
+    result_stub_str = stubdoc._add_docstrings_to_classes_in_stub_str(
+        stub_str='class TestClass(\n        Base):\n    ...\n',
+        class_names=['TestClass'],
+        docstring_index={'TestClass': 'Lorem.'})
+    assert result_stub_str is None
+
+
+def test__get_class_line_offsets_by_prefix() -> None:
+    line_offsets: Dict[str, Tuple[int, str]] = \
+        stubdoc._get_class_line_offsets_by_prefix(
+            stub_str='a: int\nclass AB: ...\nclass A: ...\n')
+    assert line_offsets == {
+        'A': (7, 'class AB: ...'),
+        'AB': (7, 'class AB: ...'),
+    }
+
+
+def test__get_class_docstring_insertion_str() -> None:
+    match: Optional[Match] = re.match(
+        pattern=r'class TestClass(.*?)\:', string='class TestClass(Base):')
+    assert match is not None
+    insertion_str: str = stubdoc._get_class_docstring_insertion_str(
+        match=match, class_name='TestClass',
+        result_docstring='    """\n    Lorem.\n    """')
+    assert insertion_str == '\n    """\n    Lorem.\n    """'
+
+    insertion_str = stubdoc._get_class_docstring_insertion_str(
+        match=match, class_name='TestClass',
+        result_docstring='    """\n    a\\tb\\\\c\n    """')
+    assert insertion_str == '\n    """\n    a\tb\\c\n    """'
+
+
+def test__add_docstring_index_to_stubfile() -> None:
+    _delete_test_modules_and_stubs()
+    os.makedirs(_TEST_MODS_AND_STUBS_DIR_PATH, exist_ok=True)
+    tmp_stub_path: str = os.path.join(
+        _TEST_MODS_AND_STUBS_DIR_PATH, 'test_module_1.pyi')
+    with open(tmp_stub_path, 'w') as f:
+        f.write('def test_func(a: int) -> None: ...\n')
+    stubdoc._add_docstring_index_to_stubfile(
+        docstring_index={'test_func': 'Lorem ipsum.'},
+        stub_file_path=tmp_stub_path)
+    with open(tmp_stub_path) as f:
+        result_stub_str: str = f.read()
+    assert result_stub_str == (
+        'def test_func(a: int) -> None:'
+        '\n    """'
+        '\n    Lorem ipsum.'
+        '\n    """\n'
+    )
+    _delete_test_modules_and_stubs()
+
+
+def test__get_package_name() -> None:
+    package_name: str = stubdoc._get_package_name(
+        module_path='./stubdoc/stubdoc.py')
+    assert package_name == 'stubdoc.stubdoc'
+
+    package_name = stubdoc._get_package_name(
+        module_path='.\\stubdoc\\stubdoc.py')
+    assert package_name == 'stubdoc.stubdoc'
+
+    site_dir_path: str = os.path.abspath('./tests/tmp_site_packages')
+    sys.path.append(site_dir_path)
+    package_name = stubdoc._get_package_name(
+        module_path=os.path.join(site_dir_path, 'pkg', 'sub.py'))
+    sys.path.remove(site_dir_path)
+    assert package_name == 'pkg.sub'
+
+
+def test__get_sys_path_entry() -> None:
+    site_dir_path: str = os.path.abspath('./tests/tmp_site_packages')
+    assert stubdoc._get_sys_path_entry(
+        module_path='./stubdoc/stubdoc.py') is None
+    sys.path.append(os.path.dirname(site_dir_path))
+    sys.path.append(site_dir_path)
+    sys_path_entries: List[Optional[str]] = [
+        stubdoc._get_sys_path_entry(
+            module_path=os.path.join(site_dir_path, 'pkg', 'sub.py')),
+        stubdoc._get_sys_path_entry(
+            module_path=os.path.join(site_dir_path, 'mod.py')),
+        stubdoc._get_sys_path_entry(
+            module_path=os.path.join(site_dir_path, 'a-b', 'mod.py')),
+        stubdoc._get_sys_path_entry(
+            module_path=os.path.join(site_dir_path + '2', 'mod.py')),
+    ]
+    sys.path.remove(site_dir_path)
+    sys.path.remove(os.path.dirname(site_dir_path))
+    assert sys_path_entries == [
+        site_dir_path, site_dir_path, None, os.path.dirname(site_dir_path)]
+
+
+def test__get_class_docstring_str() -> None:
+    result_docstring: str = stubdoc._get_class_docstring_str(
+        docstring='Lorem ipsum.\n\n    dolor sit amet.')
+    assert result_docstring == (
+        '    """'
+        '\n    Lorem ipsum.'
+        '\n'
+        '\n    dolor sit amet.'
+        '\n    """'
+    )
+
+
+def test__get_docstring_index_from_module_path() -> None:
+    docstring_index: Dict[str, str] = \
+        stubdoc._get_docstring_index_from_module_path(
+            module_path='samples/sample.py')
+    assert docstring_index['sample_func'].startswith('Lorem ipsum')
+    assert docstring_index['SampleClass.__init__'] == \
+        'Lorem ipsum dolor sit amet, consectetur adipiscing elit.'
+
+    docstring_index = stubdoc._get_docstring_index_from_module_path(
+        module_path='samples/sample.py',
+        names=['sample_func', 'SampleClass.__init__'])
+    assert list(docstring_index.keys()) == [
+        'SampleClass.__init__', 'sample_func', 'SampleClass']
+
+
+def test__get_docstring_index_from_module_by_names() -> None:
+    this_module: ModuleType = sys.modules[__name__]
+    names: List[str] = [
+        '_TestClass4',
+        '_TestClass4.__init__',
+        '_test_docstring_existing_func',
+        '_test_docstring_not_existing_func',
+        '_TestClass1',
+        '_TestClass1.test_property',
+        '_TestClass1.test_no_docstring_method',
+        '_TestClass1.__eq__',
+        '_TestClass1._TestClass2',
+        '_TestClass1.not_existing_method',
+        'ModuleType',
+        'not_existing_func',
+    ]
+    docstring_index: Dict[str, str] = \
+        stubdoc._get_docstring_index_from_module_by_names(
+            module=this_module, names=names)
+    assert list(docstring_index.items()) == [
+        ('_TestClass1.test_no_docstring_method', ''),
+        ('_TestClass1.test_property', 'Test docstring of property.'),
+        ('_TestClass4.__init__', ''),
+        ('_test_docstring_existing_func',
+         _test_docstring_existing_func.__doc__.strip()),  # type: ignore
+        ('ModuleType', ModuleType.__doc__.strip()),  # type: ignore
+        ('_TestClass4', 'Lorem ipsum dolor sit amet.'),
+    ]
+
+    module_docstring_index: Dict[str, str] = \
+        stubdoc._get_docstring_index_from_module(module=this_module)
+    expected_items = [
+        (name, docstring)
+        for name, docstring in module_docstring_index.items()
+        if name in names]
+    assert list(docstring_index.items()) == expected_items
+
+
+def test__get_stripped_docstring() -> None:
+    docstring: str = stubdoc._get_stripped_docstring(
+        val=_test_docstring_existing_func)
+    assert docstring.startswith('Lorem ipsum dolor sit amet,')
+    assert docstring.endswith('consequat.')
+    docstring = stubdoc._get_stripped_docstring(
+        val=_test_docstring_not_existing_func)
+    assert docstring == ''
+
+
+def test__get_declared_names() -> None:
+    stub_str: str = '''
+from typing import Any
+
+def test_func_1(a: int) -> None: ...
+async def test_func_2() -> None: ...
+
+class TestClass1:
+    test_value: int
+    def __init__(self, c: int) -> None: ...
+
+    @property
+    def test_property(self) -> int: ...
+    class NestedClass:
+        def nested_method(self) -> None: ...
+
+def test_func_3() -> None:
+    """
+    def not_a_method(self) -> None: ...
+    """
+
+class TestClass2(TestClass1): ...
+'''
+    names: List[str] = stubdoc._get_declared_names(stub_str=stub_str)
+    assert names == [
+        'test_func_1',
+        'TestClass1',
+        'TestClass1.__init__',
+        'TestClass1.test_property',
+        'TestClass1.nested_method',
+        'test_func_3',
+        'TestClass2',
+    ]
+
+
+def test__get_declared_name_indexes() -> None:
+    lines: List[str] = [
+        'from typing import Any',
+        'def test_func_1(a: int) -> None: ...',
+        'class TestClass1:',
+        '    test_value: int',
+        '    def __init__(self, c: int) -> None: ...',
+        'test_value_2: int',
+        'class TestClass2:',
+        '    """',
+        '    Lorem ipsum.',
+        'dolor sit amet.',
+        '    """',
+        '    def test_method(self) -> None:',
+        '        """',
+        '        """',
+        '    def test_method_2(self) -> None: ...',
+    ]
+    name_indexes: List[Tuple[str, int]] = \
+        stubdoc._get_declared_name_indexes(lines=lines)
+    assert name_indexes == [
+        ('test_func_1', 1),
+        ('TestClass1', 2),
+        ('TestClass1.__init__', 4),
+        ('TestClass2', 6),
+        ('TestClass2.test_method', 11),
+        ('TestClass2.test_method_2', 14),
+    ]
+
+
+def test__get_undocumented_names() -> None:
+    stub_str: str = '''
+def test_func_1(a: int) -> None:
+    """
+    Documented.
+    """
+def test_func_2() -> None: ...
+
+class TestClass1:
+    """
+    Documented.
+    """
+    def __init__(self, c: int) -> None:
+        """
+        Documented.
+        """
+    def test_method(self) -> None: ...
+
+class TestClass2:
+    def test_method(self) -> None:
+        """
+        Documented.
+        """
+def test_func_3() -> None:
+    pass
+'''
+    names: List[str] = stubdoc._get_undocumented_names(stub_str=stub_str)
+    assert names == [
+        'test_func_2',
+        'TestClass1.test_method',
+        'TestClass2',
+        'test_func_3',
+    ]
+
+
+def test__needs_docstring_index() -> None:
+    assert not stubdoc._needs_docstring_index(stub_str='')
+    assert not stubdoc._needs_docstring_index(
+        stub_str='from .sub import *\nTestAlias = int\n')
+    assert not stubdoc._needs_docstring_index(
+        stub_str='test_value: int\n', update_mode=True)
+    assert stubdoc._needs_docstring_index(
+        stub_str='def test_func() -> None: ...\n')
+
+    documented_stub_str: str = \
+        'def test_func() -> None:\n    """\n    Doc.\n    """\n'
+    assert not stubdoc._needs_docstring_index(stub_str=documented_stub_str)
+    assert stubdoc._needs_docstring_index(
+        stub_str=documented_stub_str, update_mode=True)
@@ -0,0 +1,215 @@
+import os
+import pickle
+import shutil
+import sys
+from typing import Dict
+
+from stubdoc import backends
+from stubdoc import symbols
+from stubdoc.symbols import SymbolTable
+
+_TEST_DIR_PATH: str = './tests/tmp_symbols/'
+_TEST_PACKAGE_DIR_PATH: str = './tests/tmp_symbols/symbolspkg/'
+_TEST_PACKAGE_NAME: str = 'tests.tmp_symbols.symbolspkg'
+
+_TEST_INIT_MODULE_STR: str = '''
+from collections import OrderedDict
+
+from .sub import sample_func, SampleClass as AliasClass
+
+
+def own_func() -> None:
+    """
+    Own function.
+    """
+'''
+
+_TEST_SUB_MODULE_STR: str = '''
+def sample_func(a: int) -> int:
+    """
+    Sample function.
+    """
+    return a
+
+
+class SampleClass:
+    """
+    Sample class.
+    """
+
+    def __init__(self) -> None:
+        """
+        Sample constructor.
+        """
+
+    def sample_method(self) -> None:
+        """
+        Sample method.
+        """
+'''
+
+_TEST_INIT_STUB_STR: str = '''from collections import OrderedDict
+
+def own_func() -> None: ...
+def sample_func(a: int) -> int: ...
+
+class AliasClass:
+    def __init__(self) -> None: ...
+    def sample_method(self) -> None: ...
+
+class OrderedDict:
+    def clear(self) -> None: ...
+'''
+
+
+def setup() -> None:
+    _delete_test_package()
+
+
+def teardown() -> None:
+    _delete_test_package()
+
+
+def _delete_test_package() -> None:
+    """
+    Delete the package added for testing and its imported modules.
+    """
+    shutil.rmtree(_TEST_DIR_PATH, ignore_errors=True)
+    for module_name in list(sys.modules):
+        if module_name.startswith('tests.tmp_symbols'):
+            sys.modules.pop(module_name)
+
+
+def _make_test_package() -> None:
+    """
+    Make a package (and its `__init__.pyi` stub) that re-exports
+    a submodule's function and class.
+    """
+    os.makedirs(_TEST_PACKAGE_DIR_PATH, exist_ok=True)
+    with open(os.path.join(_TEST_PACKAGE_DIR_PATH, '__init__.py'), 'w') as f:
+        f.write(_TEST_INIT_MODULE_STR)
+    with open(os.path.join(_TEST_PACKAGE_DIR_PATH, 'sub.py'), 'w') as f:
+        f.write(_TEST_SUB_MODULE_STR)
+    with open(os.path.join(_TEST_PACKAGE_DIR_PATH, '__init__.pyi'), 'w') as f:
+        f.write(_TEST_INIT_STUB_STR)
+
+
+def test_SymbolTable___init__() -> None:
+    table: SymbolTable = SymbolTable()
+    assert len(table.table_id) == 32
+    assert SymbolTable().table_id != table.table_id
+    assert SymbolTable(table_id='test').table_id == 'test'
+
+
+def test_SymbolTable___reduce__() -> None:
+    table: SymbolTable = SymbolTable()
+    restored_table: SymbolTable = pickle.loads(pickle.dumps(table))
+    assert restored_table is not table
+    assert restored_table.table_id == table.table_id
+    assert pickle.loads(pickle.dumps(table)) is restored_table
+    symbols._PROCESS_TABLES.pop(table.table_id)
+
+
+def test_SymbolTable_get_docstring_index() -> None:
+    _make_test_package()
+    table: SymbolTable = SymbolTable()
+    docstring_index: Dict[str, str] = table.get_docstring_index(
+        module_path=os.path.join(_TEST_PACKAGE_DIR_PATH, '__init__.py'),
+        names=[
+            'own_func', 'sample_func', 'AliasClass',
+            'AliasClass.__init__', 'AliasClass.sample_method',
+            'OrderedDict', 'OrderedDict.clear'])
+    assert list(docstring_index.items()) == [
+        ('AliasClass.__init__', 'Sample constructor.'),
+        ('AliasClass.sample_method', 'Sample method.'),
+        ('own_func', 'Own function.'),
+        ('sample_func', 'Sample function.'),
+        ('AliasClass', 'Sample class.'),
+        ('OrderedDict', docstring_index['OrderedDict']),
+    ]
+    assert table._looked_up_names == {
+        f'{_TEST_PACKAGE_NAME}.sub': {
+            'sample_func', 'SampleClass.__init__',
+            'SampleClass.sample_method'},
+    }
+    _delete_test_package()
+
+
+def test_SymbolTable__get_docstrings() -> None:
+    _make_test_package()
+    table: SymbolTable = SymbolTable()
+    table.get_docstring_index(
+        module_path=os.path.join(_TEST_PACKAGE_DIR_PATH, '__init__.py'),
+        names=['sample_func'])
+    sub_module = sys.modules[f'{_TEST_PACKAGE_NAME}.sub']
+    table._docstrings[sub_module.__name__]['sample_func'] = 'Stored.'
+    docstring_index: Dict[str, str] = table._get_docstrings(
+        module=sub_module, names=['sample_func', 'SampleClass.sample_method'])
+    assert docstring_index == {
+        'sample_func': 'Stored.',
+        'SampleClass.sample_method': 'Sample method.',
+    }
+    assert table._get_docstrings(
+        module=sub_module, names=['not_existing_func']) == {}
+    assert 'not_existing_func' in table._looked_up_names[sub_module.__name__]
+    _delete_test_package()
+
+
+def test__get_process_table() -> None:
+    table: SymbolTable = symbols._get_process_table(table_id='test')
+    assert table.table_id == 'test'
+    assert symbols._get_process_table(table_id='test') is table
+    symbols._PROCESS_TABLES.pop('test')
+
+
+def test__get_defining_module() -> None:
+    _make_test_package()
+    table: SymbolTable = SymbolTable()
+    table.get_docstring_index(
+        module_path=os.path.join(_TEST_PACKAGE_DIR_PATH, '__init__.py'),
+        names=[])
+    init_module = sys.modules[f'{_TEST_PACKAGE_NAME}.__init__']
+    sub_module = sys.modules[f'{_TEST_PACKAGE_NAME}.sub']
+    assert symbols._get_defining_module(
+        module=init_module, member_val=init_module.sample_func) is sub_module
+    assert symbols._get_defining_module(
+        module=init_module, member_val=init_module.AliasClass) is sub_module
+    assert symbols._get_defining_module(
+        module=init_module, member_val=init_module.own_func) is None
+    assert symbols._get_defining_module(
+        module=init_module, member_val=init_module.OrderedDict) is None
+    assert symbols._get_defining_module(
+        module=init_module, member_val=100) is None
+    _delete_test_package()
+
+
+def test__merge_docstring_indexes() -> None:
+    _make_test_package()
+    table: SymbolTable = SymbolTable()
+    table.get_docstring_index(
+        module_path=os.path.join(_TEST_PACKAGE_DIR_PATH, '__init__.py'),
+        names=[])
+    init_module = sys.modules[f'{_TEST_PACKAGE_NAME}.__init__']
+    docstring_index: Dict[str, str] = symbols._merge_docstring_indexes(
+        module=init_module,
+        docstring_index={'own_func': 'Own.', 'AliasClass': 'Class.'},
+        reexported_docstring_index={
+            'sample_func': 'Function.', 'AliasClass.sample_method': 'Method.'})
+    assert list(docstring_index) == [
+        'AliasClass.sample_method', 'own_func', 'sample_func', 'AliasClass']
+    _delete_test_package()
+
+
+def test_add_docstring_to_stubfile_with_backend() -> None:
+    _make_test_package()
+    stub_path: str = os.path.join(_TEST_PACKAGE_DIR_PATH, '__init__.pyi')
+    backends.add_docstring_to_stubfile_with_backend(
+        os.path.join(_TEST_PACKAGE_DIR_PATH, '__init__.py'), stub_path,
+        symbol_table=SymbolTable())
+    with open(stub_path) as f:
+        stub_str: str = f.read()
+    assert 'Sample function.' in stub_str
+    assert 'Sample method.' in stub_str
+    assert 'def clear(self) -> None: ...' in stub_str
+    assert stub_str.count('"""') == 12
+    _delete_test_package()
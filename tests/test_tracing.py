@@ -0,0 +1,88 @@
+import json
+import os
+import shutil
+import threading
+from typing import Any, Dict, List
+
+from stubdoc import tracing
+
+_TEST_DIR_PATH: str = './tests/tmp_tracing/'
+_TEST_TRACE_PATH: str = './tests/tmp_tracing/trace.json'
+
+
+def setup() -> None:
+    _delete_test_dir()
+
+
+def teardown() -> None:
+    _delete_test_dir()
+    tracing.disable()
+
+
+def _delete_test_dir() -> None:
+    """
+    Delete the directory added for testing.
+    """
+    shutil.rmtree(_TEST_DIR_PATH, ignore_errors=True)
+
+
+def test_span() -> None:
+    tracing.disable()
+    with tracing.span(name='import'):
+        pass
+    assert not tracing.is_enabled()
+    assert tracing.pop_events() == []
+
+    tracing.enable(process_name='test process')
+    assert tracing.is_enabled()
+    with tracing.span(
+            name='sample/path.py', category='module',
+            args={'stub_path': 'out/sample/path.pyi'}):
+        with tracing.span(name='import'):
+            pass
+    events: List[Dict[str, Any]] = tracing.pop_events()
+    assert [(event['name'], event['ph']) for event in events] == [
+        ('process_name', 'M'),
+        ('sample/path.py', 'B'),
+        ('import', 'B'),
+        ('import', 'E'),
+        ('sample/path.py', 'E'),
+    ]
+    assert events[0]['args'] == {'name': 'test process'}
+    assert events[1]['cat'] == 'module'
+    assert events[1]['args'] == {'stub_path': 'out/sample/path.pyi'}
+    assert events[2]['cat'] == 'phase'
+    for event in events:
+        assert event['pid'] == os.getpid()
+        assert event['tid'] == threading.get_native_id()
+    timestamps: List[float] = [event['ts'] for event in events[1:]]
+    assert timestamps == sorted(timestamps)
+    assert tracing.pop_events() == []
+    tracing.disable()
+
+
+def test_add_events() -> None:
+    tracing.disable()
+    tracing.add_events([{'name': 'import'}])
+    assert tracing.pop_events() == []
+
+    tracing.enable()
+    tracing.pop_events()
+    tracing.add_events([{'name': 'import'}])
+    assert tracing.pop_events() == [{'name': 'import'}]
+    tracing.disable()
+
+
+def test_write_trace() -> None:
+    os.makedirs(_TEST_DIR_PATH, exist_ok=True)
+    tracing.enable()
+    with tracing.span(name='write'):
+        pass
+    tracing.write_trace(file_path=_TEST_TRACE_PATH)
+    tracing.disable()
+    with open(_TEST_TRACE_PATH) as f:
+        trace_data: Dict[str, Any] = json.load(f)
+    assert trace_data['displayTimeUnit'] == 'ms'
+    assert [event['ph'] for event in trace_data['traceEvents']] == [
+        'M', 'B', 'E']
+    _delete_test_dir()
@@ -0,0 +1,294 @@
+import os
+import shutil
+from typing import Dict, List
+
+from stubdoc import stubdoc
+from stubdoc import update
+
+_TEST_DIR_PATH: str = './tests/tmp_update/'
+
+_TEST_STUB_STR: str = """from typing import Any
+
+test_value: int
+
+def test_func_1(a: int) -> int: ...
+def test_func_2() -> None: ...
+
+class TestClass1:
+    test_attr: int
+    def __init__(self, a: int) -> None: ...
+    @property
+    def test_property(self) -> int: ...
+    def test_method(self) -> None: pass
+
+class TestClass2: ...
+"""
+
+_OLD_DOCSTRING_INDEX: Dict[str, str] = {
+    'test_func_1': 'Lorem ipsum.\n\n    Dolor sit amet.',
+    'test_func_2': 'Consectetur adipiscing.',
+    'TestClass1.__init__': 'Test constructor.',
+    'TestClass1.test_property': 'Test property.',
+    'TestClass1': 'Test class 1.',
+}
+
+_NEW_DOCSTRING_INDEX: Dict[str, str] = {
+    'test_func_1': 'Lorem ipsum.\n\n    Dolor sit amet.',
+    'TestClass1.__init__': 'Changed constructor.\n\n        Sed do.',
+    'TestClass1.test_property': 'Test property.',
+    'TestClass1.test_method': 'Added method docstring.',
+    'TestClass2': 'Test class 2.',
+}
+
+
+def setup() -> None:
+    _delete_test_dir()
+
+
+def teardown() -> None:
+    _delete_test_dir()
+
+
+def _delete_test_dir() -> None:
+    """
+    Delete the directory added for testing.
+    """
+    shutil.rmtree(_TEST_DIR_PATH, ignore_errors=True)
+
+
+def _add_docstrings(*, stub_str: str, docstring_index: Dict[str, str]) -> str:
+    """
+    Add docstrings to a stub string as same as the stub file adding.
+
+    Parameters
+    ----------
+    stub_str : str
+        A target stub file string.
+    docstring_index : dict of str to str
+        A docstring index.
+
+    Returns
+    -------
+    result_stub_str : str
+        Stub file string after docstrings added.
+    """
+    result_stub_str: str = stubdoc._add_docstrings_to_stub_str(
+        stub_str=stub_str, docstring_index=docstring_index)
+    return result_stub_str + '\n'
+
+
+def test__update_docstrings_in_stub_str() -> None:
+    stub_str: str = _TEST_STUB_STR.replace(
+        'class TestClass2: ...', 'class TestClass2:\n    ...')
+    result_stub_str: str = update._update_docstrings_in_stub_str(
+        stub_str=stub_str, docstring_index=_OLD_DOCSTRING_INDEX)
+    old_stub_str: str = _add_docstrings(
+        stub_str=stub_str, docstring_index=_OLD_DOCSTRING_INDEX)
+    assert result_stub_str == old_stub_str
+
+    result_stub_str = update._update_docstrings_in_stub_str(
+        stub_str=old_stub_str, docstring_index=_NEW_DOCSTRING_INDEX)
+    assert result_stub_str == _add_docstrings(
+        stub_str=stub_str, docstring_index=_NEW_DOCSTRING_INDEX)
+
+    result_stub_str = update._update_docstrings_in_stub_str(
+        stub_str=result_stub_str, docstring_index=_NEW_DOCSTRING_INDEX)
+    assert result_stub_str == _add_docstrings(
+        stub_str=stub_str, docstring_index=_NEW_DOCSTRING_INDEX)
+
+    result_stub_str = update._update_docstrings_in_stub_str(
+        stub_str=result_stub_str, docstring_index={})
+    assert result_stub_str == stub_str.replace(
+        'def test_method(self) -> None: pass',
+        'def test_method(self) -> None: ...')
+
+
+def test__update_docstrings_in_stub_str_one_line_class() -> None:
+    result_stub_str: str = update._update_docstrings_in_stub_str(
+        stub_str=_TEST_STUB_STR, docstring_index=_NEW_DOCSTRING_INDEX)
+    assert result_stub_str.endswith(
+        'class TestClass2:\n    """\n    Test class 2.\n    """ ...\n')
+    assert result_stub_str == _add_docstrings(
+        stub_str=_TEST_STUB_STR, docstring_index=_NEW_DOCSTRING_INDEX)
+    result_stub_str = update._update_docstrings_in_stub_str(
+        stub_str=result_stub_str, docstring_index={})
+    assert result_stub_str.endswith('class TestClass2: ...\n')
+
+    stub_str: str = 'class TestClass1: ...\nclass TestClass2(Base): pass\n'
+    docstring_index: Dict[str, str] = {
+        'TestClass1': 'Test class 1.', 'TestClass2': 'Test class 2.'}
+    added_stub_str: str = _add_docstrings(
+        stub_str=stub_str, docstring_index=docstring_index)
+    result_stub_str = update._update_docstrings_in_stub_str(
+        stub_str=added_stub_str, docstring_index=docstring_index)
+    assert result_stub_str == added_stub_str
+    result_stub_str = update._update_docstrings_in_stub_str(
+        stub_str=added_stub_str,
+        docstring_index={'TestClass2': 'Changed class 2.'})
+    assert result_stub_str == (
+        'class TestClass1: ...\n'
+        'class TestClass2(Base):\n'
+        '    """\n    Changed class 2.\n    """ pass\n\n')
+
+
+def test__update_docstrings_in_stub_str_after_adding() -> None:
+    docstring_index: Dict[str, str] = {
+        **_OLD_DOCSTRING_INDEX,
+        'TestClass1.test_method': '',
+        'test_func_2': '',
+        'TestClass2': 'Test class 2.\nLorem ipsum.',
+    }
+    added_stub_str: str = _add_docstrings(
+        stub_str=_TEST_STUB_STR, docstring_index=docstring_index)
+    assert 'def test_method(self) -> None:\n        """\n        """\n' \
+        in added_stub_str
+    result_stub_str: str = update._update_docstrings_in_stub_str(
+        stub_str=added_stub_str, docstring_index=docstring_index)
+    assert result_stub_str == added_stub_str
+
+
+def test__get_header_name_and_indent() -> None:
+    assert update._get_header_name_and_indent(
+        line='def test_func(a: int) -> None: ...',
+        class_name=None) == ('test_func', '    ')
+    assert update._get_header_name_and_indent(
+        line='class TestClass(Base):',
+        class_name=None) == ('TestClass', '    ')
+    assert update._get_header_name_and_indent(
+        line='    def test_method(self) -> None:',
+        class_name='TestClass') == ('TestClass.test_method', '        ')
+    assert update._get_header_name_and_indent(
+        line='    def test_method(self) -> None:',
+        class_name=None) is None
+    assert update._get_header_name_and_indent(
+        line='def test_func(', class_name=None) is None
+    assert update._get_header_name_and_indent(
+        line='test_value: int', class_name=None) is None
+
+
+def test__get_docstring_block_end() -> None:
+    lines: List[str] = [
+        'def test_func() -> None:',
+        '    """',
+        '    Lorem ipsum.',
+        '    """',
+        'def test_func_2() -> None: ...',
+    ]
+    assert update._get_docstring_block_end(
+        lines=lines, header_index=0, indent='    ') == 4
+    assert update._get_docstring_block_end(
+        lines=lines, header_index=4, indent='    ') == 5
+    assert update._get_docstring_block_end(
+        lines=lines[:3], header_index=0, indent='    ') == 1
+
+    lines = [
+        'class TestClass1:',
+        '    """',
+        '    Lorem ipsum.',
+        '    """ ...',
+        'class TestClass2:',
+        '    """',
+        '    Dolor sit amet.',
+        '    """ ...',
+    ]
+    assert update._get_docstring_block_end(
+        lines=lines, header_index=0, indent='    ') == 4
+
+
+def test__split_header_line() -> None:
+    assert update._split_header_line(
+        line='def test_func() -> None: ...', existing_block_lines=[],
+        indent='    ') == ('def test_func() -> None:', '')
+    assert update._split_header_line(
+        line='class TestClass(Base): pass', existing_block_lines=[],
+        indent='    ') == ('class TestClass(Base):', ' pass')
+    assert update._split_header_line(
+        line='class TestClass:',
+        existing_block_lines=['    """', '    Lorem ipsum.', '    """ ...'],
+        indent='    ') == ('class TestClass:', ' ...')
+    assert update._split_header_line(
+        line='class TestClass:',
+        existing_block_lines=['    """', '    Lorem ipsum.', '    """'],
+        indent='    ') == ('class TestClass:', '')
+
+
+def test__get_docstring_block_lines() -> None:
+    block_lines: List[str] = update._get_docstring_block_lines(
+        line='def test_func() -> None:', docstring='Lorem ipsum.',
+        indent='    ')
+    assert block_lines == ['    """', '    Lorem ipsum.', '    """']
+
+    block_lines = update._get_docstring_block_lines(
+        line='    def test_method(self) -> None:',
+        docstring='Lorem ipsum.', indent='        ')
+    assert block_lines == [
+        '        """', '        Lorem ipsum.', '        """']
+
+    block_lines = update._get_docstring_block_lines(
+        line='class TestClass:', docstring='Lorem ipsum.', indent='    ')
+    assert block_lines == ['    """', '    Lorem ipsum.', '    """']
+
+    assert update._get_docstring_block_lines(
+        line='class TestClass:', docstring='', indent='    ') == []
+
+
+def test__has_body() -> None:
+    lines: List[str] = [
+        'class TestClass:',
+        '',
+        '    def test_method(self) -> None: ...',
+        'test_value: int',
+    ]
+    assert update._has_body(lines=lines, start_index=1, indent='    ')
+    assert not update._has_body(lines=lines, start_index=3, indent='    ')
+    assert not update._has_body(lines=lines, start_index=4, indent='    ')
+
+
+def test_update_docstrings_in_stubfile() -> None:
+    os.makedirs(_TEST_DIR_PATH, exist_ok=True)
+    stub_path: str = os.path.join(_TEST_DIR_PATH, 'sample.pyi')
+    stub_str: str = """sample_int: int
+
+def sample_func(a: int, b: str) -> bool:
+    \"\"\"
+    Outdated docstring.
+    \"\"\"
+
+class SampleClass:
+    def __init__(self) -> None: ...
+    @property
+    def sample_property(self) -> int: ...
+"""
+    with open(stub_path, 'w') as f:
+        f.write(stub_str)
+    update.update_docstrings_in_stubfile(
+        original_module_path='samples/sample.py',
+        stub_file_path=stub_path)
+    with open(stub_path) as f:
+        result_stub_str: str = f.read()
+
+    fresh_stub_path: str = os.path.join(_TEST_DIR_PATH, 'fresh.pyi')
+    with open(fresh_stub_path, 'w') as f:
+        f.write(stub_str.replace(
+            ':\n    \"\"\"\n    Outdated docstring.\n    \"\"\"', ': ...'))
+    stubdoc.add_docstring_to_stubfile(
+        original_module_path='samples/sample.py',
+        stub_file_path=fresh_stub_path)
+    with open(fresh_stub_path) as f:
+        assert result_stub_str == f.read()
+
+    mtime_ns: int = os.stat(stub_path).st_mtime_ns
+    os.utime(stub_path, ns=(mtime_ns - 10 ** 9, mtime_ns - 10 ** 9))
+    update.update_docstrings_in_stubfile(
+        original_module_path='samples/sample.py',
+        stub_file_path=stub_path)
+    assert os.stat(stub_path).st_mtime_ns == mtime_ns - 10 ** 9
+
+    with open(stub_path, 'w') as f:
+        f.write('sample_int: int\n')
+    update.update_docstrings_in_stubfile(
+        original_module_path='not_existing_module.py',
+        stub_file_path=stub_path)
+    with open(stub_path) as f:
+        assert f.read() == 'sample_int: int\n'
+    _delete_test_dir()